@@ -373,32 +373,51 @@ parray ClassEngine::GetRawCls(const parray& ell, Cls::Type t)
     if (ell.min() < 2)
         throw_error("minimum ell value is ell=2", __FILE__, __LINE__);
 
-    double *rcl = new double[sp.ct_size]();
-
-    // quantities for tensor modes
-    double **cl_md = new double*[sp.md_size];
-    for (int i = 0; i < sp.md_size; ++i)
-        cl_md[i] = new double[sp.ct_size]();
-
-    // quantities for isocurvature modes
-    double **cl_md_ic = new double*[sp.md_size];
-    for (int i = 0; i < sp.md_size; ++i)
-        cl_md_ic[i] = new double[sp.ct_size*sp.ic_ic_size[i]]();
-
     double tomuk = 1e6*Tcmb();
     double tomuk2 = tomuk*tomuk;
 
-    parray toret = parray::zeros(ell.size());
+    int N = (int) ell.size();
+    parray toret = parray::zeros(N);
+    bool failed = false;
 
-    #pragma omp parallel for
-    for (size_t i = 0; i < toret.size(); i++)
+    // each thread needs its own work arrays
+    #pragma omp parallel num_threads(Common::GetNumThreads())
     {
-        if (spectra_cl_at_l(&sp, ell[i], rcl, cl_md, cl_md_ic) == _FAILURE_)
-            throw invalid_argument(sp.error_message);
-        toret[i] = tomuk2*rcl[index];
+        double *rcl = new double[sp.ct_size]();
+
+        // quantities for tensor modes
+        double **cl_md = new double*[sp.md_size];
+        for (int i = 0; i < sp.md_size; ++i)
+            cl_md[i] = new double[sp.ct_size]();
+
+        // quantities for isocurvature modes
+        double **cl_md_ic = new double*[sp.md_size];
+        for (int i = 0; i < sp.md_size; ++i)
+            cl_md_ic[i] = new double[sp.ct_size*sp.ic_ic_size[i]]();
+
+        // exceptions cannot be thrown out of the parallel region
+        #pragma omp for
+        for (int i = 0; i < N; i++)
+        {
+            if (spectra_cl_at_l(&sp, ell[i], rcl, cl_md, cl_md_ic) == _FAILURE_) {
+                #pragma omp atomic write
+                failed = true;
+            }
+            else
+                toret[i] = tomuk2*rcl[index];
+        }
+
+        for (int i = 0; i < sp.md_size; ++i) {
+            delete [] cl_md[i];
+            delete [] cl_md_ic[i];
+        }
+        delete [] cl_md;
+        delete [] cl_md_ic;
+        delete [] rcl;
     }
 
-    delete [] rcl;
+    if (failed)
+        throw invalid_argument(sp.error_message);
     return toret;
 }
 
@@ -416,23 +435,36 @@ parray ClassEngine::GetLensedCls(const parray& ell, Cls::Type t)
     if (ell.min() < 2)
         throw_error("minimum ell value is ell=2", __FILE__, __LINE__);
 
-    double *lcl = new double[le.lt_size]();
-
     double tomuk = 1e6*Tcmb();
     double tomuk2 = tomuk*tomuk;
 
     // return array
-    parray toret = parray::zeros(ell.size());
+    int N = (int) ell.size();
+    parray toret = parray::zeros(N);
+    bool failed = false;
 
-    #pragma omp parallel for
-    for (size_t i = 0; i < toret.size(); i++)
+    // each thread needs its own work array
+    #pragma omp parallel num_threads(Common::GetNumThreads())
     {
-        if (lensing_cl_at_l(&le, ell[i], lcl) == _FAILURE_)
-            throw invalid_argument(le.error_message);
-        toret[i] = tomuk2*lcl[index];
+        double *lcl = new double[le.lt_size]();
+
+        // exceptions cannot be thrown out of the parallel region
+        #pragma omp for
+        for (int i = 0; i < N; i++)
+        {
+            if (lensing_cl_at_l(&le, ell[i], lcl) == _FAILURE_) {
+                #pragma omp atomic write
+                failed = true;
+            }
+            else
+                toret[i] = tomuk2*lcl[index];
+        }
+
+        delete [] lcl;
     }
 
-    delete [] lcl;
+    if (failed)
+        throw invalid_argument(le.error_message);
     return toret;
 }
 
@@ -664,7 +696,7 @@ parray ClassEngine::V(const parray& zmin, const parray& zmax, int Nz) const {
 
     int N = (int) zmin.size();
     parray toret(N);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < N; i++)
         toret[i] = V(zmin[i], zmax[i], Nz);
     return toret;
@@ -5,6 +5,14 @@
 #include <iostream>
 #include "Common.h"
 
+#ifdef _OPENMP
+#include <omp.h>
+#include <atomic>
+
+/* The number of threads set by SetNumThreads(), or 0 for the default */
+static std::atomic<int> num_threads(0);
+#endif
+
 void Common::throw_error(const char* msg, std::string file, int lineno)
 {
     std::string emsg(msg);
@@ -72,3 +80,18 @@ void Common::error(const char* format, ...) {
     fflush(stderr);
     abort();
 }
+
+int Common::GetNumThreads() {
+#ifdef _OPENMP
+    int n = num_threads.load();
+    return n > 0 ? n : omp_get_max_threads();
+#else
+    return 1;
+#endif
+}
+
+void Common::SetNumThreads(int n) {
+#ifdef _OPENMP
+    num_threads.store(n > 0 ? n : 0);
+#endif
+}
@@ -107,7 +107,7 @@ parray ComputeXiLM(int l, int m, const parray& k_, const parray& pk_, const parr
         }
 
         // integrate $P(k) k^m j_l(kr) dk$ over the interval $[kmin,kmax]$ using Simpson's rule */
-        #pragma omp parallel for
+        #pragma omp parallel for num_threads(Common::GetNumThreads())
         for(int i = 0; i < Nr; i++) {
         
             // the integrand for this r
@@ -158,7 +158,7 @@ double CorrelationFunction::Evaluate(double r) const {
 parray CorrelationFunction::EvaluateMany(const parray& r) const {
     int Nr = (int) r.size();
     parray xi(Nr);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < Nr; i++)
         xi[i] = Evaluate(r[i]);
 
@@ -1,4 +1,5 @@
 #include <functional>
+#include <string>
 #include "Imn.h"
 #include "PowerSpectrum.h"
 #include "Quadrature.h"
@@ -110,6 +111,16 @@ static double f33(double u, double v) {
     return (16*(3 + 2*v*v + 3*pow4(v) + u*u*(2 + 12*v*v - 30*pow4(v)) + pow4(u)*(3 - 30*v*v + 35*pow4(v))))/pow4(u*u - v*v);
 }
 
+typedef double (*ImnKernel)(double, double);
+
+/* The kernels, indexed by 4*m + n, and whether they are symmetric under v -> -v */
+static const ImnKernel kernels[] = {
+    f00, f01, f02, f03, f10, f11, f12, f13, f20, f21, f22, f23, f30, f31, f32, f33
+};
+static const bool symmetric[] = {
+    true, true, true, false, false, true, true, false, true, true, false, true, false, false, true, true
+};
+
 static double ImnIntegrand(double (*f)(double, double), const PowerSpectrum& P_L, double k, double logu, double v) {
     double u = exp(logu);
     double q = (k/2)*(u - v);
@@ -139,10 +150,83 @@ static double ComputeIntegral(ImnKernel f, const PowerSpectrum& P_L, double k, d
     }
 }
 
+/* The integrand of several kernels at once.  The factor u q r P_L(q) P_L(r)
+ * is symmetric under v -> -v, so the integral of each kernel over -1 < v < 1
+ * is the integral over 0 < v < 1 of the sum of the kernel at v and -v, and
+ * the power spectrum is only evaluated once for all of the kernels */
+struct ImnKernelsIntegrand {
+    const PowerSpectrum& P_L;
+    double k;
+    const std::vector<int>& index;
+
+    ImnKernelsIntegrand(const PowerSpectrum& P_L_, double k_, const std::vector<int>& index_)
+        : P_L(P_L_), k(k_), index(index_) {}
+
+    void operator()(const double* x, double* fx) const {
+        double u = exp(x[0]), v = x[1];
+        double q = (k/2)*(u - v);
+        double r = (k/2)*(u + v);
+        double h = u * q * r * P_L(q) * P_L(r);
+        for(size_t i = 0; i < index.size(); i++) {
+            ImnKernel f = kernels[index[i]];
+            fx[i] = symmetric[index[i]] ? 2*h*f(u, v) : h*(f(u, v) + f(u, -v));
+        }
+    }
+};
+
+static void ComputeKernelIntegrals(const std::vector<int>& index, const PowerSpectrum& P_L, double k, double* result, double epsrel = 1e-5, double qmax = QMAX) {
+    int nf = (int)index.size();
+    for(int i = 0; i < nf; i++)
+        result[i] = 0;
+    if(k <= 0 || nf == 0) return;
+
+    double umin = 1, umax = 2*qmax/k;
+    double a[] = { log(umin), 0. };
+    double b[] = { log(umax), 1. };
+    double V = k / (8*M_PI*M_PI);
+    IntegrateMany<2>(ImnKernelsIntegrand(P_L, k, index), nf, a, b, result, epsrel, 2*epsrel*P_L(k)/V);
+    for(int i = 0; i < nf; i++)
+        result[i] *= V;
+}
+
+/* The indices 4*m + n of the requested kernels */
+static std::vector<int> KernelIndices(const std::vector<int>& m, const std::vector<int>& n) {
+    if(m.size() != n.size())
+        throw_error("Imn: the number of m and n indices must be equal", __FILE__, __LINE__);
+    std::vector<int> index(m.size());
+    for(size_t i = 0; i < m.size(); i++) {
+        if(m[i] < 0 || m[i] > 3 || n[i] < 0 || n[i] > 3) {
+            std::string msg = "Imn: invalid indices, m = " + std::to_string(m[i]) + ", n = " + std::to_string(n[i]);
+            throw_error(msg, __FILE__, __LINE__);
+        }
+        index[i] = 4*m[i] + n[i];
+    }
+    return index;
+}
+
+parray Imn::EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    parray toret = parray::zeros(index.size());
+    if(!index.empty())
+        ComputeKernelIntegrals(index, P_L, k, &toret[0], epsrel);
+    return toret;
+}
+
+parray Imn::EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    int size = (int)k.size(), nf = (int)index.size();
+    parray toret = parray::zeros(size, nf);
+    if(nf == 0) return toret;
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
+    for(int i = 0; i < size; i++)
+        ComputeKernelIntegrals(index, P_L, k[i], &toret(i, 0), epsrel);
+    return toret;
+}
+
 parray Imn::EvaluateMany(const parray& k, int m, int n) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++)
         toret[i] = Evaluate(k[i], m, n);
     return toret;
@@ -1,4 +1,5 @@
 #include <functional>
+#include <string>
 #include "ImnOneLoop.h"
 #include "OneLoopPS.h"
 #include "Quadrature.h"
@@ -93,6 +94,97 @@ static double ComputeIntegral(ImnKernel f, const PowerSpectrum& P_1, const Power
 }
 
 
+typedef double (*ImnKernel)(double, double);
+
+/* The kernels, indexed by 2*m + n (NULL for invalid indices), for the linear
+ * and 1loop terms, and for the cross term */
+static const ImnKernel kernels[] = { NULL, h01, h02, h03, h04, NULL, NULL, f23, f23, f33 };
+static const ImnKernel cross_kernels[] = { NULL, h01, h02, h03, h04, NULL, NULL, f23, f32, f33 };
+
+/* The integrand of the linear, cross, and 1loop terms of several kernels at
+ * once, evaluating the power spectra only once for all of the terms */
+struct ImnOneLoopKernelsIntegrand {
+    const PowerSpectrum& P_L;
+    const PowerSpectrum& P_1;
+    const PowerSpectrum& P_2;
+    bool equal;
+    double k;
+    const std::vector<int>& index;
+
+    ImnOneLoopKernelsIntegrand(const PowerSpectrum& P_L_, const PowerSpectrum& P_1_, const PowerSpectrum& P_2_,
+                               bool equal_, double k_, const std::vector<int>& index_)
+        : P_L(P_L_), P_1(P_1_), P_2(P_2_), equal(equal_), k(k_), index(index_) {}
+
+    void operator()(const double* x, double* fx) const {
+        double u = exp(x[0]), v = x[1];
+        double q = (k/2)*(u - v);
+        double r = (k/2)*(u + v);
+        double h = u * q * r;
+        double PLq = P_L(q), P1q = P_1(q), P2r = P_2(r);
+        double linear = h * PLq * P_L(r);
+        double cross = equal ? 2*h*PLq*P2r : h*(PLq*P2r + P1q*P_L(r));
+        double oneloop = h * P1q * P2r;
+        for(size_t i = 0; i < index.size(); i++) {
+            double f = kernels[index[i]](u, v);
+            fx[3*i] = linear * f;
+            fx[3*i+1] = cross * cross_kernels[index[i]](u, v);
+            fx[3*i+2] = oneloop * f;
+        }
+    }
+};
+
+static void ComputeKernelIntegrals(const std::vector<int>& index, const PowerSpectrum& P_L, const PowerSpectrum& P_1,
+                                   const PowerSpectrum& P_2, bool equal, double k, double* result,
+                                   double epsrel = 1e-5, double qmax = QMAX)
+{
+    int nf = 3*(int)index.size();
+    for(int i = 0; i < nf; i++)
+        result[i] = 0;
+    if(k <= 0 || nf == 0) return;
+
+    double umin = 1, umax = 2*qmax/k;
+    double a[] = { log(umin), -1. };
+    double b[] = { log(umax), 1. };
+    double V = k / (8*M_PI*M_PI);
+    IntegrateMany<2>(ImnOneLoopKernelsIntegrand(P_L, P_1, P_2, equal, k, index), nf, a, b, result, epsrel, epsrel);
+    for(int i = 0; i < nf; i++)
+        result[i] *= V;
+}
+
+/* The indices 2*m + n of the requested kernels */
+static std::vector<int> KernelIndices(const std::vector<int>& m, const std::vector<int>& n) {
+    if(m.size() != n.size())
+        throw_error("ImnOneLoop: the number of m and n indices must be equal", __FILE__, __LINE__);
+    std::vector<int> index(m.size());
+    for(size_t i = 0; i < m.size(); i++) {
+        index[i] = 2*m[i] + n[i];
+        if(m[i] < 0 || n[i] < 0 || index[i] > 9 || kernels[index[i]] == NULL) {
+            std::string msg = "ImnOneLoop: invalid indices, m = " + std::to_string(m[i]) + ", n = " + std::to_string(n[i]);
+            throw_error(msg, __FILE__, __LINE__);
+        }
+    }
+    return index;
+}
+
+parray ImnOneLoop::EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    parray toret = parray::zeros(index.size(), 3);
+    if(!index.empty())
+        ComputeKernelIntegrals(index, P_L, P_1, P_2, equal, k, &toret[0], epsrel);
+    return toret;
+}
+
+parray ImnOneLoop::EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    int size = (int)k.size(), nf = (int)index.size();
+    parray toret = parray::zeros(size, nf, 3);
+    if(nf == 0) return toret;
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
+    for(int i = 0; i < size; i++)
+        ComputeKernelIntegrals(index, P_L, P_1, P_2, equal, k[i], &toret(i, 0, 0), epsrel);
+    return toret;
+}
+
 double ImnOneLoop::EvaluateLinear(double k, int m, int n) const {
     switch(2*m + n) {
         case 1:
@@ -118,7 +210,7 @@ double ImnOneLoop::EvaluateLinear(double k, int m, int n) const {
 parray ImnOneLoop::EvaluateLinear(const parray& k, int m, int n) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++) 
         toret[i] = EvaluateLinear(k[i], m, n);
     return toret;
@@ -178,7 +270,7 @@ double ImnOneLoop::EvaluateCross(double k, int m, int n) const {
 parray ImnOneLoop::EvaluateCross(const parray& k, int m, int n) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++) 
         toret[i] = EvaluateCross(k[i], m, n);
     return toret;
@@ -209,7 +301,7 @@ double ImnOneLoop::EvaluateOneLoop(double k, int m, int n) const {
 parray ImnOneLoop::EvaluateOneLoop(const parray& k, int m, int n) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++) 
         toret[i] = EvaluateOneLoop(k[i], m, n);
     return toret;
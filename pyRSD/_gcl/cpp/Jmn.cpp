@@ -1,5 +1,6 @@
 #include <functional>
 #include <iostream>
+#include <string>
 #include "Jmn.h"
 #include "PowerSpectrum.h"
 #include "Quadrature.h"
@@ -109,10 +110,81 @@ static double ComputeIntegral(JmnKernel g, const PowerSpectrum& P_L, double k, d
     
 }
 
+typedef double (*JmnKernel)(double);
+
+/* The kernels, indexed by 3*m + n (NULL for invalid indices) */
+static const JmnKernel kernels[] = { g00, g01, g02, g10, g11, NULL, g20 };
+
+/* The integrand of several kernels at once, evaluating the power spectrum
+ * only once for all of the kernels */
+struct JmnKernelsIntegrand {
+    const PowerSpectrum& P_L;
+    double k;
+    const std::vector<int>& index;
+
+    JmnKernelsIntegrand(const PowerSpectrum& P_L_, double k_, const std::vector<int>& index_)
+        : P_L(P_L_), k(k_), index(index_) {}
+
+    void operator()(const double* x, double* fx) const {
+        double q = exp(x[0]), r = q/k;
+        if (r == 1.) r = 1.-1e-10;
+        double h = q * P_L(q);
+        for(size_t i = 0; i < index.size(); i++)
+            fx[i] = h * kernels[index[i]](r);
+    }
+};
+
+static void ComputeKernelIntegrals(const std::vector<int>& index, const PowerSpectrum& P_L, double k, double* result, double epsrel = 1e-5, double qmax = QMAX) {
+    int nf = (int)index.size();
+    for(int i = 0; i < nf; i++)
+        result[i] = 0;
+    if(k <= 0 || nf == 0) return;
+
+    double q0 = log(QMIN), q1 = log(qmax);
+    double V = 1 / (2*M_PI*M_PI);
+    IntegrateMany<1>(JmnKernelsIntegrand(P_L, k, index), nf, &q0, &q1, result, epsrel, epsrel*P_L(k)/V);
+    for(int i = 0; i < nf; i++)
+        result[i] *= V;
+}
+
+/* The indices 3*m + n of the requested kernels */
+static std::vector<int> KernelIndices(const std::vector<int>& m, const std::vector<int>& n) {
+    if(m.size() != n.size())
+        throw_error("Jmn: the number of m and n indices must be equal", __FILE__, __LINE__);
+    std::vector<int> index(m.size());
+    for(size_t i = 0; i < m.size(); i++) {
+        index[i] = 3*m[i] + n[i];
+        if(m[i] < 0 || n[i] < 0 || n[i] > 2 || index[i] > 6 || kernels[index[i]] == NULL) {
+            std::string msg = "Jmn: invalid indices, m = " + std::to_string(m[i]) + ", n = " + std::to_string(n[i]);
+            throw_error(msg, __FILE__, __LINE__);
+        }
+    }
+    return index;
+}
+
+parray Jmn::EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    parray toret = parray::zeros(index.size());
+    if(!index.empty())
+        ComputeKernelIntegrals(index, P_L, k, &toret[0], epsrel);
+    return toret;
+}
+
+parray Jmn::EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const {
+    std::vector<int> index = KernelIndices(m, n);
+    int size = (int)k.size(), nf = (int)index.size();
+    parray toret = parray::zeros(size, nf);
+    if(nf == 0) return toret;
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
+    for(int i = 0; i < size; i++)
+        ComputeKernelIntegrals(index, P_L, k[i], &toret(i, 0), epsrel);
+    return toret;
+}
+
 parray Jmn::EvaluateMany(const parray& k, int m, int n) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++) 
         toret[i] = Evaluate(k[i], m, n);
     return toret;
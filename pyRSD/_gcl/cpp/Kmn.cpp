@@ -1,4 +1,5 @@
 #include <functional>
+#include <string>
 #include "Quadrature.h"
 #include "Kmn.h"
 #include "PowerSpectrum.h"
@@ -137,10 +138,134 @@ static double ComputeIntegral(KmnKernel f, const PowerSpectrum& P_L, double k, d
     
 }
 
+typedef double (*KmnKernel)(double, double);
+
+/* The kernel with the given indices, or NULL if the indices are invalid */
+static KmnKernel GetKernel(int m, int n, bool tidal, int part, bool& symmetric) {
+    symmetric = true;
+    if(m < 0 || n < 0 || n > 1 + int(tidal))
+        return NULL;
+    switch(2*(3*m + int(tidal)) + n) {
+        case 0:
+            return k00;
+        case 1:
+            return k01;
+        case 2:
+            return k00s;
+        case 3:
+            return k01s;
+        case 4:
+            return k02s;
+        case 6:
+            return k10;
+        case 7:
+            symmetric = false;
+            return k11;
+        case 8:
+            return k10s;
+        case 9:
+            symmetric = false;
+            return k11s;
+        case 12:
+            return (part == 0) ? k20_a : k20_b;
+        case 14:
+            return (part == 0) ? k20s_a : k20s_b;
+        default:
+            return NULL;
+    }
+}
+
+/* The integrand of several kernels at once.  The factor u q r P_L(q) P_L(r)
+ * is symmetric under v -> -v, so the integral of each kernel over -1 < v < 1
+ * is the integral over 0 < v < 1 of the sum of the kernel at v and -v, and
+ * the power spectrum is only evaluated once for all of the kernels */
+struct KmnKernelsIntegrand {
+    const PowerSpectrum& P_L;
+    double k;
+    const std::vector<KmnKernel>& kernels;
+    const std::vector<bool>& symmetric;
+
+    KmnKernelsIntegrand(const PowerSpectrum& P_L_, double k_, const std::vector<KmnKernel>& kernels_, const std::vector<bool>& symmetric_)
+        : P_L(P_L_), k(k_), kernels(kernels_), symmetric(symmetric_) {}
+
+    void operator()(const double* x, double* fx) const {
+        double u = exp(x[0]), v = x[1];
+        double q = (k/2)*(u - v);
+        double r = (k/2)*(u + v);
+        double h = u * q * r * P_L(q) * P_L(r);
+        for(size_t i = 0; i < kernels.size(); i++) {
+            KmnKernel f = kernels[i];
+            fx[i] = symmetric[i] ? 2*h*f(u, v) : h*(f(u, v) + f(u, -v));
+        }
+    }
+};
+
+static void ComputeKernelIntegrals(const std::vector<KmnKernel>& kernels, const std::vector<bool>& symmetric, const PowerSpectrum& P_L, double k, double* result, double epsrel = 1e-3, double qmax = QMAX) {
+    int nf = (int)kernels.size();
+    for(int i = 0; i < nf; i++)
+        result[i] = 0;
+    if(k <= 0 || nf == 0) return;
+
+    double umin = 1, umax = 2*qmax/k;
+    double a[] = { log(umin), 0. };
+    double b[] = { log(umax), 1. };
+    double V = k / (4*M_PI*M_PI);
+    IntegrateMany<2>(KmnKernelsIntegrand(P_L, k, kernels, symmetric), nf, a, b, result, epsrel, 0.);
+    for(int i = 0; i < nf; i++)
+        result[i] *= 0.5*V;
+}
+
+/* The requested kernels, and whether they are symmetric under v -> -v */
+static void GetKernels(const std::vector<int>& m, const std::vector<int>& n, const std::vector<int>& tidal,
+                       const std::vector<int>& part, std::vector<KmnKernel>& kernels, std::vector<bool>& symmetric)
+{
+    size_t nf = m.size();
+    if(n.size() != nf || tidal.size() != nf || part.size() != nf)
+        throw_error("Kmn: the number of m, n, tidal, and part indices must be equal", __FILE__, __LINE__);
+    kernels.resize(nf);
+    symmetric.resize(nf);
+    for(size_t i = 0; i < nf; i++) {
+        bool sym;
+        kernels[i] = GetKernel(m[i], n[i], bool(tidal[i]), part[i], sym);
+        if(kernels[i] == NULL) {
+            std::string msg = "Kmn: invalid indices, m = " + std::to_string(m[i]) + ", n = " + std::to_string(n[i]);
+            throw_error(msg, __FILE__, __LINE__);
+        }
+        symmetric[i] = sym;
+    }
+}
+
+parray Kmn::EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n,
+                            const std::vector<int>& tidal, const std::vector<int>& part) const
+{
+    std::vector<KmnKernel> kernels;
+    std::vector<bool> symmetric;
+    GetKernels(m, n, tidal, part, kernels, symmetric);
+    parray toret = parray::zeros(kernels.size());
+    if(!kernels.empty())
+        ComputeKernelIntegrals(kernels, symmetric, P_L, k, &toret[0], epsrel);
+    return toret;
+}
+
+parray Kmn::EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n,
+                            const std::vector<int>& tidal, const std::vector<int>& part) const
+{
+    std::vector<KmnKernel> kernels;
+    std::vector<bool> symmetric;
+    GetKernels(m, n, tidal, part, kernels, symmetric);
+    int size = (int)k.size(), nf = (int)kernels.size();
+    parray toret = parray::zeros(size, nf);
+    if(nf == 0) return toret;
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
+    for(int i = 0; i < size; i++)
+        ComputeKernelIntegrals(kernels, symmetric, P_L, k[i], &toret(i, 0), epsrel);
+    return toret;
+}
+
 parray Kmn::EvaluateMany(const parray& k, int m, int n,  bool tidal, int part) const {
     int size = (int)k.size();
     parray toret(size);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < size; i++) 
         toret[i] = Evaluate(k[i], m, n, tidal, part);
     return toret;
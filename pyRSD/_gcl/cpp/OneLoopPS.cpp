@@ -35,7 +35,7 @@ double OneLoopPS::Evaluate(double k) const {
 parray OneLoopPS::EvaluateFull(const parray& k) const {
     int n = (int)k.size();
     parray pk(n);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < n; i++)
         pk[i] = EvaluateFull(k[i]);
     return pk;
@@ -155,7 +155,7 @@ double OneLoopP22Bar::EvaluateFull(double k) const {
 parray OneLoopP22Bar::EvaluateFull(const parray& k) const {
     int n = (int)k.size();
     parray pk(n);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < n; i++)
         pk[i] = EvaluateFull(k[i]);
     return pk;
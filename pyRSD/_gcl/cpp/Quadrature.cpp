@@ -249,10 +249,10 @@ GMWorkspace::~GMWorkspace() {
 GKWorkspace* WorkspaceManager::get_gk_workspace() {
     GKWorkspace* ws = NULL;
 
-    /* Guard against race condition where multiple OpenMP parallel regions
-     * request a workspace simultaneously. */
-    #pragma omp critical
+    /* Guard against race condition where multiple threads request a
+     * workspace simultaneously. */
     {
+        std::lock_guard<std::mutex> lock(mutex);
         /* Look for a pre-existing workspace */
         for(GKWorkspaceList::iterator it = gk_workspaces.begin(); it != gk_workspaces.end(); it++) {
             if(it->second == 0) {
@@ -272,6 +272,7 @@ GKWorkspace* WorkspaceManager::get_gk_workspace() {
 }
 
 void WorkspaceManager::release_gk_workspace(GKWorkspace* ws) {
+    std::lock_guard<std::mutex> lock(mutex);
     if(gk_workspaces.find(ws) != gk_workspaces.end())
         gk_workspaces[ws] = 0;
 }
@@ -279,10 +280,10 @@ void WorkspaceManager::release_gk_workspace(GKWorkspace* ws) {
 GMWorkspace* WorkspaceManager::get_gm_workspace(int n) {
     GMWorkspace* ws = NULL;
 
-    /* Guard against race condition where multiple OpenMP parallel regions
-     * request a workspace simultaneously. */
-    #pragma omp critical
+    /* Guard against race condition where multiple threads request a
+     * workspace simultaneously. */
     {
+        std::lock_guard<std::mutex> lock(mutex);
         /* Look for a pre-existing workspace */
         for(GMWorkspaceList::iterator it = gm_workspaces.begin(); it != gm_workspaces.end(); it++) {
             if(it->first->n == n && it->second == 0) {
@@ -302,6 +303,7 @@ GMWorkspace* WorkspaceManager::get_gm_workspace(int n) {
 }
 
 void WorkspaceManager::release_gm_workspace(GMWorkspace* ws) {
+    std::lock_guard<std::mutex> lock(mutex);
     if(gm_workspaces.find(ws) != gm_workspaces.end())
         gm_workspaces[ws] = 0;
 }
@@ -369,7 +369,7 @@ double Spline::Evaluate(double x) const {
 parray Spline::EvaluateMany(const parray& x) const {
     int n = (int)x.size();
     parray toret(n);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < n; i++)
         toret[i] = Evaluate(x[i]);
     return toret;
@@ -85,7 +85,7 @@ parray ZeldovichPS::EvaluateMany(const parray& k) const
 {    
     int n = (int)k.size();
     parray pk(n);
-    #pragma omp parallel for
+    #pragma omp parallel for num_threads(Common::GetNumThreads())
     for(int i = 0; i < n; i++) {
         pk[i] = Evaluate(k[i]);
     }
@@ -252,7 +252,7 @@ protected:
     parray EvaluateMany(Function f, const parray& z) const {
       int Nz = (int) z.size();
       parray toret(Nz);
-      #pragma omp parallel for
+      #pragma omp parallel for num_threads(Common::GetNumThreads())
       for(int i = 0; i < Nz; i++)
           toret[i] = f(z[i]);
       return toret;
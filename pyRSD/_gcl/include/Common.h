@@ -55,6 +55,24 @@ namespace Common {
     void error(const char* format, ...);
 
 
+    /***** Threading *****/
+
+    /* The number of threads used by the OpenMP-parallel loops, which is
+     * always 1 if compiled without OpenMP support */
+    int GetNumThreads();
+    /* Set the number of threads used by the OpenMP-parallel loops; if
+     * n <= 0, the default number (set by OMP_NUM_THREADS) is restored.
+     *
+     * Unlike omp_set_num_threads(), which only applies to the calling
+     * thread, the setting is global: every parallel loop passes
+     * GetNumThreads() to its num_threads clause, so it also applies to
+     * loops started from other (e.g., Python) threads.
+     *
+     * The parallel loops evaluate each input value independently of the
+     * others, so the results do not depend on the number of threads. */
+    void SetNumThreads(int n);
+
+
     /***** Math routines *****/
 
     /* Small integer powers */
@@ -8,6 +8,8 @@
 //  creation date: 11/26/2014 
 // 
 
+#include <vector>
+
 #include "Common.h"
 #include "parray.h"
 
@@ -36,6 +38,12 @@ public:
     /* Evaluate the 1loop - 1loop term for a given kernel (scales as D(z)^8) */
     double EvaluateOneLoop(double k, int m, int n) const;
     parray EvaluateOneLoop(const parray& k, int m, int n) const;
+
+    /* Evaluate the linear, cross, and 1loop terms of the kernels (m[i], n[i])
+     * at once, on a shared integration grid; returns the terms of each kernel,
+     * with shape (Nkernels, 3), or (Nk, Nkernels, 3) for many k values */
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const;
     
     // accessors
     const OneLoopPS& GetOneLoopPS1() const { return P_1; }
@@ -9,6 +9,8 @@
 //  creation date: 11/25/2014 
 // 
 
+#include <vector>
+
 #include "Common.h"
 #include "parray.h"
 
@@ -29,6 +31,12 @@ public:
     /* Evaluate integral at many k values (parallelized for speed) */
     parray EvaluateMany(const parray& k, int m, int n) const;
     parray operator()(const parray& k, int m, int n) const { return EvaluateMany(k, m, n); }
+
+    /* Evaluate the integrals of the kernels (m[i], n[i]) at once, on a shared
+     * integration grid; returns the integrals of each kernel, with shape
+     * (Nk, Nkernels) for many k values */
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const;
     
     const PowerSpectrum& GetLinearPS() const { return P_L; }
     const double& GetEpsrel() const { return epsrel; }
@@ -8,6 +8,8 @@
 //  creation date: 11/23/2014 
 // 
 
+#include <vector>
+
 #include "Common.h"
 #include "parray.h"
 
@@ -27,6 +29,14 @@ public:
     /* Evaluate integral at many k values (parallelized for speed) */
     parray EvaluateMany(const parray& k, int m, int n, bool tidal=false, int part=0) const;
     parray operator()(const parray& k, int m, int n, bool tidal=false, int part=0) const { return EvaluateMany(k, m, n, tidal, part); }
+
+    /* Evaluate the integrals of the kernels (m[i], n[i], tidal[i], part[i]) at
+     * once, on a shared integration grid; returns the integrals of each kernel,
+     * with shape (Nk, Nkernels) for many k values */
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n,
+                           const std::vector<int>& tidal, const std::vector<int>& part) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n,
+                           const std::vector<int>& tidal, const std::vector<int>& part) const;
  
     const PowerSpectrum& GetLinearPS() const { return P_L; }
     const double& GetEpsrel() const { return epsrel; }
@@ -84,6 +84,24 @@ struct InverseSub { \
 template<int n, typename Function>
 double Integrate(Function f, double* a, double* b, double epsrel = 1e-5, double epsabs = 1e-10, double* abserr = 0, int* neval = 0);
 
+/**
+ * \brief Compute the n-dimensional definite integrals of a vector-valued function.
+ *
+ * Compute the nf integrals $\int f_i(\vec{x}) d^nx$ at once, using the same
+ * adaptive subregion algorithm of Genz and Malik as Integrate<n>.  All of the
+ * components are evaluated at the same points, so the parts of the integrand
+ * shared by the components need only be computed once per point.  The function
+ * f should have the signature
+ *   void f(const double* x, double* fx);
+ * and set the components fx[0], ..., fx[nf-1] at the point x.  The subregion
+ * with the largest error, relative to the requested accuracy of each
+ * component, is subdivided until _every_ component has either
+ *   relative error < epsrel or absolute error < epsabs.
+ * The integrals are stored in result, and the errors in abserr (if given),
+ * which must both have room for nf values. */
+template<int n, typename Function>
+void IntegrateMany(Function f, int nf, double* a, double* b, double* result, double epsrel = 1e-5, double epsabs = 1e-10, double* abserr = 0, int* neval = 0);
+
 
 #include "Quadrature.inl"
 
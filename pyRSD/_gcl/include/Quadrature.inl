@@ -1,7 +1,10 @@
 #include <cassert>
 #include <cfloat>
 #include <cstdlib>
+#include <algorithm>
 #include <map>
+#include <mutex>
+#include <vector>
 
 #include "Common.h"
 
@@ -200,6 +203,10 @@ struct WorkspaceManager {
     GKWorkspaceList gk_workspaces;
     GMWorkspaceList gm_workspaces;
 
+    /* Guards the lists against simultaneous requests, from either OpenMP
+     * threads or Python threads (which run without the GIL) */
+    std::mutex mutex;
+
     /* Get or release a GKWorkspace for 1-dimensional integration. */
     GKWorkspace* get_gk_workspace();
     void release_gk_workspace(GKWorkspace* workspace);
@@ -521,3 +528,270 @@ double Integrate(Function f, double* a, double* b, double epsrel, double epsabs,
 
     return finest;
 }
+
+
+/***** IntegrateMany<n> *****/
+
+template<int n>
+struct vector_region {
+    double center[n];
+    double width[n];
+    double priority;
+    int divaxn;
+};
+
+/* Order the regions, given by their index, by priority */
+template<int n>
+struct vector_region_less {
+    const std::vector<vector_region<n> >& regions;
+    vector_region_less(const std::vector<vector_region<n> >& regions_) : regions(regions_) {}
+    bool operator()(int i, int j) const { return regions[i].priority < regions[j].priority; }
+};
+
+/* Apply the basic rule of Genz & Malik to the vector-valued function f on the
+ * region with the given center and width, storing the integrals and the error
+ * estimates of the nf components in val and err.  Returns the axis with the
+ * largest fourth difference, summed over the components with the given
+ * weights, along which the region should be divided.  The work array must
+ * have room for 10*nf values. */
+template<int n, typename Function>
+int GMVectorRule(Function& f, int nf, const double* center, const double* width, const double* weight,
+                 double* val, double* err, double* work)
+{
+    const int two_to_the_n = (1 << n);
+    const double lambda2 = sqrt(9./70.);
+    const double lambda4 = sqrt(9./10.);
+    const double lambda5 = sqrt(9./19.);
+    const double wt1 = (12824. - 9120.*n + 400.*n*n)/19683.;
+    const double wt2 = 980./6561.;
+    const double wt3 = (1820. - 400.*n)/19683.;
+    const double wt4 = 200./19683.;
+    const double wt5 = 6859./19683./two_to_the_n;
+    const double wtp1 = (729. - 950.*n + 50.*n*n)/729.;
+    const double wtp2 = 245./486.;
+    const double wtp3 = (265. - 100.*n)/1458.;
+    const double wtp4 = 25./729.;
+    const double ratio = Common::pow2(lambda2/lambda4);
+
+    double* fx = work;
+    double* f1 = work + nf;
+    double* f2 = work + 2*nf;
+    double* f3 = work + 3*nf;
+    double* f4 = work + 4*nf;
+    double* sum1 = work + 5*nf;
+    double* sum2 = work + 6*nf;
+    double* sum3 = work + 7*nf;
+    double* sum4 = work + 8*nf;
+    double* sum5 = work + 9*nf;
+
+    double rgnvol = (double)two_to_the_n;
+    double widthl[n], z[n];
+    for(int j = 0; j < n; j++) {
+        rgnvol *= width[j];
+        z[j] = center[j];
+    }
+    f(z, sum1);
+    for(int i = 0; i < nf; i++)
+        sum2[i] = sum3[i] = sum4[i] = sum5[i] = 0.;
+
+    /* Compute symmetric sums of f(lambda2,0,...,0) and f(lambda4,0,...,0), and
+     * maximum fourth difference */
+    int divaxn = 0;
+    double difmax = 0.;
+    for(int j = 0; j < n; j++) {
+        z[j] = center[j] - lambda2*width[j];
+        f(z, f1);
+        z[j] = center[j] + lambda2*width[j];
+        f(z, f2);
+        widthl[j] = lambda4*width[j];
+        z[j] = center[j] - widthl[j];
+        f(z, f3);
+        z[j] = center[j] + widthl[j];
+        f(z, f4);
+
+        double dif = 0.;
+        for(int i = 0; i < nf; i++) {
+            sum2[i] += f1[i] + f2[i];
+            sum3[i] += f3[i] + f4[i];
+            double df1 = f1[i] + f2[i] - 2*sum1[i];
+            double df2 = f3[i] + f4[i] - 2*sum1[i];
+            dif += weight[i]*fabs(df1 - ratio*df2);
+        }
+        if(dif >= difmax) {
+            difmax = dif;
+            divaxn = j;
+        }
+        z[j] = center[j];
+    }
+
+    /* Compute symmetric sum of f(lambda4,lambda4,0,...,0) */
+    for(int j = 1; j < n; j++) {
+        for(int k = j; k < n; k++) {
+            for(int l = 1; l <= 2; l++) {
+                widthl[j-1] = -widthl[j-1];
+                z[j-1] = center[j-1] + widthl[j-1];
+                for(int m = 1; m <= 2; m++) {
+                    widthl[k] = -widthl[k];
+                    z[k] = center[k] + widthl[k];
+                    f(z, fx);
+                    for(int i = 0; i < nf; i++)
+                        sum4[i] += fx[i];
+                }
+            }
+            z[k] = center[k];
+        }
+        z[j-1] = center[j-1];
+    }
+
+    /* Compute symmetric sum of f(lambda5,lambda5,...,lambda5) */
+    for(int j = 0; j < n; j++) {
+        widthl[j] = -lambda5*width[j];
+        z[j] = center[j] + widthl[j];
+    }
+    for(int j = 0; j != n; ) {
+        f(z, fx);
+        for(int i = 0; i < nf; i++)
+            sum5[i] += fx[i];
+        for(j = 0; j < n; j++) {
+            widthl[j] = -widthl[j];
+            z[j] = center[j] + widthl[j];
+            if(widthl[j] > 0)
+                break;
+        }
+    }
+
+    /* Compute fifth and seventh degree rules and error */
+    for(int i = 0; i < nf; i++) {
+        double rgncmp = rgnvol*(wtp1*sum1[i] + wtp2*sum2[i] + wtp3*sum3[i] + wtp4*sum4[i]);
+        val[i] = rgnvol*(wt1*sum1[i] + wt2*sum2[i] + wt3*sum3[i] + wt4*sum4[i] + wt5*sum5[i]);
+        err[i] = fabs(val[i] - rgncmp);
+    }
+    return divaxn;
+}
+
+/* The priority of a region for subdivision: the largest error of the components,
+ * relative to the requested accuracy of each component */
+inline double GMVectorPriority(int nf, const double* err, const double* weight) {
+    double priority = 0.;
+    for(int i = 0; i < nf; i++)
+        priority = fmax(priority, weight[i]*err[i]);
+    return priority;
+}
+
+template<int n, typename Function>
+void IntegrateMany(Function f, int nf, double* a, double* b, double* result, double epsrel, double epsabs, double* pabserr, int* pneval) {
+    assert(n >= 1 && n <= 15 && nf >= 1);
+    const int rulcls = (1 << n) + 2*n*n + 2*n + 1;  // number of function calls per basic rule
+    assert(GM_MAXPTS >= rulcls);
+
+    /* The regions, and the integrals and errors of each region, stored
+     * contiguously for all of the components */
+    std::vector<vector_region<n> > regions(1);
+    std::vector<double> val(nf), err(nf);
+    std::vector<double> abserr(nf, 0.), scale(nf, 0.), weight(nf, 1.);
+    std::vector<double> work(10*nf);
+    std::vector<int> heap(1, 0);
+    vector_region_less<n> less(regions);
+
+    /** Apply the basic rule to the whole region **/
+    for(int j = 0; j < n; j++) {
+        regions[0].center[j] = 0.5*(a[j] + b[j]);
+        regions[0].width[j] = 0.5*(b[j] - a[j]);
+    }
+    regions[0].divaxn = GMVectorRule<n>(f, nf, regions[0].center, regions[0].width, &weight[0], &val[0], &err[0], &work[0]);
+    for(int i = 0; i < nf; i++) {
+        result[i] = val[i];
+        abserr[i] = err[i];
+    }
+    int funcls = rulcls;
+
+    int ifail = 3;
+    while(true) {
+        /** Make checks for termination of routine, which requires the
+         ** convergence of every component **/
+        bool converged = true, rescale = false;
+        for(int i = 0; i < nf; i++) {
+            double tolerance = fmax(epsabs, epsrel*fabs(result[i]));
+            if(abserr[i] > tolerance)
+                converged = false;
+            tolerance = fmax(tolerance, DBL_MIN);
+            if(tolerance > 2*scale[i] || tolerance < 0.5*scale[i])
+                rescale = true;
+        }
+        if(funcls + 2*rulcls > GM_MAXPTS)
+            ifail = 1;
+        if(converged && funcls >= GM_MINPTS)
+            ifail = 0;
+        if(ifail < 3)
+            break;
+
+        /** Re-order the regions if the accuracy requested for the components
+         ** has changed significantly **/
+        if(rescale) {
+            for(int i = 0; i < nf; i++) {
+                scale[i] = fmax(fmax(epsabs, epsrel*fabs(result[i])), DBL_MIN);
+                weight[i] = 1/scale[i];
+            }
+            for(size_t r = 0; r < regions.size(); r++)
+                regions[r].priority = GMVectorPriority(nf, &err[r*nf], &weight[0]);
+            std::make_heap(heap.begin(), heap.end(), less);
+        }
+
+        /** Divide the region with the largest priority in half, re-using its
+         ** storage for the first half **/
+        std::pop_heap(heap.begin(), heap.end(), less);
+        int r1 = heap.back(), r2 = (int)regions.size();
+        for(int i = 0; i < nf; i++) {
+            result[i] -= val[r1*nf + i];
+            abserr[i] -= err[r1*nf + i];
+        }
+        vector_region<n> half = regions[r1];
+        int divaxo = half.divaxn;
+        half.width[divaxo] *= 0.5;
+        half.center[divaxo] -= half.width[divaxo];
+        regions[r1] = half;
+        half.center[divaxo] += 2*half.width[divaxo];
+        regions.push_back(half);
+        val.resize((r2 + 1)*nf);
+        err.resize((r2 + 1)*nf);
+
+        /** Apply the basic rule to each half **/
+        int halves[] = { r1, r2 };
+        for(int h = 0; h < 2; h++) {
+            vector_region<n>& rgn = regions[halves[h]];
+            double* rgnval = &val[halves[h]*nf];
+            double* rgnerr = &err[halves[h]*nf];
+            rgn.divaxn = GMVectorRule<n>(f, nf, rgn.center, rgn.width, &weight[0], rgnval, rgnerr, &work[0]);
+            rgn.priority = GMVectorPriority(nf, rgnerr, &weight[0]);
+            for(int i = 0; i < nf; i++) {
+                result[i] += rgnval[i];
+                abserr[i] += rgnerr[i];
+            }
+        }
+        funcls += 2*rulcls;
+
+        heap.back() = r1;
+        std::push_heap(heap.begin(), heap.end(), less);
+        heap.push_back(r2);
+        std::push_heap(heap.begin(), heap.end(), less);
+    }
+
+    /* Re-sum results to minimize round-off error */
+    for(int i = 0; i < nf; i++)
+        result[i] = abserr[i] = 0.;
+    for(size_t r = 0; r < regions.size(); r++) {
+        for(int i = 0; i < nf; i++) {
+            result[i] += val[r*nf + i];
+            abserr[i] += err[r*nf + i];
+        }
+    }
+
+    if(ifail == 1)
+        Common::verbose("IntegrateMany: did not converge after %d function evaluations\n", funcls);
+
+    if(pabserr)
+        for(int i = 0; i < nf; i++)
+            pabserr[i] = abserr[i];
+    if(pneval)
+        *pneval = funcls;
+}
@@ -11,6 +11,9 @@ namespace std {
 %rename(_compute) compute(const ClassParams& pars);
 %rename(_clean) Clean();
 
+/* release the GIL during the long-running computations */
+%thread ClassEngine::compute;
+
 %pythoncode %{
 import contextlib
 %}
@@ -8,6 +8,14 @@ typedef unsigned short ushort;
 typedef unsigned int uint;
 typedef unsigned long ulong;
 
+/* Control the number of threads used by the OpenMP-parallel loops */
+%rename(get_num_threads) Common::GetNumThreads;
+%rename(set_num_threads) Common::SetNumThreads;
+namespace Common {
+    int GetNumThreads();
+    void SetNumThreads(int n);
+}
+
 /* Physical constants in SI units */
 %nodefaultctor Constants;
 %nodefaultdtor Constants;
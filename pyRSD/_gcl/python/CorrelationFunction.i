@@ -13,6 +13,12 @@ struct IntegrationMethods {
 %apply (double* INPLACE_ARRAY1, int DIM1) {(double xi[], int xisize)}
 
 
+/* release the GIL during the long-running computations */
+%thread ComputeXiLM;
+%thread pk_to_xi;
+%thread xi_to_pk;
+%thread CorrelationFunction::operator()(const parray& r) const;
+
 parray ComputeXiLM(int l, int m, const parray& k, const parray& pk, const parray& r,
                     double smoothing=0., IntegrationMethods::Type method=IntegrationMethods::FFTLOG);
 
@@ -2,6 +2,14 @@
 #include "Imn.h"
 %}
 
+namespace std {
+    %template(VectorInt) std::vector<int>;
+};
+
+/* release the GIL during the long-running computations */
+%thread Imn::operator()(const parray& k, int m, int n) const;
+%thread Imn::EvaluateKernels;
+
 class Imn {
 public: 
 
@@ -13,6 +21,10 @@ public:
     // translated to __call__ -> calls EvaluateMany(K)
     parray operator()(const parray& k, int m, int n) const;
 
+    // integrates the kernels (m[i], n[i]) at once
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const;
+
     const LinearPS& GetLinearPS() const;
     const double& GetEpsrel() const;
 };
@@ -2,6 +2,12 @@
 #include "ImnOneLoop.h"
 %}
 
+/* release the GIL during the long-running computations */
+%thread ImnOneLoop::EvaluateLinear(const parray& k, int m, int n) const;
+%thread ImnOneLoop::EvaluateCross(const parray& k, int m, int n) const;
+%thread ImnOneLoop::EvaluateOneLoop(const parray& k, int m, int n) const;
+%thread ImnOneLoop::EvaluateKernels;
+
 class ImnOneLoop {
 public: 
 
@@ -16,6 +22,10 @@ public:
 
     double EvaluateOneLoop(double k, int m, int n) const;
     parray EvaluateOneLoop(const parray& k, int m, int n) const;
+
+    // integrates the linear, cross, and 1loop terms of the kernels (m[i], n[i]) at once
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const;
     
     const OneLoopPS& GetOneLoopPS1() const;
     const OneLoopPS& GetOneLoopPS2() const;
@@ -2,6 +2,10 @@
 #include "Jmn.h"
 %}
 
+/* release the GIL during the long-running computations */
+%thread Jmn::operator()(const parray& k, int m, int n) const;
+%thread Jmn::EvaluateKernels;
+
 class Jmn {
 public: 
 
@@ -12,6 +16,10 @@ public:
     
     // translated to __call__ -> calls EvaluateMany(K)
     parray operator()(const parray& k, int m, int n) const;
+
+    // integrates the kernels (m[i], n[i]) at once
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n) const;
     
     const LinearPS& GetLinearPS() const;
     const double& GetEpsrel() const;
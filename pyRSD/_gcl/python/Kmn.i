@@ -2,6 +2,10 @@
 #include "Kmn.h"
 %}
 
+/* release the GIL during the long-running computations */
+%thread Kmn::operator()(const parray& k, int m, int n, bool tidal, int part) const;
+%thread Kmn::EvaluateKernels;
+
 class Kmn {
 public: 
 
@@ -12,6 +16,12 @@ public:
     
     // translated to __call__ -> calls EvaluateMany(K)
     parray operator()(const parray& k, int m, int n, bool tidal=false, int part=0) const;
+
+    // integrates the kernels (m[i], n[i], tidal[i], part[i]) at once
+    parray EvaluateKernels(double k, const std::vector<int>& m, const std::vector<int>& n,
+                           const std::vector<int>& tidal, const std::vector<int>& part) const;
+    parray EvaluateKernels(const parray& k, const std::vector<int>& m, const std::vector<int>& n,
+                           const std::vector<int>& tidal, const std::vector<int>& part) const;
     
     const LinearPS& GetLinearPS() const;
     const double& GetEpsrel() const;
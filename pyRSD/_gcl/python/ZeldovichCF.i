@@ -4,6 +4,10 @@
 
 %feature("kwargs");
 
+/* release the GIL during the long-running computations */
+%thread ZeldovichCF::EvaluateMany;
+%thread ZeldovichCF::operator()(const parray& r, double smoothing);
+
 class ZeldovichCF {
 public:
 
@@ -2,6 +2,9 @@
 #include "ZeldovichPS.h"
 %}
 
+/* release the GIL during the long-running computations */
+%thread ZeldovichPS::operator()(const parray& k) const;
+
 class ZeldovichPS {
 public:
     
@@ -1,4 +1,9 @@
-%module gcl
+/* enable thread support, but hold the GIL by default; the GIL is only
+ * released (with %thread in the interface files) during the long-running
+ * computations, so that other Python threads can run at the same time,
+ * and the cheap per-point calls do not pay for releasing it */
+%module(threads="1") gcl
+%nothread;
 
 %{
 #define SWIG_FILE_WITH_INIT
@@ -1,4 +1,5 @@
 from pyRSD import data_dir
+import numpy as np
 import os
 from six import add_metaclass, string_types
 
@@ -17,6 +18,7 @@ from .gcl import xi_to_pk, pk_to_xi
 from .gcl import ComputeXiLM, compute_xilm_fftlog as ComputeXiLM_fftlog
 from .gcl import IntegrationMethods
 from .gcl import SimpsIntegrate, TrapzIntegrate
+from .gcl import get_num_threads, set_num_threads
 
 class DocFixer(type):
 
@@ -150,6 +152,26 @@ class LinearPS(gcl.LinearPS, PickalableSWIG):
         args = self.args + (self.GetSigma8AtZ(),)
         return {'args': args}
 
+def _kernel_indices(kernels, defaults=()):
+    """
+    Return the lists of each index of `kernels`, a list of tuples of
+    kernel indices, using `defaults` for the trailing indices not given
+    """
+    ndim = 2 + len(defaults)
+    kernels = [tuple(kern) + tuple(defaults)[len(kern)-2:] for kern in kernels]
+    if any(len(kern) != ndim for kern in kernels):
+        raise ValueError("each kernel should be specified by 2 to %d indices" %ndim)
+    return [[int(i) for i in index] for index in zip(*kernels)] or [[]]*ndim
+
+def _reshape_kernels(k, values, shape):
+    """
+    Reshape the integrals `values` returned by ``EvaluateKernels`` to
+    `shape`, followed by the dimension of `k`, if `k` is an array
+    """
+    if np.ndim(k):
+        return np.moveaxis(values.reshape((len(k),) + shape), 0, -1)
+    return values.reshape(shape)
+
 #-------------------------------------------------------------------------------
 
 # Imn
@@ -159,6 +181,28 @@ class Imn(gcl.Imn, PickalableSWIG):
         self.args = args
         gcl.Imn.__init__(self, *args)
 
+    def EvaluateKernels(self, k, kernels):
+        """
+        Evaluate the integrals of several kernels at once, integrating
+        all of the kernels on a shared integration grid
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the integrals at
+        kernels : list of tuple
+            the ``(m, n)`` indices of the kernels
+
+        Returns
+        -------
+        numpy.ndarray :
+            the integrals, with shape ``(len(kernels),)``, or
+            ``(len(kernels), len(k))`` if `k` is an array
+        """
+        indices = _kernel_indices(kernels)
+        toret = gcl.Imn.EvaluateKernels(self, k, *indices)
+        return _reshape_kernels(k, toret, (len(kernels),))
+
 #-------------------------------------------------------------------------------
 
 # Jmn
@@ -168,6 +212,28 @@ class Jmn(gcl.Jmn, PickalableSWIG):
         self.args = args
         gcl.Jmn.__init__(self, *args)
 
+    def EvaluateKernels(self, k, kernels):
+        """
+        Evaluate the integrals of several kernels at once, integrating
+        all of the kernels on a shared integration grid
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the integrals at
+        kernels : list of tuple
+            the ``(m, n)`` indices of the kernels
+
+        Returns
+        -------
+        numpy.ndarray :
+            the integrals, with shape ``(len(kernels),)``, or
+            ``(len(kernels), len(k))`` if `k` is an array
+        """
+        indices = _kernel_indices(kernels)
+        toret = gcl.Jmn.EvaluateKernels(self, k, *indices)
+        return _reshape_kernels(k, toret, (len(kernels),))
+
 #-------------------------------------------------------------------------------
 
 # Kmn
@@ -177,6 +243,29 @@ class Kmn(gcl.Kmn, PickalableSWIG):
         self.args = args
         gcl.Kmn.__init__(self, *args)
 
+    def EvaluateKernels(self, k, kernels):
+        """
+        Evaluate the integrals of several kernels at once, integrating
+        all of the kernels on a shared integration grid
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the integrals at
+        kernels : list of tuple
+            the ``(m, n)``, ``(m, n, tidal)``, or ``(m, n, tidal, part)``
+            indices of the kernels
+
+        Returns
+        -------
+        numpy.ndarray :
+            the integrals, with shape ``(len(kernels),)``, or
+            ``(len(kernels), len(k))`` if `k` is an array
+        """
+        indices = _kernel_indices(kernels, defaults=(False, 0))
+        toret = gcl.Kmn.EvaluateKernels(self, k, *indices)
+        return _reshape_kernels(k, toret, (len(kernels),))
+
 #-------------------------------------------------------------------------------
 
 # ImnOneLoop
@@ -186,6 +275,28 @@ class ImnOneLoop(gcl.ImnOneLoop, PickalableSWIG):
         self.args = args
         gcl.ImnOneLoop.__init__(self, *args)
 
+    def EvaluateKernels(self, k, kernels):
+        """
+        Evaluate the integrals of several kernels at once, integrating
+        all of the kernels on a shared integration grid
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the integrals at
+        kernels : list of tuple
+            the ``(m, n)`` indices of the kernels
+
+        Returns
+        -------
+        numpy.ndarray :
+            the linear, cross, and 1-loop terms of each kernel, with shape
+            ``(len(kernels), 3)``, or ``(len(kernels), 3, len(k))`` if `k` is an array
+        """
+        indices = _kernel_indices(kernels)
+        toret = gcl.ImnOneLoop.EvaluateKernels(self, k, *indices)
+        return _reshape_kernels(k, toret, (len(kernels), 3))
+
 #-------------------------------------------------------------------------------
 
 # OneLoopPdd
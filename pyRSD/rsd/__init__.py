@@ -26,6 +26,7 @@ from .power.qso    import QuasarSpectrum
 from . import transfers
 from .power_extrapolator import ExtrapolatedPowerSpectrum
 from .correlation import SmoothedXiMultipoles
+from .multi_redshift import MultiRedshiftSpectrum
 
 def print_version():
     """
@@ -46,15 +47,18 @@ class OutdatedModelWarning(UserWarning):
 
 def load_model(filename, show_warning=True):
     """
-    Load a model from a npy
+    Load a model from a pickled ``.npy`` file or a ``.npz`` snapshot
     """
     from .. import os, numpy
 
     # check the filename extension
     _, ext = os.path.splitext(filename)
+    if ext == os.path.extsep + 'npz':
+        from .snapshot import load_snapshot
+        return load_snapshot(filename, show_warning=show_warning)
     desired_ext = os.path.extsep + 'npy'
     if ext != desired_ext:
-        raise ValueError("file name should end in %s" %desired_ext)
+        raise ValueError("file name should end in %s or %snpz" %(desired_ext, os.path.extsep))
 
     # load
     model = numpy.load(filename, encoding='latin1').tolist()
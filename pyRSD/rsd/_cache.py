@@ -5,7 +5,14 @@ import functools
 from collections import OrderedDict
 import inspect
 import fnmatch
+import timeit
+import contextlib
+import hashlib
+import itertools
+import sys
+import weakref
 from six import add_metaclass, PY3, string_types
+from six.moves import builtins
 
 try:
     from functools import lru_cache
@@ -42,6 +49,517 @@ def doublewrap(f):
 
     return new_dec
 
+class ParameterUpdateError(ValueError):
+    """
+    The exception raised when :func:`Cache.bulk_update` fails to set
+    a parameter value
+    """
+    def __init__(self, name, value, error):
+        self.name = name
+        self.value = value
+        self.error = error
+        msg = "failure to set parameter `%s` to value %s: %s" %(name, str(value), str(error))
+        ValueError.__init__(self, msg)
+
+class CacheStats(object):
+    """
+    Record the cache hits, misses, recompute wall-time, and the sources of
+    invalidation for each `cached_property` and `interpolated_function`
+    of a :class:`Cache` instance
+
+    Notes
+    -----
+    *   the `time` of an attribute is the total wall-time spent recomputing
+        it, including any recomputation of the attributes it depends on; the
+        `self_time` excludes the time spent on its dependencies
+    *   `invalidations` counts, for each source, the number of times a
+        cached value was discarded; the source is either the name of the
+        parameter whose setter changed value, or the name of the deleted
+        cached property
+    """
+    def __init__(self):
+        self.stats = {}
+        self._stack = []
+
+    def _get(self, name):
+        if name not in self.stats:
+            self.stats[name] = {'hits':0, 'misses':0, 'time':0., 'self_time':0., 'invalidations':{}}
+        return self.stats[name]
+
+    def hit(self, name):
+        """
+        Record a cache hit for the attribute `name`
+        """
+        self._get(name)['hits'] += 1
+
+    def start(self, name):
+        """
+        Record the start of the recompute of attribute `name`
+        """
+        self._stack.append([name, timeit.default_timer(), 0.])
+
+    def stop(self, name):
+        """
+        Record the end of the recompute of attribute `name`
+        """
+        _, start, child_time = self._stack.pop()
+        elapsed = timeit.default_timer() - start
+
+        d = self._get(name)
+        d['misses'] += 1
+        d['time'] += elapsed
+        d['self_time'] += elapsed - child_time
+
+        # remove from the parent's self time
+        if len(self._stack):
+            self._stack[-1][2] += elapsed
+
+    def invalidate(self, name, source):
+        """
+        Record that the cached value of `name` was discarded due to `source`
+        """
+        inv = self._get(name)['invalidations']
+        inv[source] = inv.get(source, 0) + 1
+
+    def reset(self):
+        """
+        Reset all statistics
+        """
+        self.stats.clear()
+        self._stack = []
+
+    def report(self, sort='time'):
+        """
+        Return the statistics as an ordered dictionary, sorted in
+        descending order by the input key
+
+        Parameters
+        ----------
+        sort : {'time', 'self_time', 'hits', 'misses'}
+            the statistic to sort by
+        """
+        names = sorted(self.stats, key=lambda name: self.stats[name][sort], reverse=True)
+        toret = OrderedDict()
+        for name in names:
+            d = dict(self.stats[name])
+            d['invalidations'] = dict(d['invalidations'])
+            d['mean_time'] = d['time'] / d['misses'] if d['misses'] else 0.
+            toret[name] = d
+        return toret
+
+    def invalidations_by_parameter(self):
+        """
+        Return a dictionary mapping each invalidation source to the
+        attributes it invalidated, and the time spent recomputing them
+        """
+        toret = {}
+        for name, d in self.stats.items():
+            mean_time = d['self_time'] / d['misses'] if d['misses'] else 0.
+            for source, N in d['invalidations'].items():
+                x = toret.setdefault(source, {'invalidated':{}, 'cost':0.})
+                x['invalidated'][name] = N
+                x['cost'] += N * mean_time
+        return toret
+
+    def graph(self, cls):
+        """
+        Return the dependency graph of the cached attributes of `cls`,
+        as stored in :attr:`_cachemap`, with each node annotated with
+        the recorded statistics
+
+        Returns
+        -------
+        graph : dict
+            dictionary with `nodes`, mapping each attribute name to
+            its statistics, and `edges`, a list of (parent, child) tuples
+        """
+        nodes = OrderedDict()
+        edges = []
+        for name, parents in cls._cachemap.items():
+            for parent in parents:
+                edges.append((parent, name))
+                nodes.setdefault(parent, None)
+            nodes[name] = None
+
+        empty = {'hits':0, 'misses':0, 'time':0., 'self_time':0., 'invalidations':{}}
+        for name in nodes:
+            d = dict(self.stats.get(name, empty))
+            d['type'] = 'parameter' if name in cls._param_names else 'cached'
+            nodes[name] = d
+
+        return {'nodes':nodes, 'edges':edges}
+
+    def to_dot(self, cls):
+        """
+        Return the annotated dependency graph of `cls` in the
+        graphviz DOT format
+        """
+        graph = self.graph(cls)
+        lines = ['digraph "%s" {' %cls.__name__]
+        for name, d in graph['nodes'].items():
+            if d['type'] == 'parameter':
+                label = name
+                lines.append('  "%s" [shape=box, label="%s"];' %(name, label))
+            else:
+                args = (name, d['hits'], d['misses'], d['self_time'])
+                label = "%s\\nhits=%d misses=%d\\nself time=%.3g s" %args
+                lines.append('  "%s" [label="%s"];' %(name, label))
+        for parent, child in graph['edges']:
+            lines.append('  "%s" -> "%s";' %(parent, child))
+        lines.append('}')
+        return "\n".join(lines)
+
+def _state_value(val, refs):
+    """
+    Return a hashable representation of a parameter value, appending
+    any objects that are identified by their `id` to `refs`, such that
+    they are kept alive
+    """
+    if val is None or isinstance(val, (string_types, bool, int, float, numpy.number)):
+        return val
+    elif isinstance(val, numpy.ndarray):
+        digest = hashlib.sha1(numpy.ascontiguousarray(val).view(numpy.uint8)).hexdigest()
+        return (val.dtype.str, val.shape, digest)
+    elif isinstance(val, (list, tuple)):
+        return tuple(_state_value(v, refs) for v in val)
+    elif isinstance(val, dict):
+        return tuple(sorted((k, _state_value(v, refs)) for k, v in val.items()))
+    else:
+        refs.append(val)
+        return ('id', id(val))
+
+def _snapshot_value(val, generation, refs):
+    """
+    Return a hashable representation of a parameter value for the keys of
+    :class:`CacheSnapshots`
+
+    Scalars are represented by their value, such that revisiting the same
+    values is recognized. Any other objects are represented by their `id`
+    and the `generation` in which the parameter was last set, such that
+    arrays never need to be hashed; the objects are appended to `refs`,
+    such that they are kept alive.
+    """
+    if val is None or isinstance(val, (string_types, bool, int, float, numpy.number)):
+        return val
+    refs.append(val)
+    return ('id', id(val), generation)
+
+def _nbytes(val):
+    """
+    Estimate the memory used by a cached value
+    """
+    if isinstance(val, numpy.ndarray):
+        return val.nbytes
+    elif isinstance(val, InterpolatedFunction):
+        splines = val.spline if isinstance(val.spline, list) else [val.spline]
+        return sum(_nbytes(spl) for spl in splines)
+    elif hasattr(val, '_data') and hasattr(val, 'x'):
+        # FITPACK splines
+        toret = sum(x.nbytes for x in val._data if isinstance(x, numpy.ndarray))
+        return toret + val.x.nbytes + val.y.nbytes
+    else:
+        return sys.getsizeof(val)
+
+class CacheSnapshots(object):
+    """
+    A bounded, least-recently used store of snapshots of the cache
+    of a :class:`Cache` instance, keyed by the state of its parameters
+
+    The store holds at most :attr:`maxsize` snapshots, using at most
+    (approximately) :attr:`max_bytes` bytes of memory.
+    """
+    def __init__(self, maxsize=16, max_bytes=256*1024**2):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            the maximum number of snapshots to store
+        max_bytes : int, optional
+            the memory budget of the snapshots in bytes
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def __getstate__(self):
+        # do not pickle the snapshots
+        return {'maxsize':self.maxsize, 'max_bytes':self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def clear(self):
+        """
+        Remove all snapshots
+        """
+        self._store = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, key, cache, refs=[], exclude=()):
+        """
+        Store a shallow copy of `cache` for the parameter state `key`,
+        evicting the least-recently used snapshots if needed
+
+        Parameters
+        ----------
+        key : hashable
+            the key identifying the parameter state
+        cache : dict
+            the cache dictionary
+        refs : list, optional
+            objects that must be kept alive as long as the snapshot exists
+        exclude : iterable of str, optional
+            the names of cached attributes that should not be stored
+        """
+        snapshot = dict((k, v) for k, v in cache.items() if k not in exclude)
+        if not snapshot: return
+        nbytes = sum(_nbytes(v) for v in snapshot.values())
+
+        self.discard(key)
+        self._store[key] = (snapshot, list(refs), nbytes)
+        self.nbytes += nbytes
+
+        # evict least recently used
+        while len(self._store) > 1 and (len(self._store) > self.maxsize or self.nbytes > self.max_bytes):
+            self.discard(next(iter(self._store)))
+
+    def discard(self, key):
+        """
+        Remove the snapshot for the state `key`, if it exists
+        """
+        if key in self._store:
+            _, _, nbytes = self._store.pop(key)
+            self.nbytes -= nbytes
+
+    def restore(self, key):
+        """
+        Return the snapshot for the state `key`, or `None` if there is
+        no such snapshot
+        """
+        if key not in self._store:
+            self.misses += 1
+            return None
+
+        # move to most recently used
+        entry = self._store.pop(key)
+        self._store[key] = entry
+        self.hits += 1
+        return entry[0]
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of parameter state changes that were restored
+        from a snapshot
+        """
+        N = self.hits + self.misses
+        return 1.*self.hits / N if N else 0.
+
+def shared_attributes(cls, params):
+    """
+    Return the names of the cached attributes of the :class:`Cache`
+    subclass `cls` that only depend on the parameters in `params`,
+    excluding those updated in place by other parameters (see
+    :attr:`Cache._snapshot_exclude`)
+    """
+    masks = cls._invalidation_masks
+    allowed = disallowed = 0
+    for name, mask in masks.items():
+        if name in params:
+            allowed |= mask
+        else:
+            disallowed |= mask
+    mask = allowed & ~disallowed
+
+    exclude = getattr(cls, '_snapshot_exclude', ())
+    return [name for i, name in enumerate(cls._cached_order) if (mask >> i) & 1 and name not in exclude]
+
+class SharedStore(object):
+    """
+    A bounded, least-recently used store of the cached attributes that
+    are shared between several :class:`Cache` instances, keyed by the
+    state of the parameters they depend on; see :class:`SharedCache`
+    """
+    def __init__(self, maxsize=4):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            the maximum number of parameter states to store
+        """
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def clear(self):
+        """
+        Remove all stored attributes
+        """
+        self._store.clear()
+
+    def entry(self, key, refs=[]):
+        """
+        Return the dictionary of the attributes shared in the parameter
+        state `key`, creating it and evicting the least-recently used
+        states if needed
+
+        Parameters
+        ----------
+        key : hashable
+            the key identifying the parameter state
+        refs : list, optional
+            objects that must be kept alive as long as the entry exists
+        """
+        if key in self._store:
+            entry = self._store.pop(key)
+        else:
+            entry = ({}, list(refs))
+        self._store[key] = entry
+
+        # evict least recently used
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+        return entry[0]
+
+class SharedCache(dict):
+    """
+    The cache of a :class:`Cache` instance, which keeps the cached
+    attributes in :attr:`names` in a :class:`SharedStore` that can be
+    shared with other instances
+
+    The shared attributes must only depend on the parameters in
+    :attr:`params`, and they are stored per state of these parameters,
+    such that instances in different states never see each other's values.
+
+    Notes
+    -----
+    *   shared attributes never need to be invalidated, so removing them
+        from the cache has no effect
+    *   iterating over the cache only returns the attributes that are not
+        shared; use :func:`copy` to get all of the attributes
+    *   a pickled :class:`SharedCache` is restored as a regular
+        dictionary, and is no longer shared
+    """
+    def __init__(self, obj, names, params, store):
+        """
+        Parameters
+        ----------
+        obj : Cache
+            the instance whose cache this is
+        names : iterable of str
+            the names of the shared cached attributes
+        params : iterable of str
+            the names of the parameters the shared attributes depend on
+        store : SharedStore
+            the store holding the shared attributes
+        """
+        dict.__init__(self)
+        self.names  = frozenset(names)
+        self.params = tuple(params)
+        self.store  = store
+
+        self._obj    = weakref.ref(obj)
+        self._attrs  = tuple('__'+name for name in self.params)
+        self._values = None
+        self._entry  = None
+
+    @classmethod
+    def install(cls, obj, params, store):
+        """
+        Replace the cache of `obj` with a :class:`SharedCache`, which shares
+        the cached attributes that only depend on `params` (see
+        :func:`shared_attributes`) through `store`
+
+        Any attributes already in the cache of `obj` are kept, unless the
+        store already holds a shared attribute for the current state.
+        """
+        names = shared_attributes(obj.__class__, params)
+        cache = obj._cache.copy()
+        obj._cache = toret = cls(obj, names, params, store)
+        for k, v in cache.items():
+            if k not in toret:
+                toret[k] = v
+        return toret
+
+    @classmethod
+    def uninstall(cls, obj):
+        """
+        Replace the :class:`SharedCache` of `obj` with a regular dictionary
+        holding the shared and non-shared attributes in the current state
+        of the parameters, such that the attributes are no longer shared
+        """
+        cache = obj._cache
+        if isinstance(cache, cls):
+            obj._cache = cache.copy()
+        return obj._cache
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    def shared(self):
+        """
+        The dictionary of shared attributes in the current state
+        of the parameters
+        """
+        # only compute the state when a parameter is set to a new object
+        d = self._obj().__dict__
+        values = tuple(d.get(name, None) for name in self._attrs)
+        if self._values is None or any(v is not w for v, w in zip(values, self._values)):
+            refs = []
+            key = tuple(_state_value(v, refs) for v in values)
+            self._entry = self.store.entry(key, refs)
+            self._values = values
+        return self._entry
+
+    def __getitem__(self, name):
+        if name in self.names:
+            return self.shared()[name]
+        return dict.__getitem__(self, name)
+
+    def __setitem__(self, name, value):
+        if name in self.names:
+            self.shared()[name] = value
+        else:
+            dict.__setitem__(self, name, value)
+
+    def __delitem__(self, name):
+        if name not in self.names:
+            dict.__delitem__(self, name)
+
+    def __contains__(self, name):
+        if name in self.names:
+            return name in self.shared()
+        return dict.__contains__(self, name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def pop(self, name, *default):
+        if name in self.names:
+            return default[0] if default else None
+        return dict.pop(self, name, *default)
+
+    def copy(self):
+        """
+        A regular dictionary holding the shared and non-shared attributes
+        """
+        toret = dict(dict.items(self))
+        toret.update(self.shared())
+        return toret
+
 class Property(object):
     def __init__(self, fget=None, fset=None, fdel=None, doc=None):
         self.fget = fget
@@ -97,8 +615,11 @@ class CachedProperty(Property):
 
         # clear the cache of any parameters that depend
         # on this cached property attribute
+        stats = obj.__dict__.get('_cache_stats', None)
         for dep in self._deps:
-            obj._cache.pop(dep, None)
+            if stats is not None and dep in obj._cache:
+                stats.invalidate(dep, self.fget.__name__)
+            _discard(obj, dep)
 
 class CacheSchema(type):
     """
@@ -146,7 +667,14 @@ class CacheSchema(type):
                         cls.allowable_kwargs.add(name)
                     cls._param_names.add(name)
 
+        # properties depending on all parameters, except those excluded
+        for name in cls._cachemap:
+            exclude = getattr(getattr(cls, name), '_exclude', None)
+            if exclude is not None:
+                cls._cachemap[name] = sorted(cls._param_names - exclude)
+
         # invert the cache map
+        cachemap = cls._cachemap
         def invert_cachemap(name, deps):
             """
             Recursively find all cached properties
@@ -165,7 +693,7 @@ class CacheSchema(type):
                 # recursively seach all parents of a cached property
                 elif isinstance(f, CachedProperty) or getattr(f, '__cache__', False):
                     f._deps.add(name)
-                    invert_cachemap(name, f._parents)
+                    invert_cachemap(name, cachemap.get(param, f._parents))
                 # invalid parent property
                 else:
                     if hasattr(f, '_deps'):
@@ -177,12 +705,43 @@ class CacheSchema(type):
         for name in cls._cachemap:
             invert_cachemap(name, cls._cachemap[name])
 
+        # the ordered internal names of the parameters
+        cls._param_attrs = tuple('__'+name for name in sorted(cls._param_names))
+
+        # precompute the invalidation bitmask of each parameter, where
+        # bit i corresponds to the cached attribute `_cached_order[i]`
+        cls._cached_order = tuple(sorted(cls._cached_names))
+        index = dict((name, i) for i, name in enumerate(cls._cached_order))
+        cls._invalidation_masks = {}
+        for name in cls._param_names:
+            mask = 0
+            for dep in getattr(cls, name)._deps:
+                if dep in index:
+                    mask |= 1 << index[dep]
+            cls._invalidation_masks[name] = mask
+
+        # the cached attributes that only need to be rescaled when each
+        # parameter changes; see the `rescale` keyword of `interpolated_function`
+        cls._rescale_deps = {}
+        cls._rescale_masks = {}
+        for name in cls._param_names:
+            deps = set()
+            for dep in getattr(cls, name)._deps:
+                if name in getattr(getattr(cls, dep, None), '_rescale', {}):
+                    deps.add(dep)
+            cls._rescale_deps[name] = deps
+            cls._rescale_masks[name] = sum(1 << index[dep] for dep in deps if dep in index)
+
 @add_metaclass(CacheSchema)
 class Cache(object):
     """
     The main class to do handle caching of parameters; this is the
     class that should serve as the base class
     """
+    # cached attributes that are updated in place when parameters
+    # change and thus cannot be restored from snapshots
+    _snapshot_exclude = frozenset()
+
     def __new__(cls, *args, **kwargs):
         obj = object.__new__(cls)
         obj._cache = {}
@@ -191,6 +750,303 @@ class Cache(object):
     def __init__(self, *args, **kwargs):
         super(Cache, self).__init__(*args, **kwargs)
 
+    @property
+    def generation(self):
+        """
+        A number identifying the current state of the parameters, which
+        changes each time a parameter changes value
+
+        Generations are drawn from a global counter, so a generation value
+        always refers to a unique parameter state.
+        """
+        return self.__dict__.get('_generation', 0)
+
+    def _clear_mask(self, mask, rescale=0):
+        """
+        Remove all cached attributes in the input invalidation bitmask
+        from the cache, in a single pass
+
+        The attributes in the `rescale` bitmask are kept aside to
+        be rescaled when next accessed; see :func:`_discard`
+        """
+        if not mask: return
+        order = self._cached_order
+        stats = self.__dict__.get('_cache_stats', None)
+        for i, name in enumerate(order):
+            if (mask >> i) & 1:
+                if stats is not None and name in self._cache:
+                    stats.invalidate(name, 'bulk_update')
+                _discard(self, name, (rescale >> i) & 1)
+
+    def bulk_update(self, **kwargs):
+        """
+        Transactionally update multiple parameters at once
+
+        The union of the cached attributes that depend on the parameters that
+        changed value is computed from the precomputed invalidation bitmasks
+        of the class and removed from the cache in a single pass, rather than
+        once per parameter. If setting any value fails, all parameters are
+        restored to their original values before re-raising the exception.
+
+        Notes
+        -----
+        Parameters with setters that access other model attributes, and
+        keywords that are not parameters, are set with :func:`setattr` after
+        applying any pending invalidations, to guarantee that they see
+        an up-to-date state
+
+        Parameters
+        ----------
+        **kwargs :
+            the parameter values to update, as key/value pairs
+
+        Returns
+        -------
+        changed : list of str
+            the names of the parameters that changed value
+
+        Raises
+        ------
+        ParameterUpdateError :
+            if any of the parameters could not be set
+        """
+        cls = self.__class__
+        masks = cls._invalidation_masks
+        rescale_masks = cls._rescale_masks
+        d = self.__dict__
+
+        # the state before updating
+        snapshots = d.get('_snapshots', None)
+        if snapshots is not None:
+            state = self._parameter_state()
+
+        saved = OrderedDict() # original values of changed parameters
+        changed = []
+        pending = 0
+        touched = 0
+        hard = 0 # invalidations that cannot be handled by rescaling
+        name = value = None
+        try:
+            for name, value in kwargs.items():
+                prop = getattr(cls, name, None) if name in masks else None
+
+                # slow path: not a parameter or an impure parameter setter
+                if prop is None or not prop._pure:
+                    self._clear_mask(pending, pending & ~hard); pending = 0
+                    if prop is not None:
+                        _name = prop._attr
+                        if name not in saved:
+                            saved[name] = d.get(_name, _missing)
+                    gen = self.generation
+                    setattr(self, name, value)
+                    if prop is not None and self.generation != gen:
+                        changed.append(name)
+                        touched |= masks[name]
+                    continue
+
+                # fast path: convert and compare
+                _name = prop._attr
+                val = prop._convert(self, value)
+                old = d.get(_name, _missing)
+                if old is _missing or not fast_eq(val, old):
+                    if name not in saved:
+                        saved[name] = old
+                    d[_name] = val
+                    changed.append(name)
+                    pending |= masks[name]
+                    touched |= masks[name]
+                    hard |= masks[name] & ~rescale_masks[name]
+        except Exception as e:
+            # restore the original state and clear anything that
+            # might have been computed with the new values
+            for par, old in saved.items():
+                _name = getattr(cls, par)._attr
+                if old is _missing: d.pop(_name, None)
+                else: d[_name] = old
+            self._clear_mask(touched)
+            d['_generation'] = generation = next(_generations)
+            generations = d.setdefault('_param_generations', {})
+            for par in saved:
+                generations[par] = generation
+            raise ParameterUpdateError(name, value, e)
+
+        # invalidate everything once
+        self._clear_mask(pending, pending & ~hard)
+        if changed:
+            d['_generation'] = generation = next(_generations)
+            generations = d.setdefault('_param_generations', {})
+            for par in changed:
+                generations[par] = generation
+
+            # save the old state and restore the new state, if we can
+            if snapshots is not None:
+                snapshots.save(state[0], state[1], refs=state[2], exclude=self._snapshot_exclude)
+                snapshot = snapshots.restore(self._parameter_state()[0])
+                if snapshot is not None:
+                    for k in snapshot:
+                        if k not in self._cache:
+                            self._cache[k] = snapshot[k]
+        return changed
+
+    @contextlib.contextmanager
+    def temporary_update(self, **kwargs):
+        """
+        Context manager to temporarily update the input parameters with
+        :func:`bulk_update`, restoring the original values upon exiting
+
+        If no other parameters were changed inside the context, the
+        original :attr:`generation` (and that of each parameter) is also
+        restored, since the model has returned to its original state.
+        """
+        original = dict((k, getattr(self, k)) for k in kwargs)
+        generation = self.generation
+        generations = dict(self.__dict__.get('_param_generations', {}))
+        self.bulk_update(**kwargs)
+        inner = self.generation
+        try:
+            yield
+        finally:
+            unchanged = self.generation == inner
+            self.bulk_update(**original)
+            if unchanged:
+                self.__dict__['_generation'] = generation
+                self.__dict__['_param_generations'] = generations
+
+    def _parameter_state(self):
+        """
+        Return a tuple of (key, cache, refs), where `key` identifies the current
+        values of all parameters, `cache` is a shallow copy of the cache,
+        and `refs` are the objects identified by their `id` in `key`
+
+        Non-scalar parameters are identified by their `id` and the generation
+        in which they were last set (see :func:`_snapshot_value`)
+        """
+        d = self.__dict__
+        generations = d.get('_param_generations', {})
+        refs = []
+        key = tuple(_snapshot_value(d.get(attr, None), generations.get(attr[2:], 0), refs)
+                    for attr in self._param_attrs)
+        return key, self._cache.copy(), refs
+
+    def enable_snapshots(self, maxsize=16, max_bytes=256*1024**2):
+        """
+        Store snapshots of the cache for previously visited parameter
+        states, which are restored instead of recomputed when the model
+        returns to that state via :func:`bulk_update`
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            the maximum number of snapshots to store
+        max_bytes : int, optional
+            the memory budget of the snapshots in bytes
+
+        Returns
+        -------
+        snapshots : CacheSnapshots
+            the snapshot store
+        """
+        self._snapshots = CacheSnapshots(maxsize=maxsize, max_bytes=max_bytes)
+        return self._snapshots
+
+    def disable_snapshots(self):
+        """
+        Stop storing snapshots of the cache, returning the
+        :class:`CacheSnapshots` store
+        """
+        return self.__dict__.pop('_snapshots', None)
+
+    @contextlib.contextmanager
+    def use_snapshots(self, **kwargs):
+        """
+        Context manager to temporarily enable cache snapshots, if they
+        are not already enabled; see :func:`enable_snapshots`
+        """
+        enabled = '_snapshots' in self.__dict__
+        if not enabled:
+            self.enable_snapshots(**kwargs)
+        try:
+            yield self._snapshots
+        finally:
+            if not enabled:
+                self.disable_snapshots()
+
+    def enable_cache_stats(self):
+        """
+        Start recording cache statistics, which are stored as a
+        :class:`CacheStats` in :attr:`cache_stats`
+        """
+        self._cache_stats = CacheStats()
+        return self._cache_stats
+
+    def disable_cache_stats(self):
+        """
+        Stop recording cache statistics, returning the recorded
+        :class:`CacheStats`
+        """
+        return self.__dict__.pop('_cache_stats', None)
+
+    @property
+    def cache_stats(self):
+        """
+        The :class:`CacheStats` being recorded, or `None`
+        """
+        return self.__dict__.get('_cache_stats', None)
+
+    def cache_stats_report(self, sort='time'):
+        """
+        Return the recorded cache statistics per cached attribute; see
+        :func:`CacheStats.report`
+        """
+        if self.cache_stats is None:
+            raise ValueError("cache statistics are not enabled; see `enable_cache_stats`")
+        return self.cache_stats.report(sort=sort)
+
+    def cache_graph(self):
+        """
+        Return the dependency graph of cached attributes, annotated
+        with the recorded statistics; see :func:`CacheStats.graph`
+        """
+        stats = self.cache_stats
+        if stats is None: stats = CacheStats()
+        return stats.graph(self.__class__)
+
+# sentinel for missing parameter values
+_missing = object()
+
+def _discard(obj, name, rescale=False):
+    """
+    Remove the cached attribute `name` from the cache of `obj`
+
+    If `rescale` is `True`, the attribute only changed by an overall
+    amplitude, and the cached value is kept aside, to be rescaled rather
+    than recomputed when next accessed; otherwise, any value kept
+    aside is discarded as well.
+    """
+    val = obj._cache.pop(name, None)
+    d = obj.__dict__
+    if rescale:
+        if val is not None:
+            d.setdefault('_rescalable', {})[name] = val
+    elif '_rescalable' in d:
+        d['_rescalable'].pop(name, None)
+
+# global source of parameter generations, such that a generation
+# is never re-used, even across instances
+_generations = itertools.count(1)
+
+# scalar types that can be compared directly
+_scalar_types = (float, int, bool, numpy.float64, numpy.int64, numpy.bool_)
+
+def fast_eq(new_val, old_val):
+    """
+    Test the equality of an old and new value, with a fast
+    path for builtin scalars
+    """
+    if type(new_val) in _scalar_types and type(old_val) in _scalar_types:
+        return new_val == old_val
+    return obj_eq(new_val, old_val)
+
 def obj_eq(new_val, old_val):
     """
     Test the equality of an old and new value
@@ -231,11 +1087,17 @@ def parameter(f, **kwargs):
 
         if doset or not obj_eq(val, old_val):
             setattr(self, _name, val)
+            self._generation = next(_generations)
+            self.__dict__.setdefault('_param_generations', {})[name] = self._generation
 
             # clear the cache of any parameters that depend
             # on this attribute
+            stats = self.__dict__.get('_cache_stats', None)
+            rescale = getattr(self, '_rescale_deps', {}).get(name, ())
             for dep in deps:
-                self._cache.pop(dep, None)
+                if stats is not None and dep in self._cache:
+                    stats.invalidate(dep, name)
+                _discard(self, dep, dep in rescale)
         return val
 
     @functools.wraps(f)
@@ -261,6 +1123,11 @@ def parameter(f, **kwargs):
 
     prop = ParameterProperty(_get_property, _set_property, _del_property)
     prop._deps = set() # track things that depend on this parameter
+    prop._attr = _name
+    prop._convert = f
+
+    # the setter is "pure" if it does not access any attributes
+    prop._pure = all(hasattr(builtins, n) for n in f.__code__.co_names)
     if have_default:
         prop._default = default
     return prop
@@ -269,9 +1136,13 @@ def cached_property(*parents, **kws):
     """
     Decorator to represent a model parameter will be cached
     and automatically updated if any of its dependencies change
+
+    If ``exclude`` is given instead of the parents, the property depends
+    on every parameter of the class, except those in ``exclude``
     """
     _lru_cache = kws.pop('lru_cache', False)
     maxsize = kws.pop('maxsize', 128)
+    exclude = kws.pop('exclude', None)
 
     def cache(f):
         name = f.__name__
@@ -284,11 +1155,18 @@ def cached_property(*parents, **kws):
                 return self._cache_overrides[name]
 
             # add to cache
+            stats = self.__dict__.get('_cache_stats', None)
             if name not in self._cache:
-                val = f(self)
-                if _lru_cache and callable(val):
-                    val = lru_cache(maxsize=maxsize)(val)
-                self._cache[name] = val
+                if stats is not None: stats.start(name)
+                try:
+                    val = f(self)
+                    if _lru_cache and callable(val):
+                        val = lru_cache(maxsize=maxsize)(val)
+                    self._cache[name] = val
+                finally:
+                    if stats is not None: stats.stop(name)
+            elif stats is not None:
+                stats.hit(name)
 
             # return the cached value
             return self._cache[name]
@@ -299,6 +1177,7 @@ def cached_property(*parents, **kws):
         prop = CachedProperty(_get_property, None, _del_property)
         prop._parents = list(parents) # the dependencies of this property
         prop._deps = set()
+        prop._exclude = frozenset(exclude) if exclude is not None else None
 
         prop._lru_cache = _lru_cache
         prop._maxsize   = maxsize
@@ -312,9 +1191,45 @@ class InterpolatedFunction(object):
     either evaluate a spline or evaluate the underlying function,
     if a domain error occurs
     """
-    def __init__(self, spline, name):
+    def __init__(self, spline, name, reference=None):
         self.spline   = spline
         self.name     = name
+        self.reference = reference
+
+    def rescaled(self, rescale, values):
+        """
+        Return a new :class:`InterpolatedFunction`, with the spline
+        coefficients rescaled from the :attr:`reference` parameter values
+        to the input values
+
+        Parameters
+        ----------
+        rescale : dict
+            the power of each parameter that the function is proportional to
+        values : dict
+            the new values of the parameters
+
+        Returns
+        -------
+        toret : InterpolatedFunction, None
+            the rescaled function, or `None` if it cannot be rescaled
+        """
+        if self.reference is None:
+            return None
+
+        factor = 1.
+        for par, n in rescale.items():
+            if not self.reference[par]:
+                return None
+            factor *= (values[par] / self.reference[par])**n
+
+        splines = self.spline if isinstance(self.spline, list) else [self.spline]
+        if not all(hasattr(spl, 'scaled') for spl in splines):
+            return None
+        splines = [spl.scaled(factor) for spl in splines]
+        if not isinstance(self.spline, list):
+            splines = splines[0]
+        return InterpolatedFunction(splines, self.name, reference=dict(values))
 
     def __call__(self, k, derivative=False):
         try:
@@ -346,7 +1261,15 @@ def interpolated_function(*parents, **kwargs):
     A decorator that represents a cached property that
     is a function of `k`. The cached property that is stored
     is a spline that predicts the function as a function of `k`
+
+    The `rescale` keyword classifies the function as rescalable with
+    respect to some of its parameters: it is a dictionary giving the power
+    of each parameter that the function is proportional to. When only these
+    parameters change, the coefficients of the stored spline are rescaled,
+    rather than re-evaluating the function and refitting the spline.
     """
+    rescale = dict(kwargs.get('rescale', None) or {})
+
     def wrapper(f):
         name = f.__name__
 
@@ -361,27 +1284,47 @@ def interpolated_function(*parents, **kwargs):
                 return f(self, *args)
 
             # the spline isn't in the cache, make the spline
+            stats = self.__dict__.get('_cache_stats', None)
             if name not in self._cache:
+                if stats is not None: stats.start(name)
+                try:
+                    # rescale the spline, if we can
+                    if rescale and name in self.__dict__.get('_rescalable', {}):
+                        values = dict((par, getattr(self, par)) for par in rescale)
+                        val = self._rescalable.pop(name).rescaled(rescale, values)
+                        if val is not None:
+                            self._cache[name] = val
+                            return val(*args, **kws)
 
-                # make the spline
-                interp_domain = getattr(self, kwargs.get("interp", "k_interp"))
-                val = f(self, interp_domain)
-                spline_kwargs = getattr(self, 'spline_kwargs', {})
+                    # make the spline
+                    interp_domain = getattr(self, kwargs.get("interp", "k_interp"))
+                    val = f(self, interp_domain)
+                    spline_kwargs = getattr(self, 'spline_kwargs', {})
 
-                # tuple of splines
-                if isinstance(val, tuple):
-                    splines = [self.spline(interp_domain, x, **spline_kwargs) for x in val]
-                    self._cache[name] = InterpolatedFunction(splines, name)
-                # single spline
-                else:
-                    spl = self.spline(interp_domain, val, **spline_kwargs)
-                    self._cache[name] = InterpolatedFunction(spl, name)
+                    # tuple of splines
+                    if isinstance(val, tuple):
+                        splines = [self.spline(interp_domain, x, **spline_kwargs) for x in val]
+                        self._cache[name] = InterpolatedFunction(splines, name)
+                    # single spline
+                    else:
+                        spl = self.spline(interp_domain, val, **spline_kwargs)
+                        self._cache[name] = InterpolatedFunction(spl, name)
+
+                    # the parameter values the spline can be rescaled from
+                    if rescale:
+                        reference = dict((par, getattr(self, par)) for par in rescale)
+                        self._cache[name].reference = reference
+                finally:
+                    if stats is not None: stats.stop(name)
+            elif stats is not None:
+                stats.hit(name)
 
             return self._cache[name](*args, **kws)
 
         # store the meta information about this property
         wrapped._parents = list(parents) # the dependencies of this property
         wrapped._deps = set()
+        wrapped._rescale = rescale
         wrapped.__cache__ = True
 
         return wrapped
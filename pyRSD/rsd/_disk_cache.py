@@ -0,0 +1,328 @@
+"""
+A persistent, content-addressed cache on disk for the cosmology-dependent
+perturbation theory integrals
+"""
+from .. import numpy as np, os, sys
+from ..version import __version__ as pkg_version
+from .tools import get_hash_key
+
+import hashlib
+import logging
+import functools
+import tempfile
+
+# bump this to invalidate all existing cache entries, i.e., when the
+# format of the entries or the way the integrals are computed changes
+#   2: the kernels of each driver are integrated together on a shared grid
+CACHE_FORMAT_VERSION = 2
+
+# default maximum size of the cache directory
+DEFAULT_MAX_SIZE = 512 * 1024**2 # 512 MB
+
+logger = logging.getLogger('rsd.disk-cache')
+
+def user_cache_dir(appname):
+    r"""
+
+    This function is copied from:
+    https://github.com/pypa/pip/blob/master/pip/utils/appdirs.py
+
+    Return full path to the user-specific cache dir for this application.
+
+    Parameters
+    ----------
+    appname : str
+        the name of application
+
+    Notes
+    -----
+    Typical user cache directories are:
+
+        - Mac OS X: ~/Library/Caches/<AppName>
+        - Unix: ~/.cache/<AppName> (XDG default)
+    """
+    from os.path import expanduser
+    WINDOWS = (sys.platform.startswith("win") or
+               (sys.platform == 'cli' and os.name == 'nt'))
+
+    if WINDOWS:
+        raise OSError("sorry, not supported on Windows")
+    elif sys.platform == "darwin":
+        # Get the base path
+        path = expanduser("~/Library/Caches")
+
+        # Add our app name to it
+        path = os.path.join(path, appname)
+    else:
+        # Get the base path
+        path = os.getenv("XDG_CACHE_HOME", expanduser("~/.cache"))
+
+        # Add our app name to it
+        path = os.path.join(path, appname)
+
+    return path
+
+def default_pt_cache_dir():
+    """
+    The default location of the PT integrals cache, which can be
+    overriden with the ``PYRSD_PT_CACHE_DIR`` environment variable
+    """
+    path = os.environ.get('PYRSD_PT_CACHE_DIR', None)
+    if path is None:
+        path = os.path.join(user_cache_dir('pyRSD'), 'pt_integrals')
+    return path
+
+def _checksum(values):
+    """
+    The SHA-1 digest of the bytes of the input array
+    """
+    return hashlib.sha1(np.ascontiguousarray(values).view(np.uint8)).hexdigest()
+
+class PTIntegralsDiskCache(object):
+    """
+    A content-addressed cache of PT integral spline nodes, stored on disk
+
+    Each entry is a ``.npz`` file holding the integral evaluated on the
+    spline domain. Entries are keyed on the linear power spectrum cosmology,
+    the transfer function, the spline domain, the integration tolerance,
+    and the name of the integral, such that they can safely be shared
+    between processes and runs.
+
+    Notes
+    -----
+    *   entries that fail to load, fail the checksum test, or were written by
+        a different version of the cache format/package are treated as misses
+        and are removed from disk
+    *   the total size of the cache is limited to :attr:`max_size` bytes;
+        the least-recently used entries are evicted first
+    """
+    ext = '.npz'
+
+    def __init__(self, path=None, max_size=DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            the directory to store the cache entries in; default is
+            given by :func:`default_pt_cache_dir`
+        max_size : int, optional
+            the maximum total size of the cache entries in bytes
+        """
+        if path is None:
+            path = default_pt_cache_dir()
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+
+        if not os.path.exists(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # another process might have made it
+                if not os.path.isdir(self.path): raise
+
+    def __repr__(self):
+        return "<PTIntegralsDiskCache: path='%s', max_size=%d>" %(self.path, self.max_size)
+
+    def __getstate__(self):
+        return {'path':self.path, 'max_size':self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def cosmo_key(cosmo):
+        """
+        Return a string that uniquely identifies the input `pygcl.Cosmology`,
+        including the transfer function
+        """
+        params, tf, sigma8, k, Tk = cosmo.__getstate__()['args']
+        params = repr(sorted(dict(params).items()))
+        return get_hash_key(params, np.float64(tf), np.float64(sigma8),
+                            np.asarray(k, dtype='f8'), np.asarray(Tk, dtype='f8'))
+
+    def make_key(self, name, cosmo, k, epsrel=None, integrator=None):
+        """
+        Return the content-addressed key for an integral
+
+        Parameters
+        ----------
+        name : str
+            the name of the integral
+        cosmo : pygcl.Cosmology
+            the cosmology of the linear power spectrum entering the integral
+        k : array_like
+            the wavenumbers the integral is evaluated at, i.e., the spline domain
+        epsrel : float, optional
+            the relative tolerance of the integration
+        integrator : str, optional
+            the name of the method used to compute the integral, e.g., the
+            class name of the integral driver
+        """
+        if epsrel is None: epsrel = np.nan
+        version = "%s-%d" %(pkg_version, CACHE_FORMAT_VERSION)
+        return get_hash_key(version, name, self.cosmo_key(cosmo),
+                            np.asarray(k, dtype='f8'), np.float64(epsrel),
+                            str(integrator))
+
+    def filename(self, key):
+        """
+        The file name for the entry with the input key
+        """
+        return os.path.join(self.path, key + self.ext)
+
+    def _remove(self, filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def load(self, key):
+        """
+        Load the entry with the specified key, returning `None` if the
+        entry is missing, corrupted, or stale
+        """
+        filename = self.filename(key)
+        if not os.path.exists(filename):
+            return None
+
+        try:
+            with np.load(filename) as ff:
+                values = ff['values']
+                valid = str(ff['key']) == key and str(ff['checksum']) == _checksum(values)
+                valid &= int(ff['format']) == CACHE_FORMAT_VERSION
+                ntuple = int(ff['ntuple'])
+        except Exception as e:
+            logger.warning("removing unreadable cache entry '%s': %s" %(filename, str(e)))
+            self._remove(filename)
+            return None
+
+        if not valid:
+            logger.warning("removing corrupted or stale cache entry '%s'" %filename)
+            self._remove(filename)
+            return None
+
+        # mark as recently used
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+
+        return tuple(values) if ntuple else values
+
+    def save(self, key, values):
+        """
+        Save the input values to the entry with the specified key,
+        evicting least-recently used entries if the cache is too large
+
+        The file is written atomically, so concurrent readers never
+        see a partially written entry.
+        """
+        ntuple = isinstance(values, tuple)
+        values = np.asarray(values, dtype='f8')
+
+        fd, tmp = tempfile.mkstemp(suffix=self.ext, dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as ff:
+                np.savez(ff, values=values, key=key, checksum=_checksum(values),
+                         format=CACHE_FORMAT_VERSION, ntuple=int(ntuple))
+            os.rename(tmp, self.filename(key))
+        except Exception as e:
+            self._remove(tmp)
+            logger.warning("unable to save cache entry '%s': %s" %(key, str(e)))
+            return
+
+        self.evict()
+
+    def entries(self):
+        """
+        Return a list of (last access time, size, filename) for each
+        entry, sorted from least to most recently used
+        """
+        toret = []
+        for f in os.listdir(self.path):
+            if not f.endswith(self.ext): continue
+            filename = os.path.join(self.path, f)
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            toret.append((st.st_mtime, st.st_size, filename))
+        return sorted(toret)
+
+    @property
+    def size(self):
+        """
+        The total size of the cache entries in bytes
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Remove the least-recently used entries until the total size
+        is below :attr:`max_size`
+        """
+        if self.max_size is None:
+            return
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total <= self.max_size: break
+            logger.debug("evicting cache entry '%s'" %filename)
+            self._remove(filename)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all entries from the cache
+        """
+        for _, _, filename in self.entries():
+            self._remove(filename)
+
+def disk_cached(driver):
+    """
+    Decorator for the unnormalized PT integral functions of `k` that
+    stores the function return value in the model's
+    :attr:`pt_disk_cache`, if it is enabled
+
+    If the model's :attr:`pt_table` provides the integral for the
+    cosmology of the model, the tabulated value is returned instead;
+    see :class:`~pyRSD.rsd.pt_table.PTIntegralsTable`
+
+    Parameters
+    ----------
+    driver : str
+        the name of the attribute holding the integral driver class, which
+        provides the integration tolerance via ``GetEpsrel()``; the class
+        of the driver is part of the cache key
+    """
+    def wrapper(f):
+        name = f.__name__
+
+        @functools.wraps(f)
+        def wrapped(self, k):
+
+            table = getattr(self, 'pt_table', None)
+            if table is not None:
+                toret = table.lookup(name, self, k)
+                if toret is not None:
+                    return toret
+
+            cache = self.pt_disk_cache
+            if cache is None:
+                return f(self, k)
+
+            integrator = getattr(self, driver)
+            epsrel = integrator.GetEpsrel() if hasattr(integrator, 'GetEpsrel') else None
+            key = cache.make_key(name, self.cosmo, k, epsrel=epsrel,
+                                 integrator=type(integrator).__name__)
+
+            toret = cache.load(key)
+            if toret is None:
+                toret = f(self, k)
+                cache.save(key, toret)
+            return toret
+
+        wrapped._pt_integral = True
+        return wrapped
+    return wrapper
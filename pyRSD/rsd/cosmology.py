@@ -1,6 +1,6 @@
-from astropy import cosmology, units
 import numpy as np
 import functools
+import sys
 from pyRSD.pygcl import transfers
 
 def removeunits(f):
@@ -10,6 +10,8 @@ def removeunits(f):
     """
     @functools.wraps(f)
     def wrapped(*args, **kwargs):
+        from astropy import units
+
         ans = f(*args, **kwargs)
         if isinstance(ans, units.Quantity):
             ans = ans.value
@@ -173,6 +175,8 @@ class Cosmology(dict):
         name : str
             a name for the cosmology
         """
+        from astropy import cosmology, units
+
         # convert neutrino mass to a astropy `Quantity`
         if m_nu is not None:
             m_nu = units.Quantity(m_nu, 'eV')
@@ -259,6 +263,8 @@ class Cosmology(dict):
         **kwargs :
             extra key/value parameters to store in the dictionary
         """
+        from astropy import units
+
         valid = ['H0', 'Om0', 'Ob0', 'Ode0', 'w0', 'Tcmb0', 'Neff', 'm_nu']
         for name in valid:
             if hasattr(cosmo, name):
@@ -396,14 +402,26 @@ class Cosmology(dict):
         cosmo.SetSigma8(self.sigma8)
         return cosmo
 
-# override these with Cosmology classes below
-from astropy.cosmology import Planck13, Planck15, WMAP5, WMAP7, WMAP9
+# the default cosmologies, built from the astropy cosmologies of the same
+# name with these (sigma8, n_s) values
+_defaults = {'Planck13' : (0.8288, 0.9611), 'Planck15' : (0.8159, 0.9667),
+             'WMAP5' : (0.817, 0.962), 'WMAP7' : (0.810, 0.967), 'WMAP9' : (0.820, 0.9608)}
 
-# Planck defaults with sigma8, n_s
-Planck13 = Cosmology.from_astropy(Planck13, sigma8=0.8288, n_s=0.9611)
-Planck15 = Cosmology.from_astropy(Planck15, sigma8=0.8159, n_s=0.9667)
+def __getattr__(name):
+    """
+    Build the default cosmologies, e.g., ``Planck15``, when first accessed,
+    such that importing this module does not import :mod:`astropy`
+    """
+    if name in _defaults:
+        from astropy import cosmology
+
+        sigma8, n_s = _defaults[name]
+        toret = Cosmology.from_astropy(getattr(cosmology, name), sigma8=sigma8, n_s=n_s)
+        globals()[name] = toret
+        return toret
+    raise AttributeError("module '%s' has no attribute '%s'" %(__name__, name))
 
-# WMAP defaults with sigma8, n_s
-WMAP5 = Cosmology.from_astropy(WMAP5, sigma8=0.817, n_s=0.962)
-WMAP7 = Cosmology.from_astropy(WMAP7, sigma8=0.810, n_s=0.967)
-WMAP9 = Cosmology.from_astropy(WMAP9, sigma8=0.820, n_s=0.9608)
+# module-level __getattr__ requires python 3.7
+if sys.version_info < (3, 7):
+    for _name in sorted(_defaults):
+        __getattr__(_name)
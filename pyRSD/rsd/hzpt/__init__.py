@@ -290,4 +290,4 @@ from .P00 import HaloZeldovichP00, HaloZeldovichCF00
 from .P01 import HaloZeldovichP01
 from .P11 import HaloZeldovichP11
 from .Phm import HaloZeldovichPhm, HaloZeldovichCFhm
-from .interpolated import InterpolatedHZPTModels
+from .interpolated import InterpolatedHZPTModels, InterpolationTable
@@ -22,12 +22,17 @@ class InterpolationTable(dict):
     """
     Dict that returns an interpolation table for
     the given Zel'dovich terms
+
+    The tables do not depend on redshift, so a single instance can be
+    shared by the HZPT models of several redshifts, with the same cosmology;
+    the tables are computed with the models in :attr:`models`, which is
+    set by the first :class:`InterpolatedHZPTModels` that uses the instance
     """
     grid = {}
     grid['sigma8_z'] = np.linspace(0.3, 1.0, 100)
     grid['k'] = np.logspace(np.log10(INTERP_KMIN), np.log10(INTERP_KMAX), 300)
 
-    def __init__(self, models):
+    def __init__(self, models=None):
         self.models = models
 
     def __missing__(self, key):
@@ -76,7 +81,7 @@ class InterpolatedHZPTModels(object):
     """
     Class to handle interpolating HZPT models
     """
-    def __init__(self, cosmo, sigma8_z, f, interpolate=True):
+    def __init__(self, cosmo, sigma8_z, f, interpolate=True, table=None):
         """
         Parameters
         ----------
@@ -88,6 +93,10 @@ class InterpolatedHZPTModels(object):
             the growth rate
         interpolate : bool, optional
             whether to turn on interpolation
+        table : InterpolationTable, optional
+            the interpolation table to use, which can be shared with the
+            models of other redshifts in the same cosmology; by default,
+            a new table is created
         """
         # the base Zel'dovich object
         self._base_zeldovich = pygcl.ZeldovichPS(cosmo, 0.)
@@ -98,7 +107,11 @@ class InterpolatedHZPTModels(object):
         self.interpolate     = interpolate
 
         # the interpolation table
-        self.table = InterpolationTable(self)
+        if table is None:
+            table = InterpolationTable()
+        if table.models is None:
+            table.models = self
+        self.table = table
 
     def _hasattr(self, m):
         """
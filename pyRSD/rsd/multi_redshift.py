@@ -0,0 +1,103 @@
+"""
+Models of the power spectrum at several redshifts in the same cosmology,
+which share the parts of the model that do not depend on redshift
+"""
+from ._cache import SharedCache, SharedStore
+
+class MultiRedshiftSpectrum(object):
+    """
+    A container of models of the redshift-space power spectrum, one per
+    redshift bin, that share the cached attributes that do not depend
+    on redshift
+
+    The shared attributes are those that only depend on the cosmological
+    parameters in :attr:`shared_params`, i.e., the ``cosmo`` and
+    ``power_lin`` objects, the z = 0 PT integral drivers (``_Imn``,
+    ``_Jmn``, ``_Kmn``, ...) and their splines, and the HZPT Zel'dovich
+    interpolation tables. They are computed once per cosmology and stored
+    in a :class:`~pyRSD.rsd._cache.SharedStore`, such that the memory
+    and initialization time scale with the number of cosmologies, rather
+    than the number of redshift bins.
+
+    Each model is a regular model instance at its redshift, and parameters
+    can be updated independently for each model. Use :func:`update` to
+    update the parameters of all models, e.g., the cosmology.
+
+    Notes
+    -----
+    The HZPT models themselves are updated in place when `sigma8_z` and
+    `f` change, so each model holds its own ``hzpt``, which shares the
+    interpolation table.
+    """
+    # the cosmological parameters the shared attributes depend on, and the
+    # method used to compute the PT integrals
+    shared_params = ('params', 'transfer_fit', 'linear_power_file', 'pt_backend')
+
+    def __init__(self, redshifts, model_class=None, maxsize=4, **kwargs):
+        """
+        Parameters
+        ----------
+        redshifts : list of float
+            the redshifts of the models
+        model_class : type, optional
+            the class of the models, which must accept the redshift as the
+            ``z`` keyword; default is :class:`~pyRSD.rsd.GalaxySpectrum`
+        maxsize : int, optional
+            the maximum number of cosmologies to keep the shared
+            attributes of in memory
+        **kwargs :
+            additional keywords passed to `model_class` for each redshift
+        """
+        if 'z' in kwargs:
+            raise ValueError("the redshifts of the models should be set with `redshifts`")
+
+        if model_class is None:
+            from .power.gal import GalaxySpectrum as model_class
+
+        self.model_class = model_class
+        self.redshifts = [float(z) for z in redshifts]
+        self.store = SharedStore(maxsize=maxsize)
+
+        self.models = []
+        for z in self.redshifts:
+            model = model_class.__new__(model_class)
+            SharedCache.install(model, self.shared_params, self.store)
+            model.__init__(z=z, **kwargs)
+            self.models.append(model)
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d['maxsize'] = d.pop('store').maxsize
+        return d
+
+    def __setstate__(self, state):
+        self.store = SharedStore(maxsize=state.pop('maxsize'))
+        self.__dict__.update(state)
+
+        # the models are unpickled with regular caches
+        for model in self.models:
+            SharedCache.install(model, self.shared_params, self.store)
+
+    def __len__(self):
+        return len(self.models)
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __getitem__(self, index):
+        return self.models[index]
+
+    @property
+    def shared_names(self):
+        """
+        The names of the cached attributes shared by the models
+        """
+        return sorted(self.models[0]._cache.names) if self.models else []
+
+    def update(self, **kwargs):
+        """
+        Update the parameters of all models; see
+        :func:`~pyRSD.rsd.DarkMatterSpectrum.update`
+        """
+        for model in self.models:
+            model.update(**kwargs)
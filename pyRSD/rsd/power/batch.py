@@ -0,0 +1,174 @@
+"""
+Batched evaluation of the power spectrum for many parameter vectors
+"""
+from pyRSD import numpy as np
+from pyRSD.rsd import tools
+from collections import OrderedDict
+
+def parameter_dicts(thetas, names=None):
+    """
+    Return a list of dictionaries of parameter values, one for each
+    parameter vector in `thetas`
+
+    Parameters
+    ----------
+    thetas : array_like, list of dict
+        either a 2D array of shape ``(N_theta, len(names))``, a structured
+        array with fields giving the parameter names, or a list of
+        dictionaries of parameter values
+    names : list of str, optional
+        the names of the parameters in each row of `thetas`; required
+        if `thetas` is a 2D array
+    """
+    if names is None:
+        dtype = getattr(thetas, 'dtype', None)
+        if dtype is not None and dtype.names is not None:
+            return [dict((name, row[name]) for name in dtype.names) for row in thetas]
+        if not all(isinstance(theta, dict) for theta in thetas):
+            raise ValueError("the parameter names must be provided if `thetas` is not a list of dicts")
+        return [dict(theta) for theta in thetas]
+
+    thetas = np.asarray(thetas, dtype='f8')
+    if thetas.ndim == 1: thetas = thetas[None]
+    if thetas.ndim != 2 or thetas.shape[1] != len(names):
+        args = (str(thetas.shape), len(names))
+        raise ValueError("shape mismatch: `thetas` has shape %s, but %d parameter names given" %args)
+    return [dict(zip(names, theta)) for theta in thetas]
+
+class BatchModel(object):
+    """
+    A proxy of a model, which returns the parameter values of a batch of
+    parameter vectors, given for each element of the (k, mu) arrays of the
+    batch, and otherwise the attributes of the model
+
+    Attributes that are set on the proxy, e.g., by the context managers of
+    the galaxy power terms, are only stored on the proxy.
+    """
+    def __init__(self, model, params):
+        """
+        Parameters
+        ----------
+        model :
+            the model instance
+        params : dict
+            the parameter values of the batch
+        """
+        self.__dict__['_model'] = model
+        self.__dict__['_params'] = dict(params)
+
+    def __getattr__(self, name):
+        params = self.__dict__['_params']
+        if name in params:
+            return params[name]
+        return getattr(self.__dict__['_model'], name)
+
+    def __setattr__(self, name, value):
+        self._params[name] = value
+
+class BatchPowerMixin(object):
+    """
+    A mixin class to evaluate the redshift-space power spectrum for a batch
+    of parameter vectors at once, via :func:`power_batch`
+
+    Subclasses must implement :func:`_batch_power`, which evaluates the power
+    at the AP-distorted (k, mu) of all parameter vectors at once, and list the
+    parameters that enter the model cheaply in :attr:`_batch_params`.
+    """
+    # the parameters that enter the model cheaply, i.e., not through
+    # the PT integrals or HZPT splines
+    _batch_params = frozenset(['alpha_par', 'alpha_perp', 'alpha_drag', 'N'])
+
+    def _batch_power(self, k, mu, params):
+        """
+        The power at the AP-distorted (k, mu), without the AP volume rescaling,
+        where `params` gives the values of the parameters in :attr:`_batch_params`
+        as arrays of the same shape as `k` and `mu`
+        """
+        raise NotImplementedError()
+
+    def power_batch(self, k, mu, thetas, names=None):
+        """
+        The redshift-space power spectrum at ``k`` and ``mu``, evaluated
+        for each parameter vector in ``thetas``
+
+        This is equivalent to calling :func:`update` and then :func:`power`
+        for each parameter vector, starting from the current parameter values
+        each time, but the expensive parts of the model are only computed once
+        for each distinct set of values of the parameters not in
+        :attr:`_batch_params`. The parameter vectors are grouped accordingly,
+        and each group is evaluated at once: the AP-distorted (k, mu) of the
+        vectors in the group are stacked, and the parameters in
+        :attr:`_batch_params` enter as arrays giving their value for each
+        of the stacked (k, mu) values.
+
+        The original parameter values are restored upon returning.
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the power spectrum at, in `h/Mpc`
+        mu : float, array_like
+            the cosine of the angle from the line of sight; `k` and `mu`
+            are broadcast against each other as in :func:`power`
+        thetas : array_like, list of dict
+            the parameter vectors; see :func:`parameter_dicts`
+        names : list of str, optional
+            the names of the parameters, if `thetas` is a 2D array
+
+        Returns
+        -------
+        pkmu : array_like
+            the power for each parameter vector, with shape
+            ``(N_theta, N_kmu)``, where the broadcasted (k, mu) values
+            are flattened as when passing ``flatten=True`` to :func:`power`
+        """
+        thetas = parameter_dicts(thetas, names=names)
+        k, mu = tools.broadcast_kmu_arrays(k, mu)
+        k = np.ravel(k, order='F'); mu = np.ravel(mu, order='F')
+
+        toret = np.empty((len(thetas), len(k)))
+        if not len(thetas):
+            return toret
+
+        # the original state
+        names = set(name for theta in thetas for name in theta)
+        original = dict((name, getattr(self, name)) for name in names if hasattr(self, name))
+
+        # group by the values of the expensive parameters
+        expensive = set(self._param_names) - self._batch_params
+        groups = OrderedDict()
+        for i, theta in enumerate(thetas):
+            key = tuple(sorted((name, val) for name, val in theta.items() if name in expensive))
+            groups.setdefault(key, []).append(i)
+
+        # the cheap parameters, including the AP parameters
+        cheap = (self._batch_params & names) | set(['alpha_perp', 'alpha_par', 'alpha_drag'])
+
+        try:
+            with self.use_snapshots(), tools.cache_suspended():
+                for key, group in groups.items():
+                    state = dict(original, **dict(key))
+                    self.bulk_update(**state)
+
+                    # the cheap parameter values of each vector
+                    values = dict((name, np.array([thetas[i].get(name, getattr(self, name)) for i in group]))
+                                    for name in cheap)
+
+                    # the stacked AP-distorted coordinates
+                    coords = OrderedDict()
+                    for alphas in zip(values['alpha_perp'], values['alpha_par']):
+                        if alphas not in coords:
+                            coords[alphas] = tools.APCoordinates(k, mu, *alphas)
+                    k_ = np.concatenate([coords[alphas].k for alphas in zip(values['alpha_perp'], values['alpha_par'])])
+                    mu_ = np.concatenate([coords[alphas].mu for alphas in zip(values['alpha_perp'], values['alpha_par'])])
+
+                    # the parameters of each (k, mu) value
+                    params = dict((name, np.repeat(val, len(k))) for name, val in values.items())
+                    pkmu = np.asarray(self._batch_power(k_, mu_, params)).reshape((len(group), len(k)))
+
+                    volume = values['alpha_drag']**3 / (values['alpha_perp']**2 * values['alpha_par'])
+                    toret[group] = pkmu * volume[:,None]
+        finally:
+            self.bulk_update(**original)
+
+        return toret
@@ -0,0 +1,474 @@
+"""
+Decomposition of the biased power spectrum into a basis of bias-independent
+functions of `k`, with coefficients that are polynomials in the biases
+"""
+import copy
+from pyRSD import numpy as np
+
+class Dual(object):
+    """
+    A dual number ``x + dx*eps``, with ``eps**2 = 0``, such that a
+    polynomial evaluated at dual numbers gives both the value and the
+    derivative of the polynomial
+    """
+    def __init__(self, x, dx=0.):
+        self.x = x
+        self.dx = dx
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.x + other.x, self.dx + other.dx)
+        return Dual(self.x + other, self.dx)
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Dual(-self.x, -self.dx)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.x*other.x, self.dx*other.x + self.x*other.dx)
+        return Dual(self.x*other, self.dx*other)
+    __rmul__ = __mul__
+
+    def __pow__(self, n):
+        return Dual(self.x**n, n*self.x**(n-1)*self.dx)
+
+class BiasValues(object):
+    """
+    The scalar bias values of the model that enter the coefficients of
+    the :class:`BiasBasis`
+
+    Attributes
+    ----------
+    b1, b1_bar :
+        the linear biases
+    bs, bs_bar :
+        the tidal biases
+    b2 : dict
+        (b2(b1), b2(b1_bar)) for each of the nonlinear biasing functions
+    sigsq, sigsq_bar :
+        the squared halo velocity dispersions
+    """
+    def __init__(self, model, b1=None, b1_bar=None):
+        """
+        Parameters
+        ----------
+        model : BiasedSpectrum
+            the model instance
+        b1, b1_bar : float, optional
+            the internal linear biases to use; default uses the
+            current biases of the model
+        """
+        if b1 is None and b1_bar is None:
+            self.b1, self.b1_bar = model._ib1, model._ib1_bar
+            self.bs, self.bs_bar = model.bs, model.bs_bar
+            self.sigsq, self.sigsq_bar = model.sigmav_halo**2, model.sigmav_halo_bar**2
+        else:
+            self.b1, self.b1_bar = b1, b1_bar
+            self.bs, self.bs_bar = model.tidal_bias(b1), model.tidal_bias(b1_bar)
+            self.sigsq = model.halo_velocity_dispersion(b1)**2
+            self.sigsq_bar = model.halo_velocity_dispersion(b1_bar)**2
+        self.kurtosis = model.velocity_kurtosis
+
+        self.b2 = {}
+        for name in model.nonlinear_biases:
+            func = getattr(model, name)
+            self.b2[name] = (func(self.b1), func(self.b1_bar))
+
+    def dual(self, **derivs):
+        """
+        Return a copy of the bias values, with the values named in `derivs`
+        replaced by :class:`Dual` numbers holding the input derivatives;
+        the derivatives of `b2` are given as a dict of pairs
+        """
+        toret = copy.copy(self)
+        for name, dx in derivs.items():
+            if name == 'b2':
+                toret.b2 = dict(self.b2)
+                for b2_name, (db2, db2_bar) in dx.items():
+                    b2, b2_bar = self.b2[b2_name]
+                    toret.b2[b2_name] = (Dual(b2, db2), Dual(b2_bar, db2_bar))
+            else:
+                setattr(toret, name, Dual(getattr(self, name), dx))
+        return toret
+
+#------------------------------------------------------------------------------
+# the bias-dependent building blocks, as lists of (coefficient, function, scaling)
+# where `scaling` gives the powers of `sigma8_z` and `f` that the function is
+# proportional to, omitting (or `None` for) parameters it is not a power law in
+#------------------------------------------------------------------------------
+ONE_LOOP = {'sigma8_z':4, 'f':0}
+def Phh_mu0(b2_name):
+    """
+    The 1-loop SPT halo density auto-correlation; see
+    :func:`pyRSD.rsd.power.biased.P00.Phh_mu0`
+    """
+    def b2_cross(v):
+        b2, b2_bar = v.b2[b2_name]
+        return v.b1*b2_bar + v.b1_bar*b2
+    def bs_cross(v):
+        b2, b2_bar = v.b2[b2_name]
+        return v.bs*b2_bar + v.bs_bar*b2
+
+    return [(lambda v: v.b1*v.b1_bar, lambda m, k: m.P00.mu0(k), None),
+            (b2_cross, lambda m, k: m.K00(k), ONE_LOOP),
+            (bs_cross, lambda m, k: m.K00s(k), ONE_LOOP)]
+
+def P01_mu2(b2_name):
+    """
+    The correlation of the halo density and halo momentum fields; see
+    :func:`pyRSD.rsd.power.biased.P01.P01_mu2`
+    """
+    def b2_sum(v):
+        return sum(v.b2[b2_name])
+    def b2_cross(v):
+        b2, b2_bar = v.b2[b2_name]
+        return v.b1_bar*b2 + v.b1*b2_bar
+
+    scaling = {'sigma8_z':4, 'f':1}
+    return [(lambda v: v.b1*v.b1_bar, lambda m, k: m.P01.mu2(k), None),
+            (lambda v: v.b1*(1.-v.b1_bar) + v.b1_bar*(1.-v.b1), lambda m, k: -m.Pdv(k), None),
+            (b2_sum, lambda m, k: m.f*m.K10(k), scaling),
+            (lambda v: v.bs + v.bs_bar, lambda m, k: m.f*m.K10s(k), scaling),
+            (b2_cross, lambda m, k: m.f*m.K11(k), scaling),
+            (lambda v: v.b1_bar*v.bs + v.b1*v.bs_bar, lambda m, k: m.f*m.K11s(k), scaling)]
+
+def scale(terms, coeff=None, kfunc=None, scaling=None):
+    """
+    Multiply each of the input (coefficient, function, scaling) terms by an
+    additional coefficient and/or function of `k`, with powers of
+    `sigma8_z` and `f` given by `scaling`
+    """
+    toret = []
+    for c, g, s in terms:
+        if coeff is not None:
+            c = (lambda c: lambda v: coeff(v)*c(v))(c)
+        if kfunc is not None:
+            g = (lambda g: lambda m, k: kfunc(m, k)*g(m, k))(g)
+            if s is not None and scaling is not None:
+                s = dict((p, s[p] + scaling[p]) for p in s if p in scaling)
+            else:
+                s = None
+        toret.append((c, g, s))
+    return toret
+
+#------------------------------------------------------------------------------
+# the terms of each power of mu
+#------------------------------------------------------------------------------
+def P_mu0_terms(model):
+    """
+    P_mu0 without stochasticity, i.e., ``Phm * Phm_bar / P00``
+    """
+    # the HZPT Phm model is not polynomial in the biases
+    if model.use_Phm_model:
+        return []
+
+    def b2_cross(v):
+        b2, b2_bar = v.b2['b2_00_a']
+        return v.b1*b2_bar + v.b1_bar*b2
+    def b2_bs_cross(v):
+        b2, b2_bar = v.b2['b2_00_a']
+        return b2*v.bs_bar + v.bs*b2_bar
+
+    return [(lambda v: v.b1*v.b1_bar, lambda m, k: m.P00.mu0(k), None),
+            (b2_cross, lambda m, k: m.K00(k), ONE_LOOP),
+            (lambda v: v.b1*v.bs_bar + v.b1_bar*v.bs, lambda m, k: m.K00s(k), ONE_LOOP),
+            (lambda v: v.b2['b2_00_a'][0]*v.b2['b2_00_a'][1], lambda m, k: m.K00(k)**2/m.P00.mu0(k), None),
+            (b2_bs_cross, lambda m, k: m.K00(k)*m.K00s(k)/m.P00.mu0(k), None),
+            (lambda v: v.bs*v.bs_bar, lambda m, k: m.K00s(k)**2/m.P00.mu0(k), None)]
+
+def P_mu2_terms(model):
+    """
+    P01_ss[mu2] + P11_ss[mu2] + P02_ss[mu2]
+    """
+    sig_sum = lambda v: v.sigsq + v.sigsq_bar
+    b1_mean = lambda v: 0.5*(v.b1 + v.b1_bar)
+
+    # P01
+    toret = P01_mu2('b2_01_a')
+
+    # P11
+    toret += [(lambda v: v.b1*v.b1_bar, lambda m, k: m.f**2 * (m.Ivvdd_h01(k) + m.Idvdv_h03(k)), {'f':2})]
+
+    # P02
+    toret += [(b1_mean, lambda m, k: m.P02.mu2.no_velocity(k), None)]
+    toret += scale(Phh_mu0('b2_00_c'), coeff=sig_sum, kfunc=lambda m, k: -0.5*(m.f*k)**2,
+                    scaling={'sigma8_z':0, 'f':2})
+    toret += [(lambda v: sum(v.b2['b2_00_c']), lambda m, k: 0.5*m.f**2 * m.K20_a(k), {'sigma8_z':4, 'f':2}),
+              (lambda v: v.bs + v.bs_bar, lambda m, k: 0.5*m.f**2 * m.K20s_a(k), {'sigma8_z':4, 'f':2})]
+    return toret
+
+def P_mu4_terms(model):
+    """
+    The sum of the mu4 terms of P11_ss, P02_ss, P12_ss, P03_ss, P22_ss,
+    P13_ss, and P04_ss
+    """
+    sig_sum = lambda v: v.sigsq + v.sigsq_bar
+    b1_sum = lambda v: v.b1 + v.b1_bar
+
+    # P11
+    toret = [(lambda v: 0.5*b1_sum(v), lambda m, k: m.P11.mu4(k), None),
+             (lambda v: b1_sum(v) - 2., lambda m, k: -0.5*m.Pvv(k), None),
+             (lambda v: v.b1*v.b1_bar - 0.5*b1_sum(v), lambda m, k: m.f**2 * (m.Ivvdd_h02(k) + m.Idvdv_h04(k)), {'f':2})]
+
+    # P02
+    toret += [(lambda v: 0.5*b1_sum(v), lambda m, k: m.P02.mu4.no_velocity(k), None),
+              (lambda v: sum(v.b2['b2_00_b']), lambda m, k: 0.5*m.f**2 * m.K20_b(k), {'sigma8_z':4, 'f':2}),
+              (lambda v: v.bs + v.bs_bar, lambda m, k: 0.5*m.f**2 * m.K20s_b(k), {'sigma8_z':4, 'f':2})]
+
+    # P12 and P03, which have identical velocity terms
+    toret += [(lambda v: 1., lambda m, k: m.P12.mu4.no_velocity(k), None),
+              (lambda v: b1_sum(v) - 2., lambda m, k: -0.5*m.f**3 * m.I03(k), {'sigma8_z':4, 'f':3})]
+    toret += scale(P01_mu2('b2_01_b'), coeff=sig_sum, kfunc=lambda m, k: -0.5*(m.f*k)**2,
+                    scaling={'sigma8_z':0, 'f':2})
+
+    # P13
+    toret += [(lambda v: sig_sum(v)*v.b1*v.b1_bar,
+                lambda m, k: -0.5*(m.f*k)**2 * m.f**2 * (m.Ivvdd_h01(k) + m.Idvdv_h03(k)), {'f':4})]
+
+    # P22
+    toret += [(lambda v: 1., lambda m, k: m.P22.mu4.no_velocity(k), None),
+              (lambda v: v.b1*v.b1_bar, lambda m, k: 0.5*(m.f*k)**4 * m.Pdd(k) * m.sigmasq_k(k)**2, {'f':4})]
+    toret += scale(Phh_mu0('b2_00_d'), coeff=lambda v: v.sigsq**2 + v.sigsq_bar**2,
+                    kfunc=lambda m, k: 0.125*(m.f*k)**4, scaling={'sigma8_z':0, 'f':4})
+
+    # P22 and P04 terms from P02[mu2]
+    toret += [(lambda v: sig_sum(v)*b1_sum(v), lambda m, k: -0.25*(m.f*k)**2 * m.P02.mu2.no_velocity(k), None)]
+
+    # P04
+    toret += scale(Phh_mu0('b2_00_d'), coeff=lambda v: 1.5*(v.sigsq**2 + v.sigsq_bar**2) + v.kurtosis,
+                    kfunc=lambda m, k: 1./12*(m.f*k)**4, scaling={'sigma8_z':0, 'f':4})
+    return toret
+
+def P_mu6_terms(model):
+    """
+    P12_ss[mu6], plus the ``f**4 I32`` term
+    """
+    return [(lambda v: 1., lambda m, k: m.f**3 * (m.I21(k) + 2*k**2*m.J20(k)*m.normed_power_lin(k)), {'sigma8_z':4, 'f':3}),
+            (lambda v: 1., lambda m, k: 1./8*m.f**4 * m.I32(k), {'sigma8_z':4, 'f':4}),
+            (lambda v: v.b1 + v.b1_bar, lambda m, k: -0.5*m.f**3 * m.I30(k), {'sigma8_z':4, 'f':3})]
+
+class BiasBasis(object):
+    """
+    The biased power spectrum terms P[mu^n], expressed as a linear
+    combination of bias-independent functions of `k`, with coefficients
+    that are polynomials in the linear, tidal, and nonlinear biases and
+    the halo velocity dispersions
+
+    The basis functions are evaluated once on the spline domain of the
+    model, such that any pair of biases requires only a dot product with
+    the bias coefficients
+
+    Notes
+    -----
+    The stochasticity, the sim-calibrated mu2/mu4 corrections, and
+    the HZPT Phm model are not polynomial in the biases, and must be added
+    to the basis result separately; see :func:`P_mu_nonpolynomial`
+    """
+    terms = {0: P_mu0_terms, 2: P_mu2_terms, 4: P_mu4_terms, 6: P_mu6_terms}
+
+    def __init__(self, model):
+        """
+        Parameters
+        ----------
+        model : BiasedSpectrum
+            the model instance
+        """
+        self.model = model
+        self._terms = {}
+        self._values = {}
+
+    def _get_terms(self, n):
+        if n not in self._terms:
+            self._terms[n] = self.terms[n](self.model)
+        return self._terms[n]
+
+    def values(self, n, k, index=None):
+        """
+        The basis functions for P[mu^n] evaluated at `k`, with shape
+        ``(N_basis, len(k))``; the values on the spline domain of the
+        model are computed once and stored
+
+        If `index` is given, only evaluate the basis functions with
+        those indices, without storing the values
+        """
+        terms = self._get_terms(n)
+        if index is not None:
+            return np.array([terms[i][1](self.model, k) for i in index]).reshape((-1, len(k)))
+        if not len(terms):
+            return np.zeros((0, len(k)))
+
+        domain = self.model.k
+        if k is domain or (len(k) == len(domain) and np.array_equal(k, domain)):
+            if n not in self._values:
+                self._values[n] = np.array([g(self.model, domain) for _, g, _ in terms])
+            return self._values[n]
+
+        return np.array([g(self.model, k) for _, g, _ in terms])
+
+    def scaling(self, n, name):
+        """
+        The power of the parameter `name`, either ``sigma8_z`` or ``f``, that
+        each of the basis functions for P[mu^n] is proportional to, or `None`
+        for the functions that are not a power law in `name`
+        """
+        return [s.get(name, None) if s is not None else None for _, _, s in self._get_terms(n)]
+
+    def coefficients(self, n, v=None):
+        """
+        The coefficients of the basis functions for P[mu^n], given
+        the current biases of the model
+
+        Parameters
+        ----------
+        n : int
+            the power of mu
+        v : BiasValues, optional
+            the bias values to use; default uses the current model biases
+        """
+        if v is None: v = BiasValues(self.model)
+        return np.array([c(v) for c, _, _ in self._get_terms(n)])
+
+    def coefficient_derivatives(self, n, v):
+        """
+        The derivatives of the coefficients of the basis functions for
+        P[mu^n], given the bias values `v` with :class:`Dual` values
+        holding the derivatives of the biases; see :func:`BiasValues.dual`
+        """
+        return np.array([getattr(c(v), 'dx', 0.) for c, _, _ in self._get_terms(n)])
+
+    def __call__(self, n, k, v=None):
+        """
+        Return the bias-polynomial part of P[mu^n] at `k`
+        """
+        values = self.values(n, k)
+        if not len(values):
+            return np.zeros(len(k))
+        return np.dot(self.coefficients(n, v=v), values)
+
+def P_mu_nonpolynomial(model, n, k, b1, b1_bar):
+    """
+    The part of the biased power spectrum term P[mu^n] at `k` that is
+    not polynomial in the biases, i.e., the stochasticity, the HZPT Phm
+    model, and the sim-calibrated corrections, for the input linear biases
+
+    Parameters
+    ----------
+    model : BiasedSpectrum
+        the model instance
+    n : int
+        the power of mu
+    k : array_like
+        the wavenumbers to evaluate at
+    b1, b1_bar : float
+        the linear biases of the two tracers
+    """
+    b1, b1_bar = model.internal_biases(b1, b1_bar)
+    toret = np.zeros(len(k))
+
+    if n == 0:
+        toret = toret + model.stochasticity_at(k, b1, b1_bar)
+        if model.use_Phm_model:
+            toret = toret + model.hzpt.Phm(b1=b1, k=k) * model.hzpt.Phm(b1=b1_bar, k=k) / model.P00.mu0(k)
+    elif n == 2 and model.correct_mu2:
+        toret = toret + model.model_correction_at(model.Pmu2_correction, k, b1, b1_bar)
+    elif n == 4 and model.correct_mu4:
+        toret = toret + model.model_correction_at(model.Pmu4_correction, k, b1, b1_bar)
+
+    return toret
+
+def P_mu(model, n, k, b1, b1_bar):
+    """
+    The biased power spectrum term P[mu^n] at `k`, for the input linear
+    biases, computed from the :class:`BiasBasis` of the model, without
+    changing the biases of the model
+
+    Parameters
+    ----------
+    model : BiasedSpectrum
+        the model instance
+    n : int
+        the power of mu
+    k : array_like
+        the wavenumbers to evaluate at
+    b1, b1_bar : float
+        the linear biases of the two tracers
+    """
+    ib1, ib1_bar = model.internal_biases(b1, b1_bar)
+    toret = model.bias_basis(n, k, v=BiasValues(model, ib1, ib1_bar))
+    return toret + P_mu_nonpolynomial(model, n, k, b1, b1_bar)
+
+def _derivative(func, b1, step=1e-4):
+    """
+    The derivative of the nonlinear bias function `func` at `b1`, which
+    is exact for polynomials, and uses central differences of step size
+    `step` for the sim-calibrated fits
+    """
+    func = getattr(func, '__wrapped__', func)
+    if isinstance(func, np.poly1d):
+        return func.deriv()(b1)
+    return (func(b1 + step) - func(b1 - step)) / (2*step)
+
+def bias_derivatives(model, b1, b1_bar, db1, db1_bar, step=1e-4):
+    """
+    Return the :class:`BiasValues` for the input linear biases, holding
+    :class:`Dual` numbers with the derivatives of the bias values along
+    the direction ``(db1, db1_bar)`` of the linear biases
+
+    The sim-calibrated nonlinear biases and halo velocity dispersions
+    are differentiated with central differences of step size `step`.
+    """
+    ib1, ib1_bar = model.internal_biases(b1, b1_bar)
+    if model.use_mean_bias:
+        db1 = db1_bar = 0.5*(b1_bar*db1 + b1*db1_bar) / ib1
+
+    v = BiasValues(model, ib1, ib1_bar)
+    b2 = {}
+    for name in model.nonlinear_biases:
+        func = getattr(model, name)
+        b2[name] = (_derivative(func, ib1, step)*db1, _derivative(func, ib1_bar, step)*db1_bar)
+
+    dsigsq = lambda b: 2*model.halo_velocity_dispersion(b) * model.halo_velocity_dispersion_derivative(b, step)
+    return v.dual(b1=db1, b1_bar=db1_bar, b2=b2,
+                  bs=model.tidal_bias_derivative(ib1)*db1,
+                  bs_bar=model.tidal_bias_derivative(ib1_bar)*db1_bar,
+                  sigsq=dsigsq(ib1)*db1, sigsq_bar=dsigsq(ib1_bar)*db1_bar)
+
+def dP_mu(model, n, k, b1, b1_bar, db1, db1_bar, step=1e-4):
+    """
+    The derivative of the biased power spectrum term P[mu^n] at `k`
+    along the direction ``(db1, db1_bar)`` of the input linear biases
+
+    The coefficients of the :class:`BiasBasis` are differentiated exactly,
+    as polynomials in the biases and halo velocity dispersions; the terms
+    that are not polynomial in the biases are differentiated with central
+    differences of step size `step`.
+
+    Parameters
+    ----------
+    model : BiasedSpectrum
+        the model instance
+    n : int
+        the power of mu
+    k : array_like
+        the wavenumbers to evaluate at
+    b1, b1_bar : float
+        the linear biases of the two tracers
+    db1, db1_bar : float
+        the direction of the derivative
+    step : float, optional
+        the step size of the central differences
+    """
+    basis = model.bias_basis
+    v = bias_derivatives(model, b1, b1_bar, db1, db1_bar, step=step)
+    toret = np.dot(basis.coefficient_derivatives(n, v), basis.values(n, k))
+
+    Pplus = P_mu_nonpolynomial(model, n, k, b1 + db1*step, b1_bar + db1_bar*step)
+    Pminus = P_mu_nonpolynomial(model, n, k, b1 - db1*step, b1_bar - db1_bar*step)
+    return toret + (Pplus - Pminus) / (2*step)
@@ -28,12 +28,16 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
     The power spectrum of two biased tracers, with linear biases `b1`
     and `b1_bar` in redshift space
     """
+    # models updated in place by parameter setters; see `_update_models`
+    _snapshot_exclude = DarkMatterSpectrum._snapshot_exclude | set(['bias_to_sigma_relation'])
+
     def __init__(self, use_tidal_bias=False,
                        use_mean_bias=False,
                        vel_disp_from_sims=False,
                        correct_mu2=False,
                        correct_mu4=False,
                        use_vlah_biasing=True,
+                       use_bias_basis=False,
                        **kwargs):
 
         # initalize the dark matter power spectrum
@@ -56,6 +60,9 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         # whether to use Vlah et al nonlinear biasing
         self.use_vlah_biasing = use_vlah_biasing
 
+        # whether to use the bias-polynomial basis decomposition
+        self.use_bias_basis = use_bias_basis
+
         # set b1_bar, unless we are fixed
         try: self.b1_bar = 2.
         except: pass
@@ -161,6 +168,16 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         """
         return val
 
+    @parameter
+    def use_bias_basis(self, val):
+        """
+        If `True`, evaluate the P[mu^n] terms as a linear combination of
+        a precomputed basis of bias-independent functions of `k`, with
+        coefficients that are polynomials in the biases; see
+        :class:`~pyRSD.rsd.power.biased.basis.BiasBasis`
+        """
+        return val
+
     @parameter
     def b1(self, val):
         """
@@ -221,40 +238,28 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         """
         The internally used bias of the 1st tracer
         """
-        if not self.use_mean_bias:
-            return self.b1
-        else:
-            return (self.b1*self.b1_bar)**0.5
+        return self.internal_biases(self.b1, self.b1_bar)[0]
 
     @cached_property("use_mean_bias", "b1", "b1_bar")
     def _ib1_bar(self):
         """
         The internally used bias of the first tracer
         """
-        if not self.use_mean_bias:
-            return self.b1_bar
-        else:
-            return (self.b1*self.b1_bar)**0.5
+        return self.internal_biases(self.b1, self.b1_bar)[1]
 
     @cached_property("_ib1", "use_tidal_bias")
     def bs(self):
         """
         The quadratic, nonlocal tidal bias factor for the first tracer
         """
-        if self.use_tidal_bias:
-            return -2./7 * (self._ib1 - 1.)
-        else:
-            return 0.
+        return self.tidal_bias(self._ib1)
 
     @cached_property("_ib1_bar", "use_tidal_bias")
     def bs_bar(self):
         """
         The quadratic, nonlocal tidal bias factor
         """
-        if self.use_tidal_bias:
-            return -2./7 * (self._ib1_bar - 1.)
-        else:
-            return 0.
+        return self.tidal_bias(self._ib1_bar)
 
     @cached_property()
     def bias_to_sigma_relation(self):
@@ -270,21 +275,61 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         """
         The velocity dispersion for halos, possibly as a function of bias
         """
-        if self.vel_disp_from_sims:
-            return self.vel_disp_fitter(b1=self._ib1, sigma8_z=self.sigma8_z)
-        else:
-            return self.sigma_v
+        return self.halo_velocity_dispersion(self._ib1)
 
     @cached_property("sigma_v", "sigma_lin", "vel_disp_from_sims", "_ib1_bar", "sigma8_z")
     def sigmav_halo_bar(self):
         """
         The velocity dispersion for halos, possibly as a function of bias
         """
+        return self.halo_velocity_dispersion(self._ib1_bar)
+
+    def internal_biases(self, b1, b1_bar):
+        """
+        Return the internally used biases of the two tracers, given the
+        linear biases `b1` and `b1_bar`
+        """
+        if not self.use_mean_bias:
+            return b1, b1_bar
+        else:
+            b = (b1*b1_bar)**0.5
+            return b, b
+
+    def tidal_bias(self, b1):
+        """
+        The quadratic, nonlocal tidal bias factor for the internal bias `b1`
+        """
+        if self.use_tidal_bias:
+            return -2./7 * (b1 - 1.)
+        else:
+            return 0.
+
+    def halo_velocity_dispersion(self, b1):
+        """
+        The velocity dispersion for halos with internal bias `b1`
+        """
         if self.vel_disp_from_sims:
-            return self.vel_disp_fitter(b1=self._ib1_bar, sigma8_z=self.sigma8_z)
+            return self.vel_disp_fitter(b1=b1, sigma8_z=self.sigma8_z)
         else:
             return self.sigma_v
 
+    def tidal_bias_derivative(self, b1):
+        """
+        The derivative of :func:`tidal_bias` with respect to the internal bias `b1`
+        """
+        return -2./7 if self.use_tidal_bias else 0.
+
+    def halo_velocity_dispersion_derivative(self, b1, step=1e-4):
+        """
+        The derivative of :func:`halo_velocity_dispersion` with respect to the
+        internal bias `b1`, using central differences of step size `step`
+        for the sim-calibrated fit
+        """
+        if not self.vel_disp_from_sims:
+            return 0.
+        fit = lambda b: self.vel_disp_fitter(b1=b, sigma8_z=self.sigma8_z)
+        return (fit(b1 + step) - fit(b1 - step)) / (2*step)
+
     def sigmav_from_bias(self, s8_z, bias):
         """
         Return the velocity dispersion `sigmav` value for the specified linear
@@ -354,14 +399,21 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         *   The model for the (type B) stochasticity, interpolated as a function
             of sigma8(z), b1, and k using a Gaussian process
         """
+        return self.stochasticity_at(k, self._ib1, self._ib1_bar)
+
+    def stochasticity_at(self, k, b1, b1_bar):
+        """
+        The (type B) stochasticity at `k` for the internal biases
+        `b1` and `b1_bar`; see :func:`stochasticity`
+        """
         _k = np.logspace(np.log10(self.k.min()), np.log10(self.k.max()), GP_NK)
 
         params = {'sigma8_z' : self.sigma8_z, 'k':_k}
-        if self._ib1 != self._ib1_bar:
-            b1_1, b1_2 = sorted([self._ib1, self._ib1_bar])
+        if b1 != b1_bar:
+            b1_1, b1_2 = sorted([b1, b1_bar])
             toret = self.cross_stochasticity_fits(b1_1=b1_1, b1_2=b1_2, **params)
         else:
-            toret = self.auto_stochasticity_fits(b1=self._ib1, **params)
+            toret = self.auto_stochasticity_fits(b1=b1, **params)
 
         return spline(_k, toret)(k)
 
@@ -459,67 +511,97 @@ class BiasedSpectrum(DarkMatterSpectrum, NonlinearBiasingMixin):
         from .P04 import P04PowerTerm
         return P04PowerTerm(self)
 
+    @cached_property("k", "f", "power_lin", "_power_norm", "use_Phm_model",
+                     "P00", "P01", "P02", "P11", "P12", "P22", "Pdd", "Pdv", "Pvv")
+    def bias_basis(self):
+        """
+        The decomposition of the P[mu^n] terms into a basis of
+        bias-independent functions of `k`; the basis only depends
+        on the dark matter model and is shared by all pairs of biases
+        """
+        from .basis import BiasBasis
+        return BiasBasis(self)
+
     @interpolated_function("_ib1", "_ib1_bar", "sigma8_z", "f", "k", interp="k")
     def mu2_model_correction(self, k):
         """
         The mu2 correction to the model evaluated at `k`
         """
-        b1, b1_bar = self._ib1, self._ib1_bar
-        mean_bias = (b1*b1_bar)**0.5
-        params = {'b1':mean_bias, 'sigma8_z':self.sigma8_z, 'k':k, 'f':self.f}
-        return self.Pmu2_correction(**params)
+        return self.model_correction_at(self.Pmu2_correction, k, self._ib1, self._ib1_bar)
 
     @interpolated_function("_ib1", "_ib1_bar", "sigma8_z", "f", "k", interp="k")
     def mu4_model_correction(self, k):
         """
         The mu4 correction to the model evaluated at `k`
         """
-        b1, b1_bar = self._ib1, self._ib1_bar
+        return self.model_correction_at(self.Pmu4_correction, k, self._ib1, self._ib1_bar)
+
+    def model_correction_at(self, correction, k, b1, b1_bar):
+        """
+        Evaluate the input sim-calibrated correction to the model at `k`,
+        for the internal biases `b1` and `b1_bar`
+        """
         mean_bias = (b1*b1_bar)**0.5
         params = {'b1':mean_bias, 'sigma8_z':self.sigma8_z, 'k':k, 'f':self.f}
-        return self.Pmu4_correction(**params)
+        return correction(**params)
 
     #---------------------------------------------------------------------------
     # power as a function of mu
     #---------------------------------------------------------------------------
-    @interpolated_function("P00_ss", "k", interp="k")
+    @interpolated_function("P00_ss", "use_bias_basis", "bias_basis", "k", interp="k")
     def P_mu0(self, k):
         """
         The full halo power spectrum term with no angular dependence. Contributions
         from P00_ss.
         """
+        if self.use_bias_basis:
+            P_mu0 = self.bias_basis(0, k) + self.stochasticity(k)
+            if self.use_Phm_model:
+                P_mu0 += self.Phm(k) * self.Phm_bar(k) / self.P00.mu0(k)
+            return P_mu0
+
         return self.P00_ss.mu0(k)
 
-    @interpolated_function("P01_ss", "P11_ss", "P02_ss", "correct_mu2", "k", interp="k")
+    @interpolated_function("P01_ss", "P11_ss", "P02_ss", "correct_mu2", "use_bias_basis",
+                           "bias_basis", "k", interp="k")
     def P_mu2(self, k):
         """
         The full halo power spectrum term with mu^2 angular dependence. Contributions
         from P01_ss, P11_ss, and P02_ss.
         """
-        P_mu2 = self.P01_ss.mu2(k) + self.P11_ss.mu2(k) + self.P02_ss.mu2(k)
+        if self.use_bias_basis:
+            P_mu2 = self.bias_basis(2, k)
+        else:
+            P_mu2 = self.P01_ss.mu2(k) + self.P11_ss.mu2(k) + self.P02_ss.mu2(k)
         if self.correct_mu2:
             P_mu2 += self.mu2_model_correction(k)
 
         return P_mu2
 
     @interpolated_function("P11_ss", "P02_ss", "P12_ss", "P22_ss", "P03_ss",
-                           "P13_ss", "P04_ss", "correct_mu4", "k", interp="k")
+                           "P13_ss", "P04_ss", "correct_mu4", "use_bias_basis",
+                           "bias_basis", "k", interp="k")
     def P_mu4(self, k):
         """
         The full halo power spectrum term with mu^4 angular dependence. Contributions
         from P11_ss, P02_ss, P12_ss, P03_ss, P13_ss, P22_ss, and P04_ss.
         """
-        P_mu4 = self.P11_ss.mu4(k) + self.P02_ss.mu4(k) + self.P12_ss.mu4(k) + self.P03_ss.mu4(k) + \
-                self.P22_ss.mu4(k) + self.P13_ss.mu4(k) + self.P04_ss.mu4(k)
+        if self.use_bias_basis:
+            P_mu4 = self.bias_basis(4, k)
+        else:
+            P_mu4 = self.P11_ss.mu4(k) + self.P02_ss.mu4(k) + self.P12_ss.mu4(k) + self.P03_ss.mu4(k) + \
+                    self.P22_ss.mu4(k) + self.P13_ss.mu4(k) + self.P04_ss.mu4(k)
         if self.correct_mu4:
             P_mu4 += self.mu4_model_correction(k)
 
         return P_mu4
 
-    @interpolated_function("P12_ss", "k", interp="k")
+    @interpolated_function("P12_ss", "use_bias_basis", "bias_basis", "k", interp="k")
     def P_mu6(self, k):
         """
         The full halo power spectrum term with mu^6 angular dependence. Contributions
         from P12_ss, P13_ss, P22_ss.
         """
+        if self.use_bias_basis:
+            return self.bias_basis(6, k)
         return self.P12_ss.mu6(k) + 1./8*self.f**4 * self.I32(k)
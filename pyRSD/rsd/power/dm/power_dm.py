@@ -1,18 +1,20 @@
 import fnmatch
 import contextlib
 import warnings
+import logging
 from six import string_types
 from scipy.special import legendre
 from scipy.integrate import simps
 
 from pyRSD.rsd._cache import Cache, parameter, interpolated_function, cached_property
+from pyRSD.rsd._cache import ParameterUpdateError
 from pyRSD.rsd import cosmology, tools, INTERP_KMIN, INTERP_KMAX, __version__
 from pyRSD import pygcl, numpy as np, data as sim_data, os
 
 from pyRSD.rsd.pt_integrals import PTIntegralsMixin
 from pyRSD.rsd.sim_loader import SimLoaderMixin
 from pyRSD.rsd.simulation import SimulationPdv, SimulationP11
-from pyRSD.rsd.hzpt import InterpolatedHZPTModels
+from pyRSD.rsd.hzpt import InterpolatedHZPTModels, InterpolationTable
 
 class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
     """
@@ -23,11 +25,14 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
     spline = tools.RSDSpline
     spline_kwargs = {'bounds_error' : True, 'fill_value' : 0}
 
+    # models updated in place by parameter setters; see `_update_models`
+    _snapshot_exclude = frozenset(['hzpt', 'P11_sim_model', 'Pdv_sim_model'])
+
     def __init__(self, kmin=1e-3,
                        kmax=0.5,
                        Nk=200,
                        z=0.,
-                       params=cosmology.Planck15,
+                       params=None,
                        include_2loop=False,
                        transfer_fit="CLASS",
                        max_mu=4,
@@ -36,6 +41,11 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
                        linear_power_file=None,
                        Pdv_model_type='jennings',
                        redshift_params=[],
+                       pt_cache_dir=None,
+                       pt_table=None,
+                       pt_backend='cubature',
+                       num_threads=None,
+                       ap_interpolation=False,
                        **kwargs):
         """
         Parameters
@@ -52,9 +62,10 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         z : float, optional
             The redshift to compute the power spectrum at. Default = 0.
 
-        params : pyRSD.cosmology.Cosmology, str
+        params : pyRSD.cosmology.Cosmology, str, optional
             Either a Cosmology instance or the name of a file to load
-            parameters from; see the 'data/params' directory for examples
+            parameters from; see the 'data/params' directory for examples.
+            Default is :attr:`pyRSD.rsd.cosmology.Planck15`
 
         include_2loop : bool, optional
             If `True`, include 2-loop contributions in the model terms. Default
@@ -87,6 +98,33 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
 
         redshift_params : list of str, optional
             the names of parameters to be updated when redshift changes
+
+        pt_cache_dir : str, bool, optional (`None`)
+            the directory of a persistent disk cache for the PT integrals,
+            shared between processes and runs; if `True`, use the default
+            user cache directory, and if `None`, the disk cache is disabled
+
+        pt_table : str, PTIntegralsTable, optional (`None`)
+            a table of the PT integrals as a function of cosmology, or the
+            name of a file holding one (see the ``pyrsd-pt-table`` command),
+            from which the integrals are interpolated when the cosmology is
+            within the range of the table
+
+        pt_backend : {'cubature', 'fftlog'}, optional (`cubature`)
+            the method used to compute the PT integrals; 'fftlog' uses the
+            much faster FFTLog-based method of :mod:`pyRSD.rsd.pt_fftlog`
+            instead of the adaptive cubature
+
+        num_threads : int, optional (`None`)
+            the number of OpenMP threads used by the :mod:`pygcl` integrals,
+            e.g., to pin the number of threads per rank in hybrid MPI+OpenMP
+            jobs; if `None`, the default set by ``OMP_NUM_THREADS`` is used
+
+        ap_interpolation : bool, optional (`False`)
+            if `True`, evaluate the AP-distorted power by interpolating a
+            2D surface of the un-distorted power, which is only recomputed
+            when parameters other than the AP parameters change; the accuracy
+            is set by `ap_interp_Nk` and `ap_interp_Nmu`
         """
         # overload cosmo with a cosmo_filename kwargs to handle deprecated syntax
         if 'cosmo_filename' in kwargs:
@@ -110,6 +148,11 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         self.k0_low            = k0_low
         self.linear_power_file = linear_power_file
         self.Pdv_model_type    = Pdv_model_type
+        self.pt_cache_dir      = pt_cache_dir
+        self.pt_table          = pt_table
+        self.pt_backend        = pt_backend
+        self.num_threads       = num_threads
+        self.ap_interpolation  = ap_interpolation
         
         # set these last
         self.redshift_params = redshift_params
@@ -151,6 +194,13 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
 
         return d
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # the number of threads is a global setting of pygcl
+        if self.num_threads is not None:
+            pygcl.set_num_threads(self.num_threads)
+
     def initialize(self):
         """
         Initialize the underlying splines, etc of the model
@@ -162,17 +212,21 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
     def use_cache(self):
         """
         Cache repeated calls to functions defined in this class, assuming
-        constant `k` and `mu` input values
+        constant `k` and `mu` input arrays
+
+        This yields a :class:`~pyRSD.rsd.tools.ScopedMemo`, which records
+        the hit rate of the cache.
         """
         from pyRSD.rsd.tools import cache_on, cache_off
 
         try:
-            cache_on()
-            yield
+            yield cache_on()
         except:
             raise
         finally:
-            cache_off()
+            memo = cache_off()
+            if memo is not None and (memo.hits + memo.misses):
+                logging.debug("scoped cache: %s" %memo)
 
     #---------------------------------------------------------------------------
     # parameters
@@ -285,6 +339,50 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         self._update_models('interpolate', ['hzpt'], val)
         return val
 
+    @parameter
+    def ap_interpolation(self, val):
+        """
+        Whether to evaluate the AP-distorted power by interpolating
+        the un-distorted power; see :func:`ap_surface`
+        """
+        return val
+
+    @parameter(default=None)
+    def num_threads(self, val):
+        """
+        The number of OpenMP threads used by the :mod:`pygcl` integrals;
+        if `None`, the current setting is unchanged
+
+        Notes
+        -----
+        The number of threads is a global setting of :mod:`pygcl`, shared
+        by all of the models in the process, which applies to the integrals
+        computed from any Python thread. The results do not depend on the
+        number of threads.
+        """
+        if val is not None:
+            val = int(val)
+            if val < 1:
+                raise ValueError("`num_threads` should be a positive integer")
+            pygcl.set_num_threads(val)
+        return val
+
+    @parameter(default=300)
+    def ap_interp_Nk(self, val):
+        """
+        The number of log-spaced wavenumbers of the grid used to
+        interpolate the un-distorted power; see :func:`ap_surface`
+        """
+        return val
+
+    @parameter(default=41)
+    def ap_interp_Nmu(self, val):
+        """
+        The number of `mu` values of the grid used to interpolate
+        the un-distorted power; see :func:`ap_surface`
+        """
+        return val
+
     @parameter
     def transfer_fit(self, val):
         """
@@ -649,12 +747,20 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
             raise ValueError("valid parameters for redshift scaling: 'f' and 'sigma8_z'")
         return val
 
+    @cached_property("cosmo")
+    def _hzpt_table(self):
+        """
+        The interpolation table of the Zel'dovich terms in the HZPT models
+        as a function of sigma8(z), which does not depend on redshift
+        """
+        return InterpolationTable()
+
     @cached_property("cosmo")
     def hzpt(self):
         """
         The class holding the (possibly interpolated) HZPT models
         """
-        kw = {'interpolate':self.interpolate}
+        kw = {'interpolate':self.interpolate, 'table':self._hzpt_table}
         return InterpolatedHZPTModels(self.cosmo, self.sigma8_z, self.f, **kw)
 
     @cached_property("power_lin")
@@ -731,6 +837,28 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         from pyRSD.rsd import load_model
         return load_model(filename)
 
+    def to_npz(self, filename):
+        """
+        Save a compact snapshot of the model to a ``.npz`` file, holding
+        the model parameters and the expensive cached attributes that only
+        depend on the cosmology; see :func:`pyRSD.rsd.snapshot.save_snapshot`
+        """
+        from pyRSD.rsd.snapshot import save_snapshot
+        save_snapshot(self, filename)
+
+    @classmethod
+    def from_npz(cls, filename, show_warning=True):
+        """
+        Load a model from a snapshot in a ``.npz`` file; see
+        :func:`pyRSD.rsd.snapshot.load_snapshot`
+        """
+        from pyRSD.rsd.snapshot import load_snapshot
+        toret = load_snapshot(filename, show_warning=show_warning)
+        if not isinstance(toret, cls):
+            args = (toret.__class__.__name__, cls.__name__)
+            raise TypeError("the model snapshot holds a %s, not a %s" %args)
+        return toret
+
     #---------------------------------------------------------------------------
     # utility functions
     #---------------------------------------------------------------------------
@@ -738,12 +866,16 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         """
         Update the attributes. Checks that the current value is not equal to
         the new value before setting.
+
+        The update is done with :func:`bulk_update`, such that the
+        cached attributes that depend on the changed parameters are
+        invalidated once, and if any value fails to be set, the
+        original state is restored.
         """
-        for k, v in kwargs.items():
-            try:
-                setattr(self, k, v)
-            except Exception as e:
-                raise RuntimeError("failure to set parameter `%s` to value %s: %s" %(k, str(v), str(e)))
+        try:
+            self.bulk_update(**kwargs)
+        except ParameterUpdateError as e:
+            raise RuntimeError(str(e))
 
     @classmethod
     def default_config(cls, **params):
@@ -979,10 +1111,42 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         from .P04 import P04PowerTerm
         return P04PowerTerm(self)
 
+    #---------------------------------------------------------------------------
+    # AP interpolation surface
+    #---------------------------------------------------------------------------
+    def _use_ap_surface(self):
+        """
+        Whether to evaluate the power from the AP interpolation surface;
+        the surface is not used if the model terms are overriden
+        """
+        if not self.ap_interpolation:
+            return False
+        if getattr(self, '_power_tangent', None) is not None:
+            return False
+        return '_cache_overrides' not in self.__dict__
+
+    @cached_property(exclude=['alpha_perp', 'alpha_par', 'alpha_drag'])
+    def ap_surface(self):
+        """
+        The :class:`~pyRSD.rsd.tools.PkmuSurface` interpolating the un-distorted
+        :func:`power`, which depends on all parameters, except the AP parameters
+
+        The surface is evaluated on a grid of `ap_interp_Nk` log-spaced wavenumbers
+        spanning :attr:`k` and `ap_interp_Nmu` values of `mu` in ``[0, 1]``.
+        """
+        k = np.logspace(np.log10(self.k[0]), np.log10(self.k[-1]), self.ap_interp_Nk)
+        mu = np.linspace(0., 1., self.ap_interp_Nmu)
+        k_, mu_ = np.broadcast_arrays(k[:,None], mu[None,:])
+
+        with tools.APLock:
+            pkmu = np.asarray(self.power(k_, mu_)).reshape(k_.shape)
+        return tools.PkmuSurface(k, mu, pkmu)
+
     #---------------------------------------------------------------------------
     # main user callables
     #---------------------------------------------------------------------------
     @tools.broadcast_kmu
+    @tools.ap_interpolated
     def power(self, k, mu, flatten=False):
         """
         The redshift space power spectrum as a function of ``k`` and ``mu``
@@ -1082,28 +1246,32 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         """
         Return the AP-distorted P[mu^0]
         """
-        return self.P_mu0(k)
+        coords = tools.get_coordinates(k, mu)
+        return coords.mu_power(0) * coords.evaluate(self.P_mu0)
 
     @tools.alcock_paczynski
     def _P_mu2(self, k, mu):
         """
         Return the AP-distorted mu^2 P[mu^2]
         """
-        return mu**2 * self.P_mu2(k)
+        coords = tools.get_coordinates(k, mu)
+        return coords.mu_power(2) * coords.evaluate(self.P_mu2)
 
     @tools.alcock_paczynski
     def _P_mu4(self, k, mu):
         """
         Return the AP-distorted mu^4 P[mu^4]
         """
-        return mu**4 * self.P_mu4(k)
+        coords = tools.get_coordinates(k, mu)
+        return coords.mu_power(4) * coords.evaluate(self.P_mu4)
 
     @tools.alcock_paczynski
     def _P_mu6(self, k, mu):
         """
         Return the AP-distorted mu^6 P[mu^6]
         """
-        return mu**6 * self.P_mu6(k)
+        coords = tools.get_coordinates(k, mu)
+        return coords.mu_power(6) * coords.evaluate(self.P_mu6)
 
     @tools.broadcast_kmu
     @tools.alcock_paczynski
@@ -1114,10 +1282,11 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         """
         toret = 0
         funcs = [self.P_mu0, self.P_mu2, self.P_mu4, self.P_mu6]
+        coords = tools.get_coordinates(k, mu)
 
         i = 0
         while i <= (self.max_mu//2):
-            toret += mu**(2*i) * funcs[i](k, derivative=True)
+            toret += coords.mu_power(2*i) * coords.evaluate(funcs[i], derivative=True)
             i += 1
 
         return toret
@@ -1131,19 +1300,24 @@ class DarkMatterSpectrum(Cache, SimLoaderMixin, PTIntegralsMixin):
         """
         toret = 0
         funcs = [self.P_mu0, self.P_mu2, self.P_mu4, self.P_mu6]
+        coords = tools.get_coordinates(k, mu)
 
         i = 0
         while i <= (self.max_mu//2):
 
             # derivative of mu^(2i)
-            if i != 0: toret += (2.*i) * mu**(2*i-1) * funcs[i](k)
+            if i != 0: toret += (2.*i) * coords.mu_power(2*i-1) * coords.evaluate(funcs[i])
             i += 1
 
         return toret
 
+    @tools.alcock_paczynski
     def _power(self, k, mu):
         """
         Return the power as sum of mu powers
+
+        The AP distortion is applied once here, such that each of
+        the mu powers share the same :class:`~pyRSD.rsd.tools.APCoordinates`
         """
 
         if self.max_mu > 6:
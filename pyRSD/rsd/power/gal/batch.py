@@ -0,0 +1,88 @@
+"""
+The two-halo terms of the galaxy power spectrum for a batch of parameter
+vectors; see :func:`~pyRSD.rsd.power.batch.BatchPowerMixin.power_batch`
+"""
+from pyRSD import numpy as np
+from pyRSD.rsd import tools
+from pyRSD.rsd.power.biased.basis import BiasValues, P_mu_nonpolynomial
+
+class BatchTwoHalo(object):
+    """
+    The two-halo terms at the stacked (k, mu) values of a batch of parameter
+    vectors, where the linear biases of each term are given for each (k, mu)
+    value, used in place of the two-halo terms as with the tangents of
+    :func:`GalaxySpectrum.use_power_tangent`
+
+    The basis functions of the :class:`~pyRSD.rsd.power.biased.basis.BiasBasis`
+    are splined on the spline domain of the model and evaluated once at the
+    input `k`. Each term then only requires the basis coefficients and the
+    part of P[mu^n] that is not polynomial in the biases, which are computed
+    once for each distinct pair of biases.
+    """
+    def __init__(self, model, k, mu):
+        """
+        Parameters
+        ----------
+        model : GalaxySpectrum
+            the model instance
+        k, mu : array_like
+            the stacked, AP-distorted (k, mu) values of the batch
+        """
+        if model.max_mu > 6:
+            raise NotImplementedError("cannot compute power spectrum including terms with order higher than mu^6")
+
+        self.model = model
+        self.k, self.mu = k, mu
+        self.powers = list(range(0, model.max_mu+1, 2))
+
+        # the basis functions at the input k
+        self.values = {}
+        for n in self.powers:
+            G = model.bias_basis.values(n, model.k)
+            self.values[n] = np.array([self._spline(g)(k) for g in G]).reshape((-1, len(k)))
+
+        self._pairs = {}
+
+    def _spline(self, y):
+        """
+        Spline the input values on the spline domain of the model
+        """
+        model = self.model
+        return model.spline(model.k, y, **getattr(model, 'spline_kwargs', {}))
+
+    def _pair(self, b1, b1_bar):
+        """
+        The basis coefficients and the spline of the non-polynomial part
+        of P[mu^n], for each `n`, given the linear biases
+        """
+        key = (b1, b1_bar)
+        if key not in self._pairs:
+            model = self.model
+            v = BiasValues(model, *model.internal_biases(b1, b1_bar))
+            self._pairs[key] = []
+            for n in self.powers:
+                R = P_mu_nonpolynomial(model, n, model.k, b1, b1_bar)
+                self._pairs[key].append((model.bias_basis.coefficients(n, v=v), self._spline(R)))
+        return self._pairs[key]
+
+    def __call__(self, term, k, mu):
+        """
+        The two-halo power of `term`, at the stacked (k, mu) values
+        """
+        # the distinct pairs of biases
+        b1, b2 = np.broadcast_arrays(term.b1, term.b2, k)[:2]
+        pairs, index = np.unique(np.column_stack([b1, b2]), axis=0, return_inverse=True)
+        index = np.ravel(index)
+        entries = [self._pair(*pair) for pair in pairs.tolist()]
+
+        coords = tools.get_coordinates(k, mu)
+        toret = 0.
+        for i, n in enumerate(self.powers):
+            C = np.array([entry[i][0] for entry in entries]).reshape((len(pairs), -1))
+            Pn = np.einsum('ij,ji->i', C[index], self.values[n])
+            for j, entry in enumerate(entries):
+                sel = index == j
+                Pn[sel] += entry[i][1](k[sel])
+            toret = toret + coords.mu_power(n) * Pn
+
+        return np.nan_to_num(toret)
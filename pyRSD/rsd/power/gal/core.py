@@ -80,26 +80,40 @@ class TwoHaloTerm(object):
         if self._b2_name is None: return self.b1
         return getattr(self.model, self._b2_name)
 
+    @property
+    def memo_state(self):
+        """
+        The biases of this term and the current power tangent of the
+        model, which are included in the keys of :func:`cacheable` results
+        """
+        return (self.b1, self.b2, self.model._power_tangent)
+
     @contextlib.contextmanager
     def set_biases(self):
         """
         Context manager to set the biases of the model
-        """
-        # save the original biases and set the new ones
-        b1, b1_bar = self.model.b1, self.model.b1_bar
-        self.model.b1, self.model.b1_bar = self.b1, self.b2
 
-        yield
-
-        # restore the old ones
-        self.model.b1, self.model.b1_bar = b1, b1_bar
+        The original biases and parameter generation of the model are
+        restored upon exiting, such that :func:`cacheable` results
+        remain valid
+        """
+        with self.model.temporary_update(b1=self.b1, b1_bar=self.b2):
+            yield
 
     @cacheable
     def __call__(self, k, mu):
         """
         Evaluate the two-halo power by calling :func:`power`,
         evaluated at (`k`,`mu`)
+
+        If the model has a power tangent set, the derivative of the
+        two-halo power given by the tangent is returned instead; see
+        :func:`GalaxySpectrum.use_power_tangent`
         """
+        tangent = self.model._power_tangent
+        if tangent is not None:
+            return tangent(self, k, mu)
+
         with self.set_biases():
             return super(self.model.__class__, self.model).power(k, mu)
 
@@ -225,9 +239,9 @@ class DampedGalaxyPowerTerm(GalaxyPowerTerm):
         """
         Return the damped power spectrum
         """
-        G1 = G2 = self.model.FOG(k, mu, self.sigma1)
+        G1 = G2 = self.model.FOG.kernel(k, mu, self.sigma1)
         if self.sigma2 is not None:
-            G2 = self.model.FOG(k, mu, self.sigma2)
+            G2 = self.model.FOG.kernel(k, mu, self.sigma2)
 
         toret = super(DampedGalaxyPowerTerm, self).__call__(k, mu)
         return G1*G2 * toret + self.model.N
@@ -237,12 +251,12 @@ class DampedGalaxyPowerTerm(GalaxyPowerTerm):
         Derivative with respect to `k`
         """
         # FOG and derivative
-        G1      = G2 = self.model.FOG(k, mu, self.sigma1)
-        G1prime = G2prime = self.model.FOG.derivative_k(k, mu, self.sigma1)
+        G1      = G2 = self.model.FOG.kernel(k, mu, self.sigma1)
+        G1prime = G2prime = self.model.FOG.kernel_derivative(k, mu, self.sigma1, 'k')
 
         if self.sigma2 is not None:
-            G2      = self.model.FOG(k, mu, self.sigma2)
-            G2prime = self.model.FOG.derivative_k(k, mu, self.sigma2)
+            G2      = self.model.FOG.kernel(k, mu, self.sigma2)
+            G2prime = self.model.FOG.kernel_derivative(k, mu, self.sigma2, 'k')
 
         deriv = super(DampedGalaxyPowerTerm, self).derivative_k(k, mu)
         power = super(DampedGalaxyPowerTerm, self).__call__(k, mu)
@@ -253,12 +267,12 @@ class DampedGalaxyPowerTerm(GalaxyPowerTerm):
         """
         Derivative with respect to `mu`
         """
-        G1      = G2 = self.model.FOG(k, mu, self.sigma1)
-        G1prime = G2prime = self.model.FOG.derivative_mu(k, mu, self.sigma1)
+        G1      = G2 = self.model.FOG.kernel(k, mu, self.sigma1)
+        G1prime = G2prime = self.model.FOG.kernel_derivative(k, mu, self.sigma1, 'mu')
 
         if self.sigma2 is not None:
-            G2      = self.model.FOG(k, mu, self.sigma2)
-            G2prime = self.model.FOG.derivative_mu(k, mu, self.sigma2)
+            G2      = self.model.FOG.kernel(k, mu, self.sigma2)
+            G2prime = self.model.FOG.kernel_derivative(k, mu, self.sigma2, 'mu')
 
         deriv = super(DampedGalaxyPowerTerm, self).derivative_mu(k, mu)
         power = super(DampedGalaxyPowerTerm, self).__call__(k, mu)
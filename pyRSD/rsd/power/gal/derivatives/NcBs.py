@@ -1,5 +1,5 @@
 from . import PgalDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPgal_dNcBs(PgalDerivative):
     """
@@ -12,19 +12,19 @@ class dPgal_dNcBs(PgalDerivative):
     def eval(m, pars, k, mu):
 
         # AP shifted
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
-        Gc = m.FOG(kprime, muprime, m.sigma_c)
-        GsA = m.FOG(kprime, muprime, m.sigma_sA)
-        GsB = m.FOG(kprime, muprime, m.sigma_sB)
+        Gc = m.FOG.kernel(kprime, muprime, m.sigma_c)
+        GsA = m.FOG.kernel(kprime, muprime, m.sigma_sA)
+        GsB = m.FOG.kernel(kprime, muprime, m.sigma_sB)
         toret = 2*m.fs*(1-m.fs)*m.fcB*Gc * ((1-m.fsB)*GsA + m.fsB*GsB)
 
         # additional term from SO correction
         if m.use_so_correction:
 
-            G1 = m.FOG(kprime, muprime, m.sigma_c)
-            G2 = m.FOG(kprime, muprime, m.sigma_so)
+            G1 = m.FOG.kernel(kprime, muprime, m.sigma_c)
+            G2 = m.FOG.kernel(kprime, muprime, m.sigma_so)
             toret += (1-m.fs)**2 * 2*G1*G2*m.f_so*m.fcB
 
         return toret / (m.alpha_perp**2 * m.alpha_par)
@@ -1,5 +1,5 @@
 from . import PgalDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPgal_dNsBsB(PgalDerivative):
     """
@@ -11,8 +11,8 @@ class dPgal_dNsBsB(PgalDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
-        G = m.FOG(kprime, muprime, m.sigma_sB)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
+        G = m.FOG.kernel(kprime, muprime, m.sigma_sB)
 
         return (m.fs*m.fsB*G)**2 / (m.alpha_perp**2 * m.alpha_par)
@@ -8,6 +8,8 @@ class PgalDerivative(PkmuDerivative):
 
 from .alpha_par  import dPgal_dalpha_par
 from .alpha_perp import dPgal_dalpha_perp
+from .b1         import dPgal_db1_cA, dPgal_db1_cB, dPgal_db1_sA, dPgal_db1_sB
+from .f          import dPgal_df
 from .f_so       import dPgal_df_so
 from .fcB        import dPgal_dfcB
 from .fs         import dPgal_dfs
@@ -16,12 +18,18 @@ from .NcBs       import dPgal_dNcBs
 from .NsBsB      import dPgal_dNsBsB
 from .sigma_c    import dPgal_dsigma_c
 from .sigma_so   import dPgal_dsigma_so
+from .sigma8_z   import dPgal_dsigma8_z
 from .nuisance   import (dPgal_dNsat_mult, dPgal_df1h_sBsB,
                         dPgal_df1h_cBs, dPgal_dlog10_fso)
 
 
 __all__ = [ 'dPgal_dalpha_par',
             'dPgal_dalpha_perp',
+            'dPgal_db1_cA',
+            'dPgal_db1_cB',
+            'dPgal_db1_sA',
+            'dPgal_db1_sB',
+            'dPgal_df',
             'dPgal_df_so',
             'dPgal_dfcB',
             'dPgal_dfs',
@@ -30,6 +38,7 @@ __all__ = [ 'dPgal_dalpha_par',
             'dPgal_dNsBsB',
             'dPgal_dsigma_c',
             'dPgal_dsigma_so',
+            'dPgal_dsigma8_z',
             'dPgal_dNsat_mult',
             'dPgal_df1h_sBsB',
             'dPgal_df1h_cBs',
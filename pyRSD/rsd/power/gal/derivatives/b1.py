@@ -0,0 +1,46 @@
+from . import PgalDerivative
+from .tangent import bias_tangent, tangent_derivative
+
+class dPgal_db1_cA(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to
+    ``b1_cA``
+    """
+    param = 'b1_cA'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, bias_tangent(m, 'b1_cA'))
+
+class dPgal_db1_cB(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to
+    ``b1_cB``
+    """
+    param = 'b1_cB'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, bias_tangent(m, 'b1_cB'))
+
+class dPgal_db1_sA(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to
+    ``b1_sA``
+    """
+    param = 'b1_sA'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, bias_tangent(m, 'b1_sA'))
+
+class dPgal_db1_sB(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to
+    ``b1_sB``
+    """
+    param = 'b1_sB'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, bias_tangent(m, 'b1_sB'))
@@ -0,0 +1,12 @@
+from . import PgalDerivative
+from .tangent import parameter_tangent, tangent_derivative
+
+class dPgal_df(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to ``f``
+    """
+    param = 'f'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, parameter_tangent(m, 'f'))
@@ -1,5 +1,5 @@
 from . import PgalDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 import numpy
 
 class dPgal_df_so(PgalDerivative):
@@ -22,10 +22,10 @@ class dPgal_df_so(PgalDerivative):
         Pcc = PcAcA + PcAcB + PcBcB
 
         # FOG
-        kprime = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
-        G1 = m.FOG(kprime, muprime, m.sigma_c)
-        G2 = m.FOG(kprime, muprime, m.sigma_so)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
+        G1 = m.FOG.kernel(kprime, muprime, m.sigma_c)
+        G2 = m.FOG.kernel(kprime, muprime, m.sigma_so)
 
         # the SO correction
         term1 = -2 * (1. - m.f_so) * G1**2 * Pcc
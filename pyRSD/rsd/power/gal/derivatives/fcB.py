@@ -1,5 +1,5 @@
 from . import PgalDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPgal_dfcB(PgalDerivative):
     """
@@ -15,14 +15,14 @@ class dPgal_dfcB(PgalDerivative):
         term2 = (1-m.fsB)*(-m.Pgal_cAsA(k,mu) + m.Pgal_cBsA(k,mu)) + m.fsB*(-m.Pgal_cAsB(k,mu) + m.Pgal_cBsB(k,mu))
 
         # AP shifted
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
         # additional term from SO correction
         if m.use_so_correction:
 
-            G1 = m.FOG(kprime, muprime, m.sigma_c)
-            G2 = m.FOG(kprime, muprime, m.sigma_so)
+            G1 = m.FOG.kernel(kprime, muprime, m.sigma_c)
+            G2 = m.FOG.kernel(kprime, muprime, m.sigma_so)
             term1 *= (((1 - m.f_so)*G1)**2 + 2*m.f_so*(1-m.f_so)*G1*G2 + (m.f_so*G2)**2)
             term1 += 2*G1*G2*m.f_so*m.NcBs / (m.alpha_perp**2 * m.alpha_par)
 
@@ -0,0 +1,13 @@
+from . import PgalDerivative
+from .tangent import parameter_tangent, tangent_derivative
+
+class dPgal_dsigma8_z(PgalDerivative):
+    """
+    The partial derivative of :func:`GalaxySpectrum.power` with respect to
+    ``sigma8_z``
+    """
+    param = 'sigma8_z'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+        return tangent_derivative(m, k, mu, parameter_tangent(m, 'sigma8_z'))
@@ -1,5 +1,5 @@
 from . import PgalDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPgal_dsigma_c(PgalDerivative):
     """
@@ -11,11 +11,11 @@ class dPgal_dsigma_c(PgalDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
-        G = m.FOG(kprime, muprime, m.sigma_c)
-        Gprime = m.FOG.derivative_sigma(kprime, muprime, m.sigma_c)
+        G = m.FOG.kernel(kprime, muprime, m.sigma_c)
+        Gprime = m.FOG.kernel_derivative(kprime, muprime, m.sigma_c, 'sigma')
 
         with m.preserve():
             m.sigma_c = 0
@@ -28,7 +28,7 @@ class dPgal_dsigma_c(PgalDerivative):
                 Pcc = m.Pgal_cc(k, mu)
 
                 # derivative of the SO correction terms
-                G2    = m.FOG(kprime, muprime, m.sigma_so)
+                G2    = m.FOG.kernel(kprime, muprime, m.sigma_so)
                 term1_a = 2*G* (1-m.f_so)**2 * Pcc
                 term1_b = 2*m.f_so*(1-m.f_so) * G2 * Pcc
                 term1_c = 2*G2*m.f_so*m.fcB*m.NcBs / (m.alpha_perp**2 * m.alpha_par)
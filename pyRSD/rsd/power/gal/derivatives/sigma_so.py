@@ -1,6 +1,6 @@
 from . import PgalDerivative
 import numpy
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPgal_dsigma_so(PgalDerivative):
     """
@@ -15,12 +15,12 @@ class dPgal_dsigma_so(PgalDerivative):
         if not m.use_so_correction:
             return numpy.zeros(len(k))
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
-        G      = m.FOG(kprime, muprime, m.sigma_c)
-        G2     = m.FOG(kprime, muprime, m.sigma_so)
-        Gprime = m.FOG.derivative_sigma(kprime, muprime, m.sigma_so)
+        G      = m.FOG.kernel(kprime, muprime, m.sigma_c)
+        G2     = m.FOG.kernel(kprime, muprime, m.sigma_so)
+        Gprime = m.FOG.kernel_derivative(kprime, muprime, m.sigma_so, 'sigma')
 
         with m.preserve(use_so_correction=False):
 
@@ -0,0 +1,170 @@
+"""
+Derivatives of the galaxy power spectrum with respect to the parameters
+that only enter the model through the two-halo terms, i.e., the linear
+biases, `f`, and `sigma8_z`
+
+The derivatives of P[mu^n] of each two-halo term are computed on the
+spline domain of the model from the :class:`~pyRSD.rsd.power.biased.basis.BiasBasis`,
+without re-evaluating the galaxy model, and the galaxy power is then
+evaluated once with the two-halo terms replaced by these derivatives;
+see :func:`GalaxySpectrum.use_power_tangent`
+"""
+from pyRSD import numpy as np
+from pyRSD.rsd import tools
+from pyRSD.rsd.power.biased.basis import BiasValues, P_mu_nonpolynomial, dP_mu
+from .. import TwoHaloTerm
+
+def two_halo_terms(term):
+    """
+    Yield the :class:`TwoHaloTerm` instances in the tree of
+    galaxy power terms, starting at `term`
+    """
+    if isinstance(term, TwoHaloTerm):
+        yield term
+    for sub in getattr(term, 'terms', []):
+        for t in two_halo_terms(sub):
+            yield t
+
+class TwoHaloTangent(object):
+    """
+    The derivatives of the two-halo terms with respect to a single
+    parameter, stored as splines of the derivatives of P[mu^n]
+
+    Terms without any splines have zero derivative.
+    """
+    def __init__(self, splines=None):
+        """
+        Parameters
+        ----------
+        splines : dict, optional
+            dictionary mapping the name of each two-halo term to a list of
+            (n, spline) giving the derivatives of P[mu^n] as a function of `k`
+        """
+        self.splines = splines if splines is not None else {}
+
+    def __call__(self, term, k, mu):
+        splines = self.splines.get(term.name, None)
+        if not splines:
+            return np.squeeze(np.zeros(np.broadcast(k, mu).shape))
+
+        coords = tools.get_coordinates(k, mu)
+        toret = 0.
+        for n, spl in splines:
+            toret = toret + coords.mu_power(n) * spl(k)
+        return np.squeeze(toret)
+
+def _spline(model, y):
+    """
+    Spline the input values on the spline domain of the model
+    """
+    return model.spline(model.k, y, **getattr(model, 'spline_kwargs', {}))
+
+def _mu_powers(model):
+    return list(range(0, model.max_mu+1, 2))
+
+def bias_tangent(model, name, step=1e-4):
+    """
+    Return the :class:`TwoHaloTangent` for the linear bias parameter `name`,
+    e.g., ``b1_cA``
+
+    The basis coefficients are differentiated exactly, as polynomials in the
+    biases, while the sim-calibrated fits of the stochasticity, the nonlinear
+    biases, and the corrections are differentiated with central differences
+    of step size `step`; see :func:`~pyRSD.rsd.power.biased.basis.dP_mu`
+    """
+    domain = model.k
+    splines = {}
+    for term in two_halo_terms(model._Pgal):
+
+        # the direction of the derivative in (b1, b1_bar)
+        w1 = 1. if term._b1_name == name else 0.
+        w2 = 1. if (term._b2_name or term._b1_name) == name else 0.
+        if not (w1 or w2):
+            continue
+
+        b1, b2 = term.b1, term.b2
+        splines[term.name] = []
+        for n in _mu_powers(model):
+            dP = dP_mu(model, n, domain, b1, b2, w1, w2, step=step)
+            splines[term.name].append((n, _spline(model, dP)))
+
+    return TwoHaloTangent(splines)
+
+def parameter_tangent(model, name, step=1e-4):
+    """
+    Return the :class:`TwoHaloTangent` for the model parameter `name`,
+    either ``f`` or ``sigma8_z``, which enters each two-halo term through
+    the PT integrals and sim-calibrated fits
+
+    The basis functions that are a power law in the parameter, e.g., the
+    one-loop integrals scaling as ``sigma8_z**4``, and the velocity kurtosis
+    are differentiated exactly. The remaining basis functions, i.e., the
+    dark matter terms, which are possibly sim-calibrated, the halo velocity
+    dispersions, and the terms that are not polynomial in the biases are
+    differentiated with central differences, shifting the parameter by a
+    relative step size `step` once in each direction. The cache of the
+    model is restored from snapshots.
+    """
+    val = getattr(model, name)
+    h = step*abs(val) if val else step
+
+    # the distinct bias pairs
+    terms = list(two_halo_terms(model._Pgal))
+    pairs = set((term.b1, term.b2) for term in terms)
+    internal = dict((pair, model.internal_biases(*pair)) for pair in pairs)
+
+    # the basis functions that are not a power law in the parameter
+    basis = model.bias_basis
+    powers = dict((n, basis.scaling(n, name)) for n in _mu_powers(model))
+    index = dict((n, [i for i, p in enumerate(powers[n]) if p is None]) for n in powers)
+
+    # the finite-difference terms at the shifted parameter values
+    G, R, sigsq = {}, {}, {}
+    with model.use_snapshots():
+        for sign in [1, -1]:
+            with model.temporary_update(**{name:val + sign*h}):
+                for n in powers:
+                    G[sign, n] = model.bias_basis.values(n, model.k, index=index[n])
+                for pair in pairs:
+                    sigsq[sign, pair] = [model.halo_velocity_dispersion(b)**2 for b in internal[pair]]
+                    for n in powers:
+                        R[sign, pair, n] = P_mu_nonpolynomial(model, n, model.k, *pair)
+
+    # the derivatives of the basis functions
+    values, dvalues = {}, {}
+    for n in powers:
+        values[n] = basis.values(n, model.k)
+        dvalues[n] = np.array([p*g/val if p is not None else 0.*g for p, g in zip(powers[n], values[n])])
+        dvalues[n] = dvalues[n].reshape(values[n].shape)
+        dvalues[n][index[n]] = (G[1, n] - G[-1, n]) / (2*h)
+
+    # the velocity kurtosis scales as sigma8_z**4
+    dkurtosis = 4*model.velocity_kurtosis/val if name == 'sigma8_z' else 0.
+
+    # the derivatives for each pair
+    derivs = {}
+    for pair in pairs:
+        v = BiasValues(model, *internal[pair])
+        dsigsq = [(p - m) / (2*h) for p, m in zip(sigsq[1, pair], sigsq[-1, pair])]
+        dv = v.dual(sigsq=dsigsq[0], sigsq_bar=dsigsq[1], kurtosis=dkurtosis)
+
+        derivs[pair] = []
+        for n in powers:
+            dP = np.dot(basis.coefficients(n, v=v), dvalues[n])
+            dP += np.dot(basis.coefficient_derivatives(n, dv), values[n])
+            dP += (R[1, pair, n] - R[-1, pair, n]) / (2*h)
+            derivs[pair].append((n, _spline(model, dP)))
+
+    return TwoHaloTangent(dict((term.name, derivs[(term.b1, term.b2)]) for term in terms))
+
+def tangent_derivative(m, k, mu, tangent):
+    """
+    The derivative of :func:`GalaxySpectrum.power` given by the
+    :class:`TwoHaloTangent`, i.e., the difference of the power
+    evaluated with `tangent` and with a zero tangent
+    """
+    with m.use_power_tangent(tangent):
+        P1 = m.power(k, mu)
+    with m.use_power_tangent(TwoHaloTangent()):
+        P0 = m.power(k, mu)
+    return P1 - P0
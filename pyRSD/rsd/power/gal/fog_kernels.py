@@ -4,81 +4,147 @@ from pyRSD.rsd import tools
 class FOGKernel(object):
     """
     Factor class for returning a specific `FOGKernel`
+
+    The kernel `G` and its derivative with respect to ``x = k*mu*sigma``
+    are computed together by :func:`evaluate`, and stored in the coordinate
+    context of the (k, mu) values (see :class:`~pyRSD.rsd.tools.APCoordinates`),
+    keyed on the kernel type and `sigma`; all galaxy sub-terms damped with
+    the same velocity dispersion share a single evaluation.
     """
     @staticmethod
     def factory(name):
-        if name == "modified_lorentzian": 
+        if name == "modified_lorentzian":
             return ModifiedLorentizanKernel()
-        elif name == "lorentzian": 
+        elif name == "lorentzian":
             return LorentzianKernel()
         elif name == 'gaussian':
             return GaussianKernel()
         else:
-            raise TypeError("no FOG kernel with name '%s'" %name) 
-        
+            raise TypeError("no FOG kernel with name '%s'" %name)
+
+    def evaluate(self, k, mu, sigma):
+        """
+        Return the kernel `G` and its derivative ``dG/dx`` at
+        ``x = k*mu*sigma``, without any broadcasting of `k` and `mu`
+
+        The results are computed once per coordinate context of
+        the input (k, mu), kernel type, and `sigma`, and are squeezed,
+        as is the output of the power spectrum terms they damp. An
+        array `sigma`, giving the dispersion for each (k, mu) value as in
+        :func:`~pyRSD.rsd.power.batch.BatchPowerMixin.power_batch`, is
+        evaluated without being stored.
+        """
+        if not numpy.isscalar(sigma):
+            return self.__fused__(numpy.squeeze(k*mu)*sigma)
+
+        coords = tools.get_coordinates(k, mu)
+        def compute():
+            kmu = coords.cached('kmu', lambda: numpy.squeeze(coords.k*coords.mu))
+            return self.__fused__(kmu*sigma)
+        return coords.cached(('fog', type(self), sigma), compute)
+
+    def kernel(self, k, mu, sigma):
+        """
+        The kernel `G`, without any broadcasting of `k` and `mu`
+        """
+        return self.evaluate(k, mu, sigma)[0]
+
+    def kernel_derivative(self, k, mu, sigma, wrt):
+        """
+        The derivative of the kernel with respect to `wrt`, one of
+        'k', 'mu', or 'sigma', without any broadcasting of `k` and `mu`
+        """
+        dG = self.evaluate(k, mu, sigma)[1]
+        if wrt == 'k':
+            return dG * numpy.squeeze(mu)*sigma
+        elif wrt == 'mu':
+            return dG * numpy.squeeze(k)*sigma
+        elif wrt == 'sigma':
+            return dG * numpy.squeeze(k*mu)
+        else:
+            raise ValueError("FOG kernel derivative must be with respect to 'k', 'mu', or 'sigma'")
+
+    def __fused__(self, x):
+        """
+        Return ``(G(x), dG/dx)``; subclasses should override this to share
+        the common sub-expressions of the kernel and its derivative
+        """
+        return self.__kernel__(x), self.__derivative__(x)
+
     @tools.broadcast_kmu
     def __call__(self, k, mu, sigma):
-        x = k*mu*sigma
-        return self.__kernel__(x)
-    
+        return self.kernel(k, mu, sigma)
+
     @tools.broadcast_kmu
     def derivative_k(self, k, mu, sigma):
-        x = k*mu*sigma
-        return self.__derivative__(x) * mu*sigma
-        
+        return self.kernel_derivative(k, mu, sigma, 'k')
+
     @tools.broadcast_kmu
     def derivative_mu(self, k, mu, sigma):
-        x = k*mu*sigma
-        return self.__derivative__(x) * k*sigma
-        
+        return self.kernel_derivative(k, mu, sigma, 'mu')
+
     @tools.broadcast_kmu
     def derivative_sigma(self, k, mu, sigma):
-        x = k*mu*sigma
-        return self.__derivative__(x) * k*mu
-        
+        return self.kernel_derivative(k, mu, sigma, 'sigma')
+
 
 class ModifiedLorentizanKernel(FOGKernel):
     """
     A FOG kernel with the functional form:
-    
+
     .. math::
-    
+
         G(x) = 1 / (1 + 0.5 x^2)^2
-    """        
+    """
     def __kernel__(self, x):
         return 1./(1 + 0.5*x**2)**2
-        
+
     def __derivative__(self, x):
         return -2*x / (1. + 0.5*x**2)**3
-        
-    
-        
+
+    def __fused__(self, x):
+        u = 0.5*x**2; u += 1.
+        G = 1./u; G *= G
+        dG = -2*x; dG *= G; dG /= u
+        return G, dG
+
+
+
 class LorentzianKernel(FOGKernel):
     """
     A FOG kernel with the functional form:
-    
+
     .. math::
-    
+
         G(x) = 1 / (1 + 0.5 x^2)
     """
     def __kernel__(self, x):
         return 1./(1 + 0.5*x**2)
-    
+
     def __derivative__(self, x):
         return -x / (1. + 0.5*x**2)**2
-    
+
+    def __fused__(self, x):
+        u = 0.5*x**2; u += 1.
+        G = 1./u
+        dG = -x; dG *= G; dG *= G
+        return G, dG
+
 
 class GaussianKernel(FOGKernel):
     """
     A FOG kernel with the functional form:
-    
+
     .. math::
-    
+
         G(x) = exp[-0.5 x^2]
     """
     def __kernel__(self, x):
         return numpy.exp(-0.5 * x**2)
-    
+
     def __derivative__(self, x):
         return -x * numpy.exp(-0.5 * x**2)
-    
+
+    def __fused__(self, x):
+        G = numpy.exp(-0.5 * x**2)
+        return G, -x*G
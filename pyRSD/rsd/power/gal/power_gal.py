@@ -2,12 +2,13 @@ import contextlib
 from pyRSD import numpy as np
 from pyRSD.rsd._cache import parameter, cached_property
 from pyRSD.rsd import tools, BiasedSpectrum
+from pyRSD.rsd.power.batch import BatchPowerMixin, BatchModel
 
 from .fog_kernels import FOGKernel
 from . import Pgal
 
 
-class GalaxySpectrum(BiasedSpectrum):
+class GalaxySpectrum(BiasedSpectrum, BatchPowerMixin):
     """
     The model for the galaxy redshift space power spectrum
 
@@ -70,6 +71,10 @@ class GalaxySpectrum(BiasedSpectrum):
         accounting for extra structure around centrals due
         to SO halo finders; default is `False`
     """
+    # the parameters that enter the model cheaply; see `power_batch`
+    _batch_params = BatchPowerMixin._batch_params | set(['fs', 'fcB', 'fsB',
+                        'b1_cA', 'b1_cB', 'b1_sA', 'b1_sB', 'sigma_c', 'sigma_s',
+                        'sigma_sA', 'sigma_sB', 'NcBs', 'NsBsB', 'f_so', 'sigma_so'])
 
     def __init__(self, fog_model='modified_lorentzian',
                  use_so_correction=False,
@@ -402,6 +407,7 @@ class GalaxySpectrum(BiasedSpectrum):
     # total galaxy P(k,mu)
     #---------------------------------------------------------------------------
     @tools.broadcast_kmu
+    @tools.ap_interpolated
     @tools.alcock_paczynski
     def power(self, k, mu, flatten=False):
         """
@@ -424,6 +430,21 @@ class GalaxySpectrum(BiasedSpectrum):
         toret = self._Pgal(k, mu)
         return toret if not flatten else np.ravel(toret, order='F')
 
+    def _batch_power(self, k, mu, params):
+        """
+        The total galaxy power at the stacked, AP-distorted (k, mu) of a batch
+        of parameter vectors; see :func:`~pyRSD.rsd.power.batch.BatchPowerMixin.power_batch`
+
+        The galaxy power terms are evaluated for a :class:`~pyRSD.rsd.power.batch.BatchModel`
+        holding the parameter values of each (k, mu), with the two-halo terms
+        given by :class:`~pyRSD.rsd.power.gal.batch.BatchTwoHalo`
+        """
+        from .batch import BatchTwoHalo
+
+        model = BatchModel(self, params)
+        model._power_tangent = BatchTwoHalo(self, k, mu)
+        return Pgal(model)(k, mu)
+
     @tools.broadcast_kmu
     @tools.alcock_paczynski
     def derivative_k(self, k, mu):
@@ -440,6 +461,33 @@ class GalaxySpectrum(BiasedSpectrum):
         """
         return self._Pgal.derivative_mu(k, mu)
 
+    # the derivatives to use in place of the two-halo terms; see `use_power_tangent`
+    _power_tangent = None
+
+    @contextlib.contextmanager
+    def use_power_tangent(self, tangent):
+        """
+        Context manager to evaluate the model with the two-halo terms
+        replaced by their derivatives with respect to a parameter
+
+        The model is affine in the two-halo terms, so the derivative of the
+        galaxy power with respect to a parameter that only enters through
+        the two-halo terms is the difference of the power evaluated with the
+        tangent and with a tangent that is zero for all terms; see
+        :mod:`pyRSD.rsd.power.gal.derivatives.tangent`
+
+        Parameters
+        ----------
+        tangent : callable
+            function taking the :class:`TwoHaloTerm` instance and the
+            AP-distorted (k, mu), and returning the derivative of the term
+        """
+        self._power_tangent = tangent
+        try:
+            yield
+        finally:
+            del self._power_tangent
+
     def get_gradient(self, pars):
         """
         Return a :class:`PkmuGradient` object which can compute
@@ -3,6 +3,7 @@ import logging
 import functools
 import abc
 from six import add_metaclass
+from pyRSD.rsd import tools
 
 @add_metaclass(abc.ABCMeta)
 class PkmuDerivative(object):
@@ -25,6 +26,49 @@ class PkmuDerivative(object):
     def eval(model, pars, k, mu):
         pass
 
+def missing_derivatives(registry, pars, name):
+    """
+    Return the names of the parameters without an analytic derivative in
+    `registry` that the total derivative with respect to `name` depends on,
+    without evaluating the model
+
+    Parameters that are not passed to the model, i.e., extra parameters, and
+    parameters that are neither free nor model parameters do not enter the
+    model directly, and only require derivatives of the parameters
+    that depend on them via constraints.
+
+    Parameters
+    ----------
+    registry : dict
+        the dictionary of available analytic derivatives
+    pars : ParameterSet
+        the theory parameters
+    name : str
+        the parameter to compute the derivative with respect to
+
+    Returns
+    -------
+    missing : list of str
+        the parameters lacking an analytic derivative; empty if the
+        total derivative can be computed analytically
+    """
+    valid = set(pars.valid_model_params)
+    missing = []
+    visited = set()
+    def visit(name):
+        if name in visited:
+            return
+        visited.add(name)
+        if name not in valid|set(pars.free_names):
+            return
+        if name in valid and name not in registry:
+            missing.append(name)
+        for child in sorted(pars[name].children):
+            visit(child)
+
+    visit(name)
+    return missing
+
 def compute(registry, name, m, pars, k, mu):
     """
     Compute the total derivative of `Pgal` with
@@ -57,10 +101,14 @@ def compute(registry, name, m, pars, k, mu):
 
     # this is dPgal/dpar
     logging.debug("computing dPkmu/d%s" %name)
-    if name not in registry:
+    if name in registry:
+        dclass = registry[name]
+        dPkmu_dpar = dclass.eval(*args)
+    elif name not in pars.valid_model_params:
+        # extra parameters only enter the model through constraints
+        dPkmu_dpar = 0. if numpy.isscalar(k) else numpy.zeros(len(k))
+    else:
         raise ValueError("no registered subclass for dPkmu/d%s" %name)
-    dclass = registry[name]
-    dPkmu_dpar = dclass.eval(*args)
 
     # now compute the derivatives of parameters
     # that depend on par via constraints
@@ -78,6 +126,124 @@ def compute(registry, name, m, pars, k, mu):
 
     return dPkmu_dpar
 
+class PkmuJacobian(object):
+    """
+    Compute the analytic derivatives of ``P(k,mu)`` with respect to
+    a set of free parameters in a single traversal of the registry
+
+    Each parameter that enters the derivatives, i.e., the free parameters
+    and the constrained parameters that depend on them, is differentiated
+    once. The total derivatives then follow from the constraint chain rule,
+    as the product of the matrix of constraint derivatives with the partial
+    derivatives of ``P(k,mu)``.
+    """
+    def __init__(self, registry, pars, names):
+        """
+        Parameters
+        ----------
+        registry : dict
+            the dictionary of available analytic derivatives
+        pars : ParameterSet
+            the theory parameters
+        names : list of str
+            the names of the free parameters to compute the derivatives for
+        """
+        self.registry = registry
+        self.pars = pars
+        self.names = list(names)
+
+        # the parameters entering the derivatives, those that are ignored, and
+        # the extra parameters only entering through constraints
+        valid = set(pars.valid_model_params)|set(pars.free_names)
+        self.params = []
+        self.ignored = set()
+        self.extra = set()
+        def add(name):
+            if name in self.params:
+                return
+            self.params.append(name)
+            if name not in valid:
+                self.ignored.add(name)
+                return
+            if name not in registry:
+                if name in pars.valid_model_params:
+                    raise ValueError("no registered subclass for dPkmu/d%s" %name)
+                self.extra.add(name)
+            for child in pars[name].children:
+                add(child)
+
+        for name in self.names:
+            add(name)
+        self.index = dict((name, i) for i, name in enumerate(self.params))
+
+    def partials(self, m, k, mu):
+        """
+        Return the partial derivatives of ``P(k,mu)`` with respect to each
+        of :attr:`params`, with shape ``(len(params), len(k))``
+        """
+        toret = numpy.zeros((len(self.params), len(k)))
+        for i, name in enumerate(self.params):
+            if name in self.ignored:
+                logging.debug("ignoring parameter '%s'" %name)
+                continue
+            if name in self.extra:
+                continue
+            logging.debug("computing dPkmu/d%s" %name)
+            toret[i] = self.registry[name].eval(m, self.pars, k, mu)
+        return toret
+
+    def chain_matrix(self, nonzero):
+        """
+        Return the matrix of total derivatives ``dparam/dname`` of
+        each of :attr:`params` with respect to each of :attr:`names`,
+        with shape ``(len(names), len(params))``
+
+        Parameters
+        ----------
+        nonzero : array_like
+            boolean array specifying whether the partial derivative
+            of ``P(k,mu)`` is non-zero for each of :attr:`params`
+        """
+        # whether each parameter contributes to the total derivatives
+        active = {}
+        def is_active(name):
+            if name not in active:
+                active[name] = False
+                children = [] if name in self.ignored else self.pars[name].children
+                active[name] = bool(nonzero[self.index[name]]) or any(is_active(c) for c in children)
+            return active[name]
+
+        # the constraint derivatives, computed once for each dependency
+        rows = {}
+        def row(name):
+            if name not in rows:
+                r = numpy.zeros(len(self.params))
+                r[self.index[name]] = 1.
+                if name not in self.ignored:
+                    for child in self.pars[name].children:
+                        if is_active(child):
+                            logging.debug("  adding dPkmu/d{child} * d{child}/d{name}".format(child=child, name=name))
+                            r += self.pars.constraint_derivative(child, name) * row(child)
+                rows[name] = r
+            return rows[name]
+
+        return numpy.array([row(name) for name in self.names])
+
+    def __call__(self, m, k, mu):
+        """
+        Return the derivatives of ``P(k,mu)`` with respect to each of
+        :attr:`names`, with shape ``(len(names), len(k))``
+
+        The derivatives are evaluated in a single coordinate context,
+        such that the AP-distorted (k, mu), the FOG kernels, and the power
+        terms are shared by all of the partial derivatives.
+        """
+        with tools.APCoordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag):
+            D = self.partials(m, k, mu)
+
+        nonzero = numpy.array([numpy.count_nonzero(d) > 0 for d in D], dtype=bool)
+        return numpy.dot(self.chain_matrix(nonzero), D)
+
 def _call_power_from_driver(k, mu, theta):
     """
     Update the model and call power(k,mu) from the global driver
@@ -113,20 +279,51 @@ class PkmuGradient(object):
         # determine which parameters require numerical derivatives
         self._find_numerical()
 
+        # the analytic derivatives of the remaining parameters
+        self.analytic_names = [name for name in self.pars.free_names if name not in self.numerical_names]
+        self.jacobian = PkmuJacobian(self.registry, self.pars, self.analytic_names)
+        logging.info(self.cost_report())
+
     def _find_numerical(self):
         """
         Internal function to determine which derivatives require a
-        numerical derivative
+        numerical derivative, from the coverage of the registry
         """
         self.numerical_names   = []
         self.numerical_indices = []
+        self.missing = {}
         for i, name in enumerate(self.pars.free_names):
-            try:
-                d = compute(self.registry, name, self.model, self.pars, 0.05, 0.5)
-            except Exception as e:
-                logging.info("analytic derivative for parameter '%s' not available; %s" %(name, str(e)))
+            missing = missing_derivatives(self.registry, self.pars, name)
+            if len(missing):
+                args = (name, ", ".join(missing))
+                logging.info("analytic derivative for parameter '%s' not available; missing dPkmu/d{%s}" %args)
                 self.numerical_names.append(name)
                 self.numerical_indices.append(i)
+                self.missing[name] = missing
+
+    @property
+    def model_evaluations(self):
+        """
+        The number of evaluations of ``power(k,mu)`` required per
+        gradient call, i.e., two for each numerical derivative
+        """
+        return 2*len(self.numerical_names)
+
+    def cost_report(self):
+        """
+        Return a string summarizing the predicted cost of each gradient
+        call: the number of model evaluations and the parameters
+        responsible for them
+        """
+        lines = []
+        lines.append("gradient of P(k,mu) with respect to %d free parameters" %len(self.pars.free_names))
+        lines.append("  analytic: %s" %(", ".join(self.analytic_names) or "none"))
+        lines.append("  numerical: %s" %(", ".join(self.numerical_names) or "none"))
+        for name in self.numerical_names:
+            args = (name, ", ".join(self.missing[name]))
+            lines.append("    %s: 2 model evaluations; missing dPkmu/d{%s}" %args)
+        lines.append("  model evaluations per gradient call: %d" %self.model_evaluations)
+        return "\n".join(lines)
 
     def __call__(self, k, mu, theta, epsilon=1e-4, pool=None, numerical=False):
         """
@@ -165,43 +362,41 @@ class PkmuGradient(object):
         if pool is not None:
             self._call_power_mpi = functools.partial(_call_power_from_driver, k, mu)
 
-        # cache results for speed
-        with self.model.use_cache():
-
-            # loop over each free parameter
-            for i, name in enumerate(self.pars.free_names):
-                if numerical or name in self.numerical_names:
-                    continue
-
-                # the analytic derivative
-                toret[i] = compute(self.registry, name, self.model, self.pars, k, mu)[:]
+        # the analytic derivatives, caching results for speed
+        if not numerical and len(self.analytic_names):
+            ii = [i for i, name in enumerate(self.pars.free_names) if name not in self.numerical_names]
+            with self.model.use_cache():
+                toret[ii] = self.jacobian(self.model, k, mu)
 
         # compute numerical derivatives
         # the increments to take
-        try:
-            increments = numpy.identity(len(theta)) * epsilon
-            if not numerical:
-                ii = self.numerical_indices
-            else:
-                ii = Ellipsis
-            tasks = numpy.concatenate([(theta+increments)[ii], (theta-increments)[ii]], axis=0)
-
-            # how to map
-            if pool is None:
-                results = numpy.asarray([self._call_power(k, mu, t) for t in tasks])
-            else:
-                results = numpy.array(pool.map(self._call_power_mpi, tasks))
-            results = results.reshape((2, -1, len(k)))
-
-            if numpy.isscalar(epsilon):
-                epsilon = numpy.ones(len(theta)) * epsilon
-
-            # compute the central finite-difference derivative
-            toret[ii] = (results[0] - results[1]) / (2.*epsilon[ii][:,None])
-        except:
-            raise
-        finally:
-            self._update(theta)
+        # NOTE: snapshots of the model cache restore the original state
+        # at the end without recomputing it
+        with self.model.use_snapshots():
+            try:
+                increments = numpy.identity(len(theta)) * epsilon
+                if not numerical:
+                    ii = self.numerical_indices
+                else:
+                    ii = Ellipsis
+                tasks = numpy.concatenate([(theta+increments)[ii], (theta-increments)[ii]], axis=0)
+
+                # how to map
+                if pool is None:
+                    results = self._call_power_batch(k, mu, tasks)
+                else:
+                    results = numpy.array(pool.map(self._call_power_mpi, tasks))
+                results = results.reshape((2, -1, len(k)))
+
+                if numpy.isscalar(epsilon):
+                    epsilon = numpy.ones(len(theta)) * epsilon
+
+                # compute the central finite-difference derivative
+                toret[ii] = (results[0] - results[1]) / (2.*epsilon[ii][:,None])
+            except:
+                raise
+            finally:
+                self._update(theta)
 
         if scalar: toret = toret[0]
         return toret
@@ -213,6 +408,20 @@ class PkmuGradient(object):
         self.pars.update_values(**dict(zip(self.pars.free_names, theta)))
         self.model.update(**self.pars.to_dict())
 
+    def _call_power_batch(self, k, mu, tasks):
+        """
+        Internal function to evaluate power(k,mu) for each parameter vector
+        in ``tasks``, using :func:`power_batch` if the model supports it
+        """
+        if not hasattr(self.model, 'power_batch'):
+            return numpy.asarray([self._call_power(k, mu, t) for t in tasks])
+
+        thetas = []
+        for theta in tasks:
+            self.pars.update_values(**dict(zip(self.pars.free_names, theta)))
+            thetas.append(self.pars.to_dict())
+        return self.model.power_batch(k, mu, thetas)
+
     def _call_power(self, k, mu, theta):
         """
         Internal function that handles updating the model and calling power(k,mu)
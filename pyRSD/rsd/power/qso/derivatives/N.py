@@ -0,0 +1,16 @@
+from . import PqsoDerivative
+from pyRSD import numpy as np
+
+class dPqso_dN(PqsoDerivative):
+    """
+    The partial derivative of :func:`QuasarSpectrum.power` with respect to
+    ``N``
+    """
+    param = 'N'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+
+        # the constant offset is only modified by the volume rescaling
+        rescaling = (m.alpha_drag**3) / (m.alpha_perp**2 * m.alpha_par)
+        return rescaling * np.ones(np.broadcast(k, mu).shape)
@@ -13,6 +13,9 @@ from .f          import dPqso_df
 from .sigma_fog  import dPqso_dsigma_fog
 from .sigma8_z   import dPqso_dsigma8_z
 from .f_nl       import dPqso_df_nl
+from .N          import dPqso_dN
+from .alpha_drag import dPqso_dalpha_drag
+from .p          import dPqso_dp
 
 
 __all__ = ['dPqso_dalpha_par',
@@ -21,5 +24,8 @@ __all__ = ['dPqso_dalpha_par',
             'dPqso_df',
             'dPqso_dsigma_fog',
             'dPqso_dsigma8_z',
-            'dPqso_df_nl'
+            'dPqso_df_nl',
+            'dPqso_dN',
+            'dPqso_dalpha_drag',
+            'dPqso_dp'
             ]
@@ -0,0 +1,14 @@
+from . import PqsoDerivative
+
+class dPqso_dalpha_drag(PqsoDerivative):
+    """
+    The partial derivative of :func:`QuasarSpectrum.power` with respect to
+    ``alpha_drag``
+    """
+    param = 'alpha_drag'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+
+        # alpha_drag only enters through the volume factor, alpha_drag**3
+        return 3 * m.power(k, mu) / m.alpha_drag
@@ -1,5 +1,5 @@
 from . import PqsoDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPqso_db1(PqsoDerivative):
     """
@@ -11,16 +11,16 @@ class dPqso_db1(PqsoDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
         # derivative of scale-dependent bias term
-        dbtot_db1 = 1 + 2*m.f_nl*m.delta_crit/m.alpha_png(kprime)
+        dbtot_db1 = 1 + 2*m.f_nl*m.delta_crit/coords.evaluate(m.alpha_png)
 
         # finger-of-god
-        G = m.FOG(kprime, muprime, m.sigma_fog)
+        G = m.FOG.kernel(kprime, muprime, m.sigma_fog)
 
         # the final derivative
-        btot = m.btot(kprime)
+        btot = coords.evaluate(m.btot)
         rescaling = (m.alpha_drag**3) / (m.alpha_perp**2 * m.alpha_par)
-        return rescaling * G**2 * (2*m.P_mu0(kprime)  + muprime**2 * m.P_mu2(kprime)) * dbtot_db1 / btot
+        return rescaling * G**2 * (2*coords.evaluate(m.P_mu0)  + muprime**2 * coords.evaluate(m.P_mu2)) * dbtot_db1 / btot
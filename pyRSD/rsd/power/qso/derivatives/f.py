@@ -1,5 +1,5 @@
 from . import PqsoDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPqso_df(PqsoDerivative):
     """
@@ -10,14 +10,14 @@ class dPqso_df(PqsoDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
         # finger of god
-        G = m.FOG(kprime, muprime, m.sigma_fog)
+        G = m.FOG.kernel(kprime, muprime, m.sigma_fog)
 
         # do the volume rescaling
         rescaling = (m.alpha_drag**3) / (m.alpha_perp**2 * m.alpha_par)
 
         mu2 = muprime**2
-        return rescaling * G**2 * mu2 * (m.P_mu2(kprime) + 2 * m.P_mu4(kprime)*mu2) / m.f
+        return rescaling * G**2 * mu2 * (coords.evaluate(m.P_mu2) + 2 * coords.evaluate(m.P_mu4)*mu2) / m.f
@@ -1,5 +1,5 @@
 from . import PqsoDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 
 class dPqso_df_nl(PqsoDerivative):
     """
@@ -11,18 +11,18 @@ class dPqso_df_nl(PqsoDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime  = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
         # finger-of-god
-        G = m.FOG(kprime, muprime, m.sigma_fog)
+        G = m.FOG.kernel(kprime, muprime, m.sigma_fog)
 
         # derivative of scale-dependent bias term
-        ddb_dfnl = 2*(m.b1-m.p)*m.delta_crit/m.alpha_png(kprime)
+        ddb_dfnl = 2*(m.b1-m.p)*m.delta_crit/coords.evaluate(m.alpha_png)
 
         # do the volume rescaling
         rescaling = (m.alpha_drag**3) / (m.alpha_perp**2 * m.alpha_par)
 
         # the final derivative
-        btot = m.btot(kprime)
-        return rescaling * G**2 * (2 * m.P_mu0(kprime) + m.P_mu2(kprime)*muprime**2) / btot * ddb_dfnl
+        btot = coords.evaluate(m.btot)
+        return rescaling * G**2 * (2 * coords.evaluate(m.P_mu0) + coords.evaluate(m.P_mu2)*muprime**2) / btot * ddb_dfnl
@@ -0,0 +1,28 @@
+from . import PqsoDerivative
+from pyRSD.rsd.tools import ap_coordinates
+
+class dPqso_dp(PqsoDerivative):
+    """
+    The partial derivative of :func:`QuasarSpectrum.power` with respect to
+    ``p``
+    """
+    param = 'p'
+
+    @staticmethod
+    def eval(m, pars, k, mu):
+
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
+
+        # finger-of-god
+        G = m.FOG.kernel(kprime, muprime, m.sigma_fog)
+
+        # derivative of scale-dependent bias term
+        ddb_dp = -2*m.f_nl*m.delta_crit/coords.evaluate(m.alpha_png)
+
+        # do the volume rescaling
+        rescaling = (m.alpha_drag**3) / (m.alpha_perp**2 * m.alpha_par)
+
+        # the final derivative
+        btot = coords.evaluate(m.btot)
+        return rescaling * G**2 * (2 * coords.evaluate(m.P_mu0) + coords.evaluate(m.P_mu2)*muprime**2) / btot * ddb_dp
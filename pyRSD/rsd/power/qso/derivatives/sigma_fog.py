@@ -1,5 +1,5 @@
 from . import PqsoDerivative
-from pyRSD.rsd.tools import k_AP, mu_AP
+from pyRSD.rsd.tools import ap_coordinates
 import numpy as np
 
 
@@ -13,13 +13,13 @@ class dPqso_dsigma_fog(PqsoDerivative):
     @staticmethod
     def eval(m, pars, k, mu):
 
-        kprime = k_AP(k, mu, m.alpha_perp, m.alpha_par)
-        muprime = mu_AP(mu, m.alpha_perp, m.alpha_par)
+        coords  = ap_coordinates(k, mu, m.alpha_perp, m.alpha_par, m.alpha_drag)
+        kprime, muprime = coords.k, coords.mu
 
-        G = m.FOG(kprime, muprime, m.sigma_fog)
+        G = m.FOG.kernel(kprime, muprime, m.sigma_fog)
         if hasattr(G, 'values'):
             G = G.values
-        Gprime = m.FOG.derivative_sigma(kprime, muprime, m.sigma_fog)
+        Gprime = m.FOG.kernel_derivative(kprime, muprime, m.sigma_fog, 'sigma')
         toret = np.zeros_like(G)
 
         valid = np.nonzero(G)
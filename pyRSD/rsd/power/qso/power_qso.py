@@ -1,5 +1,6 @@
 from pyRSD.rsd._cache import parameter, cached_property, interpolated_function
-from pyRSD.rsd import tools, HaloSpectrum
+from pyRSD.rsd import tools, HaloSpectrum, APLock
+from pyRSD.rsd.power.batch import BatchPowerMixin, BatchModel
 from pyRSD import numpy as np, pygcl
 from ..gal.fog_kernels import FOGKernel
 
@@ -47,11 +48,14 @@ def growth_function(cosmo, z):
     return efunc(1./(1+z))*vectorize_if_needed(f, z)
 
 
-class QuasarSpectrum(HaloSpectrum):
+class QuasarSpectrum(HaloSpectrum, BatchPowerMixin):
     """
     The quasar redshift space power spectrum, a subclass of
     :class:`~pyRSD.rsd.HaloSpectrum` for biased redshift space power spectra
     """
+    # the parameters that enter the model cheaply; see `power_batch`
+    _batch_params = BatchPowerMixin._batch_params | set(['b1', 'sigma_fog'])
+
     k_interp = np.logspace(np.log10(1e-8), np.log10(100.0), 500)
 
     def __init__(self, fog_model='gaussian', **kwargs):
@@ -223,21 +227,21 @@ class QuasarSpectrum(HaloSpectrum):
     #---------------------------------------------------------------------------
     # power as a function of mu
     #---------------------------------------------------------------------------
-    @interpolated_function("k", "sigma8_z", "_power_norm", "btot")
+    @interpolated_function("k", "sigma8_z", "_power_norm", "btot", rescale={'sigma8_z':2})
     def P_mu0(self, k):
         """
         The isotropic part of the Kaiser formula
         """
         return self.btot(k)**2 * self.normed_power_lin(k)
 
-    @interpolated_function("k", "sigma8_z", "f", "_power_norm", "btot")
+    @interpolated_function("k", "sigma8_z", "f", "_power_norm", "btot", rescale={'sigma8_z':2, 'f':1})
     def P_mu2(self, k):
         """
         The mu^2 term of the Kaiser formula
         """
         return 2*self.f*self.btot(k) * self.normed_power_lin(k)
 
-    @interpolated_function("k", "sigma8_z", "f", "_power_norm")
+    @interpolated_function("k", "sigma8_z", "f", "_power_norm", rescale={'sigma8_z':2, 'f':2})
     def P_mu4(self, k):
         """
         The mu^4 term of the Kaiser formula
@@ -252,6 +256,7 @@ class QuasarSpectrum(HaloSpectrum):
         return k*0.
 
     @tools.broadcast_kmu
+    @tools.ap_interpolated
     @tools.alcock_paczynski
     def power(self, k, mu, flatten=False):
         """
@@ -278,7 +283,7 @@ class QuasarSpectrum(HaloSpectrum):
         pkmu = super(QuasarSpectrum, self).power(k, mu)
 
         # add FOG damping
-        G = self.FOG(k, mu, self.sigma_fog)
+        G = self.FOG.kernel(k, mu, self.sigma_fog)
         pkmu *= G**2
 
         # add shot noise offset
@@ -288,14 +293,46 @@ class QuasarSpectrum(HaloSpectrum):
             pkmu = np.ravel(pkmu, order='F')
         return pkmu
 
+    def _batch_power(self, k, mu, params):
+        """
+        The quasar power at the stacked, AP-distorted (k, mu) of a batch
+        of parameter vectors; see :func:`~pyRSD.rsd.power.batch.BatchPowerMixin.power_batch`
+
+        The linear Kaiser power is evaluated from the splines of :func:`P_mu0`,
+        :func:`P_mu2`, and :func:`P_mu4`, once for each distinct value of `b1`;
+        the FOG damping and shot noise are applied to all (k, mu) at once.
+        """
+        model = BatchModel(self, params)
+
+        # the linear kaiser P(k,mu), for each distinct b1
+        b1 = np.broadcast_to(model.b1, np.shape(k))
+        values, index = np.unique(b1, return_inverse=True)
+        index = np.ravel(index)
+
+        pkmu = np.empty(np.shape(k))
+        with APLock:
+            for i, val in enumerate(values):
+                sel = index == i
+                with self.temporary_update(b1=val):
+                    pkmu[sel] = self._power(k[sel], mu[sel])
+
+        # add FOG damping
+        G = self.FOG.kernel(k, mu, model.sigma_fog)
+        pkmu *= G**2
+
+        # add shot noise offset
+        pkmu += model.N
+
+        return pkmu
+
     @tools.broadcast_kmu
     @tools.alcock_paczynski
     def derivative_k(self, k, mu):
         """
         The derivative with respect to `k_AP`
         """
-        G = self.FOG(k, mu, self.sigma_fog)
-        Gprime = self.FOG.derivative_k(k, mu, self.sigma_fog)
+        G = self.FOG.kernel(k, mu, self.sigma_fog)
+        Gprime = self.FOG.kernel_derivative(k, mu, self.sigma_fog, 'k')
 
         deriv = super(QuasarSpectrum, self).derivative_k(k, mu)
         power = super(QuasarSpectrum, self).power(k, mu)
@@ -308,8 +345,8 @@ class QuasarSpectrum(HaloSpectrum):
         """
         The derivative with respect to `mu_AP`
         """
-        G = self.FOG(k, mu, self.sigma_fog)
-        Gprime = self.FOG.derivative_mu(k, mu, self.sigma_fog)
+        G = self.FOG.kernel(k, mu, self.sigma_fog)
+        Gprime = self.FOG.kernel_derivative(k, mu, self.sigma_fog, 'mu')
 
         deriv = super(QuasarSpectrum, self).derivative_mu(k, mu)
         power = super(QuasarSpectrum, self).power(k, mu)
@@ -0,0 +1,536 @@
+r"""
+FFTLog-based evaluation of the one-loop PT integrals, as an alternative to
+the adaptive cubature of :class:`pygcl.Imn`, :class:`pygcl.Jmn`, and
+:class:`pygcl.Kmn`
+
+The method follows FAST-PT (McEwen et al. 2016, arXiv:1603.04826). The
+linear power spectrum is decomposed into complex power laws with an FFT on
+a logarithmic grid,
+
+.. math::
+
+    P(q) = \sum_m c_m q^{\nu + i \eta_m},
+
+and each I(m, n) and K(m, n) kernel is written as a sum of terms
+:math:`q^\alpha r^\beta L_\ell(\hat{q} \cdot \hat{r})`, with
+:math:`\vec{r} = \vec{k} - \vec{q}`. The integral of each term over a pair
+of power laws is known analytically, and the sum over the pairs is a
+convolution of the coefficients, which is also done with FFTs. The
+J(m, n) integrals are convolutions in :math:`\ln q`, and are evaluated with
+an FFT on the same grid. The integrals of all kernels are thus computed for
+every `k` of the grid in :math:`O(N \log N)` operations.
+"""
+from .. import numpy as np
+from scipy.special import loggamma
+from scipy.interpolate import InterpolatedUnivariateSpline as spline
+from numpy.polynomial import legendre
+from fractions import Fraction
+from math import factorial
+
+#-------------------------------------------------------------------------------
+# the kernel decomposition
+#-------------------------------------------------------------------------------
+class _Polynomial(object):
+    """
+    A polynomial in `q`, `r`, and `k`, with integer, possibly negative,
+    exponents, used to write the kernels in terms of powers of `q` and `r`
+
+    Division is only supported by a single term, which is all that the
+    kernels need, since :math:`u - v = 2q/k` and :math:`u + v = 2r/k`.
+    """
+    def __init__(self, terms):
+        self.terms = dict((p, c) for p, c in terms.items() if c != 0)
+
+    @classmethod
+    def _coerce(cls, other):
+        if isinstance(other, _Polynomial):
+            return other
+        return cls({(0, 0, 0): Fraction(other)})
+
+    def __add__(self, other):
+        terms = dict(self.terms)
+        for p, c in self._coerce(other).terms.items():
+            terms[p] = terms.get(p, 0) + c
+        return _Polynomial(terms)
+    __radd__ = __add__
+
+    def __neg__(self):
+        return _Polynomial(dict((p, -c) for p, c in self.terms.items()))
+
+    def __sub__(self, other):
+        return self + (-self._coerce(other))
+
+    def __rsub__(self, other):
+        return self._coerce(other) - self
+
+    def __mul__(self, other):
+        terms = {}
+        for p1, c1 in self.terms.items():
+            for p2, c2 in self._coerce(other).terms.items():
+                p = tuple(i + j for i, j in zip(p1, p2))
+                terms[p] = terms.get(p, 0) + c1*c2
+        return _Polynomial(terms)
+    __rmul__ = __mul__
+
+    def __pow__(self, n):
+        toret = self._coerce(1)
+        for i in range(n):
+            toret = toret * self
+        return toret
+
+    def __truediv__(self, other):
+        other = self._coerce(other)
+        if len(other.terms) != 1:
+            raise ValueError("can only divide by a single term")
+        (p2, c2), = other.terms.items()
+        return _Polynomial(dict((tuple(i - j for i, j in zip(p1, p2)), c1/c2) for p1, c1 in self.terms.items()))
+    __div__ = __truediv__
+
+def kernel_terms(kernel):
+    r"""
+    Decompose the kernel `kernel(u, v)` of an I(m, n) or K(m, n) integral
+    into terms :math:`q^\alpha r^\beta L_\ell(\hat{q} \cdot \hat{r})`,
+    using :math:`k^2 = q^2 + r^2 + 2 q r \hat{q} \cdot \hat{r}`
+
+    Parameters
+    ----------
+    kernel : callable
+        the kernel as a function of :math:`u = (q + r)/k` and
+        :math:`v = (r - q)/k`
+
+    Returns
+    -------
+    terms : dict
+        the coefficients of the terms, keyed by :math:`(\alpha, \beta, \ell)`
+    """
+    u = _Polynomial({(1, 0, -1): Fraction(1), (0, 1, -1): Fraction(1)})
+    v = _Polynomial({(1, 0, -1): Fraction(-1), (0, 1, -1): Fraction(1)})
+
+    toret = {}
+    for (a, b, c), coeff in kernel(u, v).terms.items():
+        if c < 0 or c % 2:
+            raise ValueError("kernels with odd or negative powers of k are not supported")
+
+        # expand (q^2 + r^2 + 2 q r mu)^(c/2), and mu^j in Legendre polynomials
+        n = c // 2
+        for i in range(n+1):
+            for j in range(n+1-i):
+                l = n - i - j
+                w = coeff * Fraction(factorial(n), factorial(i)*factorial(j)*factorial(l)) * 2**l
+                for ell, x in enumerate(legendre.poly2leg([0]*l + [1])):
+                    if x == 0: continue
+                    key = (a + 2*i + l, b + 2*j + l, ell)
+                    toret[key] = toret.get(key, 0.) + float(w)*x
+    return dict((key, x) for key, x in toret.items() if abs(x) > 1e-12)
+
+# the I(m, n) kernels of Imn.cpp
+IMN_KERNEL_FUNCTIONS = {
+    (0, 0) : lambda u, v: 4*(4 + 3*v*v + u*u*(3 - 10*v*v))**2 / (49*(u*u - v*v)**4),
+    (0, 1) : lambda u, v: 4*(-8 + v*v + u*u*(1 + 6*v*v))*(-4 - 3*v*v + u*u*(-3 + 10*v*v)) / (49*(u*u - v*v)**4),
+    (0, 2) : lambda u, v: -8*(-1 + u*u)*(-1 + v*v)*(-4 - 3*v*v + u*u*(-3 + 10*v*v)) / (7*(u*u - v*v)**4),
+    (0, 3) : lambda u, v: 8*(-1 + u*u)*(-1 + 3*u*v)*(-1 + v*v) / ((u - v)**4*(u + v)**2),
+    (1, 0) : lambda u, v: 4*(-1 + u*v)*(-4 - 3*v*v + u*u*(-3 + 10*v*v)) / (7*(u - v)**4*(u + v)**2),
+    (1, 1) : lambda u, v: 4*(-8 + u*u + v*v + 6*u*u*v*v)**2 / (49*(u*u - v*v)**4),
+    (1, 2) : lambda u, v: -8*(-1 + u*u)*(-1 + v*v)*(-8 + u*u + v*v + 6*u*u*v*v) / (7*(u*u - v*v)**4),
+    (1, 3) : lambda u, v: 8*(v*v + u*u*(1 - 2*v*v) + u**3*v*(-2 + 3*v*v) + u*(v - 2*v**3)) / ((u - v)**4*(u + v)**2),
+    (2, 0) : lambda u, v: 8*(-1 - v*v + u*u*(-1 + 3*v*v))*(-4 - 3*v*v + u*u*(-3 + 10*v*v)) / (7*(u*u - v*v)**4),
+    (2, 1) : lambda u, v: 8*(-1 - v*v + u*u*(-1 + 3*v*v))*(-8 + v*v + u*u*(1 + 6*v*v)) / (7*(u*u - v*v)**4),
+    (2, 2) : lambda u, v: 4*(-1 + u*v)*(-8 + v*v + u*u*(1 + 6*v*v)) / (7*(u - v)**4*(u + v)**2),
+    (2, 3) : lambda u, v: 48*(-1 + u*u)**2*(-1 + v*v)**2 / (u*u - v*v)**4,
+    (3, 0) : lambda u, v: -8*(1 + v*v + u*u*(1 - 3*v*v) + u**3*v*(-3 + 5*v*v) + u*(v - 3*v**3)) / ((u - v)**4*(u + v)**2),
+    (3, 1) : lambda u, v: -8*u*(-1 + u*u)*v*(-1 + v*v) / ((u - v)**4*(u + v)**2),
+    (3, 2) : lambda u, v: -16*(-1 + u*u)*(-1 + v*v)*(-1 - 3*v*v + 3*u*u*(-1 + 5*v*v)) / (u*u - v*v)**4,
+    (3, 3) : lambda u, v: 16*(3 + 2*v*v + 3*v**4 + u*u*(2 + 12*v*v - 30*v**4) + u**4*(3 - 30*v*v + 35*v**4)) / (u*u - v*v)**4,
+}
+
+# the K(m, n) kernels of Kmn.cpp, built from these
+_F2 = lambda u, v: (8 + 6*v*v + u*u*(6 - 20*v*v)) / (7*(u*u - v*v)**2)
+_G2 = lambda u, v: -2*(-8 + u*u + v*v + 6*u*u*v*v) / (7*(u*u - v*v)**2)
+_S2 = lambda u, v: 2*(6 + u**4 - 6*v*v + v**4 + u*u*(-6 + 4*v*v)) / (3*(u*u - v*v)**2)
+_h03 = lambda u, v: 2*(-1 + u*u)*(-1 + v*v) / (u*u - v*v)**2
+_h04 = lambda u, v: 2*(1 + v*v + u*u*(1 - 3*v*v)) / (u*u - v*v)**2
+_k11 = lambda u, v: (2 - 2*u*v) / (u - v)**2
+
+KMN_KERNEL_FUNCTIONS = {
+    (0, 0, False, 0) : _F2,
+    (0, 0, True, 0)  : lambda u, v: _F2(u, v)*_S2(u, v),
+    (0, 1, False, 0) : lambda u, v: 1 + 0*u,
+    (0, 1, True, 0)  : lambda u, v: _S2(u, v)**2,
+    (0, 2, True, 0)  : _S2,
+    (1, 0, False, 0) : _G2,
+    (1, 0, True, 0)  : lambda u, v: _G2(u, v)*_S2(u, v),
+    (1, 1, False, 0) : _k11,
+    (1, 1, True, 0)  : lambda u, v: _k11(u, v)*_S2(u, v),
+    (2, 0, False, 0) : _h03,
+    (2, 0, False, 1) : _h04,
+    (2, 0, True, 0)  : lambda u, v: _S2(u, v)*_h03(u, v),
+    (2, 0, True, 1)  : lambda u, v: _S2(u, v)*_h04(u, v),
+}
+
+#-------------------------------------------------------------------------------
+# the J(m, n) kernels of Jmn.cpp, as a function of r = q/k
+#-------------------------------------------------------------------------------
+# the Taylor series at small r, in powers of r^2, where the exact expressions
+# suffer from cancellations
+_JMN_SMALL_R = {
+    (0, 0) : [-1./18, 58./945, -94./2205, 26./3969, 166./218295, 202./945945, 34./405405],
+    (0, 1) : [-1./18, 26./945, -62./2205, 2./405, 134./218295, 34./189189, 206./2837835],
+    (1, 0) : [-1./18, 2./21, -2./35, 2./245, 2./2205, 2./8085, 2./21021],
+    (1, 1) : [-1./18, -2./315, -2./147, 22./6615, 34./72765, 46./315315, 58./945945],
+    (0, 2) : [0., -8./35, 24./245, -8./735, -8./8085, -8./35035, -8./105105],
+    (2, 0) : [-1./3, 12./35, -12./49, 4./105, 12./2695, 4./3185, 4./8085],
+}
+
+def _jmn_exact(m, n, r):
+    """
+    The J(m, n) kernels for intermediate r
+    """
+    r2 = r*r
+    with np.errstate(divide='ignore'):
+        L = np.where(r == 1, 0., np.log((r+1.)/abs(r-1.)))
+    if (m, n) == (0, 0):
+        return (1./3024.)*(12./r2 - 158. + 100.*r2 - 42.*r2**2 + 3./r**3*(r2-1.)**3*(7.*r2+2.)*L)
+    elif (m, n) == (0, 1):
+        return (1./3024.)*(24./r2 - 202. + 56.*r2 - 30.*r2**2 + 3./r**3*(r2-1.)**3*(5.*r2+4.)*L)
+    elif (m, n) == (1, 0):
+        return (1./1008.)*(-38. + 48.*r2 - 18.*r2**2 + 9./r*(r2-1.)**3*L)
+    elif (m, n) == (1, 1):
+        return (1./1008.)*(12./r2 - 82. + 4.*r2 - 6.*r2**2 + 3./r**3*(r2-1.)**3*(r2+2.)*L)
+    elif (m, n) == (0, 2):
+        return (1./224.)*(2./r2*(r2+1.)*(3.*r2**2 - 14.*r2 + 3.) - 3./r**3*(r2-1.)**4*L)
+    elif (m, n) == (2, 0):
+        return (1./672.)*(2./r2*(9. - 109.*r2 + 63.*r2**2 - 27.*r2**3) + 9./r**3*(r2-1.)**3*(3*r2+1.)*L)
+
+def _jmn_large_r(m, n, r):
+    """
+    The J(m, n) kernels for r > 60
+    """
+    x = 1./(r*r)
+    if (m, n) == (0, 0):
+        return (-2./3024)/105. * np.polyval([70., 125., -354., 263., 400., -1008., 5124.], x)
+    elif (m, n) == (0, 1):
+        return (-2./3024)/105. * np.polyval([140., -65., -168., 229., 656., -3312., 10500.], x)
+    elif (m, n) == (1, 0):
+        return (8./1008)/5005. * np.polyval([-28., -60., -156., -572., -5148., 1001.], x)
+    elif (m, n) == (1, 1):
+        return (-2./1008)/105. * np.polyval([70., -85., 6., 65., 304., -1872., 5292.], x)
+    elif (m, n) == (0, 2):
+        return (-2./224)/105. * np.polyval([35., -95., 93., -17., 128., -1152., 2688.], x)
+    elif (m, n) == (2, 0):
+        return (-2./672)/35. * np.polyval([35., 45., -147., 115., 192., -576., 2576.], x)
+
+def jmn_kernel(m, n, r):
+    """
+    The kernel of the J(m, n) integral, as a function of `r = q/k`
+    """
+    r = np.asarray(r, dtype=float)
+    toret = np.empty_like(r)
+
+    small = r < 0.1
+    toret[small] = np.polynomial.polynomial.polyval(r[small]**2, _JMN_SMALL_R[(m, n)])
+    large = r >= 60
+    toret[large] = _jmn_large_r(m, n, r[large])
+    mid = ~small & ~large
+    toret[mid] = _jmn_exact(m, n, r[mid])
+    return toret
+
+#-------------------------------------------------------------------------------
+# the integrals of power laws
+#-------------------------------------------------------------------------------
+def _gamma_ratio(a, b):
+    """
+    Return Gamma(a) / Gamma(b), which is zero at the poles of Gamma(b)
+    """
+    a = np.asarray(a, dtype=complex)
+    b = np.asarray(b, dtype=complex)
+    pole = (b.imag == 0) & (b.real <= 0) & (b.real == np.round(b.real))
+    toret = np.exp(loggamma(a) - loggamma(np.where(pole, 1., b)))
+    return np.where(pole, 0., toret)
+
+def _hankel_power_law(ell, s):
+    r"""
+    The spherical Hankel transform of a power law, such that
+
+    .. math::
+
+        \int \frac{q^2 dq}{2\pi^2} q^s j_\ell(qx) = G_\ell(s) x^{-3-s}
+    """
+    return np.sqrt(np.pi) * 2**(1+s) * _gamma_ratio((ell+3+s)/2., (ell-s)/2.) / (2*np.pi**2)
+
+def _inverse_hankel_power_law(tau):
+    r"""
+    The inverse of the transform of :func:`_hankel_power_law` for
+    :math:`\ell = 0`, applied to :math:`x^{-6-\tau}`, such that
+
+    .. math::
+
+        4\pi \int x^2 dx j_0(kx) x^{-6-\tau} = H(\tau) k^{3+\tau}
+    """
+    return 4*np.pi * np.sqrt(np.pi) * 2**(-5-tau) * _gamma_ratio(-(3+tau)/2., 3+tau/2.)
+
+def power_law_coefficients(lnk, f):
+    r"""
+    Decompose `f`, sampled on the uniform grid in :math:`\ln k` `lnk`, as
+
+    .. math::
+
+        f(k) = \sum_{m=-N/2}^{N/2} c_m k^{i \eta_m}
+
+    Returns
+    -------
+    eta : array_like
+        the frequencies :math:`\eta_m = 2 \pi m / (N \Delta)`
+    c : array_like
+        the complex coefficients
+    """
+    N = len(lnk)
+    delta = lnk[1] - lnk[0]
+    m = np.arange(-(N//2), N//2+1)
+
+    c = np.fft.fft(f)[m % N] / N
+    c[0] *= 0.5; c[-1] *= 0.5 # the Nyquist frequency
+    eta = 2*np.pi*m / (N*delta)
+    return eta, c * np.exp(-1j*eta*lnk[0])
+
+def _taper(lnk, width):
+    """
+    A window going smoothly from zero to unity over `width` e-folds at
+    both ends of the grid `lnk`
+    """
+    toret = np.ones(len(lnk))
+    for x in [(lnk - lnk[0])/width, (lnk[-1] - lnk)/width]:
+        edge = x < 1
+        toret[edge] = x[edge] - np.sin(2*np.pi*x[edge])/(2*np.pi)
+    return toret
+
+#-------------------------------------------------------------------------------
+# the integral drivers
+#-------------------------------------------------------------------------------
+class FFTLogIntegrals(object):
+    """
+    Base class for the FFTLog-based PT integral drivers, which evaluate the
+    integrals of all kernels on a logarithmic grid in `k` at once, and
+    interpolate from the grid
+
+    The drivers provide ``EvaluateKernels()`` with the same signature as
+    the :mod:`pygcl` drivers, and can be used in their place.
+    """
+    # the kernel functions, keyed by their indices
+    kernel_functions = {}
+
+    # the trailing indices that are optional
+    defaults = ()
+
+    def __init__(self, P_L, N=1024, kmin=1e-12, kmax=1e3):
+        """
+        Parameters
+        ----------
+        P_L : callable
+            the linear power spectrum, i.e., a :class:`pygcl.LinearPS`
+        N : int, optional
+            the number of points of the logarithmic grid
+        kmin : float, optional
+            the minimum wavenumber of the grid; the power spectrum is
+            needed well below the `k` of interest for the integrals to converge
+        kmax : float, optional
+            the maximum wavenumber of the grid
+        """
+        self.P_L = P_L
+        self.N = N
+        self.kmin = kmin
+        self.kmax = kmax
+        self.lnk = np.linspace(np.log(kmin), np.log(kmax), N)
+        self._values = {}
+
+    def __getstate__(self):
+        return {'P_L':self.P_L, 'N':self.N, 'kmin':self.kmin, 'kmax':self.kmax}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def GetLinearPS(self):
+        return self.P_L
+
+    @property
+    def Plin(self):
+        """
+        The linear power spectrum on the grid
+        """
+        try:
+            return self._Plin
+        except AttributeError:
+            self._Plin = np.asarray(self.P_L(np.exp(self.lnk)))
+            return self._Plin
+
+    def _kernel(self, kernel):
+        """
+        The full indices of `kernel`, checking that they are valid
+        """
+        ndim = 2 + len(self.defaults)
+        kernel = tuple(kernel) + tuple(self.defaults)[len(kernel)-2:]
+        if len(kernel) != ndim:
+            raise ValueError("each kernel should be specified by 2 to %d indices" %ndim)
+        kernel = tuple(int(i) for i in kernel[:2]) + tuple(type(d)(i) for i, d in zip(kernel[2:], self.defaults))
+        if kernel not in self.kernel_functions:
+            raise ValueError("%s: invalid kernel indices %s" %(self.__class__.__name__, str(kernel)))
+        return kernel
+
+    def _evaluate_grid(self, kernels):
+        """
+        Return the integrals of `kernels` on the grid
+        """
+        raise NotImplementedError
+
+    def EvaluateKernels(self, k, kernels):
+        """
+        Evaluate the integrals of several kernels at once
+
+        Parameters
+        ----------
+        k : float, array_like
+            the wavenumbers to evaluate the integrals at
+        kernels : list of tuple
+            the indices of the kernels
+
+        Returns
+        -------
+        toret : array_like
+            the integrals, with shape ``(len(kernels),)`` if `k` is a
+            scalar, and ``(len(kernels), len(k))`` otherwise
+        """
+        kernels = [self._kernel(kern) for kern in kernels]
+        k = np.asarray(k, dtype=float)
+        if np.any((k < self.kmin) | (k > self.kmax)):
+            raise ValueError("the FFTLog grid only covers %g <= k <= %g" %(self.kmin, self.kmax))
+
+        # integrate the kernels that are missing on the full grid
+        missing = [kern for kern in set(kernels) if kern not in self._values]
+        if missing:
+            for kern, values in zip(missing, self._evaluate_grid(missing)):
+                self._values[kern] = spline(self.lnk, values)
+
+        toret = np.empty((len(kernels),) + k.shape)
+        for i, kern in enumerate(kernels):
+            toret[i] = self._values[kern](np.log(k))
+        return toret
+
+    def __call__(self, k, *kernel):
+        """
+        Evaluate the integral of the kernel with the input indices
+        """
+        return self.EvaluateKernels(k, [kernel])[0]
+
+class FFTLogConvolution(FFTLogIntegrals):
+    r"""
+    Base class for the integrals of the form
+
+    .. math::
+
+        \int \frac{d^3q}{(2\pi)^3} f(\vec{k}, \vec{q}) P_L(q) P_L(|\vec{k} - \vec{q}|),
+
+    which are decomposed into the terms of :func:`kernel_terms`
+    """
+    # the width of the window at the ends of the grid, in e-folds
+    taper = 2.
+
+    @classmethod
+    def terms(cls, kernel):
+        """
+        The decomposition of the kernel with the input indices
+        """
+        cache = cls.__dict__.get('_terms', None)
+        if cache is None:
+            cache = cls._terms = {}
+        if kernel not in cache:
+            cache[kernel] = kernel_terms(cls.kernel_functions[kernel])
+        return cache[kernel]
+
+    def _coefficients(self, nu):
+        """
+        The power-law coefficients of the linear power spectrum, with bias `nu`
+        """
+        cache = self.__dict__.setdefault('_coeffs', {})
+        if nu not in cache:
+            f = self.Plin * np.exp(-nu*self.lnk) * _taper(self.lnk, self.taper)
+            cache[nu] = power_law_coefficients(self.lnk, f)
+        return cache[nu]
+
+    def _term(self, alpha, beta, ell):
+        r"""
+        The integral of :math:`q^\alpha r^\beta L_\ell(\hat{q} \cdot \hat{r})`
+        on the grid
+
+        The power laws of each leg have exponents with real part
+        :math:`s = \alpha/4 - 2`, such that the integrals of the terms
+        converge for :math:`|\alpha|, |\beta| \leq 2`, and the dynamic
+        range of the biased power spectrum is moderate.
+        """
+        N = self.N
+        lnk = self.lnk
+        s1, s2 = alpha/4. - 2, beta/4. - 2
+
+        # the coefficients of the power laws of each leg
+        eta, c1 = self._coefficients(s1 - alpha)
+        eta, c2 = self._coefficients(s2 - beta)
+        A = c1 * _hankel_power_law(ell, s1 + 1j*eta)
+        B = c2 * _hankel_power_law(ell, s2 + 1j*eta)
+
+        # the sum over pairs with the same total frequency is a convolution
+        size = 2*len(A)
+        C = np.fft.ifft(np.fft.fft(A, size) * np.fft.fft(B, size))[:2*N+1]
+        p = np.arange(-N, N+1)
+        eta_p = 2*np.pi*p / (N*(lnk[1]-lnk[0]))
+        C *= _inverse_hankel_power_law(s1 + s2 + 1j*eta_p) * np.exp(1j*eta_p*lnk[0])
+
+        # and the sum over the frequencies on the grid is a DFT
+        D = np.zeros(N, dtype=complex)
+        np.add.at(D, p % N, C)
+        toret = N * np.fft.ifft(D) * np.exp((3 + s1 + s2)*lnk)
+        return (-1)**ell * toret.real
+
+    def _evaluate_grid(self, kernels):
+        terms = [self.terms(kern) for kern in kernels]
+        needed = set(key for t in terms for key in t)
+        J = dict((key, self._term(*key)) for key in needed)
+        return [sum(x*J[key] for key, x in t.items()) for t in terms]
+
+class FFTLogImn(FFTLogConvolution):
+    """
+    The I(m, n) integrals of :class:`pygcl.Imn`, evaluated with FFTLog
+    """
+    kernel_functions = IMN_KERNEL_FUNCTIONS
+
+class FFTLogKmn(FFTLogConvolution):
+    """
+    The K(m, n) integrals of :class:`pygcl.Kmn`, evaluated with FFTLog
+    """
+    kernel_functions = KMN_KERNEL_FUNCTIONS
+    defaults = (False, 0)
+
+class FFTLogJmn(FFTLogIntegrals):
+    r"""
+    The J(m, n) integrals of :class:`pygcl.Jmn`, evaluated with FFTLog
+
+    The integrals
+
+    .. math::
+
+        \frac{1}{2\pi^2} \int d\ln q \ q P_L(q) g(q/k)
+
+    are convolutions on the logarithmic grid, which are computed with an FFT.
+    """
+    kernel_functions = dict((key, None) for key in _JMN_SMALL_R)
+
+    def _evaluate_grid(self, kernels):
+        N = self.N
+        delta = self.lnk[1] - self.lnk[0]
+        size = 1 << int(np.ceil(np.log2(3*N)))
+
+        # J_j = sum_i F_i g_{i-j}, with the reversed F
+        F = np.fft.rfft((np.exp(self.lnk) * self.Plin)[::-1], size)
+        r = np.exp(np.arange(-(N-1), N)*delta)
+        toret = []
+        for (m, n) in kernels:
+            conv = np.fft.irfft(F * np.fft.rfft(jmn_kernel(m, n, r), size), size)
+            toret.append(delta / (2*np.pi**2) * conv[2*N-2-np.arange(N)])
+        return toret
@@ -1,8 +1,11 @@
 from functools import wraps
 from .. import pygcl, numpy as np
-from ._cache import parameter, interpolated_function, cached_property
+from ._cache import Cache, parameter, interpolated_function, cached_property
 from .tools import RSDSpline as spline
+from ._disk_cache import PTIntegralsDiskCache, disk_cached
+from .pt_fftlog import FFTLogImn, FFTLogJmn, FFTLogKmn
 from . import INTERP_KMIN, INTERP_KMAX
+from six import string_types
 
 #-------------------------------------------------------------------------------
 # decorators to properly normalize integrals
@@ -39,6 +42,50 @@ def normalize_ImnOneLoop(f):
         return norm**2*terms[0] + norm**3*terms[1] + norm**4*terms[2]
     return wrapper
 
+#-------------------------------------------------------------------------------
+# evaluating the integrals of all kernels at once
+#-------------------------------------------------------------------------------
+# the kernels of each driver class that the mixin uses
+IMN_KERNELS = [(m, n) for m in range(4) for n in range(4)]
+JMN_KERNELS = [(0, 0), (0, 1), (1, 0), (1, 1), (0, 2), (2, 0)]
+KMN_KERNELS = [(0, 0, False, 0), (0, 0, True, 0), (0, 1, False, 0), (0, 1, True, 0),
+               (0, 2, True, 0), (1, 0, False, 0), (1, 0, True, 0), (1, 1, False, 0),
+               (1, 1, True, 0), (2, 0, False, 0), (2, 0, False, 1), (2, 0, True, 0),
+               (2, 0, True, 1)]
+
+# the methods to compute the I(m, n), J(m, n), and K(m, n) integrals
+PT_BACKENDS = ['cubature', 'fftlog']
+
+class KernelIntegrals(object):
+    """
+    The integrals of several kernels of a PT integral driver class, which
+    are integrated at once on a shared integration grid
+
+    All of the kernels are integrated when the first kernel is requested,
+    and the result is re-used for the other kernels at the same `k`.
+    """
+    def __init__(self, driver, kernels):
+        """
+        Parameters
+        ----------
+        driver : pygcl.Imn, pygcl.Jmn, pygcl.Kmn, pygcl.ImnOneLoop
+            the driver class, which provides ``EvaluateKernels()``
+        kernels : list of tuple
+            the indices of the kernels to integrate
+        """
+        self.driver = driver
+        self.kernels = list(kernels)
+        self._last = None
+
+    def __call__(self, k, *kernel):
+        """
+        Return the integral of the kernel with indices `kernel` at `k`
+        """
+        last = self._last
+        if last is None or np.shape(last[0]) != np.shape(k) or not np.array_equal(last[0], k):
+            self._last = last = (np.array(k, copy=True), self.driver.EvaluateKernels(k, self.kernels))
+        return last[1][self.kernels.index(kernel)]
+
 class PTIntegralsMixin(object):
     """
     A mixin class to compute and store the necessary PT integrals for the dark
@@ -48,7 +95,17 @@ class PTIntegralsMixin(object):
     -----
     The class is written such that the computationally-expensive parts do not
     depend on changes in sigma8(z) so the integrals can be renormalized to
-    the correct sigma8(z) with an overall scaling
+    the correct sigma8(z) with an overall scaling.
+
+    If :attr:`pt_cache_dir` is set, the integrals evaluated on the spline
+    domain are stored in a persistent cache on disk, and re-used by any
+    model with the same cosmology, transfer function, and spline domain.
+
+    If :attr:`pt_table` is set, the integrals are interpolated from a
+    precomputed table for any cosmology within the range of the table.
+
+    The I(m, n), J(m, n), and K(m, n) integrals are computed with the
+    method given by :attr:`pt_backend`.
     """
     def __init__(self):
 
@@ -56,6 +113,63 @@ class PTIntegralsMixin(object):
         msg = "Integrals: input linear power spectrum must be defined at z = 0"
         assert self.power_lin.GetRedshift() == 0., msg
 
+    #---------------------------------------------------------------------------
+    # persistent disk cache
+    #---------------------------------------------------------------------------
+    @parameter(default=None)
+    def pt_cache_dir(self, val):
+        """
+        The directory of the persistent disk cache for the PT integrals;
+        if `True`, use the default user cache directory, and if `None`,
+        do not use a disk cache
+        """
+        return val
+
+    @cached_property("pt_cache_dir")
+    def pt_disk_cache(self):
+        """
+        The :class:`PTIntegralsDiskCache` storing the PT integrals, or
+        `None` if the disk cache is disabled
+        """
+        if self.pt_cache_dir is None or self.pt_cache_dir is False:
+            return None
+        path = None if self.pt_cache_dir is True else self.pt_cache_dir
+        return PTIntegralsDiskCache(path)
+
+    @parameter(default=None)
+    def pt_table(self, val):
+        """
+        A :class:`~pyRSD.rsd.pt_table.PTIntegralsTable`, or the name of a
+        file holding one, to interpolate the PT integrals from as the
+        cosmology varies; if `None`, the integrals are always computed
+
+        Notes
+        -----
+        Integrals that are already computed are not affected when
+        setting the table.
+        """
+        from .pt_table import PTIntegralsTable
+        if isinstance(val, string_types):
+            val = PTIntegralsTable.from_file(val)
+        return val
+
+    @parameter(default='cubature')
+    def pt_backend(self, val):
+        """
+        The method used to compute the I(m, n), J(m, n), and K(m, n)
+        integrals; either 'cubature', for the adaptive cubature of
+        :mod:`pygcl`, or 'fftlog', for the faster FFTLog-based method of
+        :mod:`~pyRSD.rsd.pt_fftlog`
+
+        Notes
+        -----
+        The 1-loop I(m, n) integrals, which integrate over the 1-loop
+        power spectra, are always computed with the cubature.
+        """
+        if val not in PT_BACKENDS:
+            raise ValueError("`pt_backend` should be one of %s" %str(PT_BACKENDS))
+        return val
+
     #---------------------------------------------------------------------------
     # one-loop power spectra
     #---------------------------------------------------------------------------
@@ -90,27 +204,54 @@ class PTIntegralsMixin(object):
     #---------------------------------------------------------------------------
     # drivers for the various PT integrals -- depend on Plin
     #---------------------------------------------------------------------------
-    @cached_property("power_lin")
+    @cached_property("power_lin", "pt_backend")
     def _Imn(self):
         """
         The internal driver class to compute the I(m, n) integrals
         """
+        if self.pt_backend == 'fftlog':
+            return FFTLogImn(self.power_lin)
         return pygcl.Imn(self.power_lin)
 
-    @cached_property("power_lin")
+    @cached_property("power_lin", "pt_backend")
     def _Jmn(self):
         """
         The internal driver class to compute the J(m, n) integrals
         """
+        if self.pt_backend == 'fftlog':
+            return FFTLogJmn(self.power_lin)
         return pygcl.Jmn(self.power_lin)
 
-    @cached_property("power_lin")
+    @cached_property("power_lin", "pt_backend")
     def _Kmn(self):
         """
-        The internal driver class to compute the J(m, n) integrals
+        The internal driver class to compute the K(m, n) integrals
         """
+        if self.pt_backend == 'fftlog':
+            return FFTLogKmn(self.power_lin)
         return pygcl.Kmn(self.power_lin)
 
+    @cached_property("_Imn")
+    def _Imn_kernels(self):
+        """
+        The I(m, n) integrals of all kernels, integrated at once
+        """
+        return KernelIntegrals(self._Imn, IMN_KERNELS)
+
+    @cached_property("_Jmn")
+    def _Jmn_kernels(self):
+        """
+        The J(m, n) integrals of all kernels, integrated at once
+        """
+        return KernelIntegrals(self._Jmn, JMN_KERNELS)
+
+    @cached_property("_Kmn")
+    def _Kmn_kernels(self):
+        """
+        The K(m, n) integrals of all kernels, integrated at once
+        """
+        return KernelIntegrals(self._Kmn, KMN_KERNELS)
+
     @cached_property("_Pdv_0")
     def _Imn1Loop_dvdv(self):
         """
@@ -119,6 +260,14 @@ class PTIntegralsMixin(object):
         """
         return pygcl.ImnOneLoop(self._Pdv_0)
 
+    @cached_property("_Imn1Loop_dvdv")
+    def _Imn1Loop_dvdv_kernels(self):
+        """
+        The linear, cross, and 1-loop terms of the 1-loop I(m, n) integrals
+        of :attr:`_Imn1Loop_dvdv`, integrated at once
+        """
+        return KernelIntegrals(self._Imn1Loop_dvdv, [(0, 3), (0, 4)])
+
     @cached_property("_Pvv_0", "_Pdd_0")
     def _Imn1Loop_vvdd(self):
         """
@@ -127,6 +276,14 @@ class PTIntegralsMixin(object):
         """
         return pygcl.ImnOneLoop(self._Pvv_0, self._Pdd_0, 1e-4)
 
+    @cached_property("_Imn1Loop_vvdd")
+    def _Imn1Loop_vvdd_kernels(self):
+        """
+        The linear, cross, and 1-loop terms of the 1-loop I(m, n) integrals
+        of :attr:`_Imn1Loop_vvdd`, integrated at once
+        """
+        return KernelIntegrals(self._Imn1Loop_vvdd, [(0, 1), (0, 2)])
+
     @cached_property("_Pvv_0")
     def _Imn1Loop_vvvv(self):
         """
@@ -135,290 +292,312 @@ class PTIntegralsMixin(object):
         """
         return pygcl.ImnOneLoop(self._Pvv_0)
 
+    @cached_property("_Imn1Loop_vvvv")
+    def _Imn1Loop_vvvv_kernels(self):
+        """
+        The linear, cross, and 1-loop terms of the 1-loop I(m, n) integrals
+        of :attr:`_Imn1Loop_vvvv`, integrated at once
+        """
+        return KernelIntegrals(self._Imn1Loop_vvvv, [(2, 3), (3, 2), (3, 3)])
+
     #---------------------------------------------------------------------------
     # Jmn integrals as a function of input k
     #---------------------------------------------------------------------------
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J00(self, k):
         """J(m=0,n=0) perturbation theory integral"""
-        return self._Jmn(k, 0, 0)
+        return self._Jmn_kernels(k, 0, 0)
     J00 = normalize_Jmn(_unnormalized_J00)
 
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J01(self, k):
         """J(m=0,n=1) perturbation theory integral"""
-        return self._Jmn(k, 0, 1)
+        return self._Jmn_kernels(k, 0, 1)
     J01 = normalize_Jmn(_unnormalized_J01)
 
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J10(self, k):
         """J(m=1,n=0) perturbation theory integral"""
-        return self._Jmn(k, 1, 0)
+        return self._Jmn_kernels(k, 1, 0)
     J10 = normalize_Jmn(_unnormalized_J10)
 
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J11(self, k):
         """J(m=1,n=1) perturbation theory integral"""
-        return self._Jmn(k, 1, 1)
+        return self._Jmn_kernels(k, 1, 1)
     J11 = normalize_Jmn(_unnormalized_J11)
 
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J02(self, k):
         """J(m=0,n=2) perturbation theory integral"""
-        return self._Jmn(k, 0, 2)
+        return self._Jmn_kernels(k, 0, 2)
     J02 = normalize_Jmn(_unnormalized_J02)
 
     @interpolated_function("_Jmn")
+    @disk_cached("_Jmn")
     def _unnormalized_J20(self, k):
         """J(m=2,n=0) perturbation theory integral"""
-        return self._Jmn(k, 2, 0)
+        return self._Jmn_kernels(k, 2, 0)
     J20 = normalize_Jmn(_unnormalized_J20)
 
     #---------------------------------------------------------------------------
     # Imn integrals as a function of k
     #---------------------------------------------------------------------------
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I00(self, k):
         """I(m=0,n=0) perturbation theory integral"""
-        return self._Imn(k, 0, 0)
+        return self._Imn_kernels(k, 0, 0)
     I00 = normalize_Imn(_unnormalized_I00)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I01(self, k):
         """I(m=0,n=1) perturbation theory integral"""
-        return self._Imn(k, 0, 1)
+        return self._Imn_kernels(k, 0, 1)
     I01 = normalize_Imn(_unnormalized_I01)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I02(self, k):
         """I(m=0,n=2) perturbation theory integral"""
-        return self._Imn(k, 0, 2)
+        return self._Imn_kernels(k, 0, 2)
     I02 = normalize_Imn(_unnormalized_I02)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I03(self, k):
         """I(m=0,n=3) perturbation theory integral"""
-        return self._Imn(k, 0, 3)
+        return self._Imn_kernels(k, 0, 3)
     I03 = normalize_Imn(_unnormalized_I03)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I10(self, k):
         """I(m=1,n=0) perturbation theory integral"""
-        return self._Imn(k, 1, 0)
+        return self._Imn_kernels(k, 1, 0)
     I10 = normalize_Imn(_unnormalized_I10)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I11(self, k):
         """I(m=1,n=1) perturbation theory integral"""
-        return self._Imn(k, 1, 1)
+        return self._Imn_kernels(k, 1, 1)
     I11 = normalize_Imn(_unnormalized_I11)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I12(self, k):
         """I(m=1,n=2) perturbation theory integral"""
-        return self._Imn(k, 1, 2)
+        return self._Imn_kernels(k, 1, 2)
     I12 = normalize_Imn(_unnormalized_I12)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I13(self, k):
         """I(m=1,n=3) perturbation theory integral"""
-        return self._Imn(k, 1, 3)
+        return self._Imn_kernels(k, 1, 3)
     I13 = normalize_Imn(_unnormalized_I13)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I20(self, k):
         """I(m=2,n=0) perturbation theory integral"""
-        return self._Imn(k, 2, 0)
+        return self._Imn_kernels(k, 2, 0)
     I20 = normalize_Imn(_unnormalized_I20)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I21(self, k):
         """I(m=2,n=1) perturbation theory integral"""
-        return self._Imn(k, 2, 1)
+        return self._Imn_kernels(k, 2, 1)
     I21 = normalize_Imn(_unnormalized_I21)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I22(self, k):
         """I(m=2,n=2) perturbation theory integral"""
-        return self._Imn(k, 2, 2)
+        return self._Imn_kernels(k, 2, 2)
     I22 = normalize_Imn(_unnormalized_I22)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I23(self, k):
         """I(m=2,n=3) perturbation theory integral"""
-        return self._Imn(k, 2, 3)
+        return self._Imn_kernels(k, 2, 3)
     I23 = normalize_Imn(_unnormalized_I23)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I30(self, k):
         """I(m=3,n=0) perturbation theory integral"""
-        return self._Imn(k, 3, 0)
+        return self._Imn_kernels(k, 3, 0)
     I30 = normalize_Imn(_unnormalized_I30)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I31(self, k):
         """I(m=3,n=1) perturbation theory integral"""
-        return self._Imn(k, 3, 1)
+        return self._Imn_kernels(k, 3, 1)
     I31 = normalize_Imn(_unnormalized_I31)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I32(self, k):
         """I(m=3,n=2) perturbation theory integral"""
-        return self._Imn(k, 3, 2)
+        return self._Imn_kernels(k, 3, 2)
     I32 = normalize_Imn(_unnormalized_I32)
 
     @interpolated_function("_Imn")
+    @disk_cached("_Imn")
     def _unnormalized_I33(self, k):
         """I(m=3,n=3) perturbation theory integral"""
-        return self._Imn(k, 3, 3)
+        return self._Imn_kernels(k, 3, 3)
     I33 = normalize_Imn(_unnormalized_I33)
 
     #---------------------------------------------------------------------------
     # Kmn integrals
     #---------------------------------------------------------------------------
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K00(self, k):
         """K(m=0,n=0) perturbation theory integral"""
-        return self._Kmn(k, 0, 0)
+        return self._Kmn_kernels(k, 0, 0, False, 0)
     K00 = normalize_Kmn(_unnormalized_K00)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K00s(self, k):
         """K(m=0,n=0,s=True) perturbation theory integral"""
-        return self._Kmn(k, 0, 0, True)
+        return self._Kmn_kernels(k, 0, 0, True, 0)
     K00s = normalize_Kmn(_unnormalized_K00s)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K01(self, k):
         """K(m=0,n=1) perturbation theory integral"""
-        return self._Kmn(k, 0, 1)
+        return self._Kmn_kernels(k, 0, 1, False, 0)
     K01 = normalize_Kmn(_unnormalized_K01)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K01s(self, k):
         """K(m=0,n=1,s=True) perturbation theory integral"""
-        return self._Kmn(k, 0, 1, True)
+        return self._Kmn_kernels(k, 0, 1, True, 0)
     K01s = normalize_Kmn(_unnormalized_K01s)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K02s(self, k):
         """K(m=0,n=2,s=True) perturbation theory integral"""
-        return self._Kmn(k, 0, 2, True)
+        return self._Kmn_kernels(k, 0, 2, True, 0)
     K02s = normalize_Kmn(_unnormalized_K02s)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K10(self, k):
         """K(m=1,n=0) perturbation theory integral"""
-        return self._Kmn(k, 1, 0)
+        return self._Kmn_kernels(k, 1, 0, False, 0)
     K10 = normalize_Kmn(_unnormalized_K10)
 
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K10s(self, k):
         """K(m=1,n=0,s=True) perturbation theory integral"""
-        return self._Kmn(k, 1, 0, True)
+        return self._Kmn_kernels(k, 1, 0, True, 0)
     K10s = normalize_Kmn(_unnormalized_K10s)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K11(self, k):
         """K(m=1,n=1) perturbation theory integral"""
-        return self._Kmn(k, 1, 1)
+        return self._Kmn_kernels(k, 1, 1, False, 0)
     K11 = normalize_Kmn(_unnormalized_K11)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K11s(self, k):
         """K(m=1,n=1,s=True) perturbation theory integral"""
-        return self._Kmn(k, 1, 1, True)
+        return self._Kmn_kernels(k, 1, 1, True, 0)
     K11s = normalize_Kmn(_unnormalized_K11s)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K20_a(self, k):
         """K(m=2,n=0) mu^2 perturbation theory integral"""
-        return self._Kmn(k, 2, 0, False, 0)
+        return self._Kmn_kernels(k, 2, 0, False, 0)
     K20_a = normalize_Kmn(_unnormalized_K20_a)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K20_b(self, k):
         """K(m=2,n=0) mu^4 perturbation theory integral"""
-        return self._Kmn(k, 2, 0, False, 1)
+        return self._Kmn_kernels(k, 2, 0, False, 1)
     K20_b = normalize_Kmn(_unnormalized_K20_b)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K20s_a(self, k):
         """K(m=2,n=0,s=True) mu^2 perturbation theory integral"""
-        return self._Kmn(k, 2, 0, True, 0)
+        return self._Kmn_kernels(k, 2, 0, True, 0)
     K20s_a = normalize_Kmn(_unnormalized_K20s_a)
 
     @interpolated_function("_Kmn")
+    @disk_cached("_Kmn")
     def _unnormalized_K20s_b(self, k):
         """K(m=2,n=0,s=True) mu^4 perturbation theory integral"""
-        return self._Kmn(k, 2, 0, True, 1)
+        return self._Kmn_kernels(k, 2, 0, True, 1)
     K20s_b = normalize_Kmn(_unnormalized_K20s_b)
 
     #---------------------------------------------------------------------------
     # full 2-loop integrals
     #---------------------------------------------------------------------------
     @interpolated_function("_Imn1Loop_vvdd")
+    @disk_cached("_Imn1Loop_vvdd")
     def _unnormalized_Ivvdd_h01(self, k):
-        I_lin   = self._Imn1Loop_vvdd.EvaluateLinear(k, 0, 1)
-        I_cross = self._Imn1Loop_vvdd.EvaluateCross(k, 0, 1)
-        I_1loop = self._Imn1Loop_vvdd.EvaluateOneLoop(k, 0, 1)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_vvdd_kernels(k, 0, 1))
     Ivvdd_h01 = normalize_ImnOneLoop(_unnormalized_Ivvdd_h01)
 
     @interpolated_function("_Imn1Loop_vvdd")
+    @disk_cached("_Imn1Loop_vvdd")
     def _unnormalized_Ivvdd_h02(self, k):
-        I_lin   = self._Imn1Loop_vvdd.EvaluateLinear(k, 0, 2)
-        I_cross = self._Imn1Loop_vvdd.EvaluateCross(k, 0, 2)
-        I_1loop = self._Imn1Loop_vvdd.EvaluateOneLoop(k, 0, 2)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_vvdd_kernels(k, 0, 2))
     Ivvdd_h02 = normalize_ImnOneLoop(_unnormalized_Ivvdd_h02)
 
     @interpolated_function("_Imn1Loop_dvdv")
+    @disk_cached("_Imn1Loop_dvdv")
     def _unnormalized_Idvdv_h03(self, k):
-        I_lin   = self._Imn1Loop_dvdv.EvaluateLinear(k, 0, 3)
-        I_cross = self._Imn1Loop_dvdv.EvaluateCross(k, 0, 3)
-        I_1loop = self._Imn1Loop_dvdv.EvaluateOneLoop(k, 0, 3)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_dvdv_kernels(k, 0, 3))
     Idvdv_h03 = normalize_ImnOneLoop(_unnormalized_Idvdv_h03)
 
     @interpolated_function("_Imn1Loop_dvdv")
+    @disk_cached("_Imn1Loop_dvdv")
     def _unnormalized_Idvdv_h04(self, k):
-        I_lin   = self._Imn1Loop_dvdv.EvaluateLinear(k, 0, 4)
-        I_cross = self._Imn1Loop_dvdv.EvaluateCross(k, 0, 4)
-        I_1loop = self._Imn1Loop_dvdv.EvaluateOneLoop(k, 0, 4)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_dvdv_kernels(k, 0, 4))
     Idvdv_h04 = normalize_ImnOneLoop(_unnormalized_Idvdv_h04)
 
     @interpolated_function("_Imn1Loop_vvvv")
+    @disk_cached("_Imn1Loop_vvvv")
     def _unnormalized_Ivvvv_f23(self, k):
-        I_lin   = self._Imn1Loop_vvvv.EvaluateLinear(k, 2, 3)
-        I_cross = self._Imn1Loop_vvvv.EvaluateCross(k, 2, 3)
-        I_1loop = self._Imn1Loop_vvvv.EvaluateOneLoop(k, 2, 3)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_vvvv_kernels(k, 2, 3))
     Ivvvv_f23 = normalize_ImnOneLoop(_unnormalized_Ivvvv_f23)
 
     @interpolated_function("_Imn1Loop_vvvv")
+    @disk_cached("_Imn1Loop_vvvv")
     def _unnormalized_Ivvvv_f32(self, k):
-        I_lin   = self._Imn1Loop_vvvv.EvaluateLinear(k, 3, 2)
-        I_cross = self._Imn1Loop_vvvv.EvaluateCross(k, 3, 2)
-        I_1loop = self._Imn1Loop_vvvv.EvaluateOneLoop(k, 3, 2)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_vvvv_kernels(k, 3, 2))
     Ivvvv_f32 = normalize_ImnOneLoop(_unnormalized_Ivvvv_f32)
 
     @interpolated_function("_Imn1Loop_vvvv")
+    @disk_cached("_Imn1Loop_vvvv")
     def _unnormalized_Ivvvv_f33(self, k):
-        I_lin   = self._Imn1Loop_vvvv.EvaluateLinear(k, 3, 3)
-        I_cross = self._Imn1Loop_vvvv.EvaluateCross(k, 3, 3)
-        I_1loop = self._Imn1Loop_vvvv.EvaluateOneLoop(k, 3, 3)
-
-        return I_lin, I_cross, I_1loop
+        return tuple(self._Imn1Loop_vvvv_kernels(k, 3, 3))
     Ivvvv_f33 = normalize_ImnOneLoop(_unnormalized_Ivvvv_f33)
 
     #---------------------------------------------------------------------------
@@ -440,6 +619,7 @@ class PTIntegralsMixin(object):
         return self._power_norm**2 * self._unnormed_velocity_kurtosis
 
     @interpolated_function("power_lin")
+    @disk_cached("power_lin")
     def _unnormalized_sigmasq_k(self, k):
         """
         The dark matter velocity dispersion at z, as a function of k,
@@ -448,3 +628,51 @@ class PTIntegralsMixin(object):
         # integrate up to 0.5 * kmax
         return self.power_lin.VelocityDispersion(k, 0.5)
     sigmasq_k = normalize_Jmn(_unnormalized_sigmasq_k)
+
+
+class PTIntegralsEvaluator(Cache, PTIntegralsMixin):
+    """
+    A minimal class to evaluate the PT integrals of :class:`PTIntegralsMixin`
+    for a given cosmology, without initializing a full model; see
+    :class:`~pyRSD.rsd.pt_table.PTIntegralsTable`
+    """
+    def __init__(self, params, transfer_fit='CLASS'):
+        """
+        Parameters
+        ----------
+        params : pyRSD.rsd.cosmology.Cosmology
+            the cosmological parameters
+        transfer_fit : str, optional
+            the transfer function fitting method
+        """
+        self.params = params
+        self.transfer_fit = transfer_fit
+        PTIntegralsMixin.__init__(self)
+
+    @parameter
+    def params(self, val):
+        """
+        The cosmological parameters
+        """
+        return val
+
+    @parameter
+    def transfer_fit(self, val):
+        """
+        The transfer function fitting method
+        """
+        return val
+
+    @cached_property("params", "transfer_fit")
+    def cosmo(self):
+        """
+        A `pygcl.Cosmology` object holding the cosmological parameters
+        """
+        return self.params.to_class(transfer=getattr(pygcl.transfers, self.transfer_fit))
+
+    @cached_property("cosmo")
+    def power_lin(self):
+        """
+        A 'pygcl.LinearPS' object holding the linear power spectrum at z = 0
+        """
+        return pygcl.LinearPS(self.cosmo, 0.)
@@ -0,0 +1,488 @@
+"""
+A precomputed table of the perturbation theory integrals as a function of
+cosmology, for fits that vary the cosmological parameters
+
+The integrals are tabulated on the spline domain of the model at a set of
+cosmologies sampling (Omega_m h^2, Omega_b h^2, n_s, h), with the remaining
+cosmological parameters fixed to those of a base cosmology, and are
+interpolated between the samples with a radial basis function. Tables are
+built with the ``pyrsd-pt-table`` command; see :func:`main`.
+"""
+from .. import numpy as np
+from ..version import __version__ as pkg_version
+from . import cosmology
+
+import json
+import logging
+
+# bump this when the layout of the table file changes
+TABLE_FORMAT_VERSION = 2
+
+# the cosmological parameters the table varies
+TABLE_PARAMETERS = ['omega_m', 'omega_b', 'n_s', 'h']
+
+# the drivers of the integrals computed with the backend given by `pt_backend`
+BACKEND_DRIVERS = ['_Imn', '_Jmn', '_Kmn']
+
+# the default ranges of the table parameters
+DEFAULT_RANGES = {'omega_m' : (0.12, 0.16), 'omega_b' : (0.021, 0.024),
+                  'n_s' : (0.92, 1.0), 'h' : (0.62, 0.74)}
+
+logger = logging.getLogger('rsd.pt-table')
+
+def table_coordinates(params):
+    """
+    Return the values of the table parameters, (Omega_m h^2, Omega_b h^2,
+    n_s, h), for the input :class:`~pyRSD.rsd.cosmology.Cosmology`
+    """
+    h = params['H0'] / 100.
+    return np.array([params['Om0']*h**2, params['Ob0']*h**2, params['n_s'], h])
+
+def table_cosmology(base, x):
+    """
+    Return a copy of the `base` cosmology with the table parameters `x`
+    """
+    omega_m, omega_b, n_s, h = x
+    return base.clone(H0=100*h, Om0=omega_m/h**2, Ob0=omega_b/h**2, n_s=n_s)
+
+def table_design(lower, upper, N, kind='lhs', seed=None):
+    """
+    Return the table parameters to sample, with shape ``(Nsamples, 4)``
+
+    Parameters
+    ----------
+    lower, upper : array_like
+        the limits of each table parameter
+    N : int
+        the number of samples of a Latin hypercube design, or the number
+        of samples per parameter of a grid design
+    kind : {'lhs', 'grid'}
+        the type of design
+    seed : int, optional
+        the random seed of the Latin hypercube
+    """
+    lower, upper = np.asarray(lower), np.asarray(upper)
+    ndim = len(lower)
+    if kind == 'lhs':
+        rng = np.random.RandomState(seed)
+        x = np.empty((N, ndim))
+        for i in range(ndim):
+            x[:,i] = (rng.permutation(N) + rng.uniform(size=N)) / N
+    elif kind == 'grid':
+        x = np.linspace(0., 1., N)
+        x = np.array(np.meshgrid(*[x]*ndim, indexing='ij')).reshape(ndim, -1).T
+    else:
+        raise ValueError("the table design should be 'lhs' or 'grid', not '%s'" %kind)
+
+    return lower + x*(upper - lower)
+
+def integration_settings(model):
+    """
+    Return the backend used by `model` to compute the I(m, n), J(m, n),
+    and K(m, n) integrals, and the relative tolerance of each of the
+    :data:`BACKEND_DRIVERS`, which is NaN for drivers without one, e.g.,
+    the FFTLog drivers
+    """
+    epsrel = []
+    for name in BACKEND_DRIVERS:
+        driver = getattr(model, name, None)
+        epsrel.append(driver.GetEpsrel() if hasattr(driver, 'GetEpsrel') else np.nan)
+    return getattr(model, 'pt_backend', 'cubature'), np.array(epsrel, dtype='f8')
+
+def tabulated_integrals():
+    """
+    The names of the unnormalized PT integral functions that can be tabulated,
+    i.e., those stored in the PT integrals disk cache
+    """
+    from .pt_integrals import PTIntegralsMixin
+    toret = []
+    for name in sorted(dir(PTIntegralsMixin)):
+        f = getattr(PTIntegralsMixin, name)
+        if getattr(f, '_pt_integral', False) and f.__name__ == name:
+            toret.append(name)
+    return toret
+
+def _evaluate_integrals(args):
+    """
+    Evaluate the PT integrals `names` on `k` for the `base` cosmology
+    with table parameters `x`, computed with the backend `pt_backend`,
+    returning the :func:`integration_settings` and the integrals
+
+    This is defined at the module level so we can pickle it
+    """
+    from .pt_integrals import PTIntegralsEvaluator
+
+    base, x, transfer_fit, pt_backend, k, names = args
+    evaluator = PTIntegralsEvaluator(table_cosmology(base, x), transfer_fit)
+    evaluator.pt_backend = pt_backend
+    values = [getattr(evaluator, name)(k, ignore_cache=True) for name in names]
+    return integration_settings(evaluator), values
+
+def _evaluate_table(base, coords, transfer_fit, pt_backend, k, names, pool=None):
+    """
+    Evaluate the PT integrals `names` on `k` for each sample of the table
+    parameters `coords`, returning the concatenated values of each sample,
+    the length of the tuple returned by each integral, and the relative
+    tolerances of the :data:`BACKEND_DRIVERS`
+    """
+    tasks = [(base, x, transfer_fit, pt_backend, k, names) for x in coords]
+    results = pool.map(_evaluate_integrals, tasks) if pool is not None else map(_evaluate_integrals, tasks)
+
+    values = []
+    for (_, epsrel), result in results:
+        values.append(np.concatenate([np.ravel(r) for r in result]))
+    ntuple = [len(r) if isinstance(r, tuple) else 0 for r in result]
+    return values, ntuple, epsrel
+
+class PTIntegralsTable(object):
+    """
+    A table of the unnormalized PT integrals on a fixed `k` domain, sampled
+    at a set of cosmologies
+
+    The table provides the integrals for a model if the model cosmology is
+    a :class:`~pyRSD.rsd.cosmology.Cosmology` that only differs from
+    :attr:`base` in the table parameters, within the range of the table,
+    and if the model uses the same transfer function, spline domain, and
+    integration backend and tolerances. Otherwise, the integrals are
+    computed as usual.
+
+    Use :func:`build` to compute a new table, and :func:`from_file` to
+    load a table from disk.
+    """
+    def __init__(self, base, transfer_fit, k, coords, names, ntuple, values, lower=None, upper=None,
+                    pt_backend='cubature', epsrel=None):
+        """
+        Parameters
+        ----------
+        base : cosmology.Cosmology
+            the cosmology providing the parameters that are not varied
+        transfer_fit : str
+            the transfer function fitting method
+        k : array_like
+            the wavenumbers the integrals are evaluated at
+        coords : array_like
+            the table parameters of each sample, with shape ``(Nsamples, 4)``
+        names : list of str
+            the names of the tabulated integrals
+        ntuple : list of int
+            the length of the tuple returned by each integral, or zero if
+            the integral returns a single array
+        values : array_like
+            the integrals of each sample, concatenated in the order of
+            `names`, with shape ``(Nsamples, Nvalues)``
+        lower, upper : array_like, optional
+            the range of the table parameters; default is the range of `coords`
+        pt_backend : str, optional
+            the backend used to compute the I(m, n), J(m, n), and K(m, n) integrals
+        epsrel : array_like, optional
+            the relative tolerance of each of the :data:`BACKEND_DRIVERS`, or NaN
+            for drivers without one; default is NaN for all drivers
+        """
+        self.base = base
+        self.transfer_fit = transfer_fit
+        self.k = np.asarray(k, dtype='f8')
+        self.coords = np.asarray(coords, dtype='f8')
+        self.names = list(names)
+        self.ntuple = [int(n) for n in ntuple]
+        self.values = np.asarray(values, dtype='f8')
+        self.lower = self.coords.min(axis=0) if lower is None else np.asarray(lower, dtype='f8')
+        self.upper = self.coords.max(axis=0) if upper is None else np.asarray(upper, dtype='f8')
+        self.pt_backend = pt_backend
+        self.epsrel = np.full(len(BACKEND_DRIVERS), np.nan) if epsrel is None else np.asarray(epsrel, dtype='f8')
+
+        # the slice of the values of each integral
+        self._slices = {}
+        start = 0
+        for name, n in zip(self.names, self.ntuple):
+            size = max(n, 1) * len(self.k)
+            self._slices[name] = slice(start, start+size)
+            start += size
+        if start != self.values.shape[-1]:
+            raise ValueError("shape mismatch between the table values and the tabulated integrals")
+
+    def __repr__(self):
+        args = (len(self.coords), len(self.names))
+        return "<PTIntegralsTable: %d cosmologies, %d integrals>" %args
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        for k in ['_interpolator', '_last']:
+            d.pop(k, None)
+        return d
+
+    #---------------------------------------------------------------------------
+    # building
+    #---------------------------------------------------------------------------
+    @classmethod
+    def build(cls, base, coords, transfer_fit='CLASS', k=None, pool=None,
+                lower=None, upper=None, validate=None, pt_backend='cubature'):
+        """
+        Compute the table, evaluating the PT integrals for each sample of
+        the table parameters `coords`
+
+        Parameters
+        ----------
+        base : cosmology.Cosmology
+            the cosmology providing the parameters that are not varied
+        coords : array_like
+            the table parameters of each sample; see :func:`table_design`
+        transfer_fit : str, optional
+            the transfer function fitting method
+        k : array_like, optional
+            the wavenumbers to evaluate the integrals at; default is the
+            spline domain of the models, :attr:`DarkMatterSpectrum.k_interp`
+        pool : optional
+            a pool with a :func:`map` function, to evaluate the samples in parallel
+        lower, upper : array_like, optional
+            the range of the table parameters; default is the range of `coords`
+        validate : array_like, optional
+            the table parameters of held-out samples, which are not part
+            of the table; the interpolation is checked against the integrals
+            of these samples with :func:`validate`
+        pt_backend : str, optional
+            the backend used to compute the I(m, n), J(m, n), and K(m, n) integrals
+        """
+        if k is None:
+            from .power.dm import DarkMatterSpectrum
+            k = DarkMatterSpectrum.k_interp
+
+        names = tabulated_integrals()
+        values, ntuple, epsrel = _evaluate_table(base, coords, transfer_fit, pt_backend, k, names, pool=pool)
+        toret = cls(base, transfer_fit, k, coords, names, ntuple, values, lower=lower, upper=upper,
+                    pt_backend=pt_backend, epsrel=epsrel)
+
+        if validate is not None and len(validate):
+            toret.validate(validate, pool=pool)
+        return toret
+
+    def validate(self, coords, pool=None):
+        """
+        Compare the interpolated integrals to the integrals evaluated at
+        the held-out table parameters `coords`, storing the errors in
+        :attr:`errors` and logging the :func:`validation_report`
+
+        Some of the integrals cross zero, so the errors are relative to the
+        maximum absolute value over `k` of each integral, for each sample.
+        """
+        coords = np.asarray(coords, dtype='f8')
+        values = _evaluate_table(self.base, coords, self.transfer_fit, self.pt_backend, self.k, self.names, pool=pool)[0]
+        values = np.asarray(values).reshape((len(coords), -1))
+
+        x = (coords - self.lower) / (self.upper - self.lower)
+        errors = self.interpolator(x) - values
+        for name, n in zip(self.names, self.ntuple):
+            sl = self._slices[name]
+            shape = (len(coords), max(n, 1), len(self.k))
+            scale = abs(values[:,sl]).reshape(shape).max(axis=-1, keepdims=True)
+            scale[scale == 0.] = 1.
+            errors[:,sl] = (errors[:,sl].reshape(shape) / scale).reshape((len(coords), -1))
+
+        self.validation_coords = coords
+        self.errors = errors
+        logger.info(self.validation_report())
+        return self.errors
+
+    def validation_report(self):
+        """
+        A string summarizing the relative errors of the interpolation on
+        the held-out samples
+        """
+        if getattr(self, 'errors', None) is None or not len(self.errors):
+            return "PT integrals table has not been validated"
+
+        err = abs(self.errors)
+        worst = max(self.names, key=lambda name: err[:,self._slices[name]].max())
+        lines = ["PT integrals table validation on %d held-out cosmologies:" %len(err)]
+        lines.append("  max relative error: %.3e (%s)" %(err.max(), worst))
+        lines.append("  rms relative error: %.3e" %np.sqrt((err**2).mean()))
+        lines.append("  95th percentile of max error per sample: %.3e" %np.percentile(err.max(axis=1), 95))
+        return "\n".join(lines)
+
+    #---------------------------------------------------------------------------
+    # lookup
+    #---------------------------------------------------------------------------
+    def coordinates(self, model, k):
+        """
+        Return the table parameters of the cosmology of `model`, or `None`
+        if the table does not provide the integrals of `model` at `k`
+        """
+        params = model.params
+        if not isinstance(params, cosmology.Cosmology):
+            return None
+        if model.transfer_fit != self.transfer_fit or getattr(model, 'linear_power_file', None) is not None:
+            return None
+        if len(k) != len(self.k) or not np.allclose(k, self.k, rtol=1e-10):
+            return None
+        pt_backend, epsrel = integration_settings(model)
+        if pt_backend != self.pt_backend or not np.allclose(epsrel, self.epsrel, rtol=1e-10, atol=0., equal_nan=True):
+            return None
+
+        x = table_coordinates(params)
+        if (x < self.lower).any() or (x > self.upper).any():
+            return None
+        if not table_cosmology(self.base, x) == params:
+            return None
+        return x
+
+    @property
+    def interpolator(self):
+        """
+        The radial basis function interpolating the values of the table
+        as a function of the table parameters, scaled to the unit cube
+        """
+        try:
+            return self._interpolator
+        except AttributeError:
+            from scipy.interpolate import RBFInterpolator
+            x = (self.coords - self.lower) / (self.upper - self.lower)
+            self._interpolator = RBFInterpolator(x, self.values, kernel='thin_plate_spline', degree=1)
+            return self._interpolator
+
+    def lookup(self, name, model, k):
+        """
+        Return the unnormalized integral `name` for `model` at `k`, or `None`
+        if it is not tabulated for `model`
+
+        All of the integrals are interpolated at once, and the result is
+        re-used for subsequent lookups with the same cosmology.
+        """
+        if name not in self._slices:
+            return None
+        if len(k) != len(self.k) or not np.allclose(k, self.k, rtol=1e-10):
+            return None
+
+        # the state of the model that determines the integrals
+        state = (model.params, model.transfer_fit, getattr(model, 'linear_power_file', None),
+                 getattr(model, 'pt_backend', 'cubature'))
+        state += tuple(getattr(model, name, None) for name in BACKEND_DRIVERS)
+        last = getattr(self, '_last', None)
+        if last is None or any(a is not b for a, b in zip(last[0], state)):
+            x = self.coordinates(model, k)
+            if x is not None:
+                x = (x - self.lower) / (self.upper - self.lower)
+                x = self.interpolator(x[None])[0]
+            self._last = last = (state, x)
+
+        if last[1] is None:
+            return None
+        toret = last[1][self._slices[name]]
+        n = self.ntuple[self.names.index(name)]
+        return tuple(toret.reshape(n, -1)) if n else toret
+
+    #---------------------------------------------------------------------------
+    # I/O
+    #---------------------------------------------------------------------------
+    def to_file(self, filename):
+        """
+        Save the table to a numpy ``npz`` file
+        """
+        base = {}
+        for key in self.base:
+            val = self.base[key]
+            base[key] = np.asarray(val).tolist() if not isinstance(val, (str, bool, type(None))) else val
+
+        np.savez(filename, format=TABLE_FORMAT_VERSION, pyrsd_version=pkg_version,
+                 parameters=TABLE_PARAMETERS, base=json.dumps(base), transfer_fit=self.transfer_fit,
+                 pt_backend=self.pt_backend, epsrel=self.epsrel,
+                 k=self.k, coords=self.coords, lower=self.lower, upper=self.upper,
+                 names=self.names, ntuple=self.ntuple, values=self.values,
+                 validation_coords=getattr(self, 'validation_coords', np.empty((0, len(TABLE_PARAMETERS)))),
+                 errors=getattr(self, 'errors', np.empty((0, self.values.shape[-1]))))
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Load a table from a numpy ``npz`` file, raising a ``ValueError`` if the
+        file was written with a different table format
+        """
+        with np.load(filename) as ff:
+            version = int(ff['format'])
+            if version != TABLE_FORMAT_VERSION:
+                args = (filename, version, TABLE_FORMAT_VERSION)
+                raise ValueError("PT integrals table '%s' has format version %d, but version %d is required" %args)
+            if list(ff['parameters']) != TABLE_PARAMETERS:
+                raise ValueError("PT integrals table '%s' has the wrong table parameters" %filename)
+            if str(ff['pyrsd_version']) != pkg_version:
+                args = (filename, str(ff['pyrsd_version']), pkg_version)
+                logger.warning("PT integrals table '%s' was computed with pyRSD version %s; current version is %s" %args)
+
+            base = cosmology.Cosmology(**json.loads(str(ff['base'])))
+            toret = cls(base, str(ff['transfer_fit']), ff['k'], ff['coords'], ff['names'].tolist(),
+                        ff['ntuple'], ff['values'], lower=ff['lower'], upper=ff['upper'],
+                        pt_backend=str(ff['pt_backend']), epsrel=ff['epsrel'])
+
+            # the held-out validation, if any
+            if 'errors' in ff.files:
+                toret.validation_coords, toret.errors = ff['validation_coords'], ff['errors']
+            return toret
+
+def main():
+    """
+    Build a table of the PT integrals and save it to disk, evaluating the
+    cosmologies in parallel with ``multiprocessing``
+    """
+    import argparse
+    import multiprocessing
+
+    desc = "compute a table of the PT integrals as a function of (Omega_m h^2, Omega_b h^2, n_s, h)"
+    parser = argparse.ArgumentParser(description=desc)
+
+    h = "the name of the output file"
+    parser.add_argument('output', type=str, help=h)
+
+    h = "the name of the base cosmology in pyRSD.rsd.cosmology, which sets the parameters that are not varied"
+    parser.add_argument('--cosmo', type=str, default='Planck15', help=h)
+
+    h = "the transfer function fitting method"
+    parser.add_argument('--transfer-fit', type=str, default='CLASS', choices=['CLASS', 'EH', 'EH_NoWiggle', 'BBKS'], help=h)
+
+    h = "the backend used to compute the I(m, n), J(m, n), and K(m, n) integrals"
+    parser.add_argument('--pt-backend', type=str, default='cubature', choices=['cubature', 'fftlog'], help=h)
+
+    h = "the type of design; a Latin hypercube or a regular grid"
+    parser.add_argument('--design', type=str, default='lhs', choices=['lhs', 'grid'], help=h)
+
+    h = "the number of samples of the Latin hypercube, or the number of samples per parameter of the grid"
+    parser.add_argument('-N', type=int, default=200, help=h)
+
+    for name in TABLE_PARAMETERS:
+        h = "the range of %s; default is %s" %(name, str(DEFAULT_RANGES[name]))
+        parser.add_argument('--'+name.replace('_', '-'), nargs=2, type=float, default=DEFAULT_RANGES[name], help=h)
+
+    h = "the random seed of the Latin hypercube"
+    parser.add_argument('--seed', type=int, default=None, help=h)
+
+    h = "the number of held-out cosmologies to check the interpolation against; 0 to skip"
+    parser.add_argument('--validate', type=int, default=20, help=h)
+
+    h = "the number of processes; default is the number of CPUs"
+    parser.add_argument('--nproc', type=int, default=None, help=h)
+
+    ns = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    base = getattr(cosmology, ns.cosmo, None)
+    if not isinstance(base, cosmology.Cosmology):
+        raise ValueError("'%s' is not a Cosmology in pyRSD.rsd.cosmology" %ns.cosmo)
+
+    lower = [getattr(ns, name)[0] for name in TABLE_PARAMETERS]
+    upper = [getattr(ns, name)[1] for name in TABLE_PARAMETERS]
+    coords = table_design(lower, upper, ns.N, kind=ns.design, seed=ns.seed)
+    logger.info("computing the PT integrals for %d cosmologies" %len(coords))
+
+    # the held-out cosmologies
+    validate = None
+    if ns.validate:
+        seed = ns.seed + 1 if ns.seed is not None else None
+        validate = table_design(lower, upper, ns.validate, kind='lhs', seed=seed)
+
+    pool = multiprocessing.Pool(ns.nproc)
+    try:
+        table = PTIntegralsTable.build(base, coords, transfer_fit=ns.transfer_fit, pool=pool,
+                                       lower=lower, upper=upper, validate=validate, pt_backend=ns.pt_backend)
+    finally:
+        pool.close()
+        pool.join()
+
+    table.to_file(ns.output)
+    logger.info("saved the PT integrals table to '%s'" %ns.output)
@@ -4,11 +4,14 @@ from .. import pygcl, numpy as np, data as sim_data
 from . import tools
 
 import itertools
-import pandas as pd
-from sklearn import preprocessing
-import george
 
-GEORGE_v03 = george.__version__ >= '0.3'
+def _george_v03():
+    """
+    Whether the installed version of `george` is at least 0.3; `george`
+    is only imported when the Gaussian processes are first needed
+    """
+    import george
+    return george.__version__ >= '0.3'
 
 #-------------------------------------------------------------------------------
 # simulation measurements, interpolated with a gaussian process
@@ -28,8 +31,8 @@ class GeorgeSimulationData(Cache):
                     theta,
                     use_errors=True,
                     dependent_col='y',
-                    kernel=george.kernels.ExpSquaredKernel,
-                    solver=george.BasicSolver):
+                    kernel=None,
+                    solver=None):
         """
         Parameters
         ----------
@@ -47,10 +50,16 @@ class GeorgeSimulationData(Cache):
             the name of the dependent variable to interpolate the data. Should be
             a column in `data`
         kernel : `george.kernels.Kernel`, optional
-            the kernel class to use in the Gaussian process covariance matrix
+            the kernel class to use in the Gaussian process covariance matrix;
+            default is `george.kernels.ExpSquaredKernel`
         solver : {`george.BasicSolver`, `george.HODLRSolver`}, optional
-            the solver class to use when evaluating the Gaussian process
+            the solver class to use when evaluating the Gaussian process;
+            default is `george.BasicSolver`
         """
+        import george
+        if kernel is None: kernel = george.kernels.ExpSquaredKernel
+        if solver is None: solver = george.BasicSolver
+
         self.use_errors  = use_errors
         self.data        = data
         self.independent = independent_vars
@@ -74,6 +83,7 @@ class GeorgeSimulationData(Cache):
         """
         The solver to use in the Gaussian process
         """
+        import george
         avail = [george.BasicSolver, george.HODLRSolver]
         if val not in avail:
             raise ValueError("the `solver` must be one of %s" %str(avail))
@@ -166,6 +176,8 @@ class GeorgeSimulationData(Cache):
         """
         The class to scale the `x` attribute
         """
+        from sklearn import preprocessing
+
         x = self.x
         if x.ndim == 1: x = x.reshape(-1, 1)
         return preprocessing.StandardScaler(copy=True).fit(x)
@@ -175,6 +187,7 @@ class GeorgeSimulationData(Cache):
         """
         The class to scale the `y` attribute
         """
+        from sklearn import preprocessing
         return preprocessing.StandardScaler(copy=True).fit(self.y.reshape(-1, 1))
 
     @cached_property("x")
@@ -206,6 +219,8 @@ class GeorgeSimulationData(Cache):
         """
         The Gaussian process needed to do the interpolation
         """
+        import george
+
         if self.ndim == self.xshape:
             kernel = self.kernel(self.theta, ndim=self.xshape)
         elif self.ndim == self.xshape+1:
@@ -214,7 +229,7 @@ class GeorgeSimulationData(Cache):
             raise ValueError("size mismatch between supplied `x` variables and `theta` length")
         gp = george.GP(kernel, solver=self.solver)
 
-        if GEORGE_v03:
+        if _george_v03():
             kws = {}
         else:
             kws = {'sort':False}
@@ -248,7 +263,7 @@ class GeorgeSimulationData(Cache):
         if pt.ndim == 1: pt = pt.reshape(1, -1)
         pt = self.x_scaler.transform(pt)
 
-        if GEORGE_v03:
+        if _george_v03():
             kws = {'return_cov':False}
         else:
             kws = {'mean_only':True}
@@ -458,6 +473,8 @@ class SimulationP11(InterpolatedSimulationData):
         """
         Load the P11 simulation data
         """
+        import pandas as pd
+
         # cosmology and linear power spectrum for teppei's sims
         cosmo = pygcl.Cosmology("teppei_sims.ini", pygcl.Cosmology.CLASS)
         Plin = pygcl.LinearPS(cosmo, 0.)
@@ -576,6 +593,8 @@ class SimulationPdv(InterpolatedSimulationData):
         """
         Load the simulation data
         """
+        import pandas as pd
+
         # cosmology and linear power spectrum for teppei's sims
         cosmo = pygcl.Cosmology("teppei_sims.ini", pygcl.Cosmology.CLASS)
         Plin = pygcl.LinearPS(cosmo, 0.)
@@ -0,0 +1,273 @@
+"""
+A compact, versioned file format for saving and loading models
+
+A snapshot is a numpy ``npz`` file holding the model parameters and the
+cached attributes that are expensive to compute and only depend on the
+cosmology, i.e., the linear transfer function, the knots of the splines of
+the PT integrals, and the HZPT Zel'dovich interpolation tables. Nothing is
+pickled, and the model is rebuilt cheaply on load, with all other cached
+attributes re-computed when first needed.
+"""
+from .. import numpy as np, pygcl
+from . import cosmology, __version__
+from ._cache import InterpolatedFunction, SharedCache, SharedStore, shared_attributes
+from ._interpolate import RegularGridInterpolator
+from .hzpt import InterpolationTable
+from .multi_redshift import MultiRedshiftSpectrum
+
+from six import string_types
+import importlib
+import warnings
+import json
+import numbers
+import re
+
+# bump this when the layout of the snapshot file changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# the cosmological parameters the stored attributes depend on
+COSMO_PARAMETERS = MultiRedshiftSpectrum.shared_params
+
+#-------------------------------------------------------------------------------
+# encoding of parameter values
+#-------------------------------------------------------------------------------
+def _jsonify(val):
+    """
+    Return a JSON-serializable version of `val`, raising a ``TypeError``
+    if that is not possible
+    """
+    if isinstance(val, cosmology.Cosmology):
+        return {'__cosmology__': _jsonify(dict(val))}
+    elif isinstance(val, dict):
+        return dict((str(k), _jsonify(v)) for k, v in val.items())
+    elif isinstance(val, (list, tuple)):
+        return [_jsonify(v) for v in val]
+    elif isinstance(val, np.ndarray):
+        val = np.asarray(val) # removes any astropy units
+        if val.ndim == 0:
+            return val.item()
+        return {'__array__': val.tolist(), 'dtype': val.dtype.str}
+    elif isinstance(val, np.generic):
+        return val.item()
+    elif val is None or isinstance(val, string_types + (bool, int, float)):
+        return val
+    raise TypeError("cannot store a value of type '%s'" %type(val).__name__)
+
+def _object_hook(d):
+    """
+    Restore the objects encoded by :func:`_jsonify`
+    """
+    if '__cosmology__' in d:
+        return cosmology.Cosmology(**d['__cosmology__'])
+    elif '__array__' in d:
+        return np.array(d['__array__'], dtype=d['dtype'])
+    return d
+
+#-------------------------------------------------------------------------------
+# encoding of cached attributes
+#-------------------------------------------------------------------------------
+def _store_cached(name, val, arrays):
+    """
+    Add the arrays needed to rebuild the cached attribute `name` to
+    `arrays`, returning the JSON description of the attribute, or `None`
+    if the attribute cannot be stored
+    """
+    # splines of the PT integrals, from their knots
+    if isinstance(val, InterpolatedFunction):
+        splines = val.spline if isinstance(val.spline, list) else [val.spline]
+        if not all(hasattr(spl, 'x') and hasattr(spl, 'y') for spl in splines):
+            return None
+        x = splines[0].x
+        if not all(np.array_equal(spl.x, x) for spl in splines):
+            return None
+        arrays[name+'.x'] = x
+        arrays[name+'.y'] = np.array([spl.y for spl in splines])
+        return {'kind':'spline', 'tuple':isinstance(val.spline, list), 'reference':_jsonify(val.reference)}
+
+    # the cosmology, from its transfer function
+    elif isinstance(val, pygcl.Cosmology):
+        params, tf, sigma8, k, Tk = val.__getstate__()['args']
+        arrays[name+'.k'] = k
+        arrays[name+'.Tk'] = Tk
+        return {'kind':'cosmo', 'params':_jsonify(params), 'transfer':int(tf), 'sigma8':float(sigma8)}
+
+    # the Zel'dovich interpolation tables
+    elif isinstance(val, InterpolationTable):
+        for key, interp in val.items():
+            for i, g in enumerate(interp.grid):
+                arrays['%s.%s.grid%d' %(name, key, i)] = g
+            arrays['%s.%s.values' %(name, key)] = interp.values
+        return {'kind':'hzpt_table', 'keys':sorted(val), 'ndim':[len(val[key].grid) for key in sorted(val)]}
+
+    # numbers and arrays
+    elif isinstance(val, (numbers.Number, np.ndarray)) and not isinstance(val, bool):
+        arrays[name] = np.asarray(val)
+        return {'kind':'value', 'scalar':np.ndim(val) == 0}
+
+    return None
+
+def _load_cached(model_class, name, info, ff):
+    """
+    Rebuild the cached attribute `name` from its JSON description `info`
+    and the arrays in the ``npz`` file `ff`
+    """
+    kind = info['kind']
+    if kind == 'spline':
+        x = ff[name+'.x']
+        kws = getattr(model_class, 'spline_kwargs', {})
+        splines = [model_class.spline(x, y, **kws) for y in ff[name+'.y']]
+        if not info['tuple']: splines = splines[0]
+        return InterpolatedFunction(splines, name, reference=info['reference'])
+
+    elif kind == 'cosmo':
+        args = [info['params'], info['transfer'], info['sigma8'], ff[name+'.k'], ff[name+'.Tk']]
+        toret = pygcl.Cosmology.__new__(pygcl.Cosmology)
+        toret.__setstate__({'args':args})
+        return toret
+
+    elif kind == 'hzpt_table':
+        toret = InterpolationTable()
+        for key, ndim in zip(info['keys'], info['ndim']):
+            grid = [ff['%s.%s.grid%d' %(name, key, i)] for i in range(ndim)]
+            toret[key] = RegularGridInterpolator(grid, ff['%s.%s.values' %(name, key)])
+        return toret
+
+    elif kind == 'value':
+        val = ff[name]
+        return val.item() if info['scalar'] else val
+
+    raise ValueError("unknown type '%s' of cached attribute '%s'" %(kind, name))
+
+#-------------------------------------------------------------------------------
+# saving and loading
+#-------------------------------------------------------------------------------
+def _model_class(value):
+    """
+    Return the model class identified by ``'module:name'`` in a snapshot
+
+    Only modules of :mod:`pyRSD` are imported, and the class must be a
+    :class:`~pyRSD.rsd.DarkMatterSpectrum`; otherwise, a ``ValueError``
+    is raised, such that loading a snapshot never imports arbitrary code.
+    """
+    from .power.dm import DarkMatterSpectrum
+
+    module, _, name = value.partition(':')
+    if not re.match(r'^pyRSD(\.\w+)+$', module) or not re.match(r'^\w+$', name):
+        raise ValueError("model snapshot has an invalid model class '%s'" %value)
+
+    cls = getattr(importlib.import_module(module), name, None)
+    if not isinstance(cls, type) or not issubclass(cls, DarkMatterSpectrum):
+        raise ValueError("model snapshot class '%s' is not a DarkMatterSpectrum" %value)
+    return cls
+
+def save_snapshot(model, filename):
+    """
+    Save a snapshot of `model` to a numpy ``npz`` file
+
+    Parameters that cannot be stored, i.e., objects other than numbers, strings,
+    arrays, and containers of these, are not saved, and are set to their
+    default values when loading the snapshot.
+
+    Parameters
+    ----------
+    model : DarkMatterSpectrum
+        the model to save; any subclass is supported
+    filename : str
+        the name of the file to save to
+    """
+    cls = model.__class__
+    d = model.__dict__
+
+    # the parameters
+    parameters = {}
+    for name in sorted(cls._param_names):
+        if '__'+name not in d: continue
+        try:
+            parameters[name] = _jsonify(d['__'+name])
+        except TypeError as e:
+            warnings.warn("parameter `%s` is not stored in the model snapshot: %s" %(name, str(e)))
+
+    # the cached attributes that only depend on the cosmology
+    arrays = {}; cached = {}
+    for name in shared_attributes(cls, COSMO_PARAMETERS):
+        if name not in model._cache: continue
+        info = _store_cached(name, model._cache[name], arrays)
+        if info is not None:
+            cached[name] = info
+
+    model_class = "%s:%s" %(cls.__module__, cls.__name__)
+    np.savez(filename, format=SNAPSHOT_FORMAT_VERSION, pyrsd_version=__version__,
+             model_class=model_class, parameters=json.dumps(parameters),
+             cache=json.dumps(cached), **arrays)
+
+def load_snapshot(filename, show_warning=True):
+    """
+    Load a model from a snapshot saved with :func:`save_snapshot`
+
+    The model is initialized with the stored parameters, without
+    computing the stored cached attributes, and the values of all
+    stored parameters are then restored with :func:`bulk_update`.
+
+    Parameters
+    ----------
+    filename : str
+        the name of the ``npz`` file
+    show_warning : bool, optional
+        whether to warn if the snapshot was saved by a different
+        version of the model
+
+    Returns
+    -------
+    model : DarkMatterSpectrum
+        the loaded model
+
+    Raises
+    ------
+    ValueError
+        if the snapshot has the wrong format version, or its model class
+        is not a :class:`~pyRSD.rsd.DarkMatterSpectrum` defined in :mod:`pyRSD`
+    """
+    from . import OutdatedModelWarning
+
+    with np.load(filename, allow_pickle=False) as ff:
+
+        # check the format
+        fmt = int(ff['format']) if 'format' in ff else None
+        if fmt != SNAPSHOT_FORMAT_VERSION:
+            args = (filename, fmt, SNAPSHOT_FORMAT_VERSION)
+            raise ValueError("model snapshot '%s' has format version %s, but version %d is required" %args)
+
+        version = str(ff['pyrsd_version'])
+        if show_warning and version != __version__:
+            msg = "loading an outdated model:\n"
+            msg += '\tcurrent model version: %s\n' %(__version__)
+            msg += '\tloaded model version: %s\n' %(version)
+            warnings.warn(msg, OutdatedModelWarning)
+
+        cls = _model_class(str(ff['model_class']))
+        parameters = json.loads(str(ff['parameters']), object_hook=_object_hook)
+
+        cached = {}
+        for name, info in json.loads(str(ff['cache'])).items():
+            cached[name] = _load_cached(cls, name, info, ff)
+
+    # provide the stored attributes through a shared cache, such that they
+    # are not computed when initializing
+    model = cls.__new__(cls)
+    for name in COSMO_PARAMETERS:
+        if name in parameters:
+            setattr(model, name, parameters[name])
+    SharedCache.install(model, COSMO_PARAMETERS, SharedStore(maxsize=1))
+    model._cache.shared().update(cached)
+
+    # initialize
+    kwargs = dict((k, parameters[k]) for k in cls.allowable_kwargs if k in parameters)
+    model.__init__(**kwargs)
+
+    # restore the parameter values, which invalidates anything computed with
+    # the initial values; the stored attributes only depend on the cosmology,
+    # and remain in the shared cache
+    model.bulk_update(**parameters)
+    SharedCache.uninstall(model)
+
+    return model
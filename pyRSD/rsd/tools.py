@@ -12,13 +12,16 @@ from scipy.interpolate import InterpolatedUnivariateSpline as spline
 
 import functools
 import itertools
+import contextlib
+import copy
 import inspect
 import hashlib
 from six import PY3
-import xarray as xr
 
 def return_xarray(pkmu, k, mu, flatten=False):
 
+    import xarray as xr
+
     if flatten:
         k = np.ravel(k, order='F')
         mu = np.ravel(mu, order='F')
@@ -74,6 +77,197 @@ def mu_AP(mu_obs, alpha_perp, alpha_par):
     F = alpha_par / alpha_perp
     return (mu_obs/F) * (1 + mu_obs**2*(1./F**2 - 1))**(-0.5)
 
+def _same_array(a, b):
+    """
+    Whether the two input arrays are views of the same memory, with
+    the same layout
+    """
+    if a is b: return True
+    try:
+        return (a.shape == b.shape and a.strides == b.strides and a.dtype == b.dtype
+                    and a.__array_interface__['data'][0] == b.__array_interface__['data'][0])
+    except AttributeError:
+        return False
+
+class APCoordinates(object):
+    """
+    The coordinate context of a single evaluation of the model, which
+    holds the AP-distorted (k, mu) for a given (`alpha_perp`, `alpha_par`),
+    and lazily computes and stores the powers of `mu` and the functions
+    of `k` evaluated at the distorted wavenumbers
+
+    When used as a context manager, the coordinates become the current
+    coordinates (see :func:`current_coordinates`), which allows any term
+    evaluated at the distorted (k, mu) to share these quantities; this is
+    done by the :func:`alcock_paczynski` decorator for each call to the
+    model.
+
+    Examples
+    --------
+    A custom term can re-use the quantities of the current evaluation with
+
+    >>> coords = get_coordinates(k, mu)
+    >>> toret = coords.mu_power(4) * coords.evaluate(model.P_mu4)
+    """
+    def __init__(self, k_obs, mu_obs, alpha_perp=1., alpha_par=1., alpha_drag=1.):
+        """
+        Parameters
+        ----------
+        k_obs, mu_obs : array_like
+            the observed (k, mu) values
+        alpha_perp, alpha_par : float, optional
+            the AP parameters
+        alpha_drag : float, optional
+            the ratio of the sound horizon in the fiducial and true cosmologies
+        """
+        self.k_obs = k_obs = np.asarray(k_obs)
+        self.mu_obs = mu_obs = np.asarray(mu_obs)
+        self.alpha_perp = alpha_perp
+        self.alpha_par = alpha_par
+        self.alpha_drag = alpha_drag
+
+        # the AP distortion, sharing the common factor of k_AP and mu_AP
+        F = alpha_par / alpha_perp
+        if F != 1.:
+            x = 1 + mu_obs**2*(1./F**2 - 1)
+            self.k = (k_obs/alpha_perp)*x**(0.5)
+            self.mu = (mu_obs/F)*x**(-0.5)
+        else:
+            self.k = k_obs/alpha_perp
+            self.mu = mu_obs
+
+        self._mu_powers = {1: self.mu}
+        self._evaluated = {}
+
+    @classmethod
+    def identity(cls, k, mu):
+        """
+        Coordinates without any AP distortion, i.e., the (k, mu)
+        are used as is
+        """
+        toret = cls.__new__(cls)
+        toret.k_obs = toret.k = k
+        toret.mu_obs = toret.mu = mu
+        toret.alpha_perp = toret.alpha_par = toret.alpha_drag = 1.
+        toret._mu_powers = {1: mu}
+        toret._evaluated = {}
+        return toret
+
+    @property
+    def volume_factor(self):
+        """
+        The rescaling of the power due to the AP volume distortion and
+        the ratio of sound horizons
+        """
+        return self.alpha_drag**3 / (self.alpha_perp**2 * self.alpha_par)
+
+    def matches(self, k, mu):
+        """
+        Whether the input (k, mu) are the AP-distorted (k, mu) of this context
+        """
+        return _same_array(k, self.k) and _same_array(mu, self.mu)
+
+    def mu_power(self, n):
+        """
+        Return ``mu**n`` at the AP-distorted `mu`, computed once
+        """
+        toret = self._mu_powers.get(n, None)
+        if toret is None:
+            if n == 0:
+                toret = 1.
+            elif n % 2 == 0:
+                toret = self.mu_power(n//2)**2
+            else:
+                toret = self.mu**n
+            self._mu_powers[n] = toret
+        return toret
+
+    def evaluate(self, f, *args, **kwargs):
+        """
+        Return ``f(k, *args, **kwargs)`` at the AP-distorted `k`, computed once
+        for each parameter state of the model
+
+        The result is keyed on the function, the (hashable) arguments,
+        and the parameter generation of the model that `f` is bound to,
+        such that spline evaluations are re-used by all terms that need
+        them in the same parameter state.
+        """
+        model = getattr(f, '__self__', None)
+        key = (getattr(f, '__func__', f), id(model), getattr(model, 'generation', None),
+                args, tuple(sorted(kwargs.items())))
+
+        entry = self._evaluated.get(key, None)
+        if entry is None or entry[0] is not model:
+            entry = (model, f(self.k, *args, **kwargs))
+            self._evaluated[key] = entry
+        return entry[1]
+
+    def cached(self, key, func):
+        """
+        Return the value stored under `key`, computing it with ``func()``
+        if it is not yet stored
+
+        This is used for quantities that only depend on the coordinates
+        and the (hashable) `key`, e.g., the FOG kernels, which are keyed
+        on the kernel type and the velocity dispersion.
+        """
+        entry = self._evaluated.get(key, None)
+        if entry is None:
+            entry = self._evaluated[key] = (None, func())
+        return entry[1]
+
+    def clear(self):
+        """
+        Remove the stored function evaluations, keeping the
+        distorted coordinates and the powers of `mu`
+        """
+        self._evaluated.clear()
+
+    def __enter__(self):
+        _coordinates.append(self)
+        return self
+
+    def __exit__(self, *args):
+        _coordinates.pop()
+
+# the stack of active coordinate contexts
+_coordinates = []
+
+def current_coordinates():
+    """
+    Return the current :class:`APCoordinates`, or `None`
+    """
+    return _coordinates[-1] if _coordinates else None
+
+def get_coordinates(k, mu):
+    """
+    Return the current :class:`APCoordinates` if the input (k, mu)
+    are its AP-distorted coordinates, or new coordinates without any AP
+    distortion otherwise
+    """
+    coords = current_coordinates()
+    if coords is not None and coords.matches(k, mu):
+        return coords
+    return APCoordinates.identity(k, mu)
+
+def ap_coordinates(k_obs, mu_obs, alpha_perp=1., alpha_par=1., alpha_drag=1.):
+    """
+    Return the current :class:`APCoordinates` if they are the distortion of
+    the input observed (k, mu) with the input AP parameters, or new
+    coordinates otherwise
+
+    This allows separate calls to the model at the same observed (k, mu),
+    e.g., when computing the derivatives of the power with respect to each
+    parameter, to share a single coordinate context.
+    """
+    coords = current_coordinates()
+    if coords is not None:
+        alphas = (coords.alpha_perp, coords.alpha_par, coords.alpha_drag)
+        if alphas == (alpha_perp, alpha_par, alpha_drag):
+            if _same_array(k_obs, coords.k_obs) and _same_array(mu_obs, coords.mu_obs):
+                return coords
+    return APCoordinates(k_obs, mu_obs, alpha_perp, alpha_par, alpha_drag)
+
 #-------------------------------------------------------------------------------
 # decorators
 #-------------------------------------------------------------------------------
@@ -128,37 +322,107 @@ def align_input(f):
 
     return wrapper
 
+class ScopedMemo(object):
+    """
+    The storage for the scoped memoization of :func:`cacheable` functions,
+    which is active between calls to :func:`cache_on` and :func:`cache_off`
+
+    Results are keyed on the identity of the instance and of the input
+    arguments, and the parameter generation of the model (see
+    :attr:`pyRSD.rsd._cache.Cache.generation`). The input arguments are
+    stored along with the results, such that their identity can not be
+    re-used during the scope of the memoization.
+    """
+    def __init__(self):
+        self.data = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of calls returned from the cache
+        """
+        N = self.hits + self.misses
+        return 1.*self.hits / N if N else 0.
+
+    def __repr__(self):
+        args = (len(self), self.hits, self.misses, self.hit_rate)
+        return "<ScopedMemo: size=%d, hits=%d, misses=%d, hit rate=%.2f>" %args
+
 # global cache space
 _global_cache = None
 
 def cache_on():
+    """
+    Turn on the scoped memoization of :func:`cacheable` functions,
+    returning the :class:`ScopedMemo` storage
+    """
     global _global_cache
-    _global_cache = {}
+    _global_cache = ScopedMemo()
+    return _global_cache
 
 def cache_off():
+    """
+    Turn off the scoped memoization of :func:`cacheable` functions,
+    returning the :class:`ScopedMemo` storage that was in use
+    """
     global _global_cache
+    toret = _global_cache
     _global_cache = None
+    return toret
+
+@contextlib.contextmanager
+def cache_suspended():
+    """
+    Context manager to turn off the scoped memoization of :func:`cacheable`
+    functions, restoring the :class:`ScopedMemo` storage in use upon exiting
+    """
+    global _global_cache
+    memo = cache_off()
+    try:
+        yield
+    finally:
+        _global_cache = memo
 
 def cacheable(f):
     """
     Decorator to optionally cache the function return value
 
-    If the class has a :attr:`_scratch` that is a dictionary,
-    this decorator will cache the function return value,
-    using the input arguments and function name as the hash key
+    If the scoped memoization is turned on (see :func:`cache_on`), this
+    decorator will cache the function return value, keyed on the identity
+    of `self` and the input arguments and the parameter generation of the
+    model; the model is given by ``self.model``, if it exists, or ``self``
+
+    If `self` has a ``memo_state`` attribute, its value is also included
+    in the key.
     """
+    name = f.__name__
+
     @functools.wraps(f)
     def wrap(self, *args, **kws):
 
-        if _global_cache is not None and isinstance(_global_cache, dict):
-            name = "%s.%s" %(self.__class__.__name__, f.__name__)
-            hashkey = get_hash_key(name, *args)
-            if hashkey not in _global_cache:
-                _global_cache[hashkey] = f(self, *args, **kws)
-            return _global_cache[hashkey]
+        memo = _global_cache
+        if memo is not None and not kws:
+            model = getattr(self, 'model', self)
+            generation = getattr(model, 'generation', None)
+            state = getattr(self, 'memo_state', None)
+            key = (id(self), name, generation, state) + tuple(id(a) for a in args)
+
+            entry = memo.data.get(key, None)
+            if entry is not None and all(a is b for a, b in zip(entry[0], args)):
+                memo.hits += 1
+                return entry[1]
+
+            memo.misses += 1
+            toret = f(self, *args)
+            memo.data[key] = (args, toret)
+            return toret
 
-        ret = f(self, *args, **kws)
-        return ret
+        return f(self, *args, **kws)
 
     return wrap
 
@@ -194,15 +458,13 @@ def alcock_paczynski(f, alpha_par=None, alpha_perp=None, alpha_drag=None):
             alpha_drag_ = alpha_drag if alpha_drag is not None else self.alpha_drag
 
             # the k,mu to evaluate P(k, mu)
-            k_obs = np.asarray(args[0]); mu_obs =  np.asarray(args[1])
-            k = k_AP(k_obs, mu_obs, alpha_perp_, alpha_par_)
-            mu = mu_AP(mu_obs, alpha_perp_, alpha_par_)
+            coords = ap_coordinates(args[0], args[1], alpha_perp_, alpha_par_, alpha_drag_)
 
             # evaluate at the AP (k,mu)
-            args[:2] = k, mu
+            args[:2] = coords.k, coords.mu
 
-            # evaluate with the AP lock
-            with APLock:
+            # evaluate with the AP lock, sharing the coordinates
+            with APLock, coords:
 
                 # get the power spectrum
                 pkmu = f(self, *args, **kwargs)
@@ -222,6 +484,95 @@ def alcock_paczynski(f, alpha_par=None, alpha_perp=None, alpha_drag=None):
     return wrap
 
 
+class PkmuSurface(object):
+    """
+    A 2D spline of the power spectrum without any AP distortion, as a
+    function of ``log(k)`` and ``mu``, on a grid of log-spaced `k` and
+    `mu` in ``[0, 1]``; see :func:`ap_interpolated`
+    """
+    def __init__(self, k, mu, pkmu):
+        """
+        Parameters
+        ----------
+        k : array_like
+            the 1D array of log-spaced wavenumbers of the grid
+        mu : array_like
+            the 1D array of `mu` values of the grid
+        pkmu : array_like
+            the power on the grid, with shape ``(len(k), len(mu))``
+        """
+        self.k = k
+        self.mu = mu
+        self.spline = interp.RectBivariateSpline(np.log(k), mu, pkmu)
+
+    def contains(self, k):
+        """
+        Whether all of the input wavenumbers are in the domain of the grid
+        """
+        return np.all((k >= self.k[0]) & (k <= self.k[-1]))
+
+    def __call__(self, k, mu):
+        # the power is even in mu
+        return self.spline.ev(np.log(k), np.abs(mu))
+
+def ap_interpolated(f):
+    """
+    Decorator to evaluate the AP-distorted power by interpolating the
+    2D surface of the un-distorted power, if the model has ``ap_interpolation``
+    enabled; see :attr:`DarkMatterSpectrum.ap_surface`
+
+    The decorated function should be the model's ``power``, returning the full
+    AP-distorted power; the surface is computed by calling it with the AP
+    distortion disabled. If the AP-distorted wavenumbers are outside the grid,
+    `f` is called directly.
+    """
+    @functools.wraps(f)
+    def wrap(self, k, mu, *args, **kwargs):
+
+        if APLock.locked() or not self._use_ap_surface():
+            return f(self, k, mu, *args, **kwargs)
+
+        coords = ap_coordinates(k, mu, self.alpha_perp, self.alpha_par, self.alpha_drag)
+        surface = self.ap_surface
+        if not surface.contains(coords.k):
+            return f(self, k, mu, *args, **kwargs)
+
+        pkmu = surface(coords.k, coords.mu) * coords.volume_factor
+        flatten = args[0] if len(args) else kwargs.get('flatten', False)
+        return pkmu if not flatten else np.ravel(pkmu, order='F')
+
+    return wrap
+
+def broadcast_kmu_arrays(k, mu):
+    """
+    Broadcast the input `k` and `mu` values against each other,
+    following the rules of :func:`broadcast_kmu`
+
+    If `k` and `mu` are 1D arrays of different lengths, the returned
+    arrays have shape ``(len(k), len(mu))``.
+    """
+    if isinstance(k, list): k = np.array(k)
+    if isinstance(mu, list): mu = np.array(mu)
+    if np.isscalar(k): k = np.array([k])
+    if np.isscalar(mu): mu = np.array([mu])
+
+    mu_dim = np.ndim(mu); k_dim = np.ndim(k)
+    if mu_dim == 1 and k_dim == 1:
+        if len(mu) != len(k):
+            k = k[:, np.newaxis]
+            mu = mu[np.newaxis, :]
+    else:
+        if k_dim > 1 and mu_dim < 2:
+            mu =  mu[np.newaxis, :]
+        elif mu_dim > 1 and k_dim < 2:
+            k = k[:, np.newaxis]
+
+    k, mu = np.broadcast_arrays(k, mu)
+    if k.ndim > 2 or mu.ndim > 2:
+        raise ValueError(("incompatible `k`, `mu` dimensions for broadcasted; "
+                          "arrays should have maximum dimension of 2"))
+    return k, mu
+
 def broadcast_kmu(f):
     """
     Decorator to properly handle broadcasting of k, mu.
@@ -238,28 +589,7 @@ def broadcast_kmu(f):
     @functools.wraps(f)
     def wrapper(self, *args, **kwargs):
         args = list(args)
-        k = args[0]
-        mu = args[1]
-        if isinstance(k, list): k = np.array(k)
-        if isinstance(mu, list): mu = np.array(mu)
-        if np.isscalar(k): k = np.array([k])
-        if np.isscalar(mu): mu = np.array([mu])
-
-        mu_dim = np.ndim(mu); k_dim = np.ndim(k)
-        if mu_dim == 1 and k_dim == 1:
-            if len(mu) != len(k):
-                k = k[:, np.newaxis]
-                mu = mu[np.newaxis, :]
-        else:
-            if k_dim > 1 and mu_dim < 2:
-                mu =  mu[np.newaxis, :]
-            elif mu_dim > 1 and k_dim < 2:
-                k = k[:, np.newaxis]
-
-        args[:2] = np.broadcast_arrays(k, mu)
-        if args[0].ndim > 2 or args[1].ndim > 2:
-            raise ValueError(("incompatible `k`, `mu` dimensions for broadcasted; "
-                              "arrays should have maximum dimension of 2"))
+        args[:2] = broadcast_kmu_arrays(args[0], args[1])
         P = np.squeeze(f(self, *args, **kwargs))
         return return_xarray(P, args[0], args[1], flatten=kwargs.get('flatten', False))
 
@@ -372,6 +702,20 @@ class RSDSpline(interp.InterpolatedUnivariateSpline):
         """
         return self._evaluate_spline(x_new)*1.
 
+    def scaled(self, factor):
+        """
+        Return a copy of the spline with the data values, and thus
+        the spline coefficients, multiplied by `factor`
+        """
+        toret = copy.copy(self)
+        data = list(self._data)
+        data[1] = data[1]*factor # the data values
+        data[9] = data[9]*factor # the spline coefficients
+        toret._data = tuple(data)
+        toret.y = self.y*factor
+        toret._reset_class()
+        return toret
+
     def _evaluate_spline(self, x_new):
         """
         Evaluate the spline
@@ -121,33 +121,45 @@ class TransferBase(Cache):
         """
         import xarray as xr
 
-        # get the data as a numpy array
-        if isinstance(val, xr.DataArray):
-            val = val.values
-
         # create a DataArray on the grid with null values
-        toret = np.ones(self.gridshape)*np.nan
         coords = {'k':self.grid.k_cen, 'mu':self.grid.mu_cen}
-        toret = xr.DataArray(toret, coords=coords, dims=['k', 'mu'])
+        return xr.DataArray(self.grid_values(val), coords=coords, dims=['k', 'mu'])
+
+    def grid_values(self, power):
+        """
+        Return the input power as a numpy array on the grid, with shape
+        (:attr:`Nk`, :attr`Nmu`) and NaNs for any null grid points
+
+        Parameters
+        ----------
+        power : array_like, None
+            the power values defined on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
+        """
+        # get the data as a numpy array
+        power = getattr(power, 'values', power)
 
-        if val is None:
+        toret = np.ones(self.gridshape)*np.nan
+        if power is None:
             return toret
 
         # the number of grid points that are not null
         valid = self.grid.notnull.sum()
 
         # if flat data, we are setting the valid data points
-        if np.ndim(val) == 1:
-            if len(val) == valid:
-                toret.values[self.grid.notnull] = val
+        if np.ndim(power) == 1:
+            if len(power) == valid:
+                toret[self.grid.notnull] = power
             else:
                 raise ValueError("if 1D array is passed for ``power``, must have length %d" %valid)
         else:
-            toret.values[self.grid.notnull] = val[self.grid.notnull]
+            toret[self.grid.notnull] = power[self.grid.notnull]
         return toret
 
 from .grid import GriddedWedgeTransfer, GriddedMultipoleTransfer
 from .poles import MultipoleTransfer
+from .wedges import WedgeTransfer
 from .window import WindowFunctionTransfer
 
 gridded_transfers = (GriddedWedgeTransfer, GriddedMultipoleTransfer)
@@ -2,7 +2,6 @@ from pyRSD import numpy as np
 from pyRSD.rsd._cache import parameter, cached_property
 from pyRSD.rsd.transfers import TransferBase
 
-import xarray as xr
 from scipy.special import legendre
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
 
@@ -188,10 +187,14 @@ class GriddedWedgeTransfer(TransferBase):
         with np.errstate(invalid='ignore', divide='ignore'):
             return self.sum(d*w) / self.sum(w)
 
-    def __call__(self, power):
+    def evaluate(self, power):
         """
-        Return the ``power`` attribute re-binned into the ``mu`` bins
-        corresponding to `mu_edges`, optionally flattening the return array
+        Return the input power re-binned into the ``mu`` bins corresponding
+        to `mu_edges`, as a numpy array of shape (``N1``, ``N2``), with NaNs
+        outside the valid ``k`` range
+
+        Unlike :func:`__call__`, this does not set the ``power`` attribute
+        or label the result, and is meant to be used when fitting.
 
         Parameters
         ----------
@@ -201,28 +204,49 @@ class GriddedWedgeTransfer(TransferBase):
             as the values at all valid grid points
         """
         # make sure power is the right size
-        self.power = power
+        power = self.grid_values(power)
 
         # all null?
-        if not np.sum(~self.power.isnull()):
+        if np.isnan(power).all():
             raise ValueError("please set ``power`` arrary; all NaN right now")
 
         # compute the wedges
-        wedges = self.average(self.power.values, self.grid.modes)
-
-        # convert to a DataArray
-        k_cen = self.grid.k_cen
-        mu_cen = self.mu_cen # wedge centers
-        toret = xr.DataArray(wedges, coords={'k':k_cen, 'mu':mu_cen}, dims=['k', 'mu'])
+        wedges = self.average(power, self.grid.modes)
 
         # make sure there are no null values in the valid k-range!
-        if toret.isnull().values[self.in_k_range].any():
+        if np.isnan(wedges[self.in_k_range]).any():
             raise ValueError("NaN values in GriddedWedgeTransfer result within valid k range!")
 
         # set out of range to null
-        toret.values[~self.in_k_range] = np.nan
+        wedges[~self.in_k_range] = np.nan
 
-        return toret
+        return wedges
+
+    def __call__(self, power):
+        """
+        Return the ``power`` attribute re-binned into the ``mu`` bins
+        corresponding to `mu_edges`, as a DataArray with ``k`` and
+        ``mu`` dimensions
+
+        Parameters
+        ----------
+        power : array_like
+            the power values defined on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
+        """
+        import xarray as xr
+
+        # make sure power is the right size
+        self.power = power
+
+        # compute the wedges
+        wedges = self.evaluate(self.power.values)
+
+        # convert to a DataArray
+        k_cen = self.grid.k_cen
+        mu_cen = self.mu_cen # wedge centers
+        return xr.DataArray(wedges, coords={'k':k_cen, 'mu':mu_cen}, dims=['k', 'mu'])
 
 
 class GriddedMultipoleTransfer(GriddedWedgeTransfer):
@@ -283,9 +307,14 @@ class GriddedMultipoleTransfer(GriddedWedgeTransfer):
         """
         return np.broadcast_arrays(self.k_cen[:,None], self.ells[None,:])
 
-    def __call__(self, power):
+    def evaluate(self, power):
         """
-        Return the Legendre-weighted mean power on the :math:`(k, \mu)` grid.
+        Return the Legendre-weighted mean power on the :math:`(k, \mu)` grid,
+        as a numpy array of shape (``N1``, ``N2``), with NaNs outside the
+        valid ``k`` range
+
+        Unlike :func:`__call__`, this does not set the ``power`` attribute
+        or label the result, and is meant to be used when fitting.
 
         Parameters
         ----------
@@ -295,25 +324,45 @@ class GriddedMultipoleTransfer(GriddedWedgeTransfer):
             as the values at all valid grid points
         """
         # make sure power is the right size
-        self.power = power
+        power = self.grid_values(power)
 
         # all null?
-        if not np.sum(~self.power.isnull()):
+        if np.isnan(power).all():
             raise ValueError("please set ``power`` arrary; all NaN right now")
 
         # compute the poles
-        tobin = self.legendre_weights*self.power.values
+        tobin = self.legendre_weights*power
         poles = np.asarray([np.squeeze(self.average(d, self.grid.modes)) for d in tobin]).T
 
-        # convert to a DataArray
-        coords = {'k':self.grid.k_cen, 'ell':self.ells}
-        toret = xr.DataArray(poles, coords=coords, dims=['k', 'ell'])
-
         # make sure there are no null values in the valid k-range!
-        if toret.isnull().values[self.in_k_range].any():
+        if np.isnan(poles[self.in_k_range]).any():
             raise ValueError("NaN values in GriddedMultipoleTransfer result within valid k range!")
 
         # set out of range to null
-        toret.values[~self.in_k_range] = np.nan
+        poles[~self.in_k_range] = np.nan
 
-        return toret
+        return poles
+
+    def __call__(self, power):
+        """
+        Return the Legendre-weighted mean power on the :math:`(k, \mu)` grid,
+        as a DataArray with ``k`` and ``ell`` dimensions.
+
+        Parameters
+        ----------
+        power : array_like
+            the power values defined on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
+        """
+        import xarray as xr
+
+        # make sure power is the right size
+        self.power = power
+
+        # compute the poles
+        poles = GriddedMultipoleTransfer.evaluate(self, self.power.values)
+
+        # convert to a DataArray
+        coords = {'k':self.grid.k_cen, 'ell':self.ells}
+        return xr.DataArray(poles, coords=coords, dims=['k', 'ell'])
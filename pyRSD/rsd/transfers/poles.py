@@ -1,7 +1,6 @@
 from pyRSD import pygcl, numpy as np
 from pyRSD.rsd.transfers import PkmuGrid, TransferBase
 
-import xarray as xr
 from scipy.special import legendre
 
 
@@ -35,6 +34,31 @@ class MultipoleTransfer(TransferBase):
         weights = np.ones_like(grid_k) # unity weights
         self.grid = PkmuGrid([k,mu], grid_k, grid_mu, weights)
 
+    def evaluate(self, power):
+        """
+        Return the multipoles as a numpy array of shape (``len(k)``, ``len(ells)``)
+
+        Unlike :func:`__call__`, this does not set the ``power`` attribute
+        or label the result, and is meant to be used when fitting.
+
+        Parameters
+        ----------
+        power : array_like
+            the :math:`P(k,\mu)` values on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
+        """
+        power = self.grid_values(power)
+        mu = self.grid.mu_cen
+
+        # compute each Pell
+        Pell = np.empty((self.grid.Nk, len(self.ells)))
+        for i, ell in enumerate(self.ells):
+            kern = (2*ell+1.)*legendre(ell)(mu)
+            Pell[:,i] = [pygcl.SimpsIntegrate(mu, kern*d) for d in power]
+
+        return Pell
+
     def __call__(self, power):
         """
         Parameters
@@ -49,21 +73,9 @@ class MultipoleTransfer(TransferBase):
             a DataArray holding the :math:`P_\ell(k)` on a coordinate grid
             with ``k`` and ``ell`` dimensions.
         """
-        self.power = power
-
-        # input coordinate grid
-        k = self.power['k']
-        mu = self.power['mu']
-
-        # return array
-        Nk = len(self.power)
-        shape = (len(k), len(self.ells))
-        Pell = xr.DataArray(np.empty(shape), coords=[('k', k), ('ell', self.ells)])
+        import xarray as xr
 
-        # compute each Pell
-        for ell in self.ells:
-            kern = (2*ell+1.)*legendre(ell)(mu)
-            val = np.array([pygcl.SimpsIntegrate(mu, kern*d) for d in self.power])
-            Pell.loc[dict(ell=ell)] = val
+        self.power = power
 
-        return Pell
+        Pell = self.evaluate(self.power.values)
+        return xr.DataArray(Pell, coords=[('k', self.grid.k_cen), ('ell', self.ells)])
@@ -1,7 +1,6 @@
 from pyRSD import pygcl, numpy as np
 from pyRSD.rsd._cache import parameter, cached_property
 from pyRSD.rsd.transfers import PkmuGrid, TransferBase
-import xarray as xr
 
 
 class WedgeTransfer(TransferBase):
@@ -62,25 +61,21 @@ class WedgeTransfer(TransferBase):
             raise ValueError("specified `mu` bounds are not monotonically increasing")
         return toret
 
-    def __call__(self, power):
+    def evaluate(self, power):
         """
+        Return the wedges as a numpy array of shape (``len(k)``, ``len(mu_bounds)``)
+
+        Unlike :func:`__call__`, this does not set the ``power`` attribute
+        or label the result, and is meant to be used when fitting.
+
         Parameters
         ----------
-        power : xarray.DataArray
-            a DataArray holding the :math:`P(k,\mu)` values on a
-            coordinate grid with ``k`` and ``mu`` dimensions
-
-        Returns
-        -------
-        Pell : xarray.DataArray
-            a DataArray holding the :math:`P_\ell(k)` on a coordinate grid
-            with ``k`` and ``ell`` dimensions.
+        power : array_like
+            the :math:`P(k,\mu)` values on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
         """
-        self.power = power
-
-        # input coordinate grid
-        k = self.power['k']
-        mu = self.power['mu']
+        P = self.grid_values(power)
 
         # the bin shape
         Nk = self.grid.Nk; Nmu = len(self.mu_edges)-1
@@ -95,7 +90,6 @@ class WedgeTransfer(TransferBase):
         # sum up power
         toret = np.zeros(binshape)
         minlength = np.prod(binshape)
-        P = self.power.values
         toret.flat = np.bincount(indices, weights=P[self.grid.notnull], minlength=minlength)
         toret = toret.reshape(binshape)[1:-1, 1:-1][..., ::2]
 
@@ -105,12 +99,25 @@ class WedgeTransfer(TransferBase):
         N = N.reshape(binshape)[1:-1, 1:-1][..., ::2]
 
         # normalize properly
-        toret /= N
+        return toret / N
+
+    def __call__(self, power):
+        """
+        Parameters
+        ----------
+        power : xarray.DataArray
+            a DataArray holding the :math:`P(k,\mu)` values on a
+            coordinate grid with ``k`` and ``mu`` dimensions
+
+        Returns
+        -------
+        Pwedge : xarray.DataArray
+            a DataArray holding the :math:`P(k,\mu)` wedges on a coordinate
+            grid with ``k`` and ``mu`` dimensions.
+        """
+        import xarray as xr
 
-        # return array
-        shape = (len(k), len(self.mu_cen))
-        Pwedge = xr.DataArray(np.empty(shape), coords=[('k', k), ('mu', self.mu_cen)])
-        for i in range(Pwedge.shape[1]):
-            Pwedge[:,i] = toret[:,i]
+        self.power = power
 
-        return Pwedge
+        Pwedge = self.evaluate(self.power.values)
+        return xr.DataArray(Pwedge, coords=[('k', self.grid.k_cen), ('mu', self.mu_cen)])
@@ -1,10 +1,10 @@
 from pyRSD.rsd.transfers import PkmuGrid
 from pyRSD.rsd.transfers.grid import GriddedMultipoleTransfer
+from pyRSD.rsd._cache import cached_property
 from pyRSD.rsd.window import WindowConvolution
 from pyRSD import pygcl, numpy as np
 
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
-import xarray as xr
 
 class WindowFunctionTransfer(GriddedMultipoleTransfer):
     """
@@ -48,26 +48,38 @@ class WindowFunctionTransfer(GriddedMultipoleTransfer):
                                             max_ellprime=max_ellprime,
                                             max_ell=max(ells))
 
-    def __call__(self, power, k_out=None, extrap=False, mcfit_kwargs={}, **kws):
+    @cached_property()
+    def padded_k(self):
         """
-        Evaluate the convolved multipoles.
+        The ``k`` values of the grid, with additional log-spaced values up
+        to k = 100 h/Mpc for zero-padding the multipoles before the FFTs;
+        the convolved multipoles are returned at these ``k`` values
+        """
+        oldk = self.grid.k_cen
+        dk = np.diff(np.log10(oldk))[0]
+        newk = 10**(np.arange(np.log10(oldk.max()) + dk, 2 + 0.5*dk, dk))
+        return np.concatenate([oldk, newk])
+
+    def evaluate(self, power, k_out=None, extrap=False, mcfit_kwargs={}, **kws):
+        """
+        Evaluate the convolved multipoles, as a numpy array of shape
+        (``len(k_out)``, ``N2``), or (``len(padded_k)``, ``N2``) if
+        `k_out` is not provided
+
+        Unlike :func:`__call__`, this does not set the ``power`` attribute
+        or label the result, and is meant to be used when fitting.
 
         Parameters
         ----------
-        power : xarray.DataArray
-            a DataArray holding the :math:`P(k,\mu)` values on a
-            coordinate grid with ``k`` and ``mu`` dimensions.
+        power : array_like
+            the power values defined on the grid -- can have shape
+            (Nk,Nmu) or (N,), in which case it is interpreted
+            as the values at all valid grid points
         k_out : array_like, optional
             if provided, evaluate the convolved multipoles at these
             ``k`` values using a spline
         **kws :
             additional keywords for testing purposes
-
-        Returns
-        -------
-        Pell : xarray.DataArray
-            a DataArray holding the convolved :math:`P_\ell(k)` on a
-            coordinate grid with ``k`` and ``ell`` dimensions.
         """
         from pyRSD.extern import mcfit
 
@@ -76,18 +88,13 @@ class WindowFunctionTransfer(GriddedMultipoleTransfer):
         no_convolution = kws.get('no_convolution', False)
 
         # get the unconvovled theory multipoles
-        Pell0 = GriddedMultipoleTransfer.__call__(self, power)
+        Pell0 = GriddedMultipoleTransfer.evaluate(self, power)
 
-        # create additional logspaced k values for zero-padding up to k=100 h/Mpc
-        oldk = Pell0['k'].values
-        dk = np.diff(np.log10(oldk))[0]
-        newk = 10**(np.arange(np.log10(oldk.max()) + dk, 2 + 0.5*dk, dk))
-        newk = np.concatenate([oldk, newk])
-
-        # now copy over with zeros
+        # now copy over with zeros for the zero-padding
+        newk = self.padded_k
         Nk = len(newk); Nell = Pell0.shape[1]
-        Pell = xr.DataArray(np.zeros((Nk,Nell)), coords={'k':newk, 'ell':Pell0.ell}, dims=['k', 'ell'])
-        Pell.loc[dict(k=Pell0['k'])] = Pell0[:]
+        Pell = np.zeros((Nk,Nell))
+        Pell[:len(Pell0)] = Pell0
 
         # do the convolution
         if not no_convolution:
@@ -96,7 +103,7 @@ class WindowFunctionTransfer(GriddedMultipoleTransfer):
             xi = np.empty((Nk, Nell), order='F') # column-continuous
             for i, ell in enumerate(self.ells):
                 P2xi = mcfit.P2xi(newk, l=ell, **mcfit_kwargs)
-                rr, xi[:,i] = P2xi(Pell.sel(ell=ell).values, extrap=extrap)
+                rr, xi[:,i] = P2xi(Pell[:,i], extrap=extrap)
 
 
             # the linear combination of multipoles
@@ -115,7 +122,6 @@ class WindowFunctionTransfer(GriddedMultipoleTransfer):
             Pell_conv = Pell
 
         # interpolate to k_out
-        coords = coords={'ell':Pell0.ell}
         if k_out is not None:
 
             shape = (len(k_out), len(self.ells))
@@ -124,9 +130,39 @@ class WindowFunctionTransfer(GriddedMultipoleTransfer):
                 idx = np.isfinite(newk)
                 spl = spline(newk[idx], Pell_conv[idx,i])
                 toret[:,i] = spl(k_out)
-            coords['k'] = k_out
-        else:
-            toret = Pell_conv
-            coords['k'] = newk
+            return toret
+
+        return Pell_conv
+
+    def __call__(self, power, k_out=None, extrap=False, mcfit_kwargs={}, **kws):
+        """
+        Evaluate the convolved multipoles.
+
+        Parameters
+        ----------
+        power : xarray.DataArray
+            a DataArray holding the :math:`P(k,\mu)` values on a
+            coordinate grid with ``k`` and ``mu`` dimensions.
+        k_out : array_like, optional
+            if provided, evaluate the convolved multipoles at these
+            ``k`` values using a spline
+        **kws :
+            additional keywords for testing purposes
+
+        Returns
+        -------
+        Pell : xarray.DataArray
+            a DataArray holding the convolved :math:`P_\ell(k)` on a
+            coordinate grid with ``k`` and ``ell`` dimensions.
+        """
+        import xarray as xr
+
+        # make sure power is the right size
+        self.power = power
+
+        toret = self.evaluate(self.power.values, k_out=k_out, extrap=extrap,
+                                mcfit_kwargs=mcfit_kwargs, **kws)
 
+        coords = {'ell':self.ells}
+        coords['k'] = k_out if k_out is not None else self.padded_k
         return xr.DataArray(toret, coords=coords, dims=['k', 'ell'])
@@ -1,5 +1,5 @@
 params_filename = 'params.dat'
-model_filename = 'model.npy'
+model_filename = 'model.npz'
 
 class GlobalFittingDriver(object):
     """
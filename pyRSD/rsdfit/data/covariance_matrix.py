@@ -3,7 +3,6 @@ from pyRSD.rsd._cache import Cache, cached_property, parameter
 import itertools
 from collections import OrderedDict
 from six import string_types
-import xarray as xr
 from . import indexing, tools
 
 def is_array_like(d, shape):
@@ -1313,6 +1312,7 @@ class PoleCovarianceMatrix(CovarianceMatrix):
         >>> C = PoleCovarianceMatrix.cutsky_gaussian_covariance(model, k, ells, nbar, fsky, zmin, zmax)
         """
         from scipy.special import legendre
+        import xarray as xr
 
         if not callable(nbar):
             raise ValueError("``nbar`` must be a callable function returning n(z)")
@@ -1,6 +1,4 @@
-import pyRSD.extern.xarray as xr
 import numpy as np
-import pandas as pd
 from six import string_types
 
 def slice_data(data, indexers, indexes, return_indices=False):
@@ -68,6 +66,8 @@ def remap_label_indexers(indexes, indexers):
     """
     Map the specified index values from label-based to integer-based
     """
+    from pyRSD.extern.xarray.indexing import convert_label_indexer
+
     toret = {}
     for i, index in enumerate(indexes):
 
@@ -90,7 +90,7 @@ def remap_label_indexers(indexes, indexers):
                 label = indexers[dim]
                 if not isinstance(label, slice):
                     _, label = index.get_nearest(dim, label)
-                toret[dim] = xr.indexing.convert_label_indexer(index.to_pandas(dim), label, dim, None)
+                toret[dim] = convert_label_indexer(index.to_pandas(dim), label, dim, None)
 
     return toret
 
@@ -169,6 +169,8 @@ class GridIndex(object):
         If `ndim` is greater than one, return a `pandas.MultiIndex` for all
         dimensions of the index
         """
+        import pandas as pd
+
         if unique:
             return self.to_pandas(key=key, unique=False).unique()
 
@@ -199,6 +201,7 @@ class GridIndex(object):
         nearest : float
             the nearest element value
         """
+        import pandas as pd
         index = pd.Index(self.to_pandas(dim).unique())
 
         # the value should be a list
@@ -1,6 +1,6 @@
 from .. import numpy as np, os
 from . import MPILoggerAdapter, logging
-from . import params_filename, model_filename
+from . import params_filename
 
 from .parameters import ParameterSet, Parameter
 from .theory import GalaxyPowerTheory, QuasarPowerTheory
@@ -190,6 +190,15 @@ class FittingDriverSchema(Cache):
         if val is None: return {}
         return val
 
+    @parameter(default=None)
+    def emulator(self, val):
+        """
+        The name of a ``npz`` file holding a trained
+        :class:`~pyRSD.rsdfit.theory.emulator.PkmuEmulator` to evaluate
+        the theory with, instead of the model; default is None
+        """
+        return val
+
 class FittingDriver(FittingDriverSchema):
     """
     A driver to run the parameter fitting pipeline, merging 
@@ -240,6 +249,8 @@ class FittingDriver(FittingDriverSchema):
             self.theory = GalaxyPowerTheory(param_file, **kwargs)
         else:
             self.theory = QuasarPowerTheory(param_file, **kwargs)
+        if self.emulator is not None:
+            self.theory.emulator = self.emulator
 
         # log the DOF
         args = (self.Nb, self.Np, self.dof)
@@ -251,6 +262,9 @@ class FittingDriver(FittingDriverSchema):
         # results are None for now
         self.results = None
 
+        # no surrogate of the theory; see TaylorSurrogate
+        self.surrogate = None
+
         # check theory decorator keys
         for k in self.theory_decorator:
             if k not in self.data.statistics:
@@ -271,7 +285,7 @@ class FittingDriver(FittingDriverSchema):
         """
         Load a :class:`FittingDriver` from a results directory
 
-        This reads ``params.dat`` file, optionally loading a pickled model and
+        This reads ``params.dat`` file, optionally loading a saved model and
         a results object from file
 
         Parameters
@@ -281,7 +295,9 @@ class FittingDriver(FittingDriverSchema):
         results_file : str, optional
             the name of the file holding the results. Default is ``None``
         model_file : str, optional
-            the name of the file holding the model to load. Default is ``None``
+            the name of the file holding the model to load. Default is ``None``,
+            in which case the ``model.npz`` snapshot (or the pickled
+            ``model.npy``) in `dirname` is loaded, if it exists
         init_model : bool, optional
             whether to initialize the RSD model upon loading. If a model
             file exists in the specified directory, the model is loaded and
@@ -300,7 +316,8 @@ class FittingDriver(FittingDriverSchema):
             if not existing_model:
                 raise rsd_io.ConfigurationError('provided model file `%s` does not exist' %model_path)
         else:
-            model_path = os.path.join(dirname, model_filename)
+            model_path = rsd_io.find_model_file(dirname)
+            existing_model = model_path is not None
         if not os.path.exists(params_path):
             raise rsd_io.ConfigurationError('parameter file `%s` must exist to load driver' %params_path)
 
@@ -824,7 +841,8 @@ class FittingDriver(FittingDriverSchema):
         """
         Set the theory free parameters, update the model, and return the log of the posterior probability function
 
-        This returns -0.5 :func:`chi2` + :func:`lnprior`
+        This returns -0.5 :func:`chi2` + :func:`lnprior`, where the
+        theory is evaluated with :attr:`surrogate`, if it is set
 
         Parameters
         ----------
@@ -850,7 +868,10 @@ class FittingDriver(FittingDriverSchema):
         # only compute lnlike if we have finite prior
         else:
             try:
-                lnlike = self.lnlike()
+                if self.surrogate is not None:
+                    lnlike = self.surrogate.lnlike(self.theory.free_values)
+                else:
+                    lnlike = self.lnlike()
                 if np.isnan(lnlike):
                     raise ValueError("log-likelihood calculation resulted in NaN")
             except:
@@ -5,7 +5,6 @@ from pyRSD.rsdfit.util import rsd_io, rsdfit_parser
 from pyRSD.rsdfit.util import rsd_logging, mpi_manager
 
 from mpi4py import MPI
-from emcee.utils import MPIPool
 
 def find_init_result(val):
     """
@@ -130,7 +129,7 @@ class RSDFitDriver(object):
                 else:
                     if self.comm.rank == 0 and not self.no_save_model:
                         model_dir = driver.params.get('model_dir', self.folder)
-                        driver.theory.model.to_npy(os.path.join(model_dir, model_filename))
+                        driver.theory.model.to_npz(os.path.join(model_dir, model_filename))
 
             # only one rank needs to write out
             if self.comm.rank == 0:
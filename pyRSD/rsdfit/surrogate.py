@@ -0,0 +1,144 @@
+"""
+A second-order Taylor expansion of the theory around a fiducial point,
+for fast likelihood evaluations near the peak of the posterior
+"""
+from .. import numpy as np
+from . import MPILoggerAdapter, logging
+
+logger = MPILoggerAdapter(logging.getLogger('rsdfit.surrogate'))
+
+class TaylorSurrogate(object):
+    """
+    The theory prediction of a :class:`~pyRSD.rsdfit.FittingDriver`,
+    expanded to second order in the free parameters around `theta0`
+
+    The first derivatives are those of :func:`FittingDriver.grad_model_callable`,
+    and the second derivatives are central differences of the first
+    derivatives, with step sizes set by the Fisher errors at `theta0`.
+
+    The expansion is only trusted within a distance `trust_radius` of
+    `theta0`, measured in units of the Fisher errors, i.e.,
+    ``sqrt(dtheta^T F dtheta)``; outside of it, the exact theory is
+    evaluated instead. The number of calls and fallbacks are stored in
+    :attr:`ncalls` and :attr:`nfallback`.
+
+    Set :attr:`FittingDriver.surrogate` to use the surrogate in
+    :func:`FittingDriver.lnprob`.
+    """
+    def __init__(self, driver, theta0=None, trust_radius=3., step=0.1,
+                    epsilon=1e-4, pool=None, numerical=False):
+        """
+        Parameters
+        ----------
+        driver : FittingDriver
+            the driver holding the theory and data
+        theta0 : array_like, optional
+            the fiducial point to expand around; default is the current
+            values of the free parameters
+        trust_radius : float, optional
+            the distance from `theta0` in units of the Fisher errors beyond
+            which the exact theory is evaluated
+        step : float, optional
+            the step size of the second derivatives, in units of
+            the (conditional) Fisher error of each parameter
+        epsilon : float, array_like, optional
+            the step size for any numerical first derivatives; see
+            :func:`FittingDriver.grad_minus_lnlike`
+        pool : MPIPool, optional
+            a pool to distribute the calculation of the derivatives of
+            P(k,mu) with respect to each parameter
+        numerical : bool, optional
+            if `True`, evaluate all first derivatives numerically
+        """
+        self.driver = driver
+        self.trust_radius = trust_radius
+        self.ncalls = 0
+        self.nfallback = 0
+
+        theory = driver.theory
+        original = theory.free_values
+        if theta0 is None:
+            theta0 = original
+        self.theta0 = np.array(theta0, dtype='f8')
+
+        kws = {'pool':pool, 'epsilon':epsilon, 'numerical':numerical}
+        def gradient(theta):
+            if not theory.set_free_parameters(theta):
+                raise ValueError("the parameter vector is not valid (out of bounds): %s" %str(theta))
+            return driver.grad_model_callable(theta=theta, **kws)
+
+        try:
+            # the model and its first derivatives
+            self.jacobian = gradient(self.theta0)
+            self.model0 = driver.model_callable()
+
+            # the Fisher matrix
+            Cinv = driver.data.covariance_matrix.inverse
+            self.fisher = np.dot(self.jacobian, np.dot(Cinv, self.jacobian.T))
+            for i, par in enumerate(theory.free):
+                if par.has_prior and par.prior.name == 'normal':
+                    self.fisher[i,i] += par.prior.scale**(-2)
+
+            # the second derivatives, with shape (Np, Np, Nb)
+            diag = np.diag(self.fisher)
+            h = np.where(diag > 0, step / np.sqrt(np.where(diag > 0, diag, 1.)), epsilon)
+            self.hessian = np.empty(self.jacobian.shape[:1] + self.jacobian.shape)
+            for j, hj in enumerate(h):
+                dtheta = np.zeros_like(self.theta0); dtheta[j] = hj
+                self.hessian[:,j] = (gradient(self.theta0 + dtheta) - gradient(self.theta0 - dtheta)) / (2*hj)
+            self.hessian = 0.5*(self.hessian + self.hessian.transpose(1, 0, 2))
+        finally:
+            theory.set_free_parameters(original)
+
+        args = (len(self.theta0), 2*len(self.theta0)+1)
+        logger.info("Taylor surrogate of the theory in %d parameters computed from %d gradient calls" %args, on=0)
+
+    def distance(self, theta):
+        """
+        The distance of `theta` from :attr:`theta0`, in units of the Fisher errors
+        """
+        dtheta = np.asarray(theta) - self.theta0
+        return np.sqrt(np.dot(dtheta, np.dot(self.fisher, dtheta)))
+
+    def expansion(self, theta):
+        """
+        The second-order expansion of the theory at `theta`
+        """
+        dtheta = np.asarray(theta) - self.theta0
+        toret = self.model0 + np.dot(dtheta, self.jacobian)
+        toret += 0.5*np.einsum('i,ijn,j->n', dtheta, self.hessian, dtheta)
+        return toret
+
+    def __call__(self, theta):
+        """
+        The theory at `theta`, from the expansion if `theta` is within the
+        trust radius, and otherwise from the exact theory of the driver
+        evaluated at the current values of the free parameters, which
+        should equal `theta`
+        """
+        self.ncalls += 1
+        if self.distance(theta) <= self.trust_radius:
+            return self.expansion(theta)
+
+        self.nfallback += 1
+        return self.driver.model_callable()
+
+    @property
+    def fallback_fraction(self):
+        """
+        The fraction of calls that fell back to the exact theory
+        """
+        return self.nfallback / float(self.ncalls) if self.ncalls else 0.
+
+    def reset_counts(self):
+        """
+        Reset the number of calls and fallbacks
+        """
+        self.ncalls = self.nfallback = 0
+
+    def lnlike(self, theta):
+        """
+        The log of the likelihood at `theta`, using :func:`__call__`
+        """
+        diff = self(theta) - self.driver.data.combined_power
+        return -0.5*np.dot(diff, np.dot(self.driver.data.covariance_matrix.inverse, diff))
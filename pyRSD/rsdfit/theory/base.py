@@ -5,7 +5,6 @@ from pyRSD.rsdfit.theory import decorators
 
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
 import numpy as np
-import xarray as xr
 from six import string_types
 import contextlib
 import functools
@@ -606,6 +605,31 @@ class BasePowerTheory(object):
             self._pkmu_gradient = self.model.get_gradient(self.fit_params)
             return self._pkmu_gradient
 
+    @property
+    def emulator(self):
+        """
+        A :class:`~pyRSD.rsdfit.theory.emulator.PkmuEmulator` that replaces
+        the model when evaluating the theory callables, or `None`
+        """
+        return getattr(self, '_emulator', None)
+
+    @emulator.setter
+    def emulator(self, value):
+        """
+        Set the emulator, possibly from a ``npz`` file
+        """
+        from .emulator import PkmuEmulator
+
+        if isinstance(value, string_types):
+            value = PkmuEmulator.from_npz(value)
+        if value is not None:
+            if not isinstance(value, PkmuEmulator):
+                raise TypeError("the emulator should be a PkmuEmulator or the name of a file")
+            if list(value.free_names) != list(self.free_names):
+                args = (str(value.free_names), str(self.free_names))
+                raise ValueError("emulator was trained for free parameters %s, not %s" %args)
+        self._emulator = value
+
     #---------------------------------------------------------------------------
     # main functions
     #---------------------------------------------------------------------------
@@ -635,24 +659,29 @@ class BasePowerTheory(object):
         # the flattened (k,mu) pairs for evaluating the model
         # NOTE: this allows us to evaluate the model only ONCE
         k, mu, slices = self.get_kmu_pairs(transfers)
+        emulator = self._check_emulator(k, mu, model_params)
+        compiled = CompiledTransfers(data, transfers, stat_ids, slices, theory_decorator)
 
         def evaluate(theta, pool=None, epsilon=1e-4, numerical=False):
 
-            # update model parameters first?
-            if model_params is not None:
-                self.model.update(**model_params)
+            # use the emulator instead?
+            if emulator is not None:
+                gradient = emulator.gradient(theta)
+            else:
+                # update model parameters first?
+                if model_params is not None:
+                    self.model.update(**model_params)
 
-            # evaluate the P(k,mu) gradient
-            gradient = self.pkmu_gradient(k, mu, theta, 
-                                          pool=pool, 
-                                          epsilon=epsilon, 
-                                          numerical=numerical)
+                # evaluate the P(k,mu) gradient
+                gradient = self.pkmu_gradient(k, mu, theta, 
+                                              pool=pool, 
+                                              epsilon=epsilon, 
+                                              numerical=numerical)
 
             # apply to transfer for gradient of each parameter
             grad_lnlike = []
             for i in range(self.ndim):
-                grad_lnlike.append(apply_transfers(gradient[i], data, transfers, 
-                                                    stat_ids, slices, theory_decorator))
+                grad_lnlike.append(compiled(gradient[i]))
 
             return np.asarray(grad_lnlike)
 
@@ -685,9 +714,16 @@ class BasePowerTheory(object):
         # the flattened (k,mu) pairs for evaluating the model
         # NOTE: this allows us to evaluate the model only ONCE
         k, mu, slices = self.get_kmu_pairs(transfers)
+        emulator = self._check_emulator(k, mu, model_params)
+        compiled = CompiledTransfers(data, transfers, stat_ids, slices, theory_decorator)
 
         def evaluate():
 
+            # use the emulator instead?
+            if emulator is not None:
+                P = emulator(self.free_values)
+                return compiled(P)
+
             # update model parameters first?
             if model_params is not None:
                 self.model.update(**model_params)
@@ -696,10 +732,22 @@ class BasePowerTheory(object):
             P = self.model.power(k,mu)
 
             # apply the transfers to the power
-            return apply_transfers(P, data, transfers, stat_ids, slices, theory_decorator)
+            return compiled(P)
 
         return evaluate
 
+    def _check_emulator(self, k, mu, model_params):
+        """
+        Return the emulator, if any, checking that it can be used to
+        evaluate the theory at the input (k,mu) pairs
+        """
+        if self.emulator is None:
+            return None
+        if model_params is not None:
+            raise NotImplementedError("the emulator cannot be used with statistic-specific model parameters")
+        self.emulator.check_nodes(k, mu)
+        return self.emulator
+
     def get_kmu_pairs(self, transfers):
         """
         Compute the flattened ``k`` and ``mu`` values needed to evaluate the
@@ -724,6 +772,9 @@ def apply_transfers(P, data, transfers, stat_ids, slices, theory_decorator):
     """
     Apply one (or more) transfer functions to the input P(k,mu) values.
 
+    This labels the transfer results with :mod:`xarray`; see
+    :class:`CompiledTransfers` for the equivalent used when fitting.
+
     Parameters
     ----------
     P : xarray.DataArray
@@ -751,6 +802,7 @@ def apply_transfers(P, data, transfers, stat_ids, slices, theory_decorator):
 
     # concatenate results into a single array if we had multiple transfers
     if len(results) > 1:
+        import xarray as xr
         result = xr.concat(results, dim=results[0].dims[-1])
     else:
         result = results[0]
@@ -797,10 +849,132 @@ def apply_transfers(P, data, transfers, stat_ids, slices, theory_decorator):
 
         # final theory should be an array
         if not isinstance(theory, np.ndarray):
-            msg = "error computing theory prediction for '%s'; " %stat
+            msg = "error computing theory prediction for '%s'; " %stat_name
             msg += "maybe a theory decorator issue?"
             raise RuntimeError(msg)
 
         toret.append(theory)
 
     return np.concatenate(toret)
+
+class CompiledTransfers(object):
+    """
+    Apply one (or more) transfer functions to the input P(k,mu) values,
+    using plain numpy arrays
+
+    This gives the same result as :func:`apply_transfers`, but the selection
+    of each statistic from the transfer results, i.e., the column and the
+    valid ``k`` values, is resolved into integer index arrays once, when
+    initialized, rather than labelling and selecting the results with
+    :mod:`xarray` for every evaluation of the theory.
+
+    Parameters
+    ----------
+    data : PowerData
+        the data object
+    transfers : list
+        the list of transfer objects to apply
+    stat_ids : dict
+        dictionary with keys of the relevant statistics and values are
+        identifers, e.g., ell or center mu values
+    slices : list
+        the list of slices to slice the power result
+    theory_decorator : dict
+        decorator to run after the transfer function is applied
+    """
+    def __init__(self, data, transfers, stat_ids, slices, theory_decorator={}):
+
+        self.transfers = transfers
+        self.slices = slices
+
+        # the selection of each statistic, as a list of (transfer index,
+        # column, rows) for each bin value, and the decorator
+        self.selections = []
+        for stat_name in stat_ids:
+
+            # this is either ell or mu bounds for this statistic
+            binval = stat_ids[stat_name]
+            m = data.measurements[data.statistics.index(stat_name)]
+
+            # make into a list if not
+            # NOTE: this allows us to support multiple bin values per statistic
+            if not isinstance(binval, list):
+                binval = [binval]
+
+            indices = [self._resolve(data.mode, bb, m) for bb in binval]
+
+            # any theory decorators for this statistic
+            dec = theory_decorator.get(stat_name, None)
+            if dec is not None:
+                dec = getattr(decorators, dec)
+            elif len(indices) != 1:
+                raise ValueError("multiple bin values for '%s' require a theory decorator" %stat_name)
+
+            self.selections.append((stat_name, indices, dec))
+
+    def _resolve(self, mode, binval, measurement):
+        """
+        Return the index of the transfer, the column, and the rows (or the
+        ``k`` values to interpolate to) that select the bin value `binval`
+        """
+        # the labels of the second dimension of the transfer results
+        if mode == 'poles':
+            labels = lambda t: t.ells
+        else:
+            labels = lambda t: t.mu_cen
+            if np.ndim(binval) == 1: # the mu bounds
+                binval = 0.5*(binval[0] + binval[1])
+
+        for i, t in enumerate(self.transfers):
+            match = np.nonzero(np.isclose(labels(t), binval))[0]
+            if not len(match): continue
+            col = match[0]
+
+            # interpolate the window function results to the measured k
+            if isinstance(t, WindowFunctionTransfer):
+                rows = np.asarray(measurement.k)
+            # remove out of range values from Gridded Transfer results
+            elif isinstance(t, gridded_transfers):
+                rows = np.nonzero(t.in_k_range[:,col])[0]
+            # result already has the proper k binning
+            else:
+                rows = slice(None)
+            return i, col, rows
+
+        dim = 'ell' if mode == 'poles' else 'mu'
+        raise ValueError("no transfer function result for %s = %s" %(dim, str(binval)))
+
+    def __call__(self, P):
+        """
+        Return the flattened theory prediction from the P(k,mu) values `P`
+        """
+        P = getattr(P, 'values', P)
+
+        # apply the transfer function to the correct slice of P(k,mu)
+        results = [t.evaluate(P[s]) for t, s in zip(self.transfers, self.slices)]
+
+        # format the results
+        toret = []
+        for stat_name, indices, dec in self.selections:
+
+            theory = []
+            for i, col, rows in indices:
+                t = self.transfers[i]
+                if isinstance(t, WindowFunctionTransfer):
+                    spl = spline(t.padded_k, results[i][:,col])
+                    theory.append(spl(rows))
+                else:
+                    theory.append(results[i][rows, col])
+
+            # apply any theory decorators for this statistic
+            theory = dec(*theory) if dec is not None else theory[0]
+
+            # final theory should be an array
+            if not isinstance(theory, np.ndarray):
+                msg = "error computing theory prediction for '%s'; " %stat_name
+                msg += "maybe a theory decorator issue?"
+                raise RuntimeError(msg)
+
+            toret.append(theory)
+
+        return np.concatenate(toret)
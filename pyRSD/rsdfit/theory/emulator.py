@@ -0,0 +1,301 @@
+"""
+A trained emulator of the theory P(k,mu), for fast likelihood evaluations
+
+The emulator is trained on model evaluations at parameter vectors sampled
+from the priors of the free parameters, at the fixed (k,mu) nodes needed
+by the data. The log of the power is compressed with a principal component
+analysis (PCA), and each PCA coefficient is interpolated as a function of
+the free parameters with a Gaussian process regression.
+
+Only ``numpy`` is needed to evaluate a trained emulator; training also
+requires ``scikit-learn``.
+"""
+import numpy as np
+import logging
+
+logger = logging.getLogger('rsdfit.emulator')
+logger.addHandler(logging.NullHandler())
+
+def latin_hypercube(N, ndim, rng=None):
+    """
+    Return `N` points in the ``ndim``-dimensional unit cube, sampled
+    with a Latin hypercube design
+    """
+    if rng is None: rng = np.random
+    toret = np.empty((N, ndim))
+    for i in range(ndim):
+        toret[:,i] = (rng.permutation(N) + rng.uniform(size=N)) / N
+    return toret
+
+def prior_limits(fit_params, names, nsigma=3.):
+    """
+    Return the lower and upper limits of the free parameters `names` in
+    `fit_params` to sample when training the emulator
+
+    These are the limits of uniform priors and the `nsigma` limits
+    of normal priors, restricted to the bounds of each parameter.
+    """
+    lower = []; upper = []
+    for name in names:
+        par = fit_params[name]
+        lo, hi = -np.inf, np.inf
+        if par.has_prior:
+            lo, hi = par.prior.limits(factor=nsigma/3.)
+        if par.min is not None: lo = max(lo, par.min)
+        if par.max is not None: hi = min(hi, par.max)
+        if not np.isfinite(lo) or not np.isfinite(hi):
+            raise ValueError("cannot sample '%s' to train the emulator; please specify a prior or bounds" %name)
+        lower.append(lo); upper.append(hi)
+
+    return np.array(lower), np.array(upper)
+
+class PkmuEmulator(object):
+    """
+    An emulator of the theory P(k,mu) at a fixed set of (k,mu) nodes,
+    as a function of the free parameters of the theory
+
+    Use :func:`train` or :func:`from_driver` to train a new emulator
+    and :func:`from_npz` to load one from disk.
+    """
+    def __call__(self, theta):
+        """
+        The emulated P(k,mu) at the nodes, for the free parameters `theta`
+
+        Parameters
+        ----------
+        theta : array_like
+            the values of the free parameters, with shape ``(ndim,)``
+            or ``(N, ndim)``
+
+        Returns
+        -------
+        pkmu : array_like
+            the power, with shape ``(Nkmu,)`` or ``(N, Nkmu)``
+        """
+        theta = np.asarray(theta, dtype='f8')
+        if theta.ndim == 2:
+            return np.array([self(th) for th in theta])
+
+        y = self._predict(theta)[0]
+        return np.exp(y) if self.log else y
+
+    def gradient(self, theta):
+        """
+        The derivatives of the emulated P(k,mu) with respect to each of the
+        free parameters `theta`, with shape ``(ndim, Nkmu)``
+        """
+        theta = np.asarray(theta, dtype='f8')
+        y, dy = self._predict(theta, gradient=True)
+        if self.log: dy = dy * np.exp(y)
+        return dy
+
+    def _predict(self, theta, gradient=False):
+        """
+        Evaluate the Gaussian processes and invert the compression at
+        `theta`, optionally returning the derivatives too
+        """
+        x = (theta - self.lower) / (self.upper - self.lower)
+
+        # d has shape (Ncomp, Ntrain, ndim)
+        d = (x - self.x_train[None]) / self.length_scale[:,None,:]
+        K = self.amplitude[:,None] * np.exp(-0.5*(d**2).sum(axis=-1))
+        z = (K*self.dual_coef).sum(axis=-1)
+
+        # invert the PCA and the standardization
+        y = (z*self.coeff_std).dot(self.components) + self.pca_mean
+        y = y*self.scale + self.mean
+        if not gradient:
+            return y, None
+
+        # the derivative of the kernel with respect to the unit-cube parameters
+        dK = -K[...,None] * d / self.length_scale[:,None,:]
+        dz = np.einsum('cni,cn->ic', dK, self.dual_coef) / (self.upper - self.lower)[:,None]
+        dy = (dz*self.coeff_std).dot(self.components) * self.scale
+        return y, dy
+
+    #---------------------------------------------------------------------------
+    # training
+    #---------------------------------------------------------------------------
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """
+        Train an emulator for the theory of a :class:`~pyRSD.rsdfit.FittingDriver`,
+        on the (k,mu) nodes needed for all of the data statistics
+
+        Keywords are passed to :func:`train`.
+        """
+        if driver.params.get('stat_specific_params', {}):
+            raise NotImplementedError("the emulator cannot be used with ``stat_specific_params``")
+
+        transfers, _ = driver.data.calculate_transfer(driver.data.statistics)
+        k, mu, _ = driver.theory.get_kmu_pairs(transfers)
+        return cls.train(driver.theory, k, mu, **kwargs)
+
+    @classmethod
+    def train(cls, theory, k, mu, N=500, Nvalidate=100, ncomponents=0.99999,
+                nsigma=3., seed=None):
+        """
+        Train an emulator of the theory P(k,mu) at the nodes `k` and `mu`
+
+        The free parameters of `theory` are sampled within the limits of
+        their priors (see :func:`prior_limits`) with a Latin hypercube
+        design, and the model is evaluated for each sample. The accuracy
+        is checked against an independent set of random samples; see
+        :func:`validation_report`.
+
+        Parameters
+        ----------
+        theory : BasePowerTheory
+            the theory to emulate
+        k, mu : array_like
+            the flattened (k,mu) nodes
+        N : int, optional
+            the number of training samples
+        Nvalidate : int, optional
+            the number of validation samples
+        ncomponents : int, float, optional
+            the number of PCA components to keep, or, if less than one, the
+            fraction of the variance of the training set to keep
+        nsigma : float, optional
+            the number of standard deviations of normal priors to sample
+        seed : int, optional
+            the random seed
+        """
+        try:
+            from sklearn.decomposition import PCA
+            from sklearn.gaussian_process import GaussianProcessRegressor
+            from sklearn.gaussian_process.kernels import ConstantKernel, RBF
+        except ImportError:
+            raise ImportError("``scikit-learn`` is required to train the emulator")
+
+        rng = np.random.RandomState(seed)
+        names = list(theory.free_names)
+        ndim = len(names)
+
+        self = cls.__new__(cls)
+        self.free_names = names
+        self.k, self.mu = np.asarray(k, dtype='f8'), np.asarray(mu, dtype='f8')
+        self.lower, self.upper = prior_limits(theory.fit_params, names, nsigma=nsigma)
+
+        # the training set
+        x = latin_hypercube(N, ndim, rng=rng)
+        theta = self.lower + x*(self.upper - self.lower)
+        P = self._evaluate_model(theory, theta)
+
+        # standardize
+        self.log = bool((P > 0).all())
+        y = np.log(P) if self.log else P
+        self.mean, self.scale = y.mean(axis=0), y.std(axis=0)
+        self.scale[self.scale == 0.] = 1.
+        y = (y - self.mean) / self.scale
+
+        # compress
+        pca = PCA(n_components=ncomponents, svd_solver='full')
+        coeffs = pca.fit_transform(y)
+        self.pca_mean, self.components = pca.mean_, pca.components_
+        self.coeff_std = coeffs.std(axis=0)
+        coeffs /= self.coeff_std
+        args = (pca.n_components_, 100*pca.explained_variance_ratio_.sum())
+        logger.info("emulator keeps %d PCA components (%.5f%% of the variance)" %args)
+
+        # a gaussian process for each coefficient
+        self.x_train = x
+        self.amplitude = np.empty(pca.n_components_)
+        self.length_scale = np.empty((pca.n_components_, ndim))
+        self.dual_coef = np.empty((pca.n_components_, N))
+        for i in range(pca.n_components_):
+            kernel = ConstantKernel(1.0, (1e-3, 1e5)) * RBF(np.ones(ndim), (1e-2, 1e3))
+            gp = GaussianProcessRegressor(kernel=kernel, alpha=1e-8, random_state=rng)
+            gp.fit(x, coeffs[:,i])
+            self.amplitude[i] = gp.kernel_.k1.constant_value
+            self.length_scale[i] = gp.kernel_.k2.length_scale
+            self.dual_coef[i] = np.ravel(gp.alpha_)
+
+        # validate
+        if Nvalidate:
+            theta = self.lower + rng.uniform(size=(Nvalidate, ndim))*(self.upper - self.lower)
+            self.validate(theory, theta)
+
+        return self
+
+    def _evaluate_model(self, theory, theta):
+        """
+        Evaluate the model P(k,mu) at the nodes for each row of `theta`,
+        restoring the free parameters of `theory` upon returning
+        """
+        original = theory.free_values
+        toret = np.empty((len(theta), len(self.k)))
+        try:
+            for i, th in enumerate(theta):
+                if not theory.set_free_parameters(th):
+                    raise ValueError("invalid parameters when training the emulator: %s" %str(th))
+                toret[i] = theory.model.power(self.k, self.mu).values
+        finally:
+            theory.set_free_parameters(original)
+
+        return toret
+
+    def validate(self, theory, theta):
+        """
+        Compare the emulator to the model for each row of `theta`, storing
+        the fractional errors in :attr:`errors` and logging the
+        :func:`validation_report`
+        """
+        P = self._evaluate_model(theory, theta)
+        self.errors = self(theta) / P - 1.
+        logger.info(self.validation_report())
+        return self.errors
+
+    def validation_report(self):
+        """
+        A string summarizing the fractional errors of the emulator on
+        the validation samples
+        """
+        if getattr(self, 'errors', None) is None or not len(self.errors):
+            return "emulator has not been validated"
+
+        err = abs(self.errors)
+        lines = ["emulator validation on %d samples:" %len(err)]
+        lines.append("  max fractional error: %.3e" %err.max())
+        lines.append("  rms fractional error: %.3e" %np.sqrt((err**2).mean()))
+        lines.append("  95th percentile of max error per sample: %.3e" %np.percentile(err.max(axis=1), 95))
+        return "\n".join(lines)
+
+    #---------------------------------------------------------------------------
+    # I/O
+    #---------------------------------------------------------------------------
+    _attrs = ['free_names', 'k', 'mu', 'lower', 'upper', 'log', 'mean', 'scale',
+              'pca_mean', 'components', 'coeff_std', 'x_train', 'amplitude',
+              'length_scale', 'dual_coef', 'errors']
+
+    def to_npz(self, filename):
+        """
+        Save the emulator to a numpy ``npz`` file
+        """
+        from pyRSD import __version__
+        d = {k:getattr(self, k, None) for k in self._attrs}
+        if d['errors'] is None: d['errors'] = np.empty((0, len(self.k)))
+        np.savez(filename, pyrsd_version=__version__, **d)
+
+    @classmethod
+    def from_npz(cls, filename):
+        """
+        Load a numpy ``npz`` file and return the corresponding :class:`PkmuEmulator`
+        """
+        toret = cls.__new__(cls)
+        with np.load(filename, encoding='latin1') as ff:
+            for k, v in ff.items():
+                setattr(toret, k, v)
+
+        toret.free_names = toret.free_names.tolist()
+        toret.log = bool(toret.log)
+        return toret
+
+    def check_nodes(self, k, mu):
+        """
+        Raise a ``ValueError`` if the input (k,mu) nodes are not those the
+        emulator was trained on
+        """
+        k, mu = np.asarray(k), np.asarray(mu)
+        if k.shape != self.k.shape or not np.allclose(k, self.k) or not np.allclose(mu, self.mu):
+            raise ValueError("the (k,mu) nodes of the theory do not match those of the emulator")
@@ -56,16 +56,30 @@ def load_model(filename, **kwargs):
     if not os.path.exists(filename):
         raise ConfigurationError('cannot load model from file `%s`; does not exist' %filename)
     _, ext = os.path.splitext(filename)
-    if ext == '.npy':
+    if ext in ['.npy', '.npz']:
         from ...rsd import load_model
         model = load_model(filename, **kwargs)
     elif ext == '.pickle':
         model = load_pickle(filename)
     else:
-        raise ValueError("extension for model file not recognized; must be `.npy` or `.pickle`")
+        raise ValueError("extension for model file not recognized; must be `.npz`, `.npy` or `.pickle`")
 
     return model
 
+def find_model_file(dirname):
+    """
+    Return the path of the model file in the directory `dirname`, either
+    a ``.npz`` model snapshot or a pickled ``.npy`` model, or `None` if
+    neither exists
+    """
+    from .. import model_filename
+    root, _ = os.path.splitext(model_filename)
+    for ext in ['.npz', '.npy']:
+        path = os.path.join(dirname, root + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
 def create_output_file(folder, solver_type, chain_number, iterations, walkers=0, restart=None):
     """
     Automatically create a new name for the results file.
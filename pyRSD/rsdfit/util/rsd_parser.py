@@ -1,4 +1,4 @@
-from .. import logging, model_filename, params_filename
+from .. import logging, params_filename
 from ... import os
 
 import argparse as ap
@@ -345,7 +345,7 @@ def verify_arguments(ns):
     """
     Run a few quick verification tests on the supplied arguments
     """
-    from .rsd_io import ConfigurationError
+    from .rsd_io import ConfigurationError, find_model_file
     ## restart from existing
     if ns.subparser_name == 'restart':
 
@@ -356,8 +356,8 @@ def verify_arguments(ns):
         if not os.path.exists(ns.params):
             raise ConfigurationError("Restarting but associated `%s` doesn't exist" %params_filename)
         if ns.model is None:
-            ns.model = os.path.join(ns.folder, model_filename)
-            if not os.path.exists(ns.model):
+            ns.model = find_model_file(ns.folder)
+            if ns.model is None:
                 raise ConfigurationError("Restarting but cannot find existing model file to read")
         logger.warning("Restarting from %s and using associated params.dat" %ns.restart_files[0])
 
@@ -368,7 +368,7 @@ def verify_arguments(ns):
         # try to use an existing params.dat
         if os.path.isdir(ns.folder):
             params_path = os.path.join(ns.folder, params_filename)
-            model_path = os.path.join(ns.folder, model_filename)
+            model_path = find_model_file(ns.folder)
             if os.path.exists(params_path):
                 # if the params.dat exists, and param files were given,
                 # use the params.dat, and notify the user
@@ -384,7 +384,7 @@ def verify_arguments(ns):
                         " line option -p any.param)")
 
             # also check for existing model file now
-            if os.path.exists(model_path):
+            if model_path is not None:
                 if ns.model is None:
                     ns.model = model_path
         else:
@@ -0,0 +1,58 @@
+from pyRSD.rsd._cache import Cache, parameter
+from pyRSD.rsd import tools
+import numpy
+
+class Model(Cache):
+
+    def __init__(self, a=1.):
+        self.a = a
+        self.ncalls = 0
+
+    @parameter
+    def a(self, val):
+        return val
+
+    def P(self, k):
+        self.ncalls += 1
+        return self.a * k**2
+
+def test_mapping():
+
+    k = numpy.linspace(0.01, 0.4, 100)[:,None]
+    mu = numpy.linspace(0., 1., 11)[None,:]
+    k, mu = numpy.broadcast_arrays(k, mu)
+
+    coords = tools.APCoordinates(k, mu, alpha_perp=0.98, alpha_par=1.03)
+    numpy.testing.assert_allclose(coords.k, tools.k_AP(k, mu, 0.98, 1.03))
+    numpy.testing.assert_allclose(coords.mu, tools.mu_AP(mu, 0.98, 1.03))
+    assert abs(coords.volume_factor - 1./(0.98**2*1.03)) < 1e-12
+
+    # powers of mu are computed once
+    mu4 = coords.mu_power(4)
+    numpy.testing.assert_allclose(mu4, coords.mu**4)
+    assert coords.mu_power(4) is mu4
+
+def test_context():
+
+    m = Model()
+    k = numpy.linspace(0.01, 0.4, 100)
+    mu = numpy.linspace(0., 1., 100)
+
+    with tools.APCoordinates(k, mu, alpha_perp=1.01, alpha_par=0.99) as coords:
+        assert tools.current_coordinates() is coords
+
+        # broadcasted views of the same coordinates match
+        k_, mu_ = numpy.broadcast_arrays(coords.k, coords.mu)
+        assert tools.get_coordinates(k_, mu_) is coords
+
+        # other coordinates do not
+        assert tools.get_coordinates(k, mu) is not coords
+
+        # evaluations are shared in the same parameter state
+        P = coords.evaluate(m.P)
+        assert coords.evaluate(m.P) is P
+        m.a = 2.
+        numpy.testing.assert_allclose(coords.evaluate(m.P), 2*P)
+        assert m.ncalls == 2
+
+    assert tools.current_coordinates() is None
@@ -0,0 +1,175 @@
+from pyRSD.rsd._cache import Cache, parameter, cached_property, ParameterUpdateError
+import pytest
+
+class Model(Cache):
+
+    def __init__(self, a=1., b=2., c=3.):
+        self.a = a
+        self.b = b
+        self.c = c
+        self.ncalls = {'x':0, 'y':0, 'z':0}
+
+    @parameter
+    def a(self, val):
+        return val
+
+    @parameter
+    def b(self, val):
+        if val < 0:
+            raise ValueError("`b` must be positive")
+        return val
+
+    @parameter
+    def c(self, val):
+        return val
+
+    @cached_property('a')
+    def x(self):
+        self.ncalls['x'] += 1
+        return 2*self.a
+
+    @cached_property('x', 'b')
+    def y(self):
+        self.ncalls['y'] += 1
+        return self.x + self.b
+
+    @cached_property('c')
+    def z(self):
+        self.ncalls['z'] += 1
+        return self.c**2
+
+def test_invalidation_masks():
+
+    masks = Model._invalidation_masks
+    order = Model._cached_order
+    names = lambda mask: set(name for i, name in enumerate(order) if (mask >> i) & 1)
+
+    assert names(masks['a']) == {'x', 'y'}
+    assert names(masks['b']) == {'y'}
+    assert names(masks['c']) == {'z'}
+
+def test_exclude():
+
+    class Sub(Model):
+
+        @parameter
+        def d(self, val):
+            return val
+
+        @cached_property(exclude=['c'])
+        def w(self):
+            return object()
+
+    m = Sub(); m.d = 0.
+    w = m.w
+    m.bulk_update(c=4.)
+    assert m.w is w
+
+    for name in ['a', 'b', 'd']:
+        m.bulk_update(**{name:5.})
+        assert m.w is not w
+        w = m.w
+
+def test_bulk_update():
+
+    m = Model()
+    m.y; m.z
+    gen = m.generation
+
+    # only changed values invalidate
+    changed = m.bulk_update(a=2., b=2., c=3.)
+    assert changed == ['a']
+    assert m.generation == gen + 1
+    assert 'x' not in m._cache and 'y' not in m._cache
+    assert 'z' in m._cache
+
+    assert m.y == 6.
+    assert m.ncalls == {'x':2, 'y':2, 'z':1}
+
+    # no change, no new generation
+    assert m.bulk_update(a=2., b=2.) == []
+    assert m.generation == gen + 1
+
+def test_transactional():
+
+    m = Model()
+    m.y
+
+    with pytest.raises(ParameterUpdateError) as e:
+        m.bulk_update(a=5., b=-1.)
+    assert e.value.name == 'b'
+
+    # original state is restored
+    assert m.a == 1. and m.b == 2.
+    assert m.y == 4.
+
+def test_snapshots():
+
+    m = Model()
+    m.enable_snapshots(maxsize=2)
+    m.y; m.z
+
+    # visit a new state, and come back
+    m.bulk_update(a=2., c=4.)
+    m.y; m.z
+    m.bulk_update(a=1., c=3.)
+    assert m.y == 4. and m.z == 9.
+    assert m.ncalls == {'x':2, 'y':2, 'z':2}
+
+    # and back again
+    m.bulk_update(a=2., c=4.)
+    assert m.y == 6. and m.z == 16.
+    assert m.ncalls == {'x':2, 'y':2, 'z':2}
+    assert m._snapshots.hits == 2
+
+    # LRU eviction of the oldest state
+    m.bulk_update(a=3.); m.y
+    m.bulk_update(a=4.); m.y
+    assert len(m._snapshots) == 2
+    m.bulk_update(a=1., c=3.)
+    m.y
+    assert m.ncalls['y'] == 5
+
+def test_snapshots_arrays():
+
+    import numpy
+    m = Model(c=numpy.ones(3))
+    m.enable_snapshots(maxsize=4)
+    m.y; m.z
+
+    # array parameters are keyed on identity, not hashed
+    state = m._parameter_state()[0]
+    assert ('id', id(m.c), m._param_generations['c']) in state
+
+    m.bulk_update(a=2.); m.y
+    m.bulk_update(a=1.)
+    assert m.y == 4.
+    assert m._snapshots.hits == 1
+    assert m.ncalls['y'] == 2
+
+    # a new array is a new state
+    m.bulk_update(c=numpy.zeros(3))
+    assert m._parameter_state()[0] != state
+    numpy.testing.assert_array_equal(m.z, 0.)
+
+def test_use_snapshots():
+
+    m = Model()
+    with m.use_snapshots(maxsize=4) as snapshots:
+        m.y
+        m.bulk_update(b=3.); m.y
+        m.bulk_update(b=2.)
+        assert m.y == 4.
+        assert snapshots.hits == 1
+    assert m.ncalls['y'] == 2
+    assert '_snapshots' not in m.__dict__
+
+def test_temporary_update():
+
+    m = Model()
+    gen = m.generation
+    with m.temporary_update(a=5.):
+        assert m.y == 12.
+        assert m.generation != gen
+    assert m.a == 1. and m.y == 4.
+    assert m.generation == gen
@@ -0,0 +1,66 @@
+from pyRSD.rsd._cache import Cache, parameter, cached_property
+
+class Model(Cache):
+
+    def __init__(self, a=1.):
+        self.a = a
+        self.b = 2.
+
+    @parameter
+    def a(self, val):
+        return val
+
+    @parameter
+    def b(self, val):
+        return val
+
+    @cached_property('a')
+    def x(self):
+        return 2*self.a
+
+    @cached_property('x', 'b')
+    def y(self):
+        return self.x + self.b
+
+def test_hits_and_misses():
+
+    m = Model()
+    m.enable_cache_stats()
+
+    m.y; m.y
+    m.a = 3.; m.y
+    m.b = 2.; m.y # no change in value
+    m.b = 5.; m.y
+
+    report = m.cache_stats_report()
+    assert report['y']['misses'] == 3 and report['y']['hits'] == 2
+    assert report['x']['misses'] == 2 and report['x']['hits'] == 1
+    assert report['y']['time'] >= report['y']['self_time']
+
+    # sources of invalidation
+    assert report['y']['invalidations'] == {'a':1, 'b':1}
+    assert report['x']['invalidations'] == {'a':1}
+
+    by_param = m.cache_stats.invalidations_by_parameter()
+    assert set(by_param['a']['invalidated']) == {'x', 'y'}
+    assert set(by_param['b']['invalidated']) == {'y'}
+
+    # disabling stops recording
+    stats = m.disable_cache_stats()
+    m.a = 4.; m.y
+    assert stats.stats['y']['misses'] == 3
+
+def test_graph():
+
+    m = Model()
+    m.enable_cache_stats()
+    m.y
+
+    graph = m.cache_graph()
+    assert set(graph['edges']) == {('a', 'x'), ('x', 'y'), ('b', 'y')}
+    assert graph['nodes']['a']['type'] == 'parameter'
+    assert graph['nodes']['y']['type'] == 'cached'
+    assert graph['nodes']['y']['misses'] == 1
+
+    dot = m.cache_stats.to_dot(Model)
+    assert '"x" -> "y";' in dot
@@ -0,0 +1,51 @@
+from pyRSD.rsd._cache import Cache, parameter
+from pyRSD.rsd.tools import cacheable, cache_on, cache_off
+import numpy
+
+class Model(Cache):
+
+    def __init__(self, a=1.):
+        self.a = a
+        self.ncalls = 0
+
+    @parameter
+    def a(self, val):
+        return val
+
+    @cacheable
+    def power(self, k, mu):
+        self.ncalls += 1
+        return self.a * k * mu
+
+def test_cacheable():
+
+    m = Model()
+    k = numpy.linspace(0.01, 0.4, 100)
+    mu = numpy.linspace(0., 1., 100)
+
+    memo = cache_on()
+    try:
+        x = m.power(k, mu)
+        assert m.power(k, mu) is x
+
+        # new array identity is a miss
+        m.power(k.copy(), mu)
+
+        # parameter change is a miss
+        m.a = 2.
+        m.power(k, mu)
+
+        # restoring the state with `temporary_update` keeps the generation
+        with m.temporary_update(a=3.):
+            m.power(k, mu)
+        m.power(k, mu)
+    finally:
+        cache_off()
+
+    assert m.ncalls == 4
+    assert memo.hits == 2 and memo.misses == 4
+    assert abs(memo.hit_rate - 1./3) < 1e-8
+
+    # no caching when off
+    m.power(k, mu)
+    assert m.ncalls == 5
@@ -0,0 +1,99 @@
+from pyRSD.rsd._disk_cache import PTIntegralsDiskCache
+
+import pytest
+import numpy
+import os
+
+class FakeCosmology(object):
+    """
+    Mimic the pickling state of a `pygcl.Cosmology`
+    """
+    def __init__(self, h=0.7):
+        self.h = h
+
+    def __getstate__(self):
+        k = numpy.logspace(-3, 0, 10)
+        return {'args': [{'h':self.h, 'n_s':0.96}, 0, 0.8, k, k**0.5]}
+
+@pytest.fixture
+def cache(tmpdir):
+    return PTIntegralsDiskCache(str(tmpdir), max_size=None)
+
+def test_roundtrip(cache):
+
+    k = numpy.logspace(-3, 0, 100)
+    key = cache.make_key('_unnormalized_I00', FakeCosmology(), k, epsrel=1e-3)
+    assert cache.load(key) is None
+
+    # single array
+    cache.save(key, k**2)
+    numpy.testing.assert_array_equal(cache.load(key), k**2)
+
+    # tuple of arrays
+    key = cache.make_key('_unnormalized_Ivvdd_h01', FakeCosmology(), k)
+    cache.save(key, (k, 2*k, 3*k))
+    toret = cache.load(key)
+    assert isinstance(toret, tuple) and len(toret) == 3
+    numpy.testing.assert_array_equal(toret[2], 3*k)
+
+def test_key(cache):
+
+    k = numpy.logspace(-3, 0, 100)
+    key = cache.make_key('_unnormalized_I00', FakeCosmology(), k, epsrel=1e-3)
+
+    # same inputs give same key
+    assert key == cache.make_key('_unnormalized_I00', FakeCosmology(), k, epsrel=1e-3)
+
+    # any change in inputs changes the key
+    assert key != cache.make_key('_unnormalized_I01', FakeCosmology(), k, epsrel=1e-3)
+    assert key != cache.make_key('_unnormalized_I00', FakeCosmology(h=0.6), k, epsrel=1e-3)
+    assert key != cache.make_key('_unnormalized_I00', FakeCosmology(), k[:-1], epsrel=1e-3)
+    assert key != cache.make_key('_unnormalized_I00', FakeCosmology(), k, epsrel=1e-4)
+    assert key != cache.make_key('_unnormalized_I00', FakeCosmology(), k, epsrel=1e-3, integrator='FFTLogImn')
+
+def test_corrupted(cache):
+
+    k = numpy.logspace(-3, 0, 100)
+    key = cache.make_key('_unnormalized_I00', FakeCosmology(), k)
+    cache.save(key, k)
+
+    # truncate the file
+    filename = cache.filename(key)
+    with open(filename, 'r+b') as ff:
+        ff.truncate(os.path.getsize(filename)//2)
+
+    # load fails and entry is removed
+    assert cache.load(key) is None
+    assert not os.path.exists(filename)
+
+def test_stale(cache):
+
+    k = numpy.logspace(-3, 0, 100)
+    key1 = cache.make_key('_unnormalized_I00', FakeCosmology(), k)
+    key2 = cache.make_key('_unnormalized_I01', FakeCosmology(), k)
+    cache.save(key1, k)
+
+    # entry stored under the wrong key
+    os.rename(cache.filename(key1), cache.filename(key2))
+    assert cache.load(key2) is None
+    assert not os.path.exists(cache.filename(key2))
+
+def test_lru_eviction(cache):
+
+    k = numpy.logspace(-3, 0, 1000)
+    keys = [cache.make_key('I%d' %i, FakeCosmology(), k) for i in range(3)]
+
+    for i, key in enumerate(keys):
+        cache.save(key, k)
+        os.utime(cache.filename(key), (i, i))
+
+    # access the oldest entry
+    cache.load(keys[0])
+
+    # limit size to two entries
+    cache.max_size = 2 * os.path.getsize(cache.filename(keys[0]))
+    cache.evict()
+
+    assert os.path.exists(cache.filename(keys[0]))
+    assert not os.path.exists(cache.filename(keys[1]))
+    assert os.path.exists(cache.filename(keys[2]))
@@ -0,0 +1,40 @@
+from pyRSD.rsd.power.gal.fog_kernels import FOGKernel
+from pyRSD.rsd import tools
+import numpy
+import pytest
+
+kernels = {'modified_lorentzian': lambda x: 1./(1 + 0.5*x**2)**2,
+           'lorentzian': lambda x: 1./(1 + 0.5*x**2),
+           'gaussian': lambda x: numpy.exp(-0.5*x**2)}
+
+@pytest.mark.parametrize("name", list(kernels))
+def test_kernel(name):
+
+    k = numpy.linspace(0.01, 0.4, 100)[:,None]
+    mu = numpy.linspace(0., 1., 11)[None,:]
+    k, mu = numpy.broadcast_arrays(k, mu)
+    sigma = 4.
+
+    G = FOGKernel.factory(name)
+    numpy.testing.assert_allclose(G.kernel(k, mu, sigma), kernels[name](k*mu*sigma))
+
+    # derivatives versus finite differences
+    eps = 1e-6
+    for wrt, (dk, dmu, ds) in zip(['k', 'mu', 'sigma'], [(eps, 0, 0), (0, eps, 0), (0, 0, eps)]):
+        x1 = (k+dk)*(mu+dmu)*(sigma+ds); x0 = (k-dk)*(mu-dmu)*(sigma-ds)
+        numerical = (kernels[name](x1) - kernels[name](x0)) / (2*eps)
+        numpy.testing.assert_allclose(G.kernel_derivative(k, mu, sigma, wrt), numerical, rtol=1e-5, atol=1e-8)
+
+def test_shared_evaluation():
+
+    k = numpy.linspace(0.01, 0.4, 100)
+    mu = numpy.linspace(0., 1., 11)
+    G = FOGKernel.factory('modified_lorentzian')
+
+    with tools.APCoordinates(*numpy.broadcast_arrays(k[:,None], mu[None,:])) as coords:
+        G1 = G.kernel(coords.k, coords.mu, 4.)
+        assert G.kernel(coords.k, coords.mu, 4.) is G1
+        assert G.kernel(coords.k, coords.mu, 2.) is not G1
+
+        # the public methods broadcast, and return the same values
+        numpy.testing.assert_allclose(G(k, mu, 4.).values, G1)
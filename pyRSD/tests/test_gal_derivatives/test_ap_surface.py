@@ -0,0 +1,39 @@
+from . import numpy as np
+
+NMU = 41
+
+def test_ap_surface(driver):
+
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    # the (k,mu) grid
+    k  = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    alphas = [(1.0, 1.0), (0.97, 1.04), (1.05, 0.95)]
+    try:
+        # the exact power
+        P1 = []
+        for alpha_perp, alpha_par in alphas:
+            model.bulk_update(alpha_perp=alpha_perp, alpha_par=alpha_par)
+            P1.append(model.power(k, mu, flatten=True).values)
+
+        # the interpolated power, only computing the surface once
+        model.ap_interpolation = True
+        P2 = []
+        for i, (alpha_perp, alpha_par) in enumerate(alphas):
+            model.bulk_update(alpha_perp=alpha_perp, alpha_par=alpha_par)
+            P2.append(model.power(k, mu, flatten=True).values)
+            if i == 0: surface = model.ap_surface
+            assert model.ap_surface is surface
+
+        np.testing.assert_allclose(P1, P2, rtol=1e-3)
+
+        # other parameters invalidate the surface
+        model.f = 0.95 * model.f
+        model.power(k, mu)
+        assert model.ap_surface is not surface
+    finally:
+        model.ap_interpolation = False
+        driver.set_fiducial()
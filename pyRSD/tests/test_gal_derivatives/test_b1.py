@@ -0,0 +1,41 @@
+from . import numdifftools, numpy as np
+import pytest
+from pyRSD.rsd.power.gal.derivatives import dPgal_db1_cA, dPgal_db1_cB, dPgal_db1_sA, dPgal_db1_sB
+
+NMU = 41
+
+@pytest.mark.parametrize("socorr", [True, False])
+@pytest.mark.parametrize("dclass", [dPgal_db1_cA, dPgal_db1_cB, dPgal_db1_sA, dPgal_db1_sB])
+def test_partial(driver, socorr, dclass):
+
+    # set the socorr
+    driver.theory.model.use_so_correction = socorr
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    # get the deriv arguments
+    k    = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    # broadcast to the right shape
+    k     = k[:, np.newaxis]
+    mu    = mu[np.newaxis, :]
+    k, mu = np.broadcast_arrays(k, mu)
+    k     = k.ravel(order='F')
+    mu    = mu.ravel(order='F')
+
+    pars = driver.theory.fit_params
+    args = (model, pars, k, mu)
+
+    # our derivative
+    x = dclass.eval(*args)
+
+    # numerical derivative
+    def f(x):
+        setattr(model, dclass.param, x)
+        return driver.theory.model.power(k, mu)
+    g = numdifftools.Derivative(f, step=1e-3)
+    y = g(getattr(model, dclass.param))
+
+    # compare
+    np.testing.assert_allclose(x, y, rtol=1e-2)
@@ -0,0 +1,32 @@
+from . import numpy as np
+import pytest
+
+NMU = 41
+
+@pytest.mark.parametrize("use_Phm_model", [True, False])
+def test_bias_basis(driver, use_Phm_model):
+
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    # the (k,mu) grid
+    k  = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    use_Phm = model.use_Phm_model
+    model.use_Phm_model = use_Phm_model
+    try:
+        for b1_cA in [model.b1_cA, 1.5, 2.2]:
+            model.b1_cA = b1_cA
+
+            model.use_bias_basis = False
+            P1 = model.power(k, mu, flatten=True).values
+
+            model.use_bias_basis = True
+            P2 = model.power(k, mu, flatten=True).values
+
+            np.testing.assert_allclose(P1, P2, rtol=1e-8)
+    finally:
+        model.use_bias_basis = False
+        model.use_Phm_model = use_Phm
+        driver.set_fiducial()
@@ -0,0 +1,22 @@
+from . import numpy as np
+from pyRSD.rsdfit.theory.base import CompiledTransfers, apply_transfers
+
+def test_compiled_transfers(driver):
+
+    theory = driver.theory
+    data = driver.data
+    driver.set_fiducial()
+
+    transfers, ids = data.calculate_transfer(data.statistics)
+    k, mu, slices = theory.get_kmu_pairs(transfers)
+    P = theory.model.power(k, mu)
+
+    # the numpy path agrees with the labelled results
+    compiled = CompiledTransfers(data, transfers, ids, slices)
+    P1 = apply_transfers(P, data, transfers, ids, slices, {})
+    P2 = compiled(P)
+    np.testing.assert_allclose(P2, P1, rtol=1e-10)
+
+    # and accepts plain arrays
+    np.testing.assert_allclose(compiled(P.values), P1, rtol=1e-10)
+    assert len(P2) == len(data.combined_k)
@@ -0,0 +1,35 @@
+from . import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+
+def test_emulator(driver, tmpdir):
+
+    from pyRSD.rsdfit.theory.emulator import PkmuEmulator
+
+    theory = driver.theory
+    driver.set_fiducial()
+
+    # keep all of the PCA components, so the emulator interpolates the training set
+    emulator = PkmuEmulator.from_driver(driver, N=20, Nvalidate=5, ncomponents=19, seed=42)
+    assert emulator.errors.shape == (5, len(emulator.k))
+
+    # save and load
+    filename = str(tmpdir.join('emulator.npz'))
+    emulator.to_npz(filename)
+    emulator = PkmuEmulator.from_npz(filename)
+
+    # a training sample
+    theta = emulator.lower + emulator.x_train[0]*(emulator.upper - emulator.lower)
+
+    # the theory callables, without and with the emulator
+    transfers, ids = driver.data.calculate_transfer(driver.data.statistics)
+    try:
+        theory.set_free_parameters(theta)
+        f1 = theory.get_model_callable(driver.data, transfers, ids)
+        theory.emulator = filename
+        f2 = theory.get_model_callable(driver.data, transfers, ids)
+        np.testing.assert_allclose(f1(), f2(), rtol=1e-4)
+    finally:
+        theory.emulator = None
+        driver.set_fiducial()
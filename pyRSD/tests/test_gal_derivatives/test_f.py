@@ -0,0 +1,40 @@
+from . import numdifftools, numpy as np
+import pytest
+from pyRSD.rsd.power.gal.derivatives import dPgal_df
+
+NMU = 41
+
+@pytest.mark.parametrize("socorr", [True, False])
+def test_partial(driver, socorr):
+
+    # set the socorr
+    driver.theory.model.use_so_correction = socorr
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    # get the deriv arguments
+    k    = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    # broadcast to the right shape
+    k     = k[:, np.newaxis]
+    mu    = mu[np.newaxis, :]
+    k, mu = np.broadcast_arrays(k, mu)
+    k     = k.ravel(order='F')
+    mu    = mu.ravel(order='F')
+
+    pars = driver.theory.fit_params
+    args = (model, pars, k, mu)
+
+    # our derivative
+    x = dPgal_df.eval(*args)
+
+    # numerical derivative
+    def f(x):
+        model.f = x
+        return driver.theory.model.power(k, mu)
+    g = numdifftools.Derivative(f, step=1e-3)
+    y = g(model.f)
+
+    # compare
+    np.testing.assert_allclose(x, y, rtol=1e-2)
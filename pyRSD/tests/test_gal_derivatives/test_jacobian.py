@@ -0,0 +1,42 @@
+from . import numpy as np
+import pytest
+from pyRSD.rsd.power.gradient import compute, PkmuJacobian
+from pyRSD.rsd.power.gal.derivatives import PgalDerivative
+
+NMU = 41
+
+@pytest.mark.parametrize("socorr", [True, False])
+def test_jacobian(driver, socorr):
+
+    # set the socorr
+    driver.theory.model.use_so_correction = socorr
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    # get the deriv arguments
+    k    = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    # broadcast to the right shape
+    k     = k[:, np.newaxis]
+    mu    = mu[np.newaxis, :]
+    k, mu = np.broadcast_arrays(k, mu)
+    k     = k.ravel(order='F')
+    mu    = mu.ravel(order='F')
+
+    pars = driver.theory.fit_params
+    registry = PgalDerivative.registry()
+
+    # the free parameters with analytic derivatives
+    gradient = model.get_gradient(pars)
+    names = gradient.analytic_names
+
+    # the single-pass jacobian
+    with model.use_cache():
+        J = PkmuJacobian(registry, pars, names)(model, k, mu)
+    assert J.shape == (len(names), len(k))
+
+    # compare to computing each derivative separately
+    for i, name in enumerate(names):
+        x = compute(registry, name, model, pars, k, mu)
+        np.testing.assert_allclose(J[i], x, rtol=1e-8, atol=1e-12)
@@ -0,0 +1,37 @@
+from . import numpy as np
+import pytest
+
+NMU = 41
+
+@pytest.mark.parametrize("socorr", [True, False])
+def test_power_batch(driver, socorr):
+
+    driver.theory.model.use_so_correction = socorr
+    model = driver.theory.model
+    driver.set_fiducial()
+    rng = np.random.RandomState(0)
+
+    # the (k,mu) grid
+    k  = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    # vary cheap parameters and sigma8_z
+    names = ['b1_cA', 'sigma_c', 'fs', 'alpha_par', 'N', 'sigma8_z']
+    theta0 = np.array([getattr(model, name) for name in names])
+    thetas = theta0 * (1 + 0.02*rng.uniform(-1, 1, size=(6, len(names))))
+    thetas[::2, -1] = theta0[-1]
+
+    # the batch
+    Pk = model.power_batch(k, mu, thetas, names=names)
+    assert Pk.shape == (len(thetas), len(k)*NMU)
+
+    # the original state is restored
+    for name, val in zip(names, theta0):
+        assert getattr(model, name) == val
+
+    # compare to evaluating one at a time
+    for i, theta in enumerate(thetas):
+        model.update(**dict(zip(names, theta)))
+        P = model.power(k, mu, flatten=True).values
+        np.testing.assert_allclose(Pk[i], P, rtol=1e-10)
+    model.update(**dict(zip(names, theta0)))
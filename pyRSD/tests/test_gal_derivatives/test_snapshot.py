@@ -0,0 +1,44 @@
+from . import numpy as np
+from pyRSD.rsd import load_model
+
+import pytest
+
+def test_snapshot(driver, tmpdir):
+
+    model = driver.theory.model
+    driver.set_fiducial()
+
+    k  = driver.data.combined_k
+    mu = np.linspace(0., 1., 11)
+    P = model.power(k, mu, flatten=True).values
+
+    # save and load
+    filename = str(tmpdir.join('model.npz'))
+    model.to_npz(filename)
+    model2 = load_model(filename)
+    assert model2.__class__ is model.__class__
+
+    # the PT integrals are restored, not recomputed
+    assert '_unnormalized_I00' in model2._cache
+
+    # the parameters are restored
+    for name in ['z', 'sigma8_z', 'f', 'b1_cA', 'fs', 'sigma_c', 'alpha_par']:
+        assert getattr(model2, name) == getattr(model, name)
+
+    P2 = model2.power(k, mu, flatten=True).values
+    np.testing.assert_allclose(P2, P, rtol=1e-8)
+
+def test_snapshot_model_class(driver, tmpdir):
+
+    model = driver.theory.model
+    filename = str(tmpdir.join('model.npz'))
+    model.to_npz(filename)
+    with np.load(filename) as ff:
+        d = dict(ff)
+
+    # only models defined in pyRSD can be loaded
+    for model_class in ['os:system', 'pyRSD.rsd.cosmology:Cosmology']:
+        d['model_class'] = model_class
+        np.savez(filename, **d)
+        with pytest.raises(ValueError):
+            load_model(filename)
@@ -0,0 +1,33 @@
+from . import numpy as np
+from pyRSD.rsdfit.surrogate import TaylorSurrogate
+
+def test_taylor_surrogate(driver):
+
+    driver.set_fiducial()
+    theta0 = driver.theory.free_values
+
+    surrogate = TaylorSurrogate(driver, trust_radius=1.)
+    sigma = 1./np.diag(surrogate.fisher)**0.5
+
+    try:
+        # within the trust radius
+        theta = theta0 + 0.02*sigma
+        driver.surrogate = surrogate
+        lnprob = driver.lnprob(theta)
+        assert surrogate.ncalls == 1 and surrogate.nfallback == 0
+
+        driver.surrogate = None
+        np.testing.assert_allclose(lnprob, driver.lnprob(theta), rtol=1e-4)
+
+        # outside the trust radius, the exact theory is used
+        theta = theta0.copy()
+        theta[0] += 2*sigma[0]
+        driver.surrogate = surrogate
+        lnprob = driver.lnprob(theta)
+        assert surrogate.nfallback == 1 and surrogate.fallback_fraction == 0.5
+
+        driver.surrogate = None
+        assert lnprob == driver.lnprob(theta)
+    finally:
+        driver.surrogate = None
+        driver.set_fiducial()
@@ -0,0 +1,41 @@
+from pyRSD.rsd.pt_integrals import PTIntegralsEvaluator, KMN_KERNELS
+from pyRSD.rsd import cosmology
+from pyRSD import pygcl
+
+import pytest
+import numpy
+import threading
+import time
+
+K = numpy.logspace(-3, 0, 200)
+
+@pytest.fixture(scope='module')
+def Plin():
+    return PTIntegralsEvaluator(cosmology.Planck15, 'EH').power_lin
+
+def test_concurrent_integrals(Plin):
+
+    driver = pygcl.Kmn(Plin)
+    call = {}
+
+    def compute():
+        call['start'] = time.time()
+        call['result'] = driver.EvaluateKernels(K, KMN_KERNELS)
+        call['end'] = time.time()
+
+    # record the progress of this thread while the integrals run in another
+    worker = threading.Thread(target=compute)
+    worker.start()
+    progress = []
+    while worker.is_alive():
+        progress.append(time.time())
+    worker.join()
+
+    # this thread ran during the C++ call, which holding the GIL would prevent
+    start, end = call['start'], call['end']
+    margin = 0.25*(end - start)
+    progress = numpy.array(progress)
+    assert ((progress > start + margin) & (progress < end - margin)).any()
+
+    # and the result is the same as without threads
+    numpy.testing.assert_array_equal(call['result'], driver.EvaluateKernels(K, KMN_KERNELS))
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import json
+
+# optional dependencies that should only be imported when first needed
+HEAVY_MODULES = ['george', 'sklearn', 'pandas', 'astropy', 'xarray', 'matplotlib', 'emcee']
+
+# lmfit, which rsdfit builds on, may import pandas, emcee, and matplotlib itself
+RSDFIT_HEAVY_MODULES = ['george', 'sklearn', 'astropy', 'xarray']
+
+# generous upper bound on the import time, in seconds
+MAX_IMPORT_TIME = 10.
+
+def run_import(statement):
+    """
+    Run `statement` in a fresh interpreter, returning the import time
+    and the names of the imported top-level modules
+    """
+    code = ("import sys, time, json; start = time.time(); %s; "
+            "elapsed = time.time() - start; "
+            "print(json.dumps([elapsed, sorted(set(k.split('.')[0] for k in sys.modules))]))") %statement
+    out = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+def test_import_rsd():
+
+    elapsed, modules = run_import("import pyRSD.rsd")
+    assert not set(HEAVY_MODULES) & set(modules)
+    assert elapsed < MAX_IMPORT_TIME
+
+def test_import_rsdfit():
+
+    elapsed, modules = run_import("import pyRSD.rsdfit")
+    assert not set(RSDFIT_HEAVY_MODULES) & set(modules)
+    assert elapsed < MAX_IMPORT_TIME
+
+def test_default_cosmology():
+
+    # the default cosmologies are built on first access
+    _, modules = run_import("from pyRSD.rsd import cosmology")
+    assert 'astropy' not in modules
+
+    _, modules = run_import("from pyRSD.rsd import cosmology; cosmology.Planck15")
+    assert 'astropy' in modules
+
+    from pyRSD.rsd import cosmology
+    assert cosmology.Planck15 is cosmology.Planck15
+    assert cosmology.Planck15.sigma8 == 0.8159
@@ -0,0 +1,66 @@
+from pyRSD.rsd.pt_integrals import PTIntegralsEvaluator, IMN_KERNELS, JMN_KERNELS, KMN_KERNELS
+from pyRSD.rsd import cosmology, DarkMatterSpectrum
+from pyRSD import pygcl
+
+import pytest
+import numpy
+import threading
+
+K = numpy.logspace(-2, 0, 16)
+
+@pytest.fixture(scope='module')
+def evaluator():
+    return PTIntegralsEvaluator(cosmology.Planck15, 'EH')
+
+@pytest.fixture
+def restore_threads():
+    yield
+    pygcl.set_num_threads(0)
+
+def evaluate_all(evaluator):
+    """
+    Evaluate the vectorized integrals of each pygcl driver
+    """
+    Plin = evaluator.power_lin
+    toret = [pygcl.Imn(Plin).EvaluateKernels(K, IMN_KERNELS),
+             pygcl.Jmn(Plin).EvaluateKernels(K, JMN_KERNELS),
+             pygcl.Kmn(Plin).EvaluateKernels(K, KMN_KERNELS),
+             pygcl.ImnOneLoop(pygcl.OneLoopPdv(Plin)).EvaluateKernels(K, [(0, 1), (0, 2)]),
+             pygcl.OneLoopPdd(Plin).EvaluateFull(K),
+             pygcl.CorrelationFunction(Plin)(numpy.linspace(1., 100., 16))]
+    return toret
+
+def test_set_num_threads(restore_threads):
+
+    default = pygcl.get_num_threads()
+    pygcl.set_num_threads(2)
+    assert pygcl.get_num_threads() in [1, 2] # 1 without OpenMP
+
+    # the setting also applies to other threads
+    nthreads = []
+    t = threading.Thread(target=lambda: nthreads.append(pygcl.get_num_threads()))
+    t.start(); t.join()
+    assert nthreads == [pygcl.get_num_threads()]
+
+    # non-positive values restore the default
+    pygcl.set_num_threads(0)
+    assert pygcl.get_num_threads() == default
+
+def test_deterministic(evaluator, restore_threads):
+
+    # the results do not depend on the number of threads
+    pygcl.set_num_threads(1)
+    serial = evaluate_all(evaluator)
+    pygcl.set_num_threads(4)
+    parallel = evaluate_all(evaluator)
+    for x, y in zip(serial, parallel):
+        numpy.testing.assert_array_equal(x, y)
+
+def test_model(restore_threads):
+
+    model = DarkMatterSpectrum(transfer_fit='EH', num_threads=1)
+    assert model.num_threads == 1
+    assert pygcl.get_num_threads() == 1
+
+    with pytest.raises(ValueError):
+        model.num_threads = 0
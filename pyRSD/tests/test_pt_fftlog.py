@@ -0,0 +1,94 @@
+from pyRSD.rsd.pt_integrals import PTIntegralsEvaluator, IMN_KERNELS, JMN_KERNELS, KMN_KERNELS
+from pyRSD.rsd.pt_fftlog import FFTLogImn, FFTLogJmn, FFTLogKmn
+from pyRSD.rsd import cosmology
+from pyRSD import pygcl
+
+import pytest
+import numpy
+import time
+import os
+
+K = numpy.logspace(-3, 0, 20)
+
+@pytest.fixture(scope='module')
+def cubature():
+    return PTIntegralsEvaluator(cosmology.Planck15, 'EH')
+
+@pytest.fixture(scope='module')
+def fftlog():
+    evaluator = PTIntegralsEvaluator(cosmology.Planck15, 'EH')
+    evaluator.pt_backend = 'fftlog'
+    return evaluator
+
+def assert_kernels_close(toret, expected):
+    """
+    The tolerance is set by the accuracy of the cubature (epsrel = 1e-3)
+    """
+    for x, y in zip(toret, expected):
+        numpy.testing.assert_allclose(x, y, rtol=5e-3, atol=1e-3*abs(y).max())
+
+def test_Imn(cubature, fftlog):
+
+    toret = fftlog._Imn.EvaluateKernels(K, IMN_KERNELS)
+    assert toret.shape == (len(IMN_KERNELS), len(K))
+    assert_kernels_close(toret, cubature._Imn.EvaluateKernels(K, IMN_KERNELS))
+
+    # a single k
+    toret = fftlog._Imn.EvaluateKernels(K[2], IMN_KERNELS[:3])
+    assert toret.shape == (3,)
+    numpy.testing.assert_allclose(toret, [fftlog._Imn(K[2], *kern) for kern in IMN_KERNELS[:3]])
+
+def test_Jmn(cubature, fftlog):
+
+    toret = fftlog._Jmn.EvaluateKernels(K, JMN_KERNELS)
+    assert_kernels_close(toret, cubature._Jmn.EvaluateKernels(K, JMN_KERNELS))
+
+def test_Kmn(cubature, fftlog):
+
+    toret = fftlog._Kmn.EvaluateKernels(K, KMN_KERNELS)
+    assert_kernels_close(toret, cubature._Kmn.EvaluateKernels(K, KMN_KERNELS))
+
+    # trailing indices are optional
+    toret = fftlog._Kmn.EvaluateKernels(K, [(1, 1), (1, 1, True)])
+    numpy.testing.assert_allclose(toret, [fftlog._Kmn(K, 1, 1, False, 0), fftlog._Kmn(K, 1, 1, True, 0)])
+
+def test_backend(fftlog):
+
+    evaluator = PTIntegralsEvaluator(cosmology.Planck15, 'EH')
+    assert isinstance(evaluator._Imn, pygcl.Imn)
+
+    evaluator.pt_backend = 'fftlog'
+    assert isinstance(evaluator._Imn, FFTLogImn)
+    assert isinstance(evaluator._Jmn, FFTLogJmn)
+    assert isinstance(evaluator._Kmn, FFTLogKmn)
+
+    # the normalized integrals agree with the cubature
+    assert_kernels_close([evaluator.I00(K)], [PTIntegralsEvaluator(cosmology.Planck15, 'EH').I00(K)])
+
+    with pytest.raises(ValueError):
+        evaluator.pt_backend = 'quadrature'
+    with pytest.raises(ValueError):
+        fftlog._Imn.EvaluateKernels(K, [(0, 4)])
+    with pytest.raises(ValueError):
+        fftlog._Imn.EvaluateKernels(1e4, IMN_KERNELS)
+
+@pytest.mark.skipif(not os.environ.get('PYRSD_BENCHMARK'), reason="set PYRSD_BENCHMARK to run the benchmark")
+def test_benchmark(cubature):
+    """
+    Report the time to evaluate the kernels with the cubature and with
+    FFTLog; the timings depend on the machine, so nothing is asserted
+
+    Run with ``PYRSD_BENCHMARK=1 py.test -s``.
+    """
+    Plin = cubature.power_lin
+    backends = [(pygcl.Imn, FFTLogImn, IMN_KERNELS),
+                (pygcl.Jmn, FFTLogJmn, JMN_KERNELS),
+                (pygcl.Kmn, FFTLogKmn, KMN_KERNELS)]
+
+    for cubature_cls, fftlog_cls, kernels in backends:
+        timings = []
+        for cls in [cubature_cls, fftlog_cls]:
+            start = time.time()
+            cls(Plin).EvaluateKernels(K, kernels)
+            timings.append(time.time() - start)
+        print("%s: cubature %.3f s, fftlog %.3f s" %(fftlog_cls.__name__[6:], timings[0], timings[1]))
@@ -0,0 +1,75 @@
+from pyRSD.rsd.pt_integrals import PTIntegralsEvaluator, IMN_KERNELS, JMN_KERNELS, KMN_KERNELS
+from pyRSD.rsd import cosmology
+
+import pytest
+import numpy
+
+K = numpy.logspace(-2, 0, 5)
+
+@pytest.fixture(scope='module')
+def evaluator():
+    return PTIntegralsEvaluator(cosmology.Planck15, 'EH')
+
+def assert_kernels_close(toret, expected):
+    """
+    The kernels are integrated to the same accuracy, but on a different grid
+    """
+    for x, y in zip(toret, expected):
+        numpy.testing.assert_allclose(x, y, rtol=1e-2, atol=1e-3*abs(y).max())
+
+def test_Imn(evaluator):
+
+    toret = evaluator._Imn.EvaluateKernels(K, IMN_KERNELS)
+    assert toret.shape == (len(IMN_KERNELS), len(K))
+    assert_kernels_close(toret, [evaluator._Imn(K, *kern) for kern in IMN_KERNELS])
+
+    # a single k
+    toret = evaluator._Imn.EvaluateKernels(K[2], IMN_KERNELS[:3])
+    assert toret.shape == (3,)
+    assert_kernels_close(toret[:,None], [[evaluator._Imn(K[2], *kern)] for kern in IMN_KERNELS[:3]])
+
+def test_Jmn(evaluator):
+
+    toret = evaluator._Jmn.EvaluateKernels(K, JMN_KERNELS)
+    assert_kernels_close(toret, [evaluator._Jmn(K, *kern) for kern in JMN_KERNELS])
+
+def test_Kmn(evaluator):
+
+    toret = evaluator._Kmn.EvaluateKernels(K, KMN_KERNELS)
+    assert_kernels_close(toret, [evaluator._Kmn(K, *kern) for kern in KMN_KERNELS])
+
+    # trailing indices are optional
+    toret = evaluator._Kmn.EvaluateKernels(K, [(1, 1), (1, 1, True)])
+    assert_kernels_close(toret, [evaluator._Kmn(K, 1, 1), evaluator._Kmn(K, 1, 1, True)])
+
+def test_ImnOneLoop(evaluator):
+
+    kernels = [(0, 1), (0, 2)]
+    driver = evaluator._Imn1Loop_vvdd
+    toret = driver.EvaluateKernels(K, kernels)
+    assert toret.shape == (2, 3, len(K))
+    for terms, kern in zip(toret, kernels):
+        expected = [driver.EvaluateLinear(K, *kern), driver.EvaluateCross(K, *kern), driver.EvaluateOneLoop(K, *kern)]
+        assert_kernels_close(terms, expected)
+
+def test_invalid(evaluator):
+
+    with pytest.raises(Exception):
+        evaluator._Imn.EvaluateKernels(K, [(0, 4)])
+    with pytest.raises(Exception):
+        evaluator._Kmn.EvaluateKernels(K, [(2, 1)])
+    with pytest.raises(ValueError):
+        evaluator._Jmn.EvaluateKernels(K, [(0,)])
+
+def test_mixin(evaluator):
+
+    # all kernels are integrated at once, and re-used
+    I00 = evaluator._unnormalized_I00(K, ignore_cache=True)
+    values = evaluator._Imn_kernels._last[1]
+    I33 = evaluator._unnormalized_I33(K, ignore_cache=True)
+    assert evaluator._Imn_kernels._last[1] is values
+    numpy.testing.assert_array_equal(I33, values[-1])
+
+    # the 1-loop integrals return the linear, cross, and 1-loop terms
+    terms = evaluator._unnormalized_Ivvvv_f32(K, ignore_cache=True)
+    assert isinstance(terms, tuple) and len(terms) == 3
@@ -0,0 +1,131 @@
+from pyRSD.rsd.pt_table import PTIntegralsTable, table_coordinates, table_cosmology, table_design, integration_settings
+from pyRSD.rsd import cosmology
+
+import pytest
+import numpy
+
+K = numpy.logspace(-3, 0, 20)
+LOWER = [0.13, 0.021, 0.93, 0.64]
+UPPER = [0.15, 0.024, 0.99, 0.72]
+
+class FakeModel(object):
+    """
+    Mimic the attributes of a model used by the table
+    """
+    def __init__(self, params, transfer_fit='CLASS', pt_backend='cubature', epsrel=None):
+        self.params = params
+        self.transfer_fit = transfer_fit
+        self.pt_backend = pt_backend
+        if epsrel is not None:
+            self._Imn = self._Jmn = self._Kmn = FakeDriver(epsrel)
+
+class FakeDriver(object):
+    """
+    Mimic an integral driver with a relative tolerance
+    """
+    def __init__(self, epsrel):
+        self.epsrel = epsrel
+
+    def GetEpsrel(self):
+        return self.epsrel
+
+def integrals(x):
+    """
+    Smooth functions of the table parameters, as a single array and a tuple
+    """
+    omega_m, omega_b, n_s, h = x
+    return [omega_m*K**n_s, (h*K, omega_b*K, omega_m*h*K**2)]
+
+@pytest.fixture
+def table():
+    coords = table_design(LOWER, UPPER, 200, seed=42)
+    values = [numpy.concatenate([numpy.ravel(r) for r in integrals(x)]) for x in coords]
+    return PTIntegralsTable(cosmology.Planck15, 'CLASS', K, coords, ['_a', '_b'], [0, 3], values,
+                            lower=LOWER, upper=UPPER)
+
+def test_lookup(table):
+
+    # a node of the table
+    params = table_cosmology(cosmology.Planck15, table.coords[0])
+    a = table.lookup('_a', FakeModel(params), K)
+    numpy.testing.assert_allclose(a, integrals(table.coords[0])[0], rtol=1e-8)
+
+    # between nodes
+    params = cosmology.Planck15.clone(H0=70., Om0=0.29, Ob0=0.046)
+    x = table_coordinates(params)
+    b = table.lookup('_b', FakeModel(params), K)
+    assert isinstance(b, tuple) and len(b) == 3
+    for b_, b0 in zip(b, integrals(x)[1]):
+        numpy.testing.assert_allclose(b_, b0, rtol=1e-4)
+
+def test_misses(table):
+
+    params = cosmology.Planck15.clone(H0=70., Om0=0.29, Ob0=0.046)
+    assert table.lookup('_a', FakeModel(params), K) is not None
+
+    # other k, transfer function, or integral
+    assert table.lookup('_a', FakeModel(params), K[:-1]) is None
+    assert table.lookup('_a', FakeModel(params, 'EH'), K) is None
+    assert table.lookup('_c', FakeModel(params), K) is None
+
+    # outside the table range
+    params = cosmology.Planck15.clone(H0=80.)
+    assert table.lookup('_a', FakeModel(params), K) is None
+
+    # other parameters differ from the base cosmology
+    params = cosmology.Planck15.clone(H0=70., Om0=0.29, Ob0=0.046, Neff=4.)
+    assert table.lookup('_a', FakeModel(params), K) is None
+
+def test_backend(table):
+
+    params = cosmology.Planck15.clone(H0=70., Om0=0.29, Ob0=0.046)
+    assert table.lookup('_a', FakeModel(params), K) is not None
+
+    # other backend, or integration tolerance
+    assert table.lookup('_a', FakeModel(params, pt_backend='fftlog'), K) is None
+    assert table.lookup('_a', FakeModel(params, epsrel=1e-4), K) is None
+
+    # the tolerance of the table
+    table.epsrel = numpy.array([1e-4]*3)
+    assert table.lookup('_a', FakeModel(params, epsrel=1e-4), K) is not None
+    assert table.lookup('_a', FakeModel(params, epsrel=1e-3), K) is None
+
+def test_file(table, tmpdir):
+
+    filename = str(tmpdir.join('table.npz'))
+    table.to_file(filename)
+    table2 = PTIntegralsTable.from_file(filename)
+
+    params = cosmology.Planck15.clone(H0=70., Om0=0.29, Ob0=0.046)
+    numpy.testing.assert_allclose(table2.lookup('_a', FakeModel(params), K),
+                                  table.lookup('_a', FakeModel(params), K))
+    assert table2.pt_backend == table.pt_backend
+    numpy.testing.assert_array_equal(table2.epsrel, table.epsrel)
+
+    # wrong format version
+    with numpy.load(filename) as ff:
+        d = dict(ff)
+    d['format'] = -1
+    numpy.savez(filename, **d)
+    with pytest.raises(ValueError):
+        PTIntegralsTable.from_file(filename)
+
+def test_validate(table, tmpdir, monkeypatch):
+
+    # evaluate the held-out samples with the smooth functions
+    import pyRSD.rsd.pt_table as pt_table
+    monkeypatch.setattr(pt_table, '_evaluate_integrals', lambda args: (integration_settings(None), integrals(args[1])))
+
+    assert 'not been validated' in table.validation_report()
+    coords = table_design(LOWER, UPPER, 10, seed=7)
+    errors = table.validate(coords)
+    assert errors.shape == (10, table.values.shape[-1])
+    assert abs(errors).max() < 1e-3
+    assert '10 held-out' in table.validation_report()
+
+    # the validation is saved with the table
+    filename = str(tmpdir.join('table.npz'))
+    table.to_file(filename)
+    table2 = PTIntegralsTable.from_file(filename)
+    numpy.testing.assert_array_equal(table2.errors, errors)
+    assert table2.validation_report() == table.validation_report()
@@ -0,0 +1,20 @@
+from pyRSD.rsd.power.gradient import missing_derivatives
+from pyRSD.rsd.power.qso.derivatives import PqsoDerivative
+
+def test_registry(driver):
+
+    from pyRSD.rsdfit.theory import QuasarPowerParameters
+
+    # all of the default parameters have analytic derivatives
+    pars = QuasarPowerParameters.from_defaults(model=driver.theory.model)
+    registry = PqsoDerivative.registry()
+    for name in pars:
+        assert missing_derivatives(registry, pars, name) == []
+
+def test_cost_report(driver):
+
+    # no numerical derivatives are needed
+    gradient = driver.theory.model.get_gradient(driver.theory.fit_params)
+    assert gradient.numerical_names == []
+    assert gradient.model_evaluations == 0
+    assert "model evaluations per gradient call: 0" in gradient.cost_report()
@@ -0,0 +1,47 @@
+from . import numpy as np
+import pytest
+
+NMU = 41
+
+@pytest.mark.parametrize("max_mu", [2, 4])
+def test_power_batch(driver, max_mu):
+
+    model = driver.theory.model
+    driver.set_fiducial()
+    rng = np.random.RandomState(0)
+
+    # the (k,mu) grid
+    k  = driver.data.combined_k
+    mu = np.linspace(0., 1., NMU)
+
+    original = (model.max_mu, model.f_nl)
+    try:
+        # include the scale-dependent bias from PNG
+        model.max_mu = max_mu
+        model.f_nl = 10.
+
+        # vary cheap parameters and sigma8_z
+        names = ['b1', 'sigma_fog', 'alpha_par', 'alpha_perp', 'N', 'sigma8_z']
+        theta0 = np.array([getattr(model, name) for name in names])
+        thetas = theta0 * (1 + 0.02*rng.uniform(-1, 1, size=(6, len(names))))
+        thetas[:, names.index('N')] = rng.uniform(0., 100., size=len(thetas))
+        thetas[::2, -1] = theta0[-1]
+        thetas[1, 0] = thetas[3, 0]
+
+        # the batch
+        Pk = model.power_batch(k, mu, thetas, names=names)
+        assert Pk.shape == (len(thetas), len(k)*NMU)
+
+        # the original state is restored
+        for name, val in zip(names, theta0):
+            assert getattr(model, name) == val
+
+        # compare to evaluating one at a time
+        for i, theta in enumerate(thetas):
+            model.update(**dict(zip(names, theta)))
+            P = model.power(k, mu, flatten=True).values
+            np.testing.assert_allclose(Pk[i], P, rtol=1e-10)
+            model.update(**dict(zip(names, theta0)))
+    finally:
+        model.max_mu, model.f_nl = original
+        driver.set_fiducial()
@@ -0,0 +1,79 @@
+from pyRSD.rsd._cache import Cache, parameter, cached_property, interpolated_function
+from pyRSD.rsd.tools import RSDSpline
+import numpy
+
+class Model(Cache):
+
+    k_interp = numpy.logspace(-3, 0, 100)
+    spline = RSDSpline
+
+    def __init__(self, A=1., f=0.5, n=1.):
+        self.A = A
+        self.f = f
+        self.n = n
+        self.ncalls = 0
+
+    @parameter
+    def A(self, val):
+        return val
+
+    @parameter
+    def f(self, val):
+        return val
+
+    @parameter
+    def n(self, val):
+        return val
+
+    @cached_property('A')
+    def norm(self):
+        return self.A**2
+
+    @interpolated_function('norm', 'f', 'n', rescale={'A':2, 'f':1})
+    def P(self, k):
+        self.ncalls += 1
+        return self.f * self.norm * k**self.n
+
+def test_classification():
+
+    order = Model._cached_order
+    names = lambda mask: set(name for i, name in enumerate(order) if (mask >> i) & 1)
+
+    assert names(Model._rescale_masks['A']) == {'P'}
+    assert names(Model._rescale_masks['f']) == {'P'}
+    assert names(Model._rescale_masks['n']) == set()
+
+def test_rescale():
+
+    m = Model()
+    k = numpy.logspace(-2, -0.5, 20)
+    m.P(k)
+    assert m.ncalls == 1
+
+    # amplitude-only changes rescale the spline
+    m.A = 1.5
+    numpy.testing.assert_allclose(m.P(k), 0.5*1.5**2*k, rtol=1e-8)
+    m.bulk_update(A=0.8, f=0.7)
+    numpy.testing.assert_allclose(m.P(k), 0.7*0.8**2*k, rtol=1e-8)
+    numpy.testing.assert_allclose(m.P(k, derivative=True), 0.7*0.8**2, rtol=1e-6)
+    assert m.ncalls == 1
+
+    # any other change requires a rebuild
+    m.bulk_update(A=1.2, n=2.)
+    numpy.testing.assert_allclose(m.P(k), 0.7*1.2**2*k**2, rtol=1e-6)
+    assert m.ncalls == 2
+
+    m.n = 1.
+    m.A = 1.
+    numpy.testing.assert_allclose(m.P(k), 0.7*k, rtol=1e-8)
+    assert m.ncalls == 3
+
+def test_zero_reference():
+
+    # a zero amplitude cannot be rescaled
+    m = Model(f=0.)
+    k = numpy.logspace(-2, -0.5, 20)
+    m.P(k)
+    m.f = 0.5
+    numpy.testing.assert_allclose(m.P(k), 0.5*k, rtol=1e-8)
+    assert m.ncalls == 2
@@ -0,0 +1,124 @@
+from pyRSD.rsd._cache import Cache, SharedCache, parameter, cached_property, shared_attributes
+from pyRSD.rsd.multi_redshift import MultiRedshiftSpectrum
+import pickle
+
+# the number of evaluations of the cached attributes, over all models
+ncalls = {'power_lin':0, 'growth':0, 'hzpt':0}
+
+class Model(Cache):
+    """
+    Mimic the structure of the cosmology- and redshift-dependent
+    attributes of a model
+    """
+    _snapshot_exclude = frozenset(['hzpt'])
+
+    def __init__(self, z=0., params=1., transfer_fit='CLASS', linear_power_file=None):
+        self.params = params
+        self.transfer_fit = transfer_fit
+        self.linear_power_file = linear_power_file
+        self.z = z
+
+    def update(self, **kwargs):
+        self.bulk_update(**kwargs)
+
+    @parameter
+    def params(self, val):
+        return val
+
+    @parameter
+    def transfer_fit(self, val):
+        return val
+
+    @parameter
+    def linear_power_file(self, val):
+        return val
+
+    @parameter
+    def z(self, val):
+        return val
+
+    @cached_property('params', 'transfer_fit', 'linear_power_file')
+    def power_lin(self):
+        ncalls['power_lin'] += 1
+        return 2*self.params
+
+    @cached_property('power_lin', 'z')
+    def growth(self):
+        ncalls['growth'] += 1
+        return self.power_lin / (1 + self.z)
+
+    @cached_property('power_lin')
+    def hzpt(self):
+        ncalls['hzpt'] += 1
+        return [self.power_lin]
+
+def test_shared_attributes():
+
+    params = MultiRedshiftSpectrum.shared_params
+    assert shared_attributes(Model, params) == ['power_lin']
+
+def test_multi_redshift():
+
+    for k in ncalls: ncalls[k] = 0
+    models = MultiRedshiftSpectrum([0.3, 0.5, 0.7], model_class=Model, params=1.)
+    assert len(models) == 3 and models.shared_names == ['power_lin']
+
+    # computed once for all redshifts
+    for m in models:
+        assert m.growth == 2. / (1 + m.z)
+        assert m.hzpt == [2.]
+    assert ncalls == {'power_lin':1, 'growth':3, 'hzpt':3}
+
+    # redshift-dependent parameters are independent
+    models[0].z = 0.
+    assert models[0].growth == 2. and models[1].growth == 2. / 1.5
+    assert ncalls['power_lin'] == 1
+
+    # changing the cosmology of one model does not affect the others
+    models[0].params = 2.
+    assert models[0].power_lin == 4. and models[1].power_lin == 2.
+    assert ncalls['power_lin'] == 2
+
+    # and the new cosmology is shared as well
+    models.update(params=2.)
+    assert [m.power_lin for m in models] == [4., 4., 4.]
+    assert ncalls['power_lin'] == 2
+
+    # back to the original cosmology, which is still stored
+    models.update(params=1.)
+    assert [m.growth for m in models] == [2., 2. / 1.5, 2. / 1.7]
+    assert ncalls['power_lin'] == 2
+
+def test_pickle():
+
+    models = MultiRedshiftSpectrum([0.3, 0.5], model_class=Model, params=1.)
+    [m.growth for m in models]
+
+    models = pickle.loads(pickle.dumps(models))
+    for k in ncalls: ncalls[k] = 0
+    assert [m.power_lin for m in models] == [2., 2.]
+    assert ncalls['power_lin'] == 0
+
+    # still shared
+    models[0]._cache.pop('power_lin')
+    models.update(params=3.)
+    assert [m.power_lin for m in models] == [6., 6.]
+    assert ncalls['power_lin'] == 1
+
+def test_uninstall():
+
+    models = MultiRedshiftSpectrum([0.3, 0.5], model_class=Model, params=1.)
+    [m.growth for m in models]
+
+    # a regular cache, holding the shared attributes
+    cache = SharedCache.uninstall(models[0])
+    assert type(cache) is dict and models[0]._cache is cache
+    assert sorted(cache) == ['growth', 'power_lin']
+
+    # no longer shared
+    for k in ncalls: ncalls[k] = 0
+    models[0].params = 3.
+    assert models[0].power_lin == 6. and models[1].power_lin == 2.
+    models[1].params = 3.
+    assert models[1].power_lin == 6.
+    assert ncalls['power_lin'] == 2
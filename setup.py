@@ -67,6 +67,37 @@ def check_swig_version():
         raise ValueError(("the version of `swig` on PATH must greater or equal to 3.0; "
                          "recommended installation without swig is ``conda install -c nickhan pyrsd``"))
 
+def openmp_flags():
+    """
+    Return the flags to compile and link with OpenMP, or an empty list
+    if the compiler does not support OpenMP (e.g., the default clang on macOS)
+
+    Notes
+    -----
+    *   without OpenMP, the vectorized GCL evaluators run on a single thread
+    """
+    import tempfile
+    from setuptools.command.build_ext import new_compiler, customize_compiler
+    from setuptools.errors import CompileError, LinkError
+
+    compiler = new_compiler()
+    customize_compiler(compiler)
+    tmpdir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(tmpdir, 'test_openmp.c')
+        with open(source, 'w') as ff:
+            ff.write("#include <omp.h>\nint main() { return omp_get_max_threads() < 1; }\n")
+        objects = compiler.compile([source], output_dir=tmpdir, extra_postargs=['-fopenmp'])
+        compiler.link_executable(objects, os.path.join(tmpdir, 'test_openmp'), extra_postargs=['-fopenmp'])
+    except (CompileError, LinkError):
+        return []
+    finally:
+        shutil.rmtree(tmpdir)
+    return ['-fopenmp']
+
+# the OpenMP flags for the GCL library and extension
+OPENMP_FLAGS = openmp_flags()
+
 def build_CLASS(prefix):
     """
     Function to download CLASS from github and and build the library
@@ -185,7 +216,7 @@ def libgcl_config():
     gcl_info['sources'] =  gcl_sources
     gcl_info['include_dirs'] = ['pyRSD/_gcl/include', '/usr/local/include']
     gcl_info['language'] = 'c++'
-    gcl_info['extra_compiler_args'] = ["-O2", '-std=c++11']
+    gcl_info['extra_compiler_args'] = ["-O2", '-std=c++11'] + OPENMP_FLAGS
     return ('gcl', gcl_info)
 
 def libfftlog_config():
@@ -214,7 +245,7 @@ def gcl_extension_config():
     # the configuration for GCL python extension
     config = {}
     config['name'] = 'pyRSD._gcl'
-    config['extra_link_args'] = ['-g', '-fPIC']
+    config['extra_link_args'] = ['-g', '-fPIC'] + OPENMP_FLAGS
     config['extra_compile_args'] = []
     config['libraries'] = ['gcl', 'fftlog', 'emu', 'class', 'gsl', 'gslcblas', 'gfortran']
 
@@ -276,5 +307,6 @@ if __name__ == '__main__':
           package_data={'pyRSD': pkg_data},
           entry_points={'console_scripts' :
                       ['rsdfit = pyRSD.rsdfit.rsdfit:main',
-                       'pyrsd-quickstart = pyRSD.quickstart.core:main']}
+                       'pyrsd-quickstart = pyRSD.quickstart.core:main',
+                       'pyrsd-pt-table = pyRSD.rsd.pt_table:main']}
     )